@@ -1,46 +1,88 @@
 from datetime import datetime, timedelta
+from typing import Optional
 import asyncio
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
-from app.models.models import Schedule, Alarm, AlarmType, User
+from app.models.models import Schedule, Alarm, AlarmType
+from app.core.alarm_outbox import enqueue_alarm, has_pending
 from app.core.database import SessionLocal
+from app.core.recurrence import expand_occurrences
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 반복 일정 회차 알람을 찾는 창 (점검 주기 1분보다 넉넉하게, outbox 보존 기간보다 짧게)
+RECURRING_ALARM_LOOKBACK = timedelta(hours=1)
+
 def format_alarm_message(schedule, alarm_time):
     """알람 메시지를 포맷팅합니다."""
     project_name = schedule.project_name or "프로젝트 미지정"
     formatted_time = alarm_time.strftime("%Y-%m-%d %H:%M")
     return f"{project_name}:{schedule.title}:{formatted_time}"
 
-def create_alarms_for_schedule(db: Session, schedule: Schedule, alarm_time: datetime, current_time: datetime):
-    """일정에 대한 알람을 생성합니다. 개인일정은 본인에게만, 일반일정은 모든 유저에게."""
+def create_alarms_for_schedule(
+    db: Session,
+    schedule: Schedule,
+    alarm_time: datetime,
+    current_time: datetime,
+    idempotency_key: Optional[str] = None
+):
+    """일정 알람 이벤트를 outbox 에 기록합니다. 개인일정은 본인에게만, 일반일정은 모든 유저에게."""
+    # 같은 점검 주기에서 두 번 기록되지 않도록 (리더 교체 직후 겹쳐 실행되는 경우)
+    idempotency_key = idempotency_key or f"schedule_due:{schedule.id}:{current_time.strftime('%Y%m%d%H%M')}"
+    enqueue_alarm(
+        db,
+        schedule.id,
+        AlarmType.SCHEDULE_DUE,
+        format_alarm_message(schedule, alarm_time),
+        recipient_ids=[schedule.owner_id] if schedule.individual else None,
+        activated=True,
+        idempotency_key=idempotency_key
+    )
     if schedule.individual:
-        # 개인일정: 본인에게만 알람 생성
-        new_alarm = Alarm(
-            user_id=schedule.owner_id,
-            schedule_id=schedule.id,
-            type=AlarmType.SCHEDULE_DUE,
-            message=format_alarm_message(schedule, alarm_time),
-            is_activated=True,
-            activated_at=current_time
-        )
-        db.add(new_alarm)
-        logger.info(f"Created individual alarm for schedule: {schedule.title} (owner: {schedule.owner_id})")
+        logger.info(f"Queued individual alarm for schedule: {schedule.title} (owner: {schedule.owner_id})")
     else:
-        # 일반일정: 모든 유저에게 알람 생성
-        all_users = db.query(User).all()
-        for user in all_users:
-            new_alarm = Alarm(
-                user_id=user.id,
-                schedule_id=schedule.id,
-                type=AlarmType.SCHEDULE_DUE,
-                message=format_alarm_message(schedule, alarm_time),
-                is_activated=True,
-                activated_at=current_time
+        logger.info(f"Queued public alarms for schedule: {schedule.title}")
+
+def check_recurring_alarms(db: Session, current_time: datetime) -> int:
+    """
+    반복 일정에서 알람 시각이 최근 RECURRING_ALARM_LOOKBACK 안에 든 회차의 알람을 기록합니다.
+
+    회차는 이 창 안에서만 펼치고, 알람은 회차(원래 시작 시각)마다 한 번만 기록되도록
+    outbox 멱등 키로 구분합니다 (회차 예외의 취소/완료/알람 시각 변경을 반영).
+
+    Returns:
+        int: 기록한 회차 수
+    """
+    since = current_time - RECURRING_ALARM_LOOKBACK
+    masters = db.query(Schedule).filter(
+        Schedule.rrule.isnot(None),
+        Schedule.alarm_time.isnot(None),
+        Schedule.is_completed == False,
+        Schedule.is_deleted == False,
+        Schedule.alarm_time <= current_time,
+        # 마지막 회차의 알람 시각(recurrence_end + 알람 offset)이 창 시작 이후인 규칙만
+        or_(
+            Schedule.recurrence_end.is_(None),
+            func.julianday(Schedule.recurrence_end) + func.julianday(Schedule.alarm_time)
+            - func.julianday(Schedule.date) >= func.julianday(since)
+        )
+    ).all()
+    queued = 0
+    for master in masters:
+        # 알람은 회차 시작보다 offset 만큼 앞(또는 뒤)에 울림
+        offset = master.alarm_time - master.date
+        for occurrence in expand_occurrences(db, [master], since - offset, current_time - offset):
+            if occurrence.is_completed or occurrence.alarm_time is None:
+                continue
+            if not since < occurrence.alarm_time <= current_time:
+                continue
+            create_alarms_for_schedule(
+                db, occurrence, occurrence.alarm_time, current_time,
+                idempotency_key=f"schedule_due:{master.id}:{occurrence.occurrence_date.strftime('%Y%m%d%H%M')}"
             )
-            db.add(new_alarm)
-        logger.info(f"Created public alarms for schedule: {schedule.title} (sent to {len(all_users)} users)")
+            queued += 1
+    return queued
 
 async def check_schedules():
     """1분마다 모든 유저의 알람을 체크하고 상태를 업데이트합니다."""
@@ -51,6 +93,7 @@ async def check_schedules():
             
             # 1. 알람 시간이 되었지만 아직 활성화되지 않은 알람 체크
             schedules = db.query(Schedule).filter(
+                Schedule.rrule.is_(None),
                 Schedule.alarm_time.isnot(None),
                 Schedule.alarm_time <= current_time,
                 Schedule.is_completed == False,
@@ -77,6 +120,9 @@ async def check_schedules():
                     ).first()
 
                 if not existing_alarm:
+                    if has_pending(db, schedule.id, AlarmType.SCHEDULE_DUE):
+                        # 이미 기록되어 전달을 기다리는 중
+                        continue
                     # 새로운 알람 생성
                     create_alarms_for_schedule(db, schedule, schedule.alarm_time, current_time)
                 elif not existing_alarm.is_activated and schedule.alarm_time <= current_time:
@@ -86,6 +132,9 @@ async def check_schedules():
                     existing_alarm.message = format_alarm_message(schedule, schedule.alarm_time)
                     logger.info(f"Activated existing alarm for schedule: {schedule.title}")
 
+            # 반복 일정은 알람 시각이 지난 회차마다 (회차는 최근 창 안에서만 펼침)
+            check_recurring_alarms(db, current_time)
+
             # 2. 마감 시간이 지난 일정에 대한 알람 처리
             overdue_schedules = db.query(Schedule).filter(
                 Schedule.due_time.isnot(None),
@@ -0,0 +1,186 @@
+import os
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.models import Alarm, AlarmDigestItem, AlarmType
+
+logger = logging.getLogger(__name__)
+
+# 같은 (사용자, 일정, 종류)의 미확인 알람이 이 시간 안에 다시 발생하면 한 행으로 합침 (0이면 합치지 않음)
+COALESCE_WINDOW_SECONDS = int(os.environ.get("ALARM_COALESCE_WINDOW_SECONDS", "600"))
+# 즉시 보내지 않고 주기적으로 요약 알람 하나로 묶을 종류 (쉼표 구분, 예: "memo,completion_request")
+DIGEST_TYPES = {
+    value.strip() for value in os.environ.get("ALARM_DIGEST_TYPES", "").split(",") if value.strip()
+}
+DIGEST_INTERVAL_SECONDS = int(os.environ.get("ALARM_DIGEST_INTERVAL_SECONDS", "3600"))
+# 요약 알람 메시지에 그대로 보여줄 최대 항목 수
+DIGEST_PREVIEW_ITEMS = 3
+
+IN_CHUNK_SIZE = 900
+
+
+def emit_alarms(
+    db: Session,
+    user_ids: Iterable[int],
+    schedule_id: Optional[int],
+    alarm_type: AlarmType,
+    message: str,
+    actor_id: Optional[int] = None,
+    now: Optional[datetime] = None,
+    activated_at: Optional[datetime] = None,
+) -> dict:
+    """
+    여러 사용자에게 같은 알람을 보냅니다. 커밋은 호출자가 합니다.
+
+    - 요약 대상 종류는 대기열(alarm_digest_items)에만 쌓고 주기적으로 묶어서 보냅니다.
+    - 창(window) 안에 같은 (사용자, 일정, 종류)의 미확인 알람이 있으면 새 행 대신
+      횟수/메시지/마지막 행위자만 갱신하고 최신 알람으로 올립니다 (UPDATE 한 번).
+    - 나머지 사용자에게는 한 번의 executemany 로 새 알람을 만듭니다.
+    - activated_at 을 주면 만들거나 합친 알람을 그 시각에 활성화된 상태로 둡니다.
+
+    Returns:
+        dict: {"created": 새 행 수, "merged": 합친 행 수, "digested": 대기열에 넣은 수}
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    result = {"created": 0, "merged": 0, "digested": 0}
+    if not user_ids:
+        return result
+    now = now or datetime.now()
+
+    if alarm_type.value in DIGEST_TYPES:
+        db.execute(insert(AlarmDigestItem), [
+            {
+                "user_id": user_id,
+                "schedule_id": schedule_id,
+                "type": alarm_type,
+                "message": message,
+                "actor_id": actor_id,
+                "created_at": now,
+            }
+            for user_id in user_ids
+        ])
+        result["digested"] = len(user_ids)
+        return result
+
+    merged = {}
+    if COALESCE_WINDOW_SECONDS > 0 and schedule_id is not None:
+        window_start = now - timedelta(seconds=COALESCE_WINDOW_SECONDS)
+        for start in range(0, len(user_ids), IN_CHUNK_SIZE):
+            rows = db.query(Alarm.id, Alarm.user_id).filter(
+                Alarm.schedule_id == schedule_id,
+                Alarm.type == alarm_type,
+                Alarm.user_id.in_(user_ids[start:start + IN_CHUNK_SIZE]),
+                Alarm.is_acked == False,
+                Alarm.is_deleted == False,
+                Alarm.created_at >= window_start
+            ).order_by(Alarm.created_at.desc()).all()
+            for row in rows:
+                merged.setdefault(row.user_id, row.id)
+        merged_ids = list(merged.values())
+        values = {
+            "coalesced_count": Alarm.coalesced_count + 1,
+            "message": message,
+            "last_actor_id": actor_id,
+            "created_at": now,
+        }
+        if activated_at is not None:
+            values.update(is_activated=True, activated_at=activated_at)
+        for start in range(0, len(merged_ids), IN_CHUNK_SIZE):
+            db.execute(
+                update(Alarm).where(
+                    Alarm.id.in_(merged_ids[start:start + IN_CHUNK_SIZE])
+                ).values(values).execution_options(synchronize_session=False)
+            )
+        result["merged"] = len(merged_ids)
+
+    new_user_ids = [user_id for user_id in user_ids if user_id not in merged]
+    if new_user_ids:
+        db.execute(insert(Alarm), [
+            {
+                "user_id": user_id,
+                "schedule_id": schedule_id,
+                "type": alarm_type,
+                "message": message,
+                "last_actor_id": actor_id,
+                "coalesced_count": 1,
+                "created_at": now,
+                "is_activated": activated_at is not None,
+                "activated_at": activated_at,
+            }
+            for user_id in new_user_ids
+        ])
+        result["created"] = len(new_user_ids)
+    return result
+
+
+def _digest_message(items) -> str:
+    previews = [item.message for item in items[:DIGEST_PREVIEW_ITEMS]]
+    message = f"새 알림 {len(items)}건: " + " / ".join(previews)
+    if len(items) > DIGEST_PREVIEW_ITEMS:
+        message += f" 외 {len(items) - DIGEST_PREVIEW_ITEMS}건"
+    return message
+
+
+def flush_digests(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    대기 중인 요약 대상 알림을 사용자별 요약 알람 하나로 묶습니다.
+
+    Returns:
+        int: 만든 요약 알람 수
+    """
+    now = now or datetime.now()
+    items = db.query(AlarmDigestItem).filter(
+        AlarmDigestItem.created_at <= now
+    ).order_by(AlarmDigestItem.user_id, AlarmDigestItem.created_at.desc()).all()
+    if not items:
+        return 0
+
+    by_user = defaultdict(list)
+    for item in items:
+        by_user[item.user_id].append(item)
+
+    db.execute(insert(Alarm), [
+        {
+            "user_id": user_id,
+            # 한 일정에 대한 알림만 모였으면 바로가기가 가능하도록 일정 id 유지
+            "schedule_id": user_items[0].schedule_id
+            if len({item.schedule_id for item in user_items}) == 1 else None,
+            "type": AlarmType.DIGEST,
+            "message": _digest_message(user_items),
+            "last_actor_id": user_items[0].actor_id,
+            "coalesced_count": len(user_items),
+            "created_at": now,
+        }
+        for user_id, user_items in by_user.items()
+    ])
+    item_ids = [item.id for item in items]
+    for start in range(0, len(item_ids), IN_CHUNK_SIZE):
+        db.execute(delete(AlarmDigestItem).where(
+            AlarmDigestItem.id.in_(item_ids[start:start + IN_CHUNK_SIZE])
+        ))
+    db.commit()
+    return len(by_user)
+
+
+async def start_alarm_digest():
+    """요약 알람 작업을 시작합니다 (요약 대상 종류가 설정된 경우에만)."""
+    if not DIGEST_TYPES:
+        return
+    logger.info(f"Starting alarm digest for {sorted(DIGEST_TYPES)}...")
+    while True:
+        await asyncio.sleep(DIGEST_INTERVAL_SECONDS)
+        db = SessionLocal()
+        try:
+            count = await asyncio.to_thread(flush_digests, db)
+            if count:
+                logger.info(f"Sent {count} digest alarms")
+        except Exception as e:
+            logger.error(f"Error in alarm digest: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
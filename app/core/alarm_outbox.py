@@ -0,0 +1,276 @@
+import os
+import json
+import uuid
+import asyncio
+import logging
+import urllib.request
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.alarm_coalescing import emit_alarms
+from app.models.models import AlarmOutbox, AlarmType, User
+
+logger = logging.getLogger(__name__)
+
+# 대기 중인 이벤트를 확인하는 주기와 한 번에 처리하는 수
+DISPATCH_INTERVAL_SECONDS = float(os.environ.get("ALARM_DISPATCH_INTERVAL_SECONDS", "2"))
+DISPATCH_BATCH_SIZE = 100
+# 재시도: RETRY_BASE_SECONDS * 2^(시도 횟수-1), 최대 RETRY_MAX_SECONDS. MAX_ATTEMPTS 번 실패하면 failed
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 3600
+# 전달을 마친 이벤트를 남겨 두는 기간 (이 기간 동안 같은 idempotency_key 는 다시 기록되지 않음)
+OUTBOX_RETENTION_DAYS = 7
+PRUNE_INTERVAL_SECONDS = 3600
+# 외부 채널: 설정하면 모든 알람 이벤트를 JSON 으로 POST
+WEBHOOK_URL = os.environ.get("ALARM_WEBHOOK_URL", "")
+WEBHOOK_TIMEOUT_SECONDS = 5
+
+# 앱 내 알람(alarms 테이블) 전달을 기록할 때 쓰는 채널 이름
+IN_APP_CHANNEL = "in_app"
+
+
+class AlarmChannel(ABC):
+    """앱 밖으로 알람 이벤트를 보내는 채널. send 는 같은 이벤트로 여러 번 호출될 수 있음"""
+
+    name = ""
+
+    @abstractmethod
+    def send(self, event: dict):
+        """이벤트를 보냅니다. 실패하면 예외를 올려 다시 시도하게 합니다."""
+
+
+class WebhookChannel(AlarmChannel):
+    """이벤트를 JSON 으로 POST 합니다. 수신측은 Idempotency-Key 헤더로 중복을 거를 수 있음"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = WEBHOOK_TIMEOUT_SECONDS):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event: dict):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(event, ensure_ascii=False).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                "Idempotency-Key": event["idempotency_key"],
+            },
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+_channels: Optional[List[AlarmChannel]] = None
+
+
+def get_channels() -> List[AlarmChannel]:
+    """환경 변수로 설정된 외부 채널 목록"""
+    global _channels
+    if _channels is None:
+        _channels = [WebhookChannel(WEBHOOK_URL)] if WEBHOOK_URL else []
+    return _channels
+
+
+def register_channel(channel: AlarmChannel):
+    """외부 채널을 추가합니다."""
+    get_channels().append(channel)
+
+
+def enqueue_alarm(
+    db: Session,
+    schedule_id: Optional[int],
+    alarm_type: AlarmType,
+    message: str,
+    recipient_ids: Optional[Iterable[int]] = None,
+    exclude_user_id: Optional[int] = None,
+    actor_id: Optional[int] = None,
+    activated: bool = False,
+    idempotency_key: Optional[str] = None,
+) -> bool:
+    """
+    알람 이벤트를 outbox 에 기록합니다. 커밋은 호출자가 하므로 요청의 변경과 함께 저장됩니다.
+
+    수신자 수와 상관없이 한 행만 씁니다. 실제 알람 생성과 외부 채널 전달은 디스패처가 합니다.
+
+    Args:
+        recipient_ids: 받을 사용자 id. None 이면 exclude_user_id 를 제외한 전체 사용자
+        activated: 알람을 활성화된 상태로 만들지 여부 (일정 알람 시간 도래)
+        idempotency_key: 같은 키로 다시 기록하면 무시됨. 없으면 새로 만듦
+
+    Returns:
+        bool: 새로 기록했으면 True, 같은 키가 이미 있으면 False
+    """
+    stmt = insert(AlarmOutbox).values(
+        idempotency_key=idempotency_key or uuid.uuid4().hex,
+        schedule_id=schedule_id,
+        type=alarm_type,
+        message=message,
+        recipient_ids=None if recipient_ids is None else json.dumps(list(recipient_ids)),
+        exclude_user_id=exclude_user_id,
+        actor_id=actor_id,
+        activated=activated,
+        status="pending",
+        delivered_channels="[]",
+        attempts=0,
+        next_attempt_at=datetime.now(),
+        created_at=datetime.now(),
+    ).on_conflict_do_nothing(index_elements=[AlarmOutbox.idempotency_key])
+    return db.execute(stmt).rowcount > 0
+
+
+def has_pending(db: Session, schedule_id: int, alarm_type: AlarmType) -> bool:
+    """아직 전달되지 않은 같은 일정/종류의 이벤트가 있는지"""
+    return db.query(AlarmOutbox.id).filter(
+        AlarmOutbox.schedule_id == schedule_id,
+        AlarmOutbox.type == alarm_type,
+        AlarmOutbox.status == "pending"
+    ).first() is not None
+
+
+def _recipients(db: Session, entry: AlarmOutbox) -> List[int]:
+    if entry.recipient_ids is not None:
+        return json.loads(entry.recipient_ids)
+    query = db.query(User.id)
+    if entry.exclude_user_id is not None:
+        query = query.filter(User.id != entry.exclude_user_id)
+    return [user_id for (user_id,) in query.order_by(User.id)]
+
+
+def _event(entry: AlarmOutbox, user_ids: List[int]) -> dict:
+    return {
+        "idempotency_key": entry.idempotency_key,
+        "type": entry.type.value,
+        "schedule_id": entry.schedule_id,
+        "message": entry.message,
+        "actor_id": entry.actor_id,
+        "user_ids": user_ids,
+        "created_at": entry.created_at.isoformat(),
+    }
+
+
+def deliver(db: Session, entry: AlarmOutbox, channels: List[AlarmChannel], now: datetime):
+    """
+    이벤트 하나를 앱 내 알람과 외부 채널로 전달합니다. 실패하면 예외를 그대로 올립니다.
+
+    채널마다 전달을 마치면 바로 커밋하므로 재시도 때는 남은 채널로만 보냅니다.
+    앱 내 알람은 전달 기록과 같은 트랜잭션에서 만들어 정확히 한 번 생깁니다.
+    """
+    done = set(json.loads(entry.delivered_channels or "[]"))
+    user_ids = _recipients(db, entry)
+
+    if IN_APP_CHANNEL not in done:
+        emit_alarms(
+            db,
+            user_ids,
+            entry.schedule_id,
+            entry.type,
+            entry.message,
+            actor_id=entry.actor_id,
+            now=entry.created_at,
+            activated_at=now if entry.activated else None,
+        )
+        done.add(IN_APP_CHANNEL)
+        entry.delivered_channels = json.dumps(sorted(done))
+        db.commit()
+
+    event = _event(entry, user_ids)
+    for channel in channels:
+        if channel.name in done:
+            continue
+        channel.send(event)
+        done.add(channel.name)
+        entry.delivered_channels = json.dumps(sorted(done))
+        db.commit()
+
+    entry.status = "delivered"
+    entry.delivered_at = now
+    entry.last_error = None
+    db.commit()
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def dispatch_batch(
+    db: Session,
+    channels: Optional[List[AlarmChannel]] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    전달할 때가 된 이벤트 한 배치를 처리합니다.
+
+    Returns:
+        dict: {"delivered": 전달 완료, "retried": 재시도 예약, "failed": 포기}
+    """
+    channels = get_channels() if channels is None else channels
+    now = now or datetime.now()
+    result = {"delivered": 0, "retried": 0, "failed": 0}
+    entries = db.query(AlarmOutbox).filter(
+        AlarmOutbox.status == "pending",
+        AlarmOutbox.next_attempt_at <= now
+    ).order_by(AlarmOutbox.id).limit(DISPATCH_BATCH_SIZE).all()
+
+    for entry in entries:
+        try:
+            deliver(db, entry, channels, now)
+            result["delivered"] += 1
+        except Exception as e:
+            db.rollback()
+            entry.attempts += 1
+            entry.last_error = str(e)[:500]
+            if entry.attempts >= MAX_ATTEMPTS:
+                entry.status = "failed"
+                result["failed"] += 1
+                logger.error(f"Giving up alarm outbox {entry.id} after {entry.attempts} attempts: {str(e)}")
+            else:
+                entry.next_attempt_at = now + _retry_delay(entry.attempts)
+                result["retried"] += 1
+                logger.warning(f"Alarm outbox {entry.id} attempt {entry.attempts} failed: {str(e)}")
+            db.commit()
+    return result
+
+
+def prune_delivered(db: Session, now: Optional[datetime] = None) -> int:
+    """보존 기간이 지난 전달 완료 이벤트를 지웁니다."""
+    cutoff = (now or datetime.now()) - timedelta(days=OUTBOX_RETENTION_DAYS)
+    count = db.execute(delete(AlarmOutbox).where(
+        AlarmOutbox.status == "delivered",
+        AlarmOutbox.delivered_at < cutoff
+    )).rowcount
+    db.commit()
+    return count
+
+
+async def start_alarm_dispatcher():
+    """알람 outbox 디스패처를 시작합니다."""
+    logger.info("Starting alarm dispatcher...")
+    last_prune = datetime.min
+    while True:
+        db = SessionLocal()
+        try:
+            while True:
+                result = await asyncio.to_thread(dispatch_batch, db)
+                if any(result.values()):
+                    logger.info(f"Dispatched alarm outbox batch: {result}")
+                # 배치가 가득 찼으면 쉬지 않고 이어서 처리
+                if sum(result.values()) < DISPATCH_BATCH_SIZE:
+                    break
+            if datetime.now() - last_prune > timedelta(seconds=PRUNE_INTERVAL_SECONDS):
+                pruned = await asyncio.to_thread(prune_delivered, db)
+                if pruned:
+                    logger.info(f"Pruned {pruned} delivered alarm outbox entries")
+                last_prune = datetime.now()
+        except Exception as e:
+            logger.error(f"Error in alarm dispatcher: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+        await asyncio.sleep(DISPATCH_INTERVAL_SECONDS)
@@ -0,0 +1,154 @@
+import os
+import time
+import asyncio
+import logging
+import statistics
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import delete, func, insert, or_, select, text
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.models import Alarm, AlarmArchive
+
+logger = logging.getLogger(__name__)
+
+# 확인/삭제된 알람을 alarms 테이블에 남겨 두는 기간 (일)
+ALARM_RETENTION_DAYS = int(os.environ.get("ALARM_RETENTION_DAYS", "30"))
+# 한 트랜잭션에서 옮기는 알람 수 (쓰기 잠금을 짧게 유지)
+BATCH_SIZE = 500
+BATCH_PAUSE_SECONDS = 0.2
+RUN_INTERVAL_SECONDS = 6 * 3600
+# 지연 시간 측정 시 반복 횟수
+LATENCY_SAMPLES = 20
+
+# alarms_archive 로 그대로 복사하는 컬럼 (alarms.id 는 original_id 로)
+ARCHIVED_COLUMNS = [
+    "user_id", "schedule_id", "type", "message", "is_activated",
+    "is_acked", "is_deleted", "created_at", "activated_at", "acked_at",
+    "coalesced_count", "last_actor_id",
+]
+
+
+def _candidate_ids(db: Session, cutoff: datetime) -> List[int]:
+    """보존 기간이 지난 확인/삭제된 알람 id 한 배치"""
+    rows = db.query(Alarm.id).filter(
+        Alarm.created_at < cutoff,
+        or_(Alarm.is_acked == True, Alarm.is_deleted == True)
+    ).order_by(Alarm.id).limit(BATCH_SIZE).all()
+    return [row.id for row in rows]
+
+
+def archive_batch(db: Session, cutoff: datetime) -> int:
+    """
+    알람 한 배치를 alarms_archive 로 옮깁니다 (복사와 삭제를 한 트랜잭션에서).
+    보관 행은 새 id 를 받으므로 다시 쓰인 알람 id 도 건너뛰지 않고 옮깁니다.
+
+    Returns:
+        int: 옮긴 알람 수
+    """
+    ids = _candidate_ids(db, cutoff)
+    if not ids:
+        return 0
+    columns = [getattr(Alarm, name) for name in ARCHIVED_COLUMNS]
+    db.execute(
+        insert(AlarmArchive).from_select(
+            ["original_id"] + ARCHIVED_COLUMNS + ["archived_at"],
+            select(Alarm.id, *columns, func.current_timestamp()).where(Alarm.id.in_(ids))
+        )
+    )
+    db.execute(delete(Alarm).where(Alarm.id.in_(ids)).execution_options(synchronize_session=False))
+    db.commit()
+    return len(ids)
+
+
+def _index_sizes(db: Session) -> Optional[dict]:
+    """alarms 테이블과 인덱스의 크기 (바이트). dbstat 을 지원하지 않으면 None"""
+    try:
+        rows = db.execute(text(
+            "SELECT name, SUM(pgsize) FROM dbstat "
+            "WHERE name = 'alarms' OR name IN "
+            "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'alarms') "
+            "GROUP BY name"
+        )).fetchall()
+    except Exception:
+        return None
+    return {name: size for name, size in rows}
+
+
+def _feed_latency_ms(db: Session, user_id: int) -> float:
+    """알람 피드 첫 페이지 조회 시간 중앙값 (밀리초)"""
+    samples = []
+    for _ in range(LATENCY_SAMPLES):
+        started = time.perf_counter()
+        db.query(Alarm.id).filter(
+            Alarm.user_id == user_id,
+            Alarm.is_deleted == False
+        ).order_by(Alarm.created_at.desc(), Alarm.id.desc()).limit(50).all()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def alarm_table_stats(db: Session) -> dict:
+    """
+    alarms 테이블의 행 수, 인덱스 크기, 피드 조회 지연을 측정합니다.
+
+    지연은 알람이 가장 많은 사용자를 기준으로 측정합니다.
+    """
+    rows = db.query(func.count(Alarm.id)).scalar()
+    busiest = db.query(Alarm.user_id).group_by(Alarm.user_id).order_by(
+        func.count(Alarm.id).desc()
+    ).first()
+    return {
+        "rows": rows,
+        "archived_rows": db.query(func.count(AlarmArchive.id)).scalar(),
+        "sizes": _index_sizes(db),
+        "feed_latency_ms": _feed_latency_ms(db, busiest.user_id) if busiest else None,
+    }
+
+
+async def run_retention_pass(retention_days: int = ALARM_RETENTION_DAYS) -> int:
+    """
+    보존 기간이 지난 확인/삭제된 알람을 배치 단위로 보관 테이블로 옮깁니다.
+
+    Returns:
+        int: 옮긴 알람 수
+    """
+    db = SessionLocal()
+    moved = 0
+    try:
+        cutoff = datetime.now() - timedelta(days=retention_days)
+        if not _candidate_ids(db, cutoff):
+            return 0
+
+        before = await asyncio.to_thread(alarm_table_stats, db)
+        while True:
+            count = await asyncio.to_thread(archive_batch, db, cutoff)
+            if not count:
+                break
+            moved += count
+            await asyncio.sleep(BATCH_PAUSE_SECONDS)
+        after = await asyncio.to_thread(alarm_table_stats, db)
+        logger.info(f"Archived {moved} alarms older than {retention_days} days: before={before} after={after}")
+    except Exception as e:
+        logger.error(f"Error in alarm retention: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+    return moved
+
+
+async def start_alarm_retention():
+    """알람 보존 작업을 시작합니다."""
+    logger.info("Starting alarm retention...")
+    while True:
+        await run_retention_pass()
+        await asyncio.sleep(RUN_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    BATCH_PAUSE_SECONDS = 0
+    asyncio.run(run_retention_pass())
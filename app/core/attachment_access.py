@@ -0,0 +1,59 @@
+from typing import Iterable, List
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, contains_eager
+from app.models.models import Attachment, Schedule, User
+
+# SQLite 구버전의 바인드 변수 제한(999)을 넘지 않도록 IN 목록을 나누는 크기
+IN_CHUNK_SIZE = 900
+
+def can_read_clause(user: User):
+    """첨부파일 조회 권한 조건 (공개 일정이거나 본인 일정)"""
+    return or_(Schedule.individual == False, Schedule.owner_id == user.id)
+
+def can_modify_clause(user: User):
+    """첨부파일 수정/삭제 권한 조건 (업로더 본인이거나 일정 소유자)"""
+    return or_(Attachment.uploader_id == user.id, Schedule.owner_id == user.id)
+
+def _unique_ids(file_ids: Iterable[int]) -> List[int]:
+    seen = set()
+    result = []
+    for file_id in file_ids:
+        if file_id not in seen:
+            seen.add(file_id)
+            result.append(file_id)
+    return result
+
+def resolve_attachments(db: Session, file_ids: Iterable[int], permission_clause) -> List[Attachment]:
+    """
+    ID 목록 전체에 대한 권한을 한 번의 JOIN + IN 쿼리로 확인합니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        file_ids (Iterable[int]): 첨부파일 ID 목록
+        permission_clause: 권한 조건 (can_read_clause / can_modify_clause)
+
+    Returns:
+        List[Attachment]: 권한이 있는 첨부파일 (요청 순서 유지, schedule 로드됨)
+    """
+    ids = _unique_ids(file_ids)
+    found = {}
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CHUNK_SIZE]
+        rows = db.query(Attachment).join(
+            Schedule, Attachment.schedule_id == Schedule.id
+        ).options(
+            contains_eager(Attachment.schedule)
+        ).filter(
+            and_(Attachment.id.in_(chunk), permission_clause)
+        ).all()
+        for attachment in rows:
+            found[attachment.id] = attachment
+    return [found[file_id] for file_id in ids if file_id in found]
+
+def readable_attachments(db: Session, file_ids: Iterable[int], user: User) -> List[Attachment]:
+    """사용자가 조회(다운로드)할 수 있는 첨부파일만 반환합니다."""
+    return resolve_attachments(db, file_ids, can_read_clause(user))
+
+def modifiable_attachments(db: Session, file_ids: Iterable[int], user: User) -> List[Attachment]:
+    """사용자가 수정/삭제할 수 있는 첨부파일만 반환합니다."""
+    return resolve_attachments(db, file_ids, can_modify_clause(user))
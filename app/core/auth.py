@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.database import get_db
@@ -155,6 +155,42 @@ async def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+#@log_function_call(logger)
+async def get_current_user_from_request(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Authorization 헤더 또는 session_token 쿠키로 현재 사용자 조회
+    
+    <img>, <video> 태그처럼 헤더를 붙일 수 없는 요청을 위해 쿠키도 허용합니다.
+    
+    Args:
+        request (Request): 요청 객체
+        db (Session): 데이터베이스 세션
+    
+    Returns:
+        User: 활성화된 사용자 정보
+    
+    Raises:
+        HTTPException: 인증 실패 시
+    """
+    token = None
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ", 1)[1]
+    if not token:
+        token = request.cookies.get("session_token")
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = await get_current_user(token=token, db=db)
+    return await get_current_active_user(current_user=user)
+
 #@log_function_call(logger)
 def decode_access_token(token: str) -> str:
     """
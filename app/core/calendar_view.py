@@ -0,0 +1,105 @@
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from app.core.recurrence import expand_occurrences, recurring_in_window
+from app.core.schedule_access import can_view_clause
+from app.models.models import Schedule, User
+
+# DB 에 저장된 (timezone 없는) 일정 시각의 기준 시간대
+STORAGE_TIMEZONE = ZoneInfo(os.getenv("SCHEDULE_TIMEZONE", "Asia/Seoul"))
+# 한 번에 요청할 수 있는 최대 일 수 (월간 보기 6주 + 여유)
+MAX_CALENDAR_DAYS = 93
+# 날짜 버킷 한 칸의 열 (열 이름마다 값 배열)
+CALENDAR_COLUMNS = ("id", "title", "priority", "time", "completed")
+
+
+def _to_view(value: datetime, tz: ZoneInfo) -> datetime:
+    """저장 시간대의 시각을 보는 사람의 시간대로 (timezone 없는 값으로 돌려줌)"""
+    if tz == STORAGE_TIMEZONE:
+        return value
+    return value.replace(tzinfo=STORAGE_TIMEZONE).astimezone(tz).replace(tzinfo=None)
+
+
+def _to_storage(value: datetime, tz: ZoneInfo) -> datetime:
+    if tz == STORAGE_TIMEZONE:
+        return value
+    return value.replace(tzinfo=tz).astimezone(STORAGE_TIMEZONE).replace(tzinfo=None)
+
+
+def _add_entry(buckets: Dict[str, dict], item, start: date, end: date, tz: ZoneInfo):
+    """일정을 시작일부터 마감일까지 (창 안의) 날짜마다 넣음. 시각은 시작한 날에만"""
+    begins = _to_view(item.date, tz)
+    finishes = _to_view(item.due_time, tz) if item.due_time and item.due_time > item.date else begins
+    day = max(begins.date(), start)
+    last = min(finishes.date(), end)
+    while day <= last:
+        bucket = buckets.setdefault(day.isoformat(), {column: [] for column in CALENDAR_COLUMNS})
+        bucket["id"].append(item.id)
+        bucket["title"].append(item.title)
+        bucket["priority"].append(item.priority.value if item.priority else None)
+        bucket["time"].append(begins.strftime("%H:%M") if day == begins.date() else None)
+        bucket["completed"].append(bool(item.is_completed))
+        day += timedelta(days=1)
+
+
+def build_calendar(db: Session, user: User, start: date, end: date, tz: Optional[ZoneInfo] = None) -> dict:
+    """
+    start~end(양 끝 포함, tz 기준 날짜)의 일정을 날짜별 열 배열로 묶어 돌려줍니다.
+
+    일반 일정은 필요한 열만 date 인덱스 범위로 조회하고, 여러 날에 걸친 일정(date~due_time)은
+    걸친 날짜마다 넣습니다. 반복 일정은 이 창 안의 회차로 펼칩니다.
+
+    Returns:
+        dict: {"start", "end", "tz", "days": {"YYYY-MM-DD": {"id": [...], "title": [...], ...}}}
+            일정이 없는 날짜는 빠지고, 날짜 안에서는 시각 순 (이어지는 날은 맨 앞)
+
+    Raises:
+        ValueError: 기간이 잘못되었거나 MAX_CALENDAR_DAYS 보다 긴 경우
+    """
+    tz = tz or STORAGE_TIMEZONE
+    if end < start:
+        raise ValueError("end must not be before start")
+    if (end - start).days + 1 > MAX_CALENDAR_DAYS:
+        raise ValueError(f"at most {MAX_CALENDAR_DAYS} days can be requested at once")
+    window_start = _to_storage(datetime.combine(start, time.min), tz)
+    window_end = _to_storage(datetime.combine(end + timedelta(days=1), time.min), tz) - timedelta(microseconds=1)
+
+    visible = and_(Schedule.is_deleted == False, can_view_clause(user))
+    rows = db.query(
+        Schedule.id, Schedule.title, Schedule.priority, Schedule.date, Schedule.due_time, Schedule.is_completed
+    ).filter(
+        visible,
+        Schedule.rrule.is_(None),
+        or_(
+            # 창 안에서 시작 (ix_schedules_date)
+            Schedule.date.between(window_start, window_end),
+            # 창 전에 시작해서 창 안까지 이어짐 (ix_schedules_due_time). likely() 로 date 인덱스 대신
+            # due_time 인덱스를 고르도록 알려 줌
+            and_(Schedule.due_time >= window_start, func.likely(Schedule.date < window_start))
+        )
+    ).all()
+    # 회차가 창 전에 시작해서 이어지는 경우까지 보도록 가장 긴 회차 길이만큼 앞에서부터 펼침
+    masters = db.query(Schedule).filter(visible, recurring_in_window(window_start, window_end)).all()
+    longest = max(
+        (master.due_time - master.date for master in masters if master.due_time and master.due_time > master.date),
+        default=timedelta(0)
+    )
+    items = list(rows) + expand_occurrences(db, masters, window_start - longest, window_end)
+
+    buckets: Dict[str, dict] = {}
+    for item in sorted(items, key=lambda item: (item.date, item.id)):
+        _add_entry(buckets, item, start, end, tz)
+    for bucket in buckets.values():
+        # 이어지는 날(시각 없음)을 먼저, 나머지는 시작 시각 순
+        order = sorted(range(len(bucket["id"])), key=lambda i: (bucket["time"][i] is not None, bucket["time"][i] or ""))
+        for column in CALENDAR_COLUMNS:
+            bucket[column] = [bucket[column][i] for i in order]
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "tz": tz.key,
+        "days": dict(sorted(buckets.items())),
+    }
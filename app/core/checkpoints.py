@@ -0,0 +1,18 @@
+import json
+from sqlalchemy.orm import Session
+from app.models.models import MaintenanceCheckpoint
+
+def load_checkpoint(db: Session, name: str) -> dict:
+    """저장된 체크포인트를 반환합니다. 없으면 빈 dict"""
+    checkpoint = db.get(MaintenanceCheckpoint, name)
+    if not checkpoint or not checkpoint.value:
+        return {}
+    return json.loads(checkpoint.value)
+
+def save_checkpoint(db: Session, name: str, value: dict):
+    """체크포인트를 저장합니다. 커밋은 호출자가 합니다."""
+    checkpoint = db.get(MaintenanceCheckpoint, name)
+    if checkpoint is None:
+        checkpoint = MaintenanceCheckpoint(name=name)
+        db.add(checkpoint)
+    checkpoint.value = json.dumps(value, ensure_ascii=False)
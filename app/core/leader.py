@@ -0,0 +1,142 @@
+import os
+import uuid
+import socket
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+from sqlalchemy import case, delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.models import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+# 백그라운드 작업 전체를 묶는 임대 이름
+BACKGROUND_LEASE_NAME = "background_jobs"
+# 임대 유효 시간. 리더가 죽으면 길어야 이 시간 뒤에 다른 워커가 인수
+LEASE_TTL_SECONDS = int(os.environ.get("LEADER_LEASE_TTL_SECONDS", "15"))
+# 임대 갱신(리더) / 인수 시도(대기 워커) 주기
+HEARTBEAT_SECONDS = int(os.environ.get("LEADER_HEARTBEAT_SECONDS", "5"))
+
+# 이 프로세스를 구분하는 값 (같은 호스트의 여러 워커, 재시작된 워커를 모두 구분)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def try_acquire(
+    db: Session,
+    name: str,
+    holder: str,
+    ttl_seconds: int = LEASE_TTL_SECONDS,
+    now: Optional[datetime] = None,
+) -> bool:
+    """
+    임대를 얻거나 갱신합니다.
+
+    UPSERT 한 문장으로 처리하므로 여러 워커가 동시에 시도해도 한 워커만 성공합니다.
+    임대가 없거나, 이미 내 것이거나, 만료된 경우에만 내 것으로 씁니다.
+
+    Returns:
+        bool: 이 holder 가 임대를 가지고 있으면 True
+    """
+    now = now or datetime.now()
+    stmt = insert(LeaderLease).values(
+        name=name,
+        holder=holder,
+        acquired_at=now,
+        expires_at=now + timedelta(seconds=ttl_seconds),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LeaderLease.name],
+        set_={
+            "holder": stmt.excluded.holder,
+            "expires_at": stmt.excluded.expires_at,
+            # 갱신이면 처음 얻은 시각 유지
+            "acquired_at": case(
+                (LeaderLease.holder == stmt.excluded.holder, LeaderLease.acquired_at),
+                else_=stmt.excluded.acquired_at,
+            ),
+        },
+        where=(LeaderLease.holder == stmt.excluded.holder) | (LeaderLease.expires_at < stmt.excluded.acquired_at),
+    )
+    db.execute(stmt)
+    db.commit()
+    current = db.query(LeaderLease.holder).filter(LeaderLease.name == name).scalar()
+    return current == holder
+
+
+def release(db: Session, name: str, holder: str):
+    """내가 가진 임대를 놓습니다. 대기 중인 워커가 다음 시도에서 바로 인수합니다."""
+    db.execute(delete(LeaderLease).where(LeaderLease.name == name, LeaderLease.holder == holder))
+    db.commit()
+
+
+def _renew(name: str, holder: str) -> bool:
+    db = SessionLocal()
+    try:
+        return try_acquire(db, name, holder, LEASE_TTL_SECONDS)
+    finally:
+        db.close()
+
+
+def _release(name: str, holder: str):
+    db = SessionLocal()
+    try:
+        release(db, name, holder)
+    finally:
+        db.close()
+
+
+async def _stop_jobs(tasks: List[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    tasks.clear()
+
+
+async def run_as_leader(
+    jobs: List[Callable[[], Awaitable]],
+    name: str = BACKGROUND_LEASE_NAME,
+    holder: str = WORKER_ID,
+):
+    """
+    리더로 선출된 동안에만 백그라운드 작업들을 실행합니다.
+
+    모든 워커가 이 함수를 실행하지만 임대를 가진 워커 하나만 jobs 를 시작합니다.
+    리더는 HEARTBEAT_SECONDS 마다 임대를 갱신하고, 갱신에 실패해 임대를 잃으면
+    작업을 취소합니다. 나머지 워커는 같은 주기로 인수를 시도하므로 리더가 죽으면
+    LEASE_TTL_SECONDS + HEARTBEAT_SECONDS 안에 다른 워커가 작업을 이어받습니다.
+
+    Args:
+        jobs: 인자 없이 호출하면 코루틴을 돌려주는 함수 목록 (예: start_alarm_checker)
+    """
+    tasks: List[asyncio.Task] = []
+    lease_until = datetime.min
+    try:
+        while True:
+            try:
+                is_leader = await asyncio.to_thread(_renew, name, holder)
+                if is_leader:
+                    lease_until = datetime.now() + timedelta(seconds=LEASE_TTL_SECONDS)
+            except Exception as e:
+                # DB 잠금 등으로 갱신하지 못해도 임대가 남아 있는 동안은 리더 유지
+                logger.error(f"Error renewing leader lease '{name}': {str(e)}")
+                is_leader = datetime.now() < lease_until
+
+            if is_leader and not tasks:
+                logger.info(f"Worker {holder} became leader for '{name}', starting {len(jobs)} jobs")
+                tasks = [asyncio.create_task(job()) for job in jobs]
+            elif not is_leader and tasks:
+                logger.warning(f"Worker {holder} lost leader lease '{name}', stopping jobs")
+                await _stop_jobs(tasks)
+
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+    finally:
+        if tasks:
+            await _stop_jobs(tasks)
+            try:
+                await asyncio.to_thread(_release, name, holder)
+                logger.info(f"Worker {holder} released leader lease '{name}'")
+            except Exception as e:
+                logger.error(f"Error releasing leader lease '{name}': {str(e)}")
@@ -1,5 +1,4 @@
 import sqlite3
-from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -57,6 +56,426 @@ def migrate_database():
         if 'conn' in locals():
             conn.close()
 
+# 기존 테이블에 추가된 컬럼 (table, column, DDL 타입)
+COLUMN_UPGRADES = [
+    ("attachments", "file_missing_at", "DATETIME"),
+    ("alarms", "coalesced_count", "INTEGER DEFAULT 1"),
+    ("alarms", "last_actor_id", "INTEGER REFERENCES users(id)"),
+    ("alarms_archive", "coalesced_count", "INTEGER DEFAULT 1"),
+    ("alarms_archive", "last_actor_id", "INTEGER"),
+    ("alarms_archive", "original_id", "INTEGER"),
+    ("schedules", "order_key", "VARCHAR"),
+    ("schedules", "deleted_at", "DATETIME"),
+    ("schedules", "deleted_batch", "VARCHAR"),
+    ("schedule_shares", "is_deleted", "BOOLEAN DEFAULT 0"),
+    ("schedule_shares", "deleted_batch", "VARCHAR"),
+    ("alarms", "deleted_batch", "VARCHAR"),
+    ("schedules", "rrule", "VARCHAR"),
+    ("schedules", "recurrence_end", "DATETIME"),
+]
+
+# 애플리케이션 시작 시 적용하는 인덱스 (IF NOT EXISTS 로 멱등)
+# 새 DB는 모델 정의로 생성되고, 기존 DB는 여기서 보완된다.
+INDEX_UPGRADES = [
+    "CREATE INDEX IF NOT EXISTS ix_attachments_schedule_id ON attachments (schedule_id)",
+    "CREATE INDEX IF NOT EXISTS ix_attachments_created_at ON attachments (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_attachments_uploader_created ON attachments (uploader_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_alarms_user_feed ON alarms (user_id, is_deleted, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_alarms_schedule_type ON alarms (schedule_id, type)",
+    "CREATE INDEX IF NOT EXISTS ix_alarms_archive_original_id ON alarms_archive (original_id)",
+    "DROP INDEX IF EXISTS ix_schedules_parent_id",
+    "CREATE INDEX IF NOT EXISTS ix_schedules_parent_order_key ON schedules (parent_id, order_key)",
+    "CREATE INDEX IF NOT EXISTS ix_schedules_deleted_batch ON schedules (deleted_batch) WHERE deleted_batch IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_alarms_deleted_batch ON alarms (deleted_batch) WHERE deleted_batch IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_schedules_recurring ON schedules (date, recurrence_end) WHERE rrule IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_schedules_date ON schedules (date)",
+    "CREATE INDEX IF NOT EXISTS ix_schedules_due_time ON schedules (due_time)",
+    "CREATE INDEX IF NOT EXISTS ix_schedules_owner_due ON schedules (owner_id, due_time)",
+    "CREATE INDEX IF NOT EXISTS ix_schedules_project_due ON schedules (project_name, due_time)",
+]
+
+# 첨부파일명 부분 검색용 trigram FTS5 인덱스 (attachments 테이블을 외부 컨텐츠로 사용)
+ATTACHMENT_FTS_TABLE = "attachments_fts"
+ATTACHMENT_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {ATTACHMENT_FTS_TABLE}
+    USING fts5(filename, content='attachments', content_rowid='id', tokenize='trigram')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS attachments_fts_ai AFTER INSERT ON attachments BEGIN
+        INSERT INTO {ATTACHMENT_FTS_TABLE}(rowid, filename) VALUES (new.id, new.filename);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS attachments_fts_ad AFTER DELETE ON attachments BEGIN
+        INSERT INTO {ATTACHMENT_FTS_TABLE}({ATTACHMENT_FTS_TABLE}, rowid, filename)
+        VALUES ('delete', old.id, old.filename);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS attachments_fts_au AFTER UPDATE OF filename ON attachments BEGIN
+        INSERT INTO {ATTACHMENT_FTS_TABLE}({ATTACHMENT_FTS_TABLE}, rowid, filename)
+        VALUES ('delete', old.id, old.filename);
+        INSERT INTO {ATTACHMENT_FTS_TABLE}(rowid, filename) VALUES (new.id, new.filename);
+    END
+    """,
+]
+
+# 일정 검색 색인 (app.core.schedule_search). 한글 n-gram/초성 토큰을 Python 에서 만들어 넣으므로
+# 트리거는 바뀐 일정 id 만 schedule_search_queue 에 쌓고, 색인은 쓰는 세션이 commit 할 때 큐만큼 갱신
+SCHEDULE_SEARCH_TABLE = "schedule_search"
+SCHEDULE_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SCHEDULE_SEARCH_TABLE}
+    USING fts5(title, body, memo, project, filenames, choseong, tokenize='unicode61 remove_diacritics 0')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS schedules_search_ai AFTER INSERT ON schedules BEGIN
+        INSERT OR IGNORE INTO schedule_search_queue (schedule_id) VALUES (new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS schedules_search_ad AFTER DELETE ON schedules BEGIN
+        INSERT OR IGNORE INTO schedule_search_queue (schedule_id) VALUES (old.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS attachments_search_ai AFTER INSERT ON attachments
+    WHEN new.schedule_id IS NOT NULL BEGIN
+        INSERT OR IGNORE INTO schedule_search_queue (schedule_id) VALUES (new.schedule_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS attachments_search_ad AFTER DELETE ON attachments
+    WHEN old.schedule_id IS NOT NULL BEGIN
+        INSERT OR IGNORE INTO schedule_search_queue (schedule_id) VALUES (old.schedule_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS attachments_search_au AFTER UPDATE OF filename, schedule_id ON attachments BEGIN
+        INSERT OR IGNORE INTO schedule_search_queue (schedule_id)
+        SELECT old.schedule_id WHERE old.schedule_id IS NOT NULL
+        UNION SELECT new.schedule_id WHERE new.schedule_id IS NOT NULL;
+    END
+    """,
+    # 마지막에 만드는 트리거로 설치 여부를 판단 (없으면 색인을 처음부터 다시 만듦)
+    """
+    CREATE TRIGGER IF NOT EXISTS schedules_search_au
+    AFTER UPDATE OF title, content, memo, project_name, is_deleted ON schedules BEGIN
+        INSERT OR IGNORE INTO schedule_search_queue (schedule_id) VALUES (new.id);
+    END
+    """,
+]
+
+# 저장된 검색 캐시 무효화용 일정 변경 피드. 저장된 검색이 하나도 없으면 쌓지 않음
+_CHANGES_WANTED = "EXISTS (SELECT 1 FROM saved_searches)"
+SCHEDULE_CHANGE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedules_changes_ai AFTER INSERT ON schedules
+    WHEN {_CHANGES_WANTED} BEGIN
+        INSERT INTO schedule_changes (schedule_id) VALUES (new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedules_changes_au AFTER UPDATE ON schedules
+    WHEN {_CHANGES_WANTED} BEGIN
+        INSERT INTO schedule_changes (schedule_id) VALUES (new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedules_changes_ad AFTER DELETE ON schedules
+    WHEN {_CHANGES_WANTED} BEGIN
+        INSERT INTO schedule_changes (schedule_id) VALUES (old.id);
+    END
+    """,
+    # 첨부파일은 has:attachment 조건에 영향
+    f"""
+    CREATE TRIGGER IF NOT EXISTS attachments_changes_ai AFTER INSERT ON attachments
+    WHEN new.schedule_id IS NOT NULL AND {_CHANGES_WANTED} BEGIN
+        INSERT INTO schedule_changes (schedule_id) VALUES (new.schedule_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS attachments_changes_ad AFTER DELETE ON attachments
+    WHEN old.schedule_id IS NOT NULL AND {_CHANGES_WANTED} BEGIN
+        INSERT INTO schedule_changes (schedule_id) VALUES (old.schedule_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS attachments_changes_au AFTER UPDATE OF schedule_id ON attachments
+    WHEN {_CHANGES_WANTED} BEGIN
+        INSERT INTO schedule_changes (schedule_id)
+        SELECT old.schedule_id WHERE old.schedule_id IS NOT NULL
+        UNION SELECT new.schedule_id WHERE new.schedule_id IS NOT NULL;
+    END
+    """,
+]
+
+# 사용자별 미확인 알람 수 (is_acked = 0 AND is_deleted = 0) 를 유지하는 트리거
+# 알람을 만들거나 바꾸는 모든 코드 경로(일괄 UPDATE 포함)에서 카운터가 어긋나지 않도록 DB에서 처리
+ALARM_UNREAD_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS alarms_unread_ai AFTER INSERT ON alarms
+    WHEN COALESCE(new.is_acked, 0) = 0 AND COALESCE(new.is_deleted, 0) = 0 BEGIN
+        INSERT INTO alarm_unread_counts (user_id, unread_count) VALUES (new.user_id, 1)
+        ON CONFLICT(user_id) DO UPDATE SET unread_count = unread_count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS alarms_unread_ad AFTER DELETE ON alarms
+    WHEN COALESCE(old.is_acked, 0) = 0 AND COALESCE(old.is_deleted, 0) = 0 BEGIN
+        UPDATE alarm_unread_counts SET unread_count = MAX(unread_count - 1, 0)
+        WHERE user_id = old.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS alarms_unread_au AFTER UPDATE OF is_acked, is_deleted, user_id ON alarms
+    WHEN (COALESCE(old.is_acked, 0) = 0 AND COALESCE(old.is_deleted, 0) = 0)
+      != (COALESCE(new.is_acked, 0) = 0 AND COALESCE(new.is_deleted, 0) = 0)
+      OR old.user_id IS NOT new.user_id BEGIN
+        UPDATE alarm_unread_counts SET unread_count = MAX(unread_count - 1, 0)
+        WHERE user_id = old.user_id
+          AND COALESCE(old.is_acked, 0) = 0 AND COALESCE(old.is_deleted, 0) = 0;
+        INSERT INTO alarm_unread_counts (user_id, unread_count)
+        SELECT new.user_id, 1
+        WHERE COALESCE(new.is_acked, 0) = 0 AND COALESCE(new.is_deleted, 0) = 0
+        ON CONFLICT(user_id) DO UPDATE SET unread_count = unread_count + 1;
+    END
+    """,
+]
+
+# 트리거를 처음 만들 때 기존 알람으로 카운터를 다시 계산
+ALARM_UNREAD_REBUILD = [
+    "DELETE FROM alarm_unread_counts",
+    """
+    INSERT INTO alarm_unread_counts (user_id, unread_count)
+    SELECT user_id, COUNT(*) FROM alarms
+    WHERE user_id IS NOT NULL AND COALESCE(is_acked, 0) = 0 AND COALESCE(is_deleted, 0) = 0
+    GROUP BY user_id
+    """,
+]
+
+# 일정 계층 closure table 을 유지하는 트리거
+# 생성/부모 변경/삭제가 어느 코드 경로(일괄 UPDATE 포함)에서 일어나도 조상/자손 쌍이 어긋나지 않도록 DB에서 처리
+SCHEDULE_CLOSURE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS schedules_closure_bu BEFORE UPDATE OF parent_id ON schedules
+    WHEN new.parent_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM schedule_closure WHERE ancestor_id = new.id AND descendant_id = new.parent_id
+    ) BEGIN
+        SELECT RAISE(ABORT, 'schedule cannot be moved under its own subtree');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS schedules_closure_ai AFTER INSERT ON schedules BEGIN
+        INSERT INTO schedule_closure (ancestor_id, descendant_id, depth)
+        SELECT new.id, new.id, 0
+        UNION ALL
+        SELECT ancestor_id, new.id, depth + 1 FROM schedule_closure WHERE descendant_id = new.parent_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS schedules_closure_au AFTER UPDATE OF parent_id ON schedules
+    WHEN old.parent_id IS NOT new.parent_id BEGIN
+        DELETE FROM schedule_closure
+        WHERE descendant_id IN (SELECT descendant_id FROM schedule_closure WHERE ancestor_id = new.id)
+          AND ancestor_id NOT IN (SELECT descendant_id FROM schedule_closure WHERE ancestor_id = new.id);
+        INSERT INTO schedule_closure (ancestor_id, descendant_id, depth)
+        SELECT super.ancestor_id, sub.descendant_id, super.depth + sub.depth + 1
+        FROM schedule_closure AS super, schedule_closure AS sub
+        WHERE super.descendant_id = new.parent_id AND sub.ancestor_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS schedules_closure_ad AFTER DELETE ON schedules BEGIN
+        DELETE FROM schedule_closure
+        WHERE descendant_id IN (SELECT descendant_id FROM schedule_closure WHERE ancestor_id = old.id)
+          AND ancestor_id NOT IN (SELECT descendant_id FROM schedule_closure WHERE ancestor_id = old.id);
+        DELETE FROM schedule_closure WHERE ancestor_id = old.id OR descendant_id = old.id;
+    END
+    """,
+]
+
+# 트리거를 처음 만들 때 기존 일정의 parent_id 로 closure table 을 다시 채움
+# (parent_id 순환이 있어도 끝나도록 깊이를 제한하고, 같은 쌍은 가장 짧은 거리만 남김)
+SCHEDULE_CLOSURE_REBUILD = [
+    "DELETE FROM schedule_closure",
+    """
+    INSERT INTO schedule_closure (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE chain(ancestor_id, descendant_id, depth) AS (
+        SELECT id, id, 0 FROM schedules
+        UNION ALL
+        SELECT parent.id, chain.descendant_id, chain.depth + 1
+        FROM chain
+        JOIN schedules AS node ON node.id = chain.ancestor_id
+        JOIN schedules AS parent ON parent.id = node.parent_id
+        WHERE chain.depth < 100
+    )
+    SELECT ancestor_id, descendant_id, MIN(depth) FROM chain GROUP BY ancestor_id, descendant_id
+    """,
+]
+
+# 통계 롤업(schedule_daily_stats)에 세는 일정: 삭제되지 않은 반복 아닌 일정
+_STAT_COUNTED = "COALESCE({row}.is_deleted, 0) = 0 AND {row}.rrule IS NULL AND {row}.date IS NOT NULL"
+_STAT_KEY = (
+    "date({row}.date), COALESCE({row}.owner_id, 0), COALESCE({row}.individual, 0), "
+    "COALESCE({row}.priority, ''), COALESCE({row}.project_name, '')"
+)
+_STAT_MATCH = (
+    "day = date({row}.date) AND owner_id = COALESCE({row}.owner_id, 0) "
+    "AND individual = COALESCE({row}.individual, 0) AND priority = COALESCE({row}.priority, '') "
+    "AND project_name = COALESCE({row}.project_name, '')"
+)
+_STAT_UPSERT = f"""
+        INSERT INTO schedule_daily_stats (day, owner_id, individual, priority, project_name, total, completed)
+        SELECT {_STAT_KEY.format(row="new")}, 1, COALESCE(new.is_completed, 0)
+        WHERE {_STAT_COUNTED.format(row="new")}
+        ON CONFLICT(day, owner_id, individual, priority, project_name)
+        DO UPDATE SET total = total + 1, completed = completed + excluded.completed;"""
+_STAT_DECREMENT = f"""
+        UPDATE schedule_daily_stats
+        SET total = total - 1, completed = completed - COALESCE(old.is_completed, 0)
+        WHERE {_STAT_MATCH.format(row="old")} AND {_STAT_COUNTED.format(row="old")};"""
+
+# 일정 통계 롤업을 유지하는 트리거 (일괄 UPDATE 를 포함한 모든 쓰기 경로에서 증분 갱신)
+SCHEDULE_STATS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedules_stats_ai AFTER INSERT ON schedules BEGIN{_STAT_UPSERT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedules_stats_ad AFTER DELETE ON schedules BEGIN{_STAT_DECREMENT}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS schedules_stats_au AFTER UPDATE OF
+        date, owner_id, individual, priority, project_name, is_completed, is_deleted, rrule
+    ON schedules BEGIN{_STAT_DECREMENT}{_STAT_UPSERT}
+    END
+    """,
+]
+
+# 트리거를 처음 만들 때 기존 일정으로 롤업을 다시 계산
+SCHEDULE_STATS_REBUILD = [
+    "DELETE FROM schedule_daily_stats",
+    f"""
+    INSERT INTO schedule_daily_stats (day, owner_id, individual, priority, project_name, total, completed)
+    SELECT {_STAT_KEY.format(row="schedules")}, COUNT(*), SUM(COALESCE(is_completed, 0))
+    FROM schedules WHERE {_STAT_COUNTED.format(row="schedules")}
+    GROUP BY 1, 2, 3, 4, 5
+    """,
+]
+
+# 첨부파일 사용량 카운터 초기값 (카운터 테이블이 비어 있을 때 한 번만 채움)
+STORAGE_USAGE_BACKFILL = [
+    """
+    INSERT INTO storage_usage (scope, owner_id, bytes_used, file_count, updated_at)
+    SELECT 'user', uploader_id, COALESCE(SUM(file_size), 0), COUNT(*), CURRENT_TIMESTAMP
+    FROM attachments WHERE uploader_id IS NOT NULL GROUP BY uploader_id
+    """,
+    """
+    INSERT INTO storage_usage (scope, owner_id, bytes_used, file_count, updated_at)
+    SELECT 'schedule', schedule_id, COALESCE(SUM(file_size), 0), COUNT(*), CURRENT_TIMESTAMP
+    FROM attachments WHERE schedule_id IS NOT NULL GROUP BY schedule_id
+    """,
+]
+
+# upgrade_schema() 이후 FTS 인덱스 사용 가능 여부 (SQLite 3.34 미만은 trigram 미지원)
+attachment_fts_enabled = False
+# upgrade_schema() 이후 일정 검색 색인 사용 가능 여부 (FTS5 가 없으면 LIKE 검색으로 대신함)
+schedule_search_enabled = False
+
+def _sqlite_object_exists(conn, name):
+    return conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+    ).first() is not None
+
+def upgrade_schema(engine):
+    """
+    기존 DB에 누락된 컬럼, 인덱스와 검색용 가상 테이블을 추가합니다.
+    
+    Base.metadata.create_all() 은 이미 존재하는 테이블에 인덱스를 추가하지 않으므로
+    애플리케이션 시작 시 이 함수로 보완합니다.
+    """
+    global attachment_fts_enabled, schedule_search_enabled
+    
+    with engine.begin() as conn:
+        added = set()
+        for table_name, column_name, column_type in COLUMN_UPGRADES:
+            columns = conn.exec_driver_sql(f"PRAGMA table_info({table_name})").fetchall()
+            if not any(column[1] == column_name for column in columns):
+                logger.info(f"Adding {column_name} column to {table_name} table...")
+                conn.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+                added.add((table_name, column_name))
+        
+        if ("alarms_archive", "original_id") in added:
+            # 이전에 보관된 행은 id 가 원래 알람 id
+            conn.exec_driver_sql("UPDATE alarms_archive SET original_id = id")
+        
+        for statement in INDEX_UPGRADES:
+            conn.exec_driver_sql(statement)
+        
+        if conn.exec_driver_sql("SELECT 1 FROM storage_usage LIMIT 1").first() is None:
+            for statement in STORAGE_USAGE_BACKFILL:
+                conn.exec_driver_sql(statement)
+        
+        created = not _sqlite_object_exists(conn, "alarms_unread_au")
+        for statement in ALARM_UNREAD_TRIGGERS:
+            conn.exec_driver_sql(statement)
+        if created:
+            for statement in ALARM_UNREAD_REBUILD:
+                conn.exec_driver_sql(statement)
+            logger.info("Built alarm unread counters")
+        
+        created = not _sqlite_object_exists(conn, "schedules_closure_ad")
+        for statement in SCHEDULE_CLOSURE_TRIGGERS:
+            conn.exec_driver_sql(statement)
+        if created:
+            for statement in SCHEDULE_CLOSURE_REBUILD:
+                conn.exec_driver_sql(statement)
+            logger.info("Built schedule hierarchy closure table")
+        
+        created = not _sqlite_object_exists(conn, "schedules_stats_au")
+        for statement in SCHEDULE_STATS_TRIGGERS:
+            conn.exec_driver_sql(statement)
+        if created:
+            for statement in SCHEDULE_STATS_REBUILD:
+                conn.exec_driver_sql(statement)
+            logger.info("Built schedule statistics rollup")
+        
+        for statement in SCHEDULE_CHANGE_TRIGGERS:
+            conn.exec_driver_sql(statement)
+    
+    try:
+        with engine.begin() as conn:
+            created = not _sqlite_object_exists(conn, ATTACHMENT_FTS_TABLE)
+            for statement in ATTACHMENT_FTS_DDL:
+                conn.exec_driver_sql(statement)
+            if created:
+                # 기존 첨부파일로 인덱스 채우기
+                conn.exec_driver_sql(
+                    f"INSERT INTO {ATTACHMENT_FTS_TABLE}({ATTACHMENT_FTS_TABLE}) VALUES ('rebuild')"
+                )
+                logger.info("Built attachment filename trigram index")
+        attachment_fts_enabled = True
+    except Exception as e:
+        logger.warning(f"Attachment FTS index unavailable, falling back to LIKE scans: {str(e)}")
+        attachment_fts_enabled = False
+    
+    try:
+        with engine.begin() as conn:
+            created = not _sqlite_object_exists(conn, "schedules_search_au")
+            for statement in SCHEDULE_SEARCH_DDL:
+                conn.exec_driver_sql(statement)
+            if created:
+                from app.core.schedule_search import rebuild_search_index
+                rebuild_search_index(conn)
+                logger.info("Built schedule search index")
+        schedule_search_enabled = True
+    except Exception as e:
+        logger.warning(f"Schedule search index unavailable, falling back to LIKE scans: {str(e)}")
+        schedule_search_enabled = False
+
 if __name__ == "__main__":
     # 로깅 설정
     logging.basicConfig(
@@ -0,0 +1,169 @@
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 제공하는 미리보기 크기 (긴 변 기준 픽셀). 요청 크기는 이 중 가장 가까운 큰 값으로 맞춘다.
+PREVIEW_SIZES = (160, 480, 1280)
+DEFAULT_PREVIEW_SIZE = 160
+# 업로드 직후 백그라운드에서 미리 만들어 두는 크기 (그리드/리스트 뷰용)
+PREGENERATED_SIZES = (160, 480)
+PREVIEW_QUALITY = 80
+PREVIEW_MEDIA_TYPE = "image/jpeg"
+PREVIEW_WORKERS = 2
+
+# 원본 옆에 "<원본파일명>.preview<크기>.jpg" 형태로 캐시
+PREVIEW_MARKER = ".preview"
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tif", ".tiff", ".heic"}
+
+_executor = ThreadPoolExecutor(max_workers=PREVIEW_WORKERS, thread_name_prefix="preview")
+
+
+def normalize_size(size: int) -> int:
+    """요청된 크기를 제공 가능한 미리보기 크기로 맞춥니다."""
+    for preview_size in PREVIEW_SIZES:
+        if size <= preview_size:
+            return preview_size
+    return PREVIEW_SIZES[-1]
+
+
+def preview_key(key: str, size: int) -> str:
+    """원본 옆에 저장되는 미리보기 캐시 키"""
+    return f"{key}{PREVIEW_MARKER}{size}.jpg"
+
+
+def preview_path(blob_path: Path, size: int) -> Path:
+    """로컬 원본 파일 옆의 미리보기 캐시 경로"""
+    return blob_path.with_name(preview_key(blob_path.name, size))
+
+
+def is_preview_file(path: Path) -> bool:
+    """미리보기 캐시 파일인지 확인합니다."""
+    name = path.name
+    return any(name.endswith(f"{PREVIEW_MARKER}{size}.jpg") for size in PREVIEW_SIZES)
+
+
+def _kind(filename: str, mime_type: Optional[str]) -> Optional[str]:
+    mime_type = (mime_type or "").lower()
+    ext = Path(filename).suffix.lower()
+    if mime_type == "application/pdf" or ext == ".pdf":
+        return "pdf"
+    if mime_type == "image/svg+xml" or ext == ".svg":
+        return None
+    if mime_type.startswith("image/") or ext in IMAGE_EXTENSIONS:
+        return "image"
+    return None
+
+
+def can_preview(filename: str, mime_type: Optional[str]) -> bool:
+    """미리보기를 만들 수 있는 파일인지 확인합니다 (이미지, PDF)."""
+    return _kind(filename, mime_type) is not None
+
+
+def _open_image(blob_path: Path, kind: str, max_size: int):
+    """원본을 max_size 이하 해상도의 RGB 이미지로 엽니다."""
+    from PIL import Image, ImageOps
+
+    if kind == "pdf":
+        import fitz  # PyMuPDF
+
+        with fitz.open(blob_path) as document:
+            page = document.load_page(0)
+            zoom = max_size / max(page.rect.width, page.rect.height)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+    image = Image.open(blob_path)
+    # JPEG는 디코딩 단계에서 축소하여 메모리/CPU 사용을 줄임
+    image.draft("RGB", (max_size, max_size))
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def _save(storage, image, target: str):
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=PREVIEW_QUALITY, optimize=True, progressive=True)
+    buffer.seek(0)
+    storage.put(target, buffer, PREVIEW_MEDIA_TYPE)
+
+
+def generate_previews(storage, key: str, filename: str, mime_type: Optional[str], sizes=PREGENERATED_SIZES) -> dict:
+    """
+    원본 파일로부터 미리보기 이미지를 생성하여 저장소에 저장합니다.
+
+    원본은 한 번만 디코딩하고, 큰 크기부터 차례로 축소하여 저장합니다.
+
+    Returns:
+        dict: {크기: 미리보기 키}. 생성할 수 없으면 빈 dict
+    """
+    kind = _kind(filename, mime_type)
+    if kind is None:
+        return {}
+
+    try:
+        with storage.local_copy(key) as blob_path:
+            image = _open_image(blob_path, kind, max(sizes))
+            image.load()
+    except FileNotFoundError:
+        return {}
+    except ImportError as e:
+        logger.warning(f"Preview dependency missing ({e}); skipping preview for {key}")
+        return {}
+    except Exception as e:
+        logger.error(f"Failed to open {key} for preview: {str(e)}")
+        return {}
+
+    results = {}
+    for size in sorted(sizes, reverse=True):
+        image.thumbnail((size, size))
+        target = preview_key(key, size)
+        try:
+            _save(storage, image, target)
+            results[size] = target
+        except Exception as e:
+            logger.error(f"Failed to save preview {target}: {str(e)}")
+    return results
+
+
+def get_or_create_preview(storage, key: str, filename: str, mime_type: Optional[str], size: int):
+    """
+    캐시된 미리보기를 반환하고, 없으면 즉시 생성합니다.
+
+    Returns:
+        Optional[Tuple[str, StoredObject]]: (미리보기 키, 메타데이터). 만들 수 없으면 None
+    """
+    target = preview_key(key, size)
+    stored = storage.stat(target)
+    if stored is None:
+        if size not in generate_previews(storage, key, filename, mime_type, sizes=(size,)):
+            return None
+        stored = storage.stat(target)
+    return (target, stored) if stored else None
+
+
+def schedule_previews(storage, key: str, filename: str, mime_type: Optional[str]):
+    """업로드된 파일의 미리보기 생성을 백그라운드 워커에 맡깁니다."""
+    if not can_preview(filename, mime_type):
+        return None
+    return _executor.submit(generate_previews, storage, key, filename, mime_type)
+
+
+def preview_keys(key: str):
+    """원본에 딸린 미리보기 캐시 키 목록 (삭제용)"""
+    return [preview_key(key, size) for size in PREVIEW_SIZES]
+
+
+def shutdown_preview_workers():
+    """애플리케이션 종료 시 대기 중인 미리보기 작업을 정리합니다."""
+    _executor.shutdown(wait=False, cancel_futures=True)
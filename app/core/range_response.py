@@ -0,0 +1,216 @@
+import os
+import stat as stat_module
+from abc import ABC, abstractmethod
+from email.utils import formatdate
+from typing import Callable, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.concurrency import iterate_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# ASGI 서버가 지원할 경우 사용하는 zero-copy 전송 확장
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """파일의 수정 시각과 크기로 만든 strong ETag"""
+    return f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+
+
+def parse_range(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 바이트 범위 Range 헤더를 (start, end) 로 해석합니다. end는 포함 범위.
+    빈 파일에는 만족할 수 있는 범위가 없으므로 올바른 범위라도 416 입니다.
+
+    Returns:
+        Optional[Tuple[int, int]]: 범위. 해석할 수 없거나 다중 범위면 None (전체 전송)
+
+    Raises:
+        ValueError: 만족할 수 없는 범위 (416)
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not ranges or "," in ranges:
+        return None
+
+    start_text, _, end_text = ranges.strip().partition("-")
+    start_text, end_text = start_text.strip(), end_text.strip()
+    if not start_text:
+        # bytes=-500 : 마지막 500바이트
+        if not end_text.isdigit():
+            return None
+        suffix = int(end_text)
+        if suffix == 0 or file_size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(file_size - suffix, 0), file_size - 1
+    if not start_text.isdigit() or (end_text and not end_text.isdigit()):
+        return None
+    start = int(start_text)
+    end = int(end_text) if end_text else file_size - 1
+
+    if start >= file_size:
+        raise ValueError("Unsatisfiable range")
+    if start > end:
+        return None
+    return start, min(end, file_size - 1)
+
+
+class RangeResponse(Response, ABC):
+    """
+    Range / If-Range / If-None-Match 를 처리하는 응답의 공통 부분
+
+    - 206 Partial Content 로 요청된 구간만 전송 (이어받기, 동영상 탐색)
+    - If-Range 검증값이 바뀌었으면 전체 본문을 200으로 전송
+    본문 전송은 하위 클래스의 send_range 가 담당합니다.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        request: Request,
+        size: int,
+        etag: str,
+        modified: float,
+        media_type: Optional[str] = None,
+        filename: Optional[str] = None,
+        as_attachment: bool = False,
+        headers: Optional[dict] = None,
+    ):
+        self.media_type = media_type or "application/octet-stream"
+        self.background = None
+        self.init_headers(headers)
+
+        last_modified = formatdate(modified, usegmt=True)
+
+        self.send_body = request.method != "HEAD"
+        self.start, self.end = 0, size - 1
+        self.status_code = 200
+
+        self.headers.setdefault("accept-ranges", "bytes")
+        self.headers.setdefault("etag", etag)
+        self.headers.setdefault("last-modified", last_modified)
+        if filename:
+            disposition = "attachment" if as_attachment else "inline"
+            self.headers.setdefault(
+                "content-disposition", f"{disposition}; filename*=utf-8''{quote(filename)}"
+            )
+
+        if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+            self.status_code = 304
+            self.send_body = False
+            return
+
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (not if_range or if_range.strip() in (etag, last_modified)):
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                self.status_code = 416
+                self.send_body = False
+                self.headers["content-range"] = f"bytes */{size}"
+                self.headers["content-length"] = "0"
+                return
+            if byte_range is not None:
+                self.start, self.end = byte_range
+                self.status_code = 206
+                self.headers["content-range"] = f"bytes {self.start}-{self.end}/{size}"
+
+        self.headers["content-length"] = str(self.end - self.start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if not self.send_body:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        await self.send_range(scope, send)
+
+    @abstractmethod
+    async def send_range(self, scope: Scope, send: Send) -> None:
+        """self.start ~ self.end 구간의 본문을 보냅니다."""
+
+
+class RangeFileResponse(RangeResponse):
+    """
+    로컬 파일 Range 응답
+
+    서버가 zero-copy 확장을 제공하면 sendfile 로 본문 전송, 아니면 청크 단위 전송
+    """
+
+    def __init__(
+        self,
+        path: str,
+        request: Request,
+        media_type: Optional[str] = None,
+        filename: Optional[str] = None,
+        as_attachment: bool = False,
+        headers: Optional[dict] = None,
+        stat_result: Optional[os.stat_result] = None,
+    ):
+        self.path = path
+        stat_result = stat_result or os.stat(path)
+        if not stat_module.S_ISREG(stat_result.st_mode):
+            raise RuntimeError(f"File at path {path} is not a file.")
+        super().__init__(
+            request, stat_result.st_size, file_etag(stat_result), stat_result.st_mtime,
+            media_type=media_type, filename=filename, as_attachment=as_attachment, headers=headers
+        )
+
+    async def send_range(self, scope: Scope, send: Send) -> None:
+        count = self.end - self.start + 1
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+            return
+
+        remaining = count
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0 or count == 0:
+            # 빈 파일이거나 전송 중 파일이 줄어든 경우에도 응답을 종료
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class RangeStreamResponse(RangeResponse):
+    """
+    원격 저장소 등 파일 경로가 없는 본문의 Range 응답
+
+    read_range(start, end) 가 돌려주는 동기 청크 이터레이터를 스레드풀에서 읽어 전송합니다.
+    """
+
+    def __init__(
+        self,
+        read_range: Callable[[int, int], Iterator[bytes]],
+        request: Request,
+        size: int,
+        etag: str,
+        modified: float,
+        **kwargs,
+    ):
+        self.read_range = read_range
+        super().__init__(request, size, etag, modified, **kwargs)
+
+    async def send_range(self, scope: Scope, send: Send) -> None:
+        if self.end >= self.start:
+            async for chunk in iterate_in_threadpool(self.read_range(self.start, self.end)):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,278 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.models.models import Schedule, ScheduleOccurrenceOverride
+
+# 지원하는 RRULE 부분집합 (RFC 5545): FREQ, INTERVAL, COUNT, UNTIL, BYDAY(WEEKLY), BYMONTHDAY(MONTHLY)
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# COUNT 로 끝나는 규칙의 마지막 회차는 저장할 때 한 번 계산하므로 상한을 둠
+MAX_COUNT = 5000
+# 회차별로 바꿀 수 있는 필드 (None 이면 원본 일정을 따름)
+OVERRIDE_FIELDS = ("title", "content", "date", "due_time", "alarm_time", "priority", "is_completed")
+IN_CHUNK_SIZE = 900
+
+
+class RecurrenceRule(NamedTuple):
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byday: Tuple[int, ...] = ()
+    bymonthday: Tuple[int, ...] = ()
+
+
+def _parse_until(value: str) -> datetime:
+    value = value.rstrip("Z")
+    for fmt in ("%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            until = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        # 날짜만 주면 그 날 전체를 포함
+        return until.replace(hour=23, minute=59, second=59) if fmt == "%Y%m%d" else until
+    raise ValueError(f"invalid UNTIL: {value!r}")
+
+
+def parse_rrule(text: str) -> RecurrenceRule:
+    """
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;UNTIL=20271231" 형식의 규칙을 읽습니다.
+
+    Raises:
+        ValueError: 지원하지 않는 항목이거나 값이 잘못된 경우
+    """
+    if text.upper().startswith("RRULE:"):
+        text = text[len("RRULE:"):]
+    parts = {}
+    for part in filter(None, text.strip().split(";")):
+        name, sep, value = part.partition("=")
+        if not sep or not value:
+            raise ValueError(f"invalid rule part: {part!r}")
+        parts[name.strip().upper()] = value.strip().upper()
+
+    unknown = set(parts) - {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY"}
+    if unknown:
+        raise ValueError(f"unsupported rule parts: {', '.join(sorted(unknown))}")
+    freq = parts.get("FREQ")
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if "COUNT" in parts and "UNTIL" in parts:
+        raise ValueError("COUNT and UNTIL cannot be used together")
+
+    try:
+        interval = int(parts.get("INTERVAL", 1))
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+        bymonthday = tuple(sorted({int(day) for day in parts["BYMONTHDAY"].split(",")})) if "BYMONTHDAY" in parts else ()
+    except ValueError:
+        raise ValueError("INTERVAL, COUNT and BYMONTHDAY must be integers")
+    if interval < 1:
+        raise ValueError("INTERVAL must be positive")
+    if count is not None and not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+    if any(day == 0 or not -31 <= day <= 31 for day in bymonthday):
+        raise ValueError("BYMONTHDAY must be between -31 and 31 (not 0)")
+    if bymonthday and freq != "MONTHLY":
+        raise ValueError("BYMONTHDAY is only supported with FREQ=MONTHLY")
+
+    byday = ()
+    if "BYDAY" in parts:
+        if freq != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        names = parts["BYDAY"].split(",")
+        if any(name not in WEEKDAYS for name in names):
+            raise ValueError(f"BYDAY must be a list of {', '.join(WEEKDAYS)}")
+        byday = tuple(sorted({WEEKDAYS.index(name) for name in names}))
+
+    until = _parse_until(parts["UNTIL"]) if "UNTIL" in parts else None
+    return RecurrenceRule(freq, interval, count, until, byday, bymonthday)
+
+
+def _add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _candidates(rule: RecurrenceRule, dtstart: datetime, start: datetime, end: datetime) -> Iterator[datetime]:
+    """
+    규칙이 만드는 시작 시각을 순서대로 (dtstart 이후, end 까지). COUNT/UNTIL 은 보지 않음.
+
+    start 이전 주기는 계산으로 건너뛰므로 오래된 규칙도 창 안의 회차 수만큼만 비용이 듦
+    """
+    clock = dtstart.time()
+    if rule.freq == "DAILY":
+        step = timedelta(days=rule.interval)
+        k = max(0, -((dtstart - start) // step))
+        current = dtstart + k * step
+        while current <= end:
+            yield current
+            current += step
+    elif rule.freq == "WEEKLY":
+        weekdays = rule.byday or (dtstart.weekday(),)
+        week = datetime.combine(dtstart.date() - timedelta(days=dtstart.weekday()), clock)
+        period = timedelta(weeks=rule.interval)
+        base = week + max(0, (start - week) // period) * period
+        while base <= end:
+            for weekday in weekdays:
+                current = base + timedelta(days=weekday)
+                if current >= dtstart:
+                    yield current
+            base += period
+    elif rule.freq == "MONTHLY":
+        days = rule.bymonthday or (dtstart.day,)
+        elapsed = (start.year - dtstart.year) * 12 + start.month - dtstart.month
+        k = max(0, elapsed // rule.interval)
+        while True:
+            year, month = _add_months(dtstart.year, dtstart.month, k * rule.interval)
+            if (year, month) > (end.year, end.month):
+                break
+            last = calendar.monthrange(year, month)[1]
+            # 음수는 말일부터 (-1 이 말일). 그 달에 없는 날짜는 건너뜀
+            resolved = sorted({day if day > 0 else last + 1 + day for day in days})
+            for day in resolved:
+                if 1 <= day <= last:
+                    current = datetime.combine(datetime(year, month, day).date(), clock)
+                    if current >= dtstart:
+                        yield current
+            k += 1
+    else:
+        k = max(0, (start.year - dtstart.year) // rule.interval)
+        while True:
+            year = dtstart.year + k * rule.interval
+            if year > end.year:
+                break
+            # 2월 29일 같은 날짜는 해당 연도에 있을 때만
+            if dtstart.day <= calendar.monthrange(year, dtstart.month)[1]:
+                yield dtstart.replace(year=year)
+            k += 1
+
+
+def recurrence_end(rule: RecurrenceRule, dtstart: datetime) -> Optional[datetime]:
+    """마지막 회차 시작 시각 (끝이 없으면 None). 저장할 때 계산해서 조회 범위 필터에 씀"""
+    if rule.until is not None:
+        return rule.until
+    if rule.count is None:
+        return None
+    last = None
+    # 규칙에 따라 회차가 COUNT 개보다 적을 수 있으므로 (예: 매년 2월 30일) 끝을 둠
+    for index, current in enumerate(_candidates(rule, dtstart, dtstart, datetime(9999, 1, 1))):
+        last = current
+        if index + 1 >= rule.count:
+            break
+    return last
+
+
+def recurrence_fields(rrule: Optional[str], dtstart: Optional[datetime]) -> dict:
+    """
+    저장할 rrule/recurrence_end 값. 규칙을 검사해서 표준 형태(대문자, RRULE: 제거)로 돌려줍니다.
+
+    Raises:
+        ValueError: 규칙이 잘못된 경우
+    """
+    if not rrule or not rrule.strip():
+        return {"rrule": None, "recurrence_end": None}
+    rule = parse_rrule(rrule)
+    normalized = rrule.strip().upper()
+    if normalized.startswith("RRULE:"):
+        normalized = normalized[len("RRULE:"):]
+    return {"rrule": normalized, "recurrence_end": recurrence_end(rule, dtstart) if dtstart else None}
+
+
+def occurrence_starts(
+    rule: RecurrenceRule,
+    dtstart: datetime,
+    start: datetime,
+    end: datetime,
+    last: Optional[datetime] = None,
+) -> List[datetime]:
+    """start~end(양 끝 포함) 사이 회차의 시작 시각. last 는 저장해 둔 recurrence_end"""
+    if last is None:
+        last = recurrence_end(rule, dtstart)
+    if last is not None:
+        end = min(end, last)
+    return [current for current in _candidates(rule, dtstart, start, end) if start <= current <= end]
+
+
+class ScheduleOccurrence:
+    """
+    반복 일정의 가상 회차 (DB 행 없음). 원래 시작 시각 occurrence_date 로 구분하고,
+    회차 예외가 있으면 그 값을, 없으면 원본 일정의 값을 (시각은 회차만큼 옮겨서) 돌려줍니다.
+    """
+
+    def __init__(self, master: Schedule, occurrence_date: datetime, override: Optional[ScheduleOccurrenceOverride] = None):
+        self.master = master
+        self.occurrence_date = occurrence_date
+        self.date = occurrence_date
+        moved = occurrence_date
+        if override is not None and override.date is not None:
+            self.date = moved = override.date
+        offset = moved - master.date
+        self.due_time = master.due_time + offset if master.due_time else None
+        self.alarm_time = master.alarm_time + offset if master.alarm_time else None
+        if override is not None:
+            for field in OVERRIDE_FIELDS:
+                value = getattr(override, field)
+                if value is not None:
+                    setattr(self, field, value)
+
+    def __getattr__(self, name):
+        return getattr(self.master, name)
+
+
+def _load_overrides(db: Session, master_ids: List[int], start: datetime, end: datetime) -> Dict[int, list]:
+    """창 안에 원래 있었거나 창 안으로 옮겨진 회차의 예외"""
+    overrides: Dict[int, list] = {}
+    for chunk_start in range(0, len(master_ids), IN_CHUNK_SIZE):
+        rows = db.query(ScheduleOccurrenceOverride).filter(
+            ScheduleOccurrenceOverride.schedule_id.in_(master_ids[chunk_start:chunk_start + IN_CHUNK_SIZE]),
+            or_(
+                ScheduleOccurrenceOverride.occurrence_date.between(start, end),
+                ScheduleOccurrenceOverride.date.between(start, end)
+            )
+        )
+        for row in rows:
+            overrides.setdefault(row.schedule_id, []).append(row)
+    return overrides
+
+
+def expand_occurrences(db: Session, masters: List[Schedule], start: datetime, end: datetime) -> List[ScheduleOccurrence]:
+    """
+    반복 일정들을 start~end 창 안의 회차로 펼칩니다. 회차 예외(취소/변경/완료)를 반영하고
+    예외로 창 밖으로 옮겨진 회차는 빼고, 창 안으로 옮겨진 회차는 넣습니다.
+    """
+    masters = [master for master in masters if master.rrule]
+    overrides = _load_overrides(db, [master.id for master in masters], start, end)
+    occurrences = []
+    for master in masters:
+        by_date = {row.occurrence_date: row for row in overrides.get(master.id, [])}
+        rule = parse_rrule(master.rrule)
+        natural = occurrence_starts(rule, master.date, start, end, master.recurrence_end)
+        # 창 밖의 원래 회차가 창 안으로 옮겨진 경우
+        natural_set = set(natural)
+        moved_in = sorted(when for when in by_date if when not in natural_set)
+        for when in natural + moved_in:
+            override = by_date.get(when)
+            if override is not None and override.is_cancelled:
+                continue
+            occurrence = ScheduleOccurrence(master, when, override)
+            if start <= occurrence.date <= end:
+                occurrences.append(occurrence)
+    return occurrences
+
+
+def recurring_in_window(start: datetime, end: datetime):
+    """창과 겹칠 수 있는 반복 일정 조건 (첫 회차가 창 끝 이전이고 마지막 회차가 창 시작 이후)"""
+    return and_(
+        Schedule.rrule.isnot(None),
+        Schedule.date <= end,
+        or_(Schedule.recurrence_end.is_(None), Schedule.recurrence_end >= start)
+    )
+
+
+def is_occurrence(master: Schedule, occurrence_date: datetime) -> bool:
+    """occurrence_date 가 반복 일정의 실제 회차 시작 시각인지"""
+    if not master.rrule:
+        return False
+    rule = parse_rrule(master.rrule)
+    return occurrence_date in occurrence_starts(rule, master.date, occurrence_date, occurrence_date, master.recurrence_end)
@@ -0,0 +1,115 @@
+import json
+import logging
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Query, Session
+from app.core.schedule_dsl import apply_search_terms, parse_search_query, time_dependent
+from app.core.schedule_query import filter_status_and_range, filter_visible
+from app.models.models import SavedSearch, Schedule, ScheduleChange, User
+
+logger = logging.getLogger(__name__)
+
+IN_CHUNK_SIZE = 900
+
+
+def saved_search_query(db: Session, user: User, saved: SavedSearch, now: datetime) -> Query:
+    """저장된 검색의 일정 id 쿼리 (read_schedules 와 같은 조건, 같은 순서)"""
+    query = filter_visible(db.query(Schedule.id), user, saved.show_all_users)
+    query = apply_search_terms(db, query, parse_search_query(saved.query), user, now=now)
+    query = filter_status_and_range(query, saved.show_completed, saved.completed_only)
+    return query.order_by(Schedule.due_time.asc().nullslast(), Schedule.created_at.desc())
+
+
+def invalidate(saved: SavedSearch):
+    """검색식/조건을 바꾸면 캐시를 버림"""
+    saved.cached_ids = None
+    saved.cached_version = None
+    saved.cached_at = None
+    saved.cached_until = None
+
+
+def _expires_at(db: Session, user: User, saved: SavedSearch, now: datetime) -> Optional[datetime]:
+    """
+    변경이 없어도 결과가 바뀌는 시각. today 기준 날짜는 자정, is:overdue 는
+    지금 이후 가장 가까운 (볼 수 있는 미완료 일정의) 마감시간
+    """
+    relative, overdue = time_dependent(parse_search_query(saved.query))
+    moments = []
+    if relative:
+        moments.append(datetime.combine(now.date() + timedelta(days=1), time.min))
+    if overdue:
+        next_due = filter_visible(db.query(func.min(Schedule.due_time)), user, saved.show_all_users).filter(
+            Schedule.is_completed == False, Schedule.due_time > now
+        ).scalar()
+        if next_due is not None:
+            moments.append(next_due)
+    return min(moments, default=None)
+
+
+def _affected(db: Session, user: User, saved: SavedSearch, cached_ids: List[int], changed: set, now: datetime) -> bool:
+    """
+    바뀐 일정이 결과에 영향을 줄 수 있는지. 이전 결과에 있었거나(빠지거나 순서가 바뀔 수 있음)
+    지금 검색 조건에 맞으면(새로 들어오거나 순서가 바뀜) 영향이 있음
+    """
+    if not changed.isdisjoint(cached_ids):
+        return True
+    changed = sorted(changed)
+    query = saved_search_query(db, user, saved, now).order_by(None)
+    for start in range(0, len(changed), IN_CHUNK_SIZE):
+        if query.filter(Schedule.id.in_(changed[start:start + IN_CHUNK_SIZE])).first() is not None:
+            return True
+    return False
+
+
+def prune_changes(db: Session):
+    """모든 캐시가 이미 본 변경은 지움 (캐시가 하나도 없으면 전부)"""
+    db.flush()
+    oldest = select(func.min(SavedSearch.cached_version)).where(SavedSearch.cached_ids.isnot(None)).scalar_subquery()
+    db.execute(delete(ScheduleChange).where(
+        ScheduleChange.seq <= func.coalesce(oldest, select(func.max(ScheduleChange.seq)).scalar_subquery())
+    ))
+
+
+def cached_result_ids(
+    db: Session, user: User, saved: SavedSearch, now: Optional[datetime] = None
+) -> Tuple[List[int], bool]:
+    """
+    저장된 검색의 결과 id 목록을 돌려줍니다. 캐시가 있으면 그 뒤 변경 피드만 보고,
+    영향을 줄 수 있는 변경이 없으면 캐시를 그대로 씁니다 (호출한 쪽에서 commit).
+
+    Returns:
+        Tuple[List[int], bool]: (정렬된 일정 id, 캐시 적중 여부)
+    """
+    now = now or datetime.now()
+    if saved.cached_ids is not None and (saved.cached_until is None or now < saved.cached_until):
+        cached_ids = json.loads(saved.cached_ids)
+        changes = db.query(ScheduleChange.seq, ScheduleChange.schedule_id).filter(
+            ScheduleChange.seq > saved.cached_version
+        ).all()
+        if not changes:
+            return cached_ids, True
+        if not _affected(db, user, saved, cached_ids, {schedule_id for _, schedule_id in changes}, now):
+            saved.cached_version = max(seq for seq, _ in changes)
+            prune_changes(db)
+            return cached_ids, True
+
+    # 계산 전에 피드 위치를 읽어 두어야 계산하는 동안의 변경을 다음에 다시 봄
+    version = db.query(func.max(ScheduleChange.seq)).scalar() or 0
+    ids = [schedule_id for schedule_id, in saved_search_query(db, user, saved, now)]
+    saved.cached_ids = json.dumps(ids)
+    saved.cached_version = version
+    saved.cached_at = now
+    saved.cached_until = _expires_at(db, user, saved, now)
+    prune_changes(db)
+    logger.debug(f"Saved search {saved.id} recomputed: {len(ids)} schedules")
+    return ids, False
+
+
+def load_page(db: Session, ids: List[int], skip: int = 0, limit: int = 50) -> List[Schedule]:
+    """캐시된 id 목록에서 페이지만큼 잘라 그 일정만 읽음 (id 목록 순서대로)"""
+    page = ids[skip:skip + limit]
+    if not page:
+        return []
+    rows = {schedule.id: schedule for schedule in db.query(Schedule).filter(Schedule.id.in_(page))}
+    return [rows[schedule_id] for schedule_id in page if schedule_id in rows]
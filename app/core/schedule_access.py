@@ -0,0 +1,20 @@
+from sqlalchemy import or_, select
+from app.models.models import Schedule, ScheduleShare, User
+
+def can_view_clause(user: User, model=Schedule):
+    """
+    일정 조회 권한 조건 (본인 일정, 공개 일정, 또는 공유받은 일정)
+
+    Args:
+        model: Schedule 또는 aliased(Schedule) (재귀 CTE 등에서 별칭을 쓸 때)
+    """
+    return or_(
+        model.owner_id == user.id,
+        model.individual == False,
+        model.id.in_(
+            select(ScheduleShare.schedule_id).where(
+                ScheduleShare.shared_with_id == user.id,
+                ScheduleShare.is_deleted == False
+            )
+        )
+    )
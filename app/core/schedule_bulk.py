@@ -0,0 +1,241 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.orm import Session
+from app.core.recurrence import recurrence_fields
+from app.core.schedule_access import can_view_clause
+from app.core.schedule_cascade import soft_delete_subtrees
+from app.core.schedule_order import key_between, last_key, unique_key
+from app.models.models import Schedule, ScheduleOccurrenceOverride, ScheduleShare, User
+from app.schemas.schemas import BulkOperation, ScheduleCreate, ScheduleUpdate
+
+# SQLite 구버전의 바인드 변수 제한(999)을 넘지 않도록 IN 목록을 나누는 크기
+IN_CHUNK_SIZE = 900
+# 한 요청에서 받는 작업 수
+MAX_BULK_OPERATIONS = 1000
+
+# 같은 요청 안에서 적용하는 순서 (예: 만든 뒤 공유, 수정한 뒤 삭제)
+APPLY_ORDER = ["create", "update", "complete", "share", "delete"]
+
+
+def _chunks(values: List[int]):
+    for start in range(0, len(values), IN_CHUNK_SIZE):
+        yield values[start:start + IN_CHUNK_SIZE]
+
+
+def _owned_ids(db: Session, schedule_ids: List[int], user: User) -> set:
+    """수정 권한(소유자)이 있고 삭제되지 않은 일정 id 를 IN 쿼리로 한꺼번에 확인"""
+    owned = set()
+    for chunk in _chunks(schedule_ids):
+        owned.update(schedule_id for (schedule_id,) in db.query(Schedule.id).filter(
+            Schedule.id.in_(chunk),
+            Schedule.owner_id == user.id,
+            Schedule.is_deleted == False
+        ))
+    return owned
+
+
+def _existing_user_ids(db: Session, user_ids: List[int]) -> set:
+    found = set()
+    for chunk in _chunks(user_ids):
+        found.update(user_id for (user_id,) in db.query(User.id).filter(User.id.in_(chunk)))
+    return found
+
+
+def _visible_parent_ids(db: Session, parent_ids: List[int], user: User) -> set:
+    """새 일정의 부모로 쓸 수 있는(삭제되지 않고 볼 수 있는) 일정 id"""
+    found = set()
+    for chunk in _chunks(parent_ids):
+        found.update(parent_id for (parent_id,) in db.query(Schedule.id).filter(
+            Schedule.id.in_(chunk),
+            Schedule.is_deleted == False,
+            can_view_clause(user)
+        ))
+    return found
+
+
+def _live_shares(db: Session, schedule_ids: List[int]) -> set:
+    """이미 있는 (삭제되지 않은) 공유의 (schedule_id, shared_with_id)"""
+    found = set()
+    for chunk in _chunks(schedule_ids):
+        found.update(db.query(ScheduleShare.schedule_id, ScheduleShare.shared_with_id).filter(
+            ScheduleShare.schedule_id.in_(chunk),
+            ScheduleShare.is_deleted == False
+        ).all())
+    return found
+
+
+def _error(index: int, operation: BulkOperation, detail: str) -> dict:
+    return {"index": index, "op": operation.op, "id": operation.id, "status": "error", "detail": detail}
+
+
+def _validate(operation: BulkOperation, owned: set, users: set, user: User):
+    """작업 하나를 검사하고 적용할 값을 돌려줍니다. 문제가 있으면 ValueError"""
+    if operation.op == "create":
+        values = ScheduleCreate(**(operation.data or {})).model_dump()
+        values.update(recurrence_fields(values.get("rrule"), values["date"]))
+        return values
+    if operation.id is None:
+        raise ValueError("id is required")
+    if operation.id not in owned:
+        raise ValueError("Schedule not found")
+    if operation.op == "update":
+        if "memo" in (operation.data or {}):
+            # 메모는 알람을 보내는 /{id}/memo 로만 수정
+            raise ValueError("memo cannot be updated in bulk")
+        values = ScheduleUpdate(**(operation.data or {})).model_dump(exclude_unset=True)
+        if not values:
+            raise ValueError("nothing to update")
+        if "rrule" in values:
+            # 마지막 회차는 첫 회차(date)가 필요해서 적용한 뒤 _refresh_recurrence_end 에서 계산
+            values["rrule"] = recurrence_fields(values["rrule"], None)["rrule"]
+        return values
+    if operation.op == "share":
+        if operation.shared_with_id not in users:
+            raise ValueError("User not found")
+        if operation.shared_with_id == user.id:
+            raise ValueError("Cannot share a schedule with yourself")
+        return {"schedule_id": operation.id, "shared_with_id": operation.shared_with_id, "memo": operation.memo}
+    return None
+
+
+def _check_references(operation: BulkOperation, values, parents: set, shares: set):
+    """
+    DB 의 다른 행을 가리키는 값을 검사합니다. 문제가 있으면 ValueError
+
+    shares 에는 적용할 공유를 더해 같은 요청 안의 중복도 거릅니다.
+    """
+    if operation.op == "create":
+        parent_id = values.get("parent_id")
+        if parent_id and parent_id not in parents:
+            raise ValueError("Parent schedule not found")
+    elif operation.op == "share":
+        share = (values["schedule_id"], values["shared_with_id"])
+        if share in shares:
+            raise ValueError("Schedule is already shared with this user")
+        shares.add(share)
+
+
+def _create_rows(db: Session, items: List[dict], user: User) -> List[int]:
+    """
+    새 일정을 한 번의 executemany(INSERT ... RETURNING)로 만듭니다.
+
+    같은 부모(최상위 포함) 아래 여러 개를 만들면 요청 순서대로 parent_order 와 order_key 를 이어 붙입니다.
+    """
+    parent_ids = sorted({item["parent_id"] for item in items if item.get("parent_id")})
+    last_order: Dict[int, int] = {}
+    last_keys: Dict[Optional[int], Optional[str]] = {}
+    for chunk in _chunks(parent_ids):
+        for parent_id, parent_order in db.query(Schedule.id, Schedule.parent_order).filter(Schedule.id.in_(chunk)):
+            last_order[parent_id] = parent_order or 0
+        for parent_id, max_order, max_key in db.query(
+            Schedule.parent_id, func.max(Schedule.parent_order), func.max(Schedule.order_key)
+        ).filter(Schedule.parent_id.in_(chunk)).group_by(Schedule.parent_id):
+            last_order[parent_id] = max_order or last_order.get(parent_id, 0)
+            last_keys[parent_id] = max_key
+    if any(not item.get("parent_id") for item in items):
+        last_keys[None] = last_key(db, None)
+
+    rows = []
+    for item in items:
+        row = dict(item, owner_id=user.id)
+        parent_id = item.get("parent_id")
+        if parent_id:
+            last_order[parent_id] += 1
+            row["parent_order"] = last_order[parent_id]
+        else:
+            row["parent_order"] = 0
+        rows.append(row)
+    ids = list(db.scalars(
+        insert(Schedule).returning(Schedule.id, sort_by_parameter_order=True), rows
+    ))
+    # 키에 id 를 붙여야 동시에 같은 부모 아래 만든 일정과 겹치지 않으므로 INSERT 뒤에 씀
+    keys = []
+    for item, schedule_id in zip(items, ids):
+        parent_id = item.get("parent_id") or None
+        last_keys[parent_id] = unique_key(key_between(last_keys.get(parent_id), None), schedule_id)
+        keys.append({"id": schedule_id, "order_key": last_keys[parent_id]})
+    db.execute(update(Schedule), keys)
+    return ids
+
+
+def _refresh_recurrence_end(db: Session, schedule_ids: List[int]):
+    """규칙이나 첫 회차가 바뀐 반복 일정의 마지막 회차를 다시 계산하고 회차 예외를 지웁니다 (단건 수정과 같음)."""
+    rows = []
+    for chunk in _chunks(schedule_ids):
+        db.execute(delete(ScheduleOccurrenceOverride).where(ScheduleOccurrenceOverride.schedule_id.in_(chunk)))
+        for schedule_id, date, rrule in db.query(Schedule.id, Schedule.date, Schedule.rrule).filter(
+            Schedule.id.in_(chunk)
+        ):
+            rows.append(dict(recurrence_fields(rrule, date), id=schedule_id))
+    if rows:
+        db.execute(update(Schedule), rows)
+
+
+def apply_bulk(db: Session, operations: List[BulkOperation], user: User) -> List[dict]:
+    """
+    여러 일정 작업을 한 트랜잭션에서 적용합니다. 커밋은 호출자가 합니다.
+
+    권한은 대상 일정 id 전체를 IN 쿼리로 한 번에 확인하고, 작업은 종류별로 묶어
+    executemany / IN 조건 UPDATE 로 적용합니다. 검증에 실패한 작업만 건너뛰고
+    나머지는 적용합니다.
+
+    Returns:
+        List[dict]: 요청 순서대로 {"index", "op", "id", "status": "ok"|"error", "detail"?}
+    """
+    target_ids = sorted({op.id for op in operations if op.op != "create" and op.id is not None})
+    owned = _owned_ids(db, target_ids, user)
+    users = _existing_user_ids(db, sorted({op.shared_with_id for op in operations if op.shared_with_id is not None}))
+
+    results: List[Optional[dict]] = [None] * len(operations)
+    validated = []
+    for index, operation in enumerate(operations):
+        try:
+            values = _validate(operation, owned, users, user)
+        except (ValueError, ValidationError) as e:
+            results[index] = _error(index, operation, str(e))
+            continue
+        validated.append((index, operation, values))
+
+    # 부모 일정과 기존 공유도 작업마다 조회하지 않고 IN 쿼리로 한꺼번에 확인
+    parents = _visible_parent_ids(db, sorted({
+        values["parent_id"] for _, operation, values in validated
+        if operation.op == "create" and values.get("parent_id")
+    }), user)
+    shares = _live_shares(db, sorted({operation.id for _, operation, _ in validated if operation.op == "share"}))
+    grouped = defaultdict(list)
+    for index, operation, values in validated:
+        try:
+            _check_references(operation, values, parents, shares)
+        except ValueError as e:
+            results[index] = _error(index, operation, str(e))
+            continue
+        grouped[operation.op].append((index, operation, values))
+
+    for op in APPLY_ORDER:
+        items = grouped.get(op)
+        if not items:
+            continue
+        ids = [operation.id for _, operation, _ in items]
+        if op == "create":
+            ids = _create_rows(db, [values for _, _, values in items], user)
+        elif op == "update":
+            db.execute(update(Schedule), [dict(values, id=operation.id) for _, operation, values in items])
+            _refresh_recurrence_end(db, [
+                operation.id for _, operation, values in items if "rrule" in values or "date" in values
+            ])
+        elif op == "complete":
+            for chunk in _chunks(ids):
+                db.execute(update(Schedule).where(Schedule.id.in_(chunk)).values(
+                    is_completed=True
+                ).execution_options(synchronize_session=False))
+        elif op == "share":
+            db.execute(insert(ScheduleShare), [values for _, _, values in items])
+        elif op == "delete":
+            # 단건 삭제와 같이 하위 트리와 연관 알람/공유까지 soft delete.
+            # 앞선 작업의 하위 트리에 포함되어 이미 지워진 일정은 UPDATE 할 행이 없을 뿐 성공으로 처리
+            soft_delete_subtrees(db, ids)
+        for (index, operation, _), schedule_id in zip(items, ids):
+            results[index] = {"index": index, "op": op, "id": schedule_id, "status": "ok"}
+    return results
@@ -0,0 +1,154 @@
+import uuid
+import logging
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import String, and_, cast, func, literal, select, update
+from sqlalchemy.orm import Session, aliased
+from app.models.models import Alarm, Schedule, ScheduleShare
+
+logger = logging.getLogger(__name__)
+
+
+class RestoreConflict(ValueError):
+    """부모 일정이 삭제된 상태라 하위 트리만 되살릴 수 없는 경우"""
+
+
+IN_CHUNK_SIZE = 900
+
+
+def _batch_name(token: str, root_id: int) -> str:
+    return f"{token}-{root_id}"
+
+
+def _in_call(column, token: str):
+    """이번 호출에서 찍은 배치 값 (token-<루트 id>) 범위. deleted_batch 인덱스로 찾음"""
+    return and_(column > f"{token}-", column < f"{token}.")
+
+
+def _subtrees(root_ids: List[int], token: str):
+    """
+    루트들과 그 아래 삭제되지 않은 일정 (재귀 CTE). 각 행에 루트별 배치 값과 루트로부터의 깊이를 붙임.
+
+    이미 삭제된 가지는 자기 배치로 따로 복원되므로 그 아래로는 내려가지 않음
+    """
+    tree = select(
+        Schedule.id.label("id"),
+        (literal(f"{token}-") + cast(Schedule.id, String)).label("batch"),
+        literal(0).label("depth"),
+    ).where(
+        Schedule.id.in_(root_ids),
+        Schedule.is_deleted == False
+    ).cte("delete_tree", recursive=True)
+    child = aliased(Schedule)
+    return tree.union_all(
+        select(child.id, tree.c.batch, tree.c.depth + 1).join(
+            tree, child.parent_id == tree.c.id
+        ).where(child.is_deleted == False)
+    )
+
+
+def soft_delete_subtrees(db: Session, root_ids: List[int], now: Optional[datetime] = None) -> dict:
+    """
+    일정들과 그 아래 하위 트리 전체, 연관 알람과 공유를 soft delete 합니다. 커밋은 호출자가 합니다.
+
+    노드 수와 관계없이 (루트 IN 묶음마다) UPDATE 세 번으로 처리합니다. 일정은 재귀 CTE 로 찾은
+    하위 트리를, 알람/공유는 이번에 지운 일정을 기준으로 고릅니다. 루트마다 지운 행 모두에 같은
+    deleted_batch 를 남겨 restore_subtree 가 그 삭제로 지운 행만 되살리도록 합니다. 한 루트가
+    다른 루트의 하위에 있으면 바깥 루트의 삭제 단위에 포함됩니다.
+
+    Returns:
+        dict: {"token", "schedules", "alarms", "shares"} (각 테이블에서 지운 행 수)
+    """
+    token = uuid.uuid4().hex
+    now = now or datetime.now()
+    counts = {"token": token, "schedules": 0, "alarms": 0, "shares": 0}
+    for start in range(0, len(root_ids), IN_CHUNK_SIZE):
+        tree = _subtrees(root_ids[start:start + IN_CHUNK_SIZE], token)
+        # 여러 루트에서 닿은 일정은 가장 바깥 루트의 배치로 (SQLite 는 max() 와 같은 행의 batch 를 돌려줌)
+        nodes = select(tree.c.id, tree.c.batch, func.max(tree.c.depth)).group_by(tree.c.id).subquery()
+        # UPDATE ... FROM 로 CTE 를 한 번만 계산. WITH 로 시작하는 UPDATE 는 rowcount 가 없어서 RETURNING 으로 셈
+        counts["schedules"] += len(db.execute(
+            update(Schedule).where(Schedule.id == nodes.c.id).values(
+                is_deleted=True, deleted_at=now, deleted_batch=nodes.c.batch
+            ).returning(Schedule.id).execution_options(synchronize_session=False)
+        ).all())
+
+    deleted_ids = select(Schedule.id).where(_in_call(Schedule.deleted_batch, token))
+    for key, model in (("alarms", Alarm), ("shares", ScheduleShare)):
+        counts[key] = db.execute(
+            update(model).where(
+                model.schedule_id.in_(deleted_ids),
+                model.is_deleted == False
+            ).values(
+                is_deleted=True,
+                deleted_batch=select(Schedule.deleted_batch).where(
+                    Schedule.id == model.schedule_id
+                ).scalar_subquery()
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+    # 세션에 올라온 객체가 예전 is_deleted 값을 보지 않도록
+    db.expire_all()
+    return counts
+
+
+def soft_delete_subtree(db: Session, root_id: int, now: Optional[datetime] = None) -> dict:
+    """
+    일정 하나의 하위 트리를 soft delete 합니다 (soft_delete_subtrees 참고).
+
+    Returns:
+        dict: {"batch", "schedules", "alarms", "shares"}
+    """
+    counts = soft_delete_subtrees(db, [root_id], now=now)
+    return {"batch": _batch_name(counts.pop("token"), root_id), **counts}
+
+
+def deletion_root(db: Session, schedule: Schedule) -> Schedule:
+    """schedule 이 함께 지워진 삭제 단위의 시작 일정 (배치 값이 없으면 schedule 자신)"""
+    batch = schedule.deleted_batch
+    if batch is None:
+        return schedule
+    # 같은 배치 안에서 부모가 배치 밖에 있는 일정이 삭제의 시작점
+    parent = aliased(Schedule)
+    return db.query(Schedule).outerjoin(parent, Schedule.parent_id == parent.id).filter(
+        Schedule.deleted_batch == batch,
+        parent.deleted_batch.is_distinct_from(batch)
+    ).first()
+
+
+def restore_subtree(db: Session, schedule: Schedule) -> dict:
+    """
+    soft_delete_subtree 로 함께 지운 일정/알람/공유를 되살립니다. 커밋은 호출자가 합니다.
+
+    하위 일정을 주어도 그 일정이 지워진 삭제 단위 전체를 복원합니다. 이 변경 이전에
+    지워져 배치 값이 없는 일정은 그 한 행만 되살립니다. 권한 확인(deletion_root 의
+    소유자인지)은 호출자가 합니다.
+
+    Raises:
+        RestoreConflict: 복원할 일정의 부모가 아직 삭제된 상태인 경우
+    """
+    batch = schedule.deleted_batch
+    root = deletion_root(db, schedule)
+    if root.parent_id is not None:
+        parent_deleted = db.query(Schedule.is_deleted).filter(Schedule.id == root.parent_id).scalar()
+        if parent_deleted:
+            raise RestoreConflict("parent schedule is deleted; restore the parent first")
+
+    if batch is None:
+        schedule.is_deleted = False
+        schedule.deleted_at = None
+        db.flush()
+        return {"batch": None, "schedules": 1, "alarms": 0, "shares": 0}
+
+    counts = {"batch": batch}
+    for key, model, values in (
+        ("schedules", Schedule, {"is_deleted": False, "deleted_at": None, "deleted_batch": None}),
+        ("alarms", Alarm, {"is_deleted": False, "deleted_batch": None}),
+        ("shares", ScheduleShare, {"is_deleted": False, "deleted_batch": None}),
+    ):
+        counts[key] = db.execute(
+            update(model).where(model.deleted_batch == batch).values(**values).execution_options(
+                synchronize_session=False
+            )
+        ).rowcount
+    db.expire_all()
+    return counts
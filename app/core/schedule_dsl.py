@@ -0,0 +1,288 @@
+import re
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+from sqlalchemy import and_, func, not_, or_, select
+from sqlalchemy.orm import Query, Session
+from app.core import migrate_db
+from app.core.schedule_search import matching_ids, substring_expression
+from app.models.models import Attachment, PriorityLevel, Schedule, User
+
+
+class QuerySyntaxError(ValueError):
+    """검색식을 해석할 수 없는 경우 (알 수 없는 값, 잘못된 날짜, 닫히지 않은 따옴표)"""
+
+
+# 날짜 필드 -> 열
+DATE_FIELDS = {
+    "due": Schedule.due_time,
+    "date": Schedule.date,
+    "created": Schedule.created_at,
+    "updated": Schedule.updated_at,
+}
+IS_VALUES = ("open", "done", "completed", "overdue", "private", "recurring", "mine")
+HAS_VALUES = ("attachment", "memo", "due", "alarm")
+FIELDS = ("owner", "project", "priority", "is", "has") + tuple(DATE_FIELDS)
+# 반복 일정은 회차마다 값이 다르므로 회차를 펼친 뒤 Python 으로 다시 거르는 조건
+OCCURRENCE_FIELDS = ("due", "date")
+OCCURRENCE_IS_VALUES = ("open", "done", "completed", "overdue")
+
+_TOKEN_RE = re.compile(r'\s*(-?)(?:([A-Za-z]+)(<=|>=|<|>|:))?(?:"([^"]*)"|(\S+))')
+_EMPTY_FIELD_RE = re.compile(r"^([A-Za-z]+)(?:<=|>=|<|>|:)$")
+_DATE_RE = re.compile(r"^today(?:([+-])(\d+))?$")
+_ONE_DAY = timedelta(days=1)
+_ONE_TICK = timedelta(microseconds=1)
+
+
+class SearchTerm(NamedTuple):
+    """
+    검색식 한 조각.
+
+    field 가 None 이면 본문 검색어(values[0]), 날짜 필드는 values 가 (이상, 미만) 경계,
+    그 밖에는 쉼표로 나눈 값들 (하나라도 맞으면 참)
+    """
+    field: Optional[str]
+    op: str
+    values: tuple
+    negated: bool = False
+    relative: bool = False  # today 기준 날짜 (날이 바뀌면 결과가 달라짐)
+
+
+def _parse_date_range(field: str, op: str, raw: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """날짜만 주면 그날 하루 단위로 비교 (due<=2026-11-01 은 11월 1일 포함)"""
+    relative = _DATE_RE.match(raw.lower())
+    try:
+        if relative:
+            days = int(relative.group(2) or 0) * (-1 if relative.group(1) == "-" else 1)
+            value = datetime.combine(datetime.now().date(), datetime.min.time()) + timedelta(days=days)
+            whole_day = True
+        else:
+            value = datetime.fromisoformat(raw)
+            whole_day = "T" not in raw and " " not in raw
+    except ValueError:
+        raise QuerySyntaxError(f"{field}: invalid date '{raw}' (YYYY-MM-DD, YYYY-MM-DDTHH:MM or today[+-N])")
+    step = _ONE_DAY if whole_day else _ONE_TICK
+    if op == ":":
+        return value, value + step
+    if op == "<":
+        return None, value
+    if op == "<=":
+        return None, value + step
+    if op == ">":
+        return value + step, None
+    return value, None
+
+
+def _parse_priorities(raw_values: List[str]) -> tuple:
+    levels = []
+    for raw in raw_values:
+        level = next(
+            (level for level in PriorityLevel if raw in (level.value, level.name) or raw.upper() == level.name),
+            None
+        )
+        if level is None:
+            choices = ", ".join(level.value for level in PriorityLevel)
+            raise QuerySyntaxError(f"priority: unknown value '{raw}' ({choices})")
+        levels.append(level)
+    return tuple(levels)
+
+
+def _make_term(field: str, op: str, raw: str, negated: bool) -> SearchTerm:
+    if field in DATE_FIELDS:
+        relative = bool(_DATE_RE.match(raw.lower()))
+        return SearchTerm(field, op, _parse_date_range(field, op, raw), negated, relative)
+    if op != ":":
+        raise QuerySyntaxError(f"{field}: only ':' is supported")
+    values = [value.strip() for value in raw.split(",") if value.strip()]
+    if not values:
+        raise QuerySyntaxError(f"{field}: missing value")
+    if field == "priority":
+        return SearchTerm(field, op, _parse_priorities(values), negated)
+    if field in ("is", "has"):
+        allowed = IS_VALUES if field == "is" else HAS_VALUES
+        for value in values:
+            if value.lower() not in allowed:
+                raise QuerySyntaxError(f"{field}: unknown value '{value}' ({', '.join(allowed)})")
+        values = [value.lower() for value in values]
+    return SearchTerm(field, op, tuple(values), negated)
+
+
+def parse_search_query(text: Optional[str]) -> List[SearchTerm]:
+    """
+    검색식을 조각으로 나눕니다. 조각끼리는 AND.
+
+    - 검색어: 제목/내용/메모에 포함 (`"정확한 문구"` 는 공백까지 그대로)
+    - `-` 로 시작하면 제외 (`-보류`, `-"문구"`, `-is:done`)
+    - `owner:kim,lee` (아이디/이름/번호, me), `project:개발`, `priority:긴급` (쉼표는 OR)
+    - `due<2026-11-01`, `date>=today-7`, `created:2026-10-01`, `updated>2026-10-01T09:00`
+    - `is:open|done|overdue|private|recurring|mine`, `has:attachment|memo|due|alarm`
+
+    모르는 필드 이름(`http://...`, `10:30`)은 그대로 검색어로 취급합니다.
+
+    Raises:
+        QuerySyntaxError: 알 수 없는 값, 잘못된 날짜, 닫히지 않은 따옴표
+    """
+    terms = []
+    for match in _TOKEN_RE.finditer(text or ""):
+        negated, field, op, quoted, bare = match.groups()
+        negated = bool(negated)
+        raw = quoted if quoted is not None else bare
+        if quoted is None and bare.startswith('"'):
+            raise QuerySyntaxError("unterminated quote")
+        if field and field.lower() in FIELDS:
+            terms.append(_make_term(field.lower(), op, raw, negated))
+            continue
+        if field:
+            raw = field + op + raw
+        elif _EMPTY_FIELD_RE.match(raw) and _EMPTY_FIELD_RE.match(raw).group(1).lower() in FIELDS:
+            raise QuerySyntaxError(f"{raw}: missing value")
+        if raw.strip() and raw != "-":
+            terms.append(SearchTerm(None, ":", (raw,), negated))
+    return terms
+
+
+def time_dependent(terms: List[SearchTerm]) -> Tuple[bool, bool]:
+    """(today 기준 날짜가 있는지, is:overdue 가 있는지) - 시간이 지나면 결과가 바뀌는 검색식"""
+    return (
+        any(term.relative for term in terms),
+        any(term.field == "is" and "overdue" in term.values for term in terms),
+    )
+
+
+def split_terms(terms: List[SearchTerm]) -> Tuple[List[SearchTerm], List[SearchTerm]]:
+    """(일정 행에 거는 조건, 반복 일정은 회차마다 다시 보는 조건)"""
+    row_terms, occurrence_terms = [], []
+    for term in terms:
+        depends_on_occurrence = term.field in OCCURRENCE_FIELDS or (
+            term.field == "is" and all(value in OCCURRENCE_IS_VALUES for value in term.values)
+        )
+        (occurrence_terms if depends_on_occurrence else row_terms).append(term)
+    return row_terms, occurrence_terms
+
+
+def _text_columns(search_in_title: bool, search_in_content: bool, search_in_memo: bool):
+    return [
+        text_column for text_column, enabled in (
+            (Schedule.title, search_in_title), (Schedule.content, search_in_content), (Schedule.memo, search_in_memo)
+        ) if enabled
+    ]
+
+
+def _status_clause(value: str, user: User, now: datetime):
+    if value == "open":
+        return Schedule.is_completed == False
+    if value in ("done", "completed"):
+        return Schedule.is_completed == True
+    if value == "overdue":
+        return and_(Schedule.is_completed == False, Schedule.due_time < now)
+    if value == "private":
+        return Schedule.individual == True
+    if value == "recurring":
+        return Schedule.rrule.isnot(None)
+    return Schedule.owner_id == user.id
+
+
+def _has_clause(value: str):
+    if value == "attachment":
+        return Schedule.id.in_(select(Attachment.schedule_id).where(Attachment.schedule_id.isnot(None)))
+    if value == "memo":
+        return and_(Schedule.memo.isnot(None), Schedule.memo != "")
+    if value == "due":
+        return Schedule.due_time.isnot(None)
+    return Schedule.alarm_time.isnot(None)
+
+
+def _owner_clause(values: tuple, user: User):
+    ids = [user.id for value in values if value.lower() == "me"]
+    ids.extend(int(value) for value in values if value.isdigit())
+    names = [value for value in values if value.lower() != "me"]
+    owners = select(User.id).where(or_(User.username.in_(names), User.name.in_(names)))
+    return or_(Schedule.owner_id.in_(ids), Schedule.owner_id.in_(owners))
+
+
+def _term_clause(term: SearchTerm, user: User, now: datetime, columns, use_index: bool):
+    if term.field is None:
+        value = term.values[0]
+        if term.negated:
+            # NULL 열은 "포함하지 않음"으로 봄
+            return or_(*[func.coalesce(text_column, "").contains(value, autoescape=True) for text_column in columns])
+        clause = or_(*[text_column.contains(value, autoescape=True) for text_column in columns])
+        expression = substring_expression(value) if use_index else None
+        if expression is not None:
+            clause = and_(Schedule.id.in_(matching_ids(expression)), clause)
+        return clause
+    if term.field in DATE_FIELDS:
+        lower, upper = term.values
+        date_column = DATE_FIELDS[term.field]
+        bounds = []
+        if lower is not None:
+            bounds.append(date_column >= lower)
+        if upper is not None:
+            bounds.append(date_column < upper)
+        return and_(*bounds)
+    if term.field == "owner":
+        return _owner_clause(term.values, user)
+    if term.field == "project":
+        return Schedule.project_name.in_(term.values)
+    if term.field == "priority":
+        return Schedule.priority.in_(term.values)
+    if term.field == "is":
+        return or_(*[_status_clause(value, user, now) for value in term.values])
+    return or_(*[_has_clause(value) for value in term.values])
+
+
+def uses_search_index(terms: List[SearchTerm]) -> bool:
+    return migrate_db.schedule_search_enabled and any(
+        term.field is None and not term.negated and substring_expression(term.values[0]) for term in terms
+    )
+
+
+def apply_search_terms(
+    db: Session,
+    query: Query,
+    terms: List[SearchTerm],
+    user: User,
+    now: Optional[datetime] = None,
+    search_in_title: bool = True,
+    search_in_content: bool = True,
+    search_in_memo: bool = True,
+) -> Query:
+    """
+    검색식 조각을 SQL 조건으로 붙입니다. 한글 검색어는 검색 색인(app.core.schedule_search)으로
+    후보를 먼저 줄이고, 소유자/프로젝트/날짜 조건은 인덱스 열을 그대로 비교합니다.
+    """
+    now = now or datetime.now()
+    columns = _text_columns(search_in_title, search_in_content, search_in_memo)
+    use_index = uses_search_index(terms)
+    clauses = []
+    for term in terms:
+        if term.field is None and not columns:
+            continue
+        clause = _term_clause(term, user, now, columns, use_index)
+        clauses.append(not_(clause) if term.negated else clause)
+    if clauses:
+        query = query.filter(and_(*clauses))
+    return query
+
+
+def occurrence_matches(terms: List[SearchTerm], item, now: Optional[datetime] = None) -> bool:
+    """split_terms 의 회차 조건을 반복 일정 회차(ScheduleOccurrence)에 적용"""
+    now = now or datetime.now()
+    for term in terms:
+        if term.field in DATE_FIELDS:
+            lower, upper = term.values
+            value = getattr(item, DATE_FIELDS[term.field].key)
+            if value is None:
+                # SQL 과 같이 값이 없으면 제외 조건이어도 맞지 않음
+                return False
+            matched = (lower is None or value >= lower) and (upper is None or value < upper)
+        else:
+            completed = bool(item.is_completed)
+            matched = any(
+                (value == "open" and not completed)
+                or (value in ("done", "completed") and completed)
+                or (value == "overdue" and not completed and item.due_time is not None and item.due_time < now)
+                for value in term.values
+            )
+        if matched == term.negated:
+            return False
+    return True
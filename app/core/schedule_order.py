@@ -0,0 +1,239 @@
+import asyncio
+import logging
+from typing import List, Optional
+from sqlalchemy import func, or_, update
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.models import Schedule
+
+logger = logging.getLogger(__name__)
+
+# 순서 키에 쓰는 문자. ASCII 순서와 같아서 SQLite 기본 정렬(BINARY)로 그대로 비교됨
+KEY_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+# 형제 중 이보다 긴 키가 생기면 백그라운드에서 다시 고르게 나눔
+REBALANCE_KEY_LENGTH = 12
+REBALANCE_INTERVAL_SECONDS = 3600
+REBALANCE_BATCH_SIZE = 50
+REBALANCE_PAUSE_SECONDS = 0.1
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """a < b 인 두 키(b 가 None 이면 끝) 사이의 키. a 는 "" 일 수 있고 키는 '0' 으로 끝나지 않음"""
+    if b is not None:
+        # 공통 접두사는 그대로 두고 나머지 사이를 구함
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else KEY_DIGITS[0]) == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = KEY_DIGITS.index(a[0]) if a else 0
+    digit_b = KEY_DIGITS.index(b[0]) if b is not None else len(KEY_DIGITS)
+    if digit_b - digit_a > 1:
+        return KEY_DIGITS[(digit_a + digit_b) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return KEY_DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    두 형제 키 사이에 들어갈 새 키를 만듭니다. 다른 행은 바꾸지 않습니다.
+
+    Args:
+        before: 앞 형제의 키 (None 이면 맨 앞)
+        after: 뒤 형제의 키 (None 이면 맨 뒤)
+
+    Raises:
+        ValueError: before >= after 이거나 키 형식이 잘못된 경우
+    """
+    for key in (before, after):
+        if key is not None and (not key or key.endswith(KEY_DIGITS[0]) or any(c not in KEY_DIGITS for c in key)):
+            raise ValueError(f"invalid order key: {key!r}")
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"order keys out of order: {before!r} >= {after!r}")
+    return _midpoint(before or "", after)
+
+
+def unique_key(key: str, schedule_id: int) -> str:
+    """
+    key 뒤에 일정 id 를 붙여 형제 사이에서 겹치지 않는 키를 만듭니다.
+
+    같은 마지막 키를 읽은 동시 생성도 id 가 달라 서로 다른 키를 받습니다. 붙인 꼬리는
+    key 보다 뒤에 정렬되므로 맨 뒤에 붙이는 키(key_between(last, None))에 씁니다.
+    """
+    digits = []
+    value = schedule_id
+    while True:
+        value, digit = divmod(value, len(KEY_DIGITS))
+        digits.append(KEY_DIGITS[digit])
+        if not value:
+            break
+    # 키는 '0' 으로 끝나지 않아야 하므로 끝에 '1' 을 붙임
+    return key + "".join(reversed(digits)) + KEY_DIGITS[1]
+
+
+def spread_keys(count: int) -> List[str]:
+    """count 개의 짧은 키를 고른 간격으로 만듭니다 (재정렬/초기값용)."""
+    length = 1
+    while len(KEY_DIGITS) ** length <= count:
+        length += 1
+    space = len(KEY_DIGITS) ** length
+    keys = []
+    for i in range(1, count + 1):
+        value = i * space // (count + 1)
+        digits = []
+        for _ in range(length):
+            value, digit = divmod(value, len(KEY_DIGITS))
+            digits.append(KEY_DIGITS[digit])
+        keys.append("".join(reversed(digits)).rstrip(KEY_DIGITS[0]))
+    return keys
+
+
+def sibling_filter(parent_id: Optional[int]):
+    return Schedule.parent_id.is_(None) if parent_id is None else Schedule.parent_id == parent_id
+
+
+def last_key(db: Session, parent_id: Optional[int]) -> Optional[str]:
+    """형제 중 마지막 키 ((parent_id, order_key) 인덱스로 바로 찾음)"""
+    return db.query(func.max(Schedule.order_key)).filter(sibling_filter(parent_id)).scalar()
+
+
+def append_key(db: Session, schedule: Schedule) -> str:
+    """
+    flush 되어 id 가 있는 일정에 형제 맨 뒤 키를 줍니다. 커밋은 호출자가 합니다.
+
+    다른 행은 바꾸지 않고, 동시에 같은 부모 아래 만든 일정과도 키가 겹치지 않습니다.
+    """
+    last = db.query(func.max(Schedule.order_key)).filter(
+        sibling_filter(schedule.parent_id), Schedule.id != schedule.id
+    ).scalar()
+    schedule.order_key = unique_key(key_between(last, None), schedule.id)
+    return schedule.order_key
+
+
+def rebalance_siblings(db: Session, parent_id: Optional[int]) -> int:
+    """
+    한 부모(None 이면 최상위) 아래 형제들의 키를 현재 순서대로 짧고 고른 키로 다시 씁니다.
+    커밋은 호출자가 합니다. 삭제된 일정은 건드리지 않습니다.
+
+    키가 없는 기존 일정은 트리 조회와 같이 맨 앞에 parent_order, id 순서로 놓입니다.
+
+    Returns:
+        int: 다시 쓴 행 수
+    """
+    ids = [
+        schedule_id for (schedule_id,) in db.query(Schedule.id).filter(
+            sibling_filter(parent_id), Schedule.is_deleted == False
+        ).order_by(
+            func.coalesce(Schedule.order_key, ""),
+            Schedule.parent_order,
+            Schedule.id
+        )
+    ]
+    if not ids:
+        return 0
+    db.execute(
+        update(Schedule),
+        [{"id": schedule_id, "order_key": key} for schedule_id, key in zip(ids, spread_keys(len(ids)))]
+    )
+    return len(ids)
+
+
+def _neighbor_keys(
+    db: Session,
+    schedule_id: int,
+    parent_id: Optional[int],
+    after_id: Optional[int],
+    before_id: Optional[int],
+):
+    """옮길 위치의 앞/뒤 형제 키. 한쪽만 주어지면 그 옆의 실제 형제 키를 찾음"""
+    siblings = db.query(Schedule.order_key).filter(sibling_filter(parent_id), Schedule.id != schedule_id)
+
+    def key_of(sibling_id):
+        row = siblings.filter(Schedule.id == sibling_id, Schedule.is_deleted == False).first()
+        if row is None:
+            raise ValueError(f"schedule {sibling_id} is not a sibling under the target parent")
+        return row.order_key
+
+    prev_key = key_of(after_id) if after_id is not None else None
+    next_key = key_of(before_id) if before_id is not None else None
+    if after_id is not None and before_id is None and prev_key is not None:
+        next_key = siblings.filter(Schedule.order_key > prev_key).with_entities(
+            func.min(Schedule.order_key)
+        ).scalar()
+    elif before_id is not None and after_id is None and next_key is not None:
+        prev_key = siblings.filter(Schedule.order_key < next_key).with_entities(
+            func.max(Schedule.order_key)
+        ).scalar()
+    elif after_id is None and before_id is None:
+        prev_key = siblings.with_entities(func.max(Schedule.order_key)).scalar()
+    return prev_key, next_key, (after_id is not None and prev_key is None) or (before_id is not None and next_key is None)
+
+
+def move_schedule(
+    db: Session,
+    schedule: Schedule,
+    parent_id: Optional[int],
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+) -> Schedule:
+    """
+    일정을 parent_id 아래 after_id 와 before_id 사이로 옮깁니다. 커밋은 호출자가 합니다.
+
+    보통은 옮기는 일정 한 행만 씁니다. 이웃 형제에 키가 없거나(기존 일정) 동시 삽입으로
+    키가 겹친 경우에만 그 형제들을 먼저 재정렬합니다.
+
+    Raises:
+        ValueError: after_id/before_id 가 대상 부모 아래 형제가 아니거나 순서가 맞지 않는 경우
+    """
+    for attempt in range(2):
+        prev_key, next_key, missing = _neighbor_keys(db, schedule.id, parent_id, after_id, before_id)
+        if not missing and (prev_key is None or next_key is None or prev_key < next_key):
+            break
+        if attempt:
+            raise ValueError("after_id must come before before_id")
+        rebalance_siblings(db, parent_id)
+    schedule.parent_id = parent_id
+    schedule.order_key = key_between(prev_key, next_key)
+    return schedule
+
+
+def parents_needing_rebalance(db: Session, limit: int = REBALANCE_BATCH_SIZE) -> List[int]:
+    """키가 길어졌거나 키가 없는 (삭제되지 않은) 자식이 있는 부모 id. 최상위 일정은 None"""
+    rows = db.query(Schedule.parent_id).filter(
+        Schedule.is_deleted == False,
+        or_(Schedule.order_key.is_(None), func.length(Schedule.order_key) > REBALANCE_KEY_LENGTH)
+    ).distinct().limit(limit).all()
+    return [parent_id for (parent_id,) in rows]
+
+
+def rebalance_batch(db: Session) -> int:
+    """재정렬이 필요한 부모 한 배치를 처리합니다 (부모마다 커밋)."""
+    parent_ids = parents_needing_rebalance(db)
+    for parent_id in parent_ids:
+        rebalance_siblings(db, parent_id)
+        db.commit()
+    return len(parent_ids)
+
+
+async def start_order_rebalancer():
+    """형제 순서 키 재정렬 작업을 시작합니다 (기존 일정의 키 채우기 포함)."""
+    logger.info("Starting schedule order rebalancer...")
+    while True:
+        db = SessionLocal()
+        total = 0
+        try:
+            while True:
+                count = await asyncio.to_thread(rebalance_batch, db)
+                total += count
+                if count < REBALANCE_BATCH_SIZE:
+                    break
+                await asyncio.sleep(REBALANCE_PAUSE_SECONDS)
+            if total:
+                logger.info(f"Rebalanced order keys under {total} parents")
+        except Exception as e:
+            logger.error(f"Error in order rebalancer: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+        await asyncio.sleep(REBALANCE_INTERVAL_SECONDS)
@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, not_, or_
+from sqlalchemy.orm import Query
+from app.models.models import Schedule, User
+
+
+def filter_visible(query: Query, user: User, show_all_users: bool = True) -> Query:
+    """삭제되지 않은 일정 중 목록에 보일 일정 (본인 일정, 또는 다른 사용자의 개인일정이 아닌 일정)"""
+    # 삭제되지 않은 일정만 조회
+    query = query.filter(Schedule.is_deleted == False)
+
+    # 사용자 및 개인일정 필터링
+    if not show_all_users:
+        # 자신의 일정만 조회
+        return query.filter(Schedule.owner_id == user.id)
+    # 모든 사용자 일정을 보되, 다른 사용자의 개인일정은 제외
+    return query.filter(
+        or_(
+            Schedule.owner_id == user.id,  # 자신의 모든 일정
+            and_(
+                Schedule.owner_id != user.id,  # 다른 사용자의 일정 중
+                Schedule.individual == False  # 개인일정이 아닌 것만
+            )
+        )
+    )
+
+
+def _term_conditions(term: str, search_in_title: bool, search_in_content: bool, search_in_memo: bool):
+    conditions = []
+    if search_in_title:
+        conditions.append(Schedule.title.ilike(f'%{term}%'))
+    if search_in_content:
+        conditions.append(Schedule.content.ilike(f'%{term}%'))
+    if search_in_memo:
+        conditions.append(Schedule.memo.ilike(f'%{term}%'))
+    return conditions
+
+
+def filter_terms(
+    query: Query,
+    search_terms: Optional[str] = None,
+    exclude_terms: Optional[str] = None,
+    search_in_title: bool = True,
+    search_in_content: bool = True,
+    search_in_memo: bool = True,
+) -> Query:
+    """쉼표로 구분한 검색어(하나라도 포함)와 제외 검색어(모두 미포함) 조건"""
+    # 검색어 필터링
+    if search_terms:
+        search_conditions = []
+        for term in search_terms.split(','):
+            term = term.strip()
+            if term:
+                term_conditions = _term_conditions(term, search_in_title, search_in_content, search_in_memo)
+                if term_conditions:
+                    search_conditions.append(or_(*term_conditions))
+        if search_conditions:
+            query = query.filter(or_(*search_conditions))
+
+    # 제외 검색어 필터링
+    if exclude_terms:
+        exclude_conditions = []
+        for term in exclude_terms.split(','):
+            term = term.strip()
+            if term:
+                exclude_term_conditions = _term_conditions(term, search_in_title, search_in_content, search_in_memo)
+                if exclude_term_conditions:
+                    exclude_conditions.append(not_(or_(*exclude_term_conditions)))
+        if exclude_conditions:
+            query = query.filter(and_(*exclude_conditions))
+    return query
+
+
+def filter_status_and_range(
+    query: Query,
+    show_completed: bool = True,
+    completed_only: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Query:
+    """완료 상태와 시작일(date) 범위 조건. 반복 일정은 회차마다 달라서 이 조건 전에 따로 조회함"""
+    # 완료 상태 필터링
+    if completed_only:
+        query = query.filter(Schedule.is_completed == True)
+    elif not show_completed:
+        query = query.filter(Schedule.is_completed == False)
+
+    # 날짜 범위 필터링
+    if start_date:
+        query = query.filter(Schedule.date >= start_date)
+    if end_date:
+        query = query.filter(Schedule.date <= end_date)
+    return query
@@ -0,0 +1,301 @@
+import re
+import logging
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, column, delete, event, func, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+from app.core import migrate_db
+from app.core.schedule_access import can_view_clause
+from app.models.models import Attachment, Schedule, ScheduleSearchQueue, User
+
+logger = logging.getLogger(__name__)
+
+IN_CHUNK_SIZE = 900
+
+# 초성 (호환용 자모, 음절 코드 순서)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+# 검색어 끝에서 떼어 보는 조사 (긴 것부터). 떼고 남는 말이 두 글자 이상일 때만
+PARTICLES = (
+    "으로부터", "에서부터", "이라고", "이라는", "에게서", "한테서", "으로써", "으로서",
+    "에서", "에게", "한테", "까지", "부터", "보다", "처럼", "으로", "이나", "이랑", "하고",
+    "라고", "라는", "로써", "로서",
+    "은", "는", "이", "가", "을", "를", "에", "의", "와", "과", "도", "로", "만", "나", "랑",
+)
+# 일반 검색 대상 열과 BM25 가중치 (제목 > 프로젝트 > 첨부파일명 > 내용 > 메모)
+TEXT_COLUMNS = "{title body memo project filenames}"
+COLUMN_WEIGHTS = (10.0, 2.0, 1.0, 5.0, 3.0, 4.0)  # title, body, memo, project, filenames, choseong
+
+HANGUL, JAMO, OTHER = "hangul", "jamo", "other"
+_WORD_RE = re.compile(r"[^\W_]+")
+_RUN_RE = re.compile(r"([가-힣]+)|([ㄱ-ㅣ]+)|([^가-힣ㄱ-ㅣ]+)")
+
+
+def _normalize(value: Optional[str]) -> str:
+    return unicodedata.normalize("NFC", value or "").lower()
+
+
+def _runs(value: str) -> List[Tuple[str, str]]:
+    """단어 안을 한글 음절 / 낱자(자모) / 그 밖의 글자 조각으로 나눔 ("2026년도" -> 2026, 년도)"""
+    runs = []
+    for word in _WORD_RE.findall(_normalize(value)):
+        for hangul, jamo, other in _RUN_RE.findall(word):
+            if hangul:
+                runs.append((HANGUL, hangul))
+            elif jamo:
+                runs.append((JAMO, jamo))
+            else:
+                runs.append((OTHER, other))
+        runs.append((None, ""))  # 단어 경계
+    return runs
+
+
+def choseong(syllables: str) -> str:
+    """한글 음절의 초성 ("회의록" -> "ㅎㅇㄹ")"""
+    return "".join(CHOSEONG[(ord(ch) - 0xAC00) // 588] for ch in syllables)
+
+
+def hangul_ngrams(syllables: str) -> List[str]:
+    """한 글자 말은 그대로, 그 밖에는 bigram 과 trigram"""
+    if len(syllables) == 1:
+        return [syllables]
+    grams = [syllables[i:i + 2] for i in range(len(syllables) - 1)]
+    grams.extend(syllables[i:i + 3] for i in range(len(syllables) - 2))
+    return grams
+
+
+def document_tokens(value: Optional[str]) -> List[str]:
+    """
+    색인할 토큰. 한글은 n-gram 이라 조사가 붙은 말("회의를")에도 어간의 n-gram("회의")이 들어가고,
+    영문/숫자는 단어 그대로. 낱자만 있는 조각은 색인하지 않음
+    """
+    tokens = []
+    for kind, run in _runs(value):
+        if kind == HANGUL:
+            tokens.extend(hangul_ngrams(run))
+        elif kind == OTHER:
+            tokens.append(run)
+    return tokens
+
+
+def choseong_tokens(value: Optional[str]) -> List[str]:
+    return [choseong(run) for kind, run in _runs(value) if kind == HANGUL]
+
+
+def strip_particle(syllables: str) -> str:
+    for particle in PARTICLES:
+        if syllables.endswith(particle) and len(syllables) - len(particle) >= 2:
+            return syllables[:-len(particle)]
+    return syllables
+
+
+def _phrase(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
+def _grams_clause(syllables: str) -> str:
+    if len(syllables) == 1:
+        # 한 글자는 그 글자로 시작하는 n-gram 모두
+        return _phrase(syllables) + "*"
+    if len(syllables) <= 3:
+        return _phrase(syllables)
+    trigrams = [syllables[i:i + 3] for i in range(len(syllables) - 2)]
+    return "(" + " AND ".join(_phrase(gram) for gram in trigrams) + ")"
+
+
+def compile_query(value: Optional[str]) -> Optional[str]:
+    """
+    검색어를 FTS5 MATCH 식으로 바꿉니다. 조각마다 AND.
+
+    - 한글: n-gram 이 모두 있어야 함. 조사가 붙어 있으면 뗀 말로도 찾음 ("회의를" -> 회의를 OR 회의)
+    - 낱자: 초성 검색. 앞에 음절이 있으면 그 초성과 이어서 ("회의ㄹ" -> 회의 AND 초성 ㅎㅇㄹ*)
+    - 영문/숫자: 앞부분 일치 ("repo" -> report)
+
+    Returns:
+        Optional[str]: 찾을 조각이 없으면 None
+    """
+    clauses = []
+    runs = _runs(value)
+    for index, (kind, run) in enumerate(runs):
+        if kind == HANGUL:
+            alternatives = [_grams_clause(run)]
+            stem = strip_particle(run)
+            if stem != run:
+                alternatives.append(_grams_clause(stem))
+            clauses.append(f"{TEXT_COLUMNS} : ({' OR '.join(alternatives)})")
+        elif kind == JAMO:
+            initials = "".join(ch for ch in run if ch in CHOSEONG)
+            if not initials:
+                continue
+            previous = runs[index - 1][1] if index and runs[index - 1][0] == HANGUL else ""
+            clauses.append(f"choseong : {_phrase(choseong(previous) + initials)}*")
+        elif kind == OTHER:
+            clauses.append(f"{TEXT_COLUMNS} : {_phrase(run)}*")
+    return " AND ".join(clauses) or None
+
+
+def substring_expression(value: Optional[str]) -> Optional[str]:
+    """
+    LIKE '%value%' 후보를 색인으로 줄이는 MATCH 식. 두 글자 이상인 한글 조각의 n-gram 만 씀
+    (문구가 단어 중간에서 시작/끝나도 그 조각의 n-gram 은 문서 단어의 n-gram 이므로 LIKE 결과를 빠뜨리지 않음)
+
+    Returns:
+        Optional[str]: 색인으로 줄일 수 없으면 None
+    """
+    clauses = []
+    for kind, run in _runs(value):
+        if kind != HANGUL or len(run) < 2:
+            continue
+        size = 2 if len(run) == 2 else 3
+        grams = sorted({run[i:i + size] for i in range(len(run) - size + 1)})
+        clauses.extend(_phrase(gram) for gram in grams)
+    if not clauses:
+        return None
+    return f"{TEXT_COLUMNS} : ({' AND '.join(clauses)})"
+
+
+def matching_ids(expression: str):
+    """MATCH 식에 맞는 일정 id 서브쿼리"""
+    fts = table(migrate_db.SCHEDULE_SEARCH_TABLE, column("rowid"))
+    fts_table = literal_column(migrate_db.SCHEDULE_SEARCH_TABLE)
+    return select(fts.c.rowid).where(fts_table.op("MATCH")(expression))
+
+
+def _chunks(ids: List[int]):
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        yield ids[start:start + IN_CHUNK_SIZE]
+
+
+def _index_schedules(conn, ids: List[int]) -> int:
+    """ids 의 색인을 지우고 삭제되지 않은 일정만 다시 넣음. 넣은 수를 반환"""
+    fts = table(migrate_db.SCHEDULE_SEARCH_TABLE, column("rowid"))
+    insert_sql = text(
+        f"INSERT INTO {migrate_db.SCHEDULE_SEARCH_TABLE} (rowid, title, body, memo, project, filenames, choseong) "
+        "VALUES (:id, :title, :body, :memo, :project, :filenames, :choseong)"
+    )
+    indexed = 0
+    for chunk in _chunks(ids):
+        conn.execute(delete(fts).where(fts.c.rowid.in_(chunk)))
+        filenames: Dict[int, List[str]] = defaultdict(list)
+        for schedule_id, filename in conn.execute(
+            select(Attachment.schedule_id, Attachment.filename).where(Attachment.schedule_id.in_(chunk))
+        ):
+            filenames[schedule_id].append(filename)
+        documents = []
+        for row in conn.execute(
+            select(Schedule.id, Schedule.title, Schedule.content, Schedule.memo, Schedule.project_name)
+            .where(Schedule.id.in_(chunk), Schedule.is_deleted == False)
+        ):
+            documents.append({
+                "id": row.id,
+                "title": " ".join(document_tokens(row.title)),
+                "body": " ".join(document_tokens(row.content)),
+                "memo": " ".join(document_tokens(row.memo)),
+                "project": " ".join(document_tokens(row.project_name)),
+                "filenames": " ".join(token for name in filenames[row.id] for token in document_tokens(name)),
+                # 초성 검색(타이핑 중 자동완성)은 제목과 프로젝트만
+                "choseong": " ".join(choseong_tokens(row.title) + choseong_tokens(row.project_name)),
+            })
+        if documents:
+            conn.execute(insert_sql, documents)
+        indexed += len(documents)
+    return indexed
+
+
+def refresh_search_index(conn) -> int:
+    """
+    트리거가 쌓은 큐의 일정만 다시 색인합니다 (쓰는 트랜잭션의 commit 직전에 호출, 비용은 그 트랜잭션이 바꾼 일정 수에 비례).
+
+    Returns:
+        int: 다시 색인한 큐 항목 수
+    """
+    ids = [schedule_id for schedule_id, in conn.execute(select(ScheduleSearchQueue.schedule_id))]
+    if not ids:
+        return 0
+    _index_schedules(conn, ids)
+    for chunk in _chunks(ids):
+        conn.execute(delete(ScheduleSearchQueue).where(ScheduleSearchQueue.schedule_id.in_(chunk)))
+    return len(ids)
+
+
+# 이번 트랜잭션에서 쓴 적이 있는지 (session.info). 읽기만 한 commit 은 큐를 보지 않음
+_WROTE_KEY = "schedule_search_wrote"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_before_commit(session: Session):
+    """
+    일정을 바꾼 트랜잭션 안에서 색인도 갱신해서 함께 commit 합니다.
+    검색(GET)은 색인을 읽기만 하므로 읽기 요청이 SQLite 쓰기 잠금을 잡지 않습니다.
+    """
+    # before_commit 은 남은 변경을 flush 하기 전에 불리므로 먼저 flush 해서 트리거가 큐를 채우게 함
+    session.flush()
+    if session.info.pop(_WROTE_KEY, False) and migrate_db.schedule_search_enabled:
+        refresh_search_index(session.connection())
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session: Session):
+    session.info.pop(_WROTE_KEY, None)
+
+
+def rebuild_search_index(conn) -> int:
+    """색인을 비우고 삭제되지 않은 모든 일정을 다시 넣음 (트리거를 처음 만들 때)"""
+    conn.execute(text(f"DELETE FROM {migrate_db.SCHEDULE_SEARCH_TABLE}"))
+    conn.execute(delete(ScheduleSearchQueue))
+    ids = [schedule_id for schedule_id, in conn.execute(select(Schedule.id).where(Schedule.is_deleted == False))]
+    return _index_schedules(conn, ids)
+
+
+def _like_search(db: Session, user: User, value: str, skip: int, limit: int) -> List[Schedule]:
+    """색인이 없을 때: 단어마다 제목/내용/메모/프로젝트 중 하나에 포함 (순위 없이 최근 수정 순)"""
+    query = db.query(Schedule).filter(Schedule.is_deleted == False, can_view_clause(user))
+    for word in _WORD_RE.findall(_normalize(value)):
+        query = query.filter(or_(
+            Schedule.title.ilike(f"%{word}%"),
+            Schedule.content.ilike(f"%{word}%"),
+            Schedule.memo.ilike(f"%{word}%"),
+            Schedule.project_name.ilike(f"%{word}%"),
+        ))
+    return query.order_by(Schedule.updated_at.desc(), Schedule.id.desc()).offset(skip).limit(limit).all()
+
+
+def search_schedules(db: Session, user: User, value: str, skip: int = 0, limit: int = 50) -> List[Schedule]:
+    """
+    볼 수 있는 일정 중 검색어와 맞는 일정을 BM25 점수 순으로 반환합니다.
+
+    제목/내용/메모/프로젝트/첨부파일명을 열별 가중치(COLUMN_WEIGHTS)로 매깁니다.
+    색인은 쓰기 트랜잭션이 commit 할 때 갱신되므로 여기서는 읽기만 합니다.
+    """
+    expression = compile_query(value)
+    if expression is None:
+        return []
+    if not migrate_db.schedule_search_enabled:
+        return _like_search(db, user, value, skip, limit)
+
+    fts = table(migrate_db.SCHEDULE_SEARCH_TABLE, column("rowid"))
+    fts_table = literal_column(migrate_db.SCHEDULE_SEARCH_TABLE)
+    matches = select(
+        fts.c.rowid.label("schedule_id"),
+        func.bm25(fts_table, *COLUMN_WEIGHTS).label("score"),
+    ).where(fts_table.op("MATCH")(expression)).subquery()
+    return [
+        schedule for schedule, _ in db.query(Schedule, matches.c.score)
+        .join(matches, Schedule.id == matches.c.schedule_id)
+        .filter(and_(Schedule.is_deleted == False, can_view_clause(user)))
+        .order_by(matches.c.score, Schedule.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    ]
@@ -0,0 +1,220 @@
+from datetime import datetime, time, timedelta
+from typing import Dict, Optional
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Query, Session
+from app.core.recurrence import expand_occurrences, recurring_in_window
+from app.core.schedule_query import filter_status_and_range
+from app.models.models import PriorityLevel, Schedule, ScheduleDailyStat, User
+
+GROUP_BY_OPTIONS = ("day", "week", "month", "priority", "owner", "project")
+
+
+def _group_key(group_by: str, date_column, priority_column, owner_column, project_column):
+    """
+    묶음 키 SQL 식. week 는 그 주 월요일 날짜, month 는 YYYY-MM.
+
+    일정 테이블과 롤업 테이블에 같은 식을 쓰도록 열을 받음
+    """
+    if group_by == "day":
+        return func.date(date_column)
+    if group_by == "week":
+        return func.date(date_column, "-6 days", "weekday 1")
+    if group_by == "month":
+        return func.strftime("%Y-%m", date_column)
+    if group_by == "priority":
+        return priority_column
+    if group_by == "owner":
+        return owner_column
+    return project_column
+
+
+def _python_key(group_by: str, item):
+    """반복 일정 회차용 (SQL 식과 같은 값)"""
+    if group_by == "day":
+        return item.date.date().isoformat()
+    if group_by == "week":
+        return (item.date.date() - timedelta(days=item.date.weekday())).isoformat()
+    if group_by == "month":
+        return item.date.strftime("%Y-%m")
+    if group_by == "priority":
+        return item.priority.name if item.priority else None
+    if group_by == "owner":
+        return item.owner_id
+    return item.project_name
+
+
+def _normalize_key(group_by: str, key):
+    if group_by == "priority":
+        if isinstance(key, PriorityLevel):
+            return key.name
+        return key or None
+    if group_by == "project":
+        return key or None
+    return key
+
+
+def _overdue(now: datetime):
+    return and_(Schedule.is_completed == False, Schedule.due_time < now)
+
+
+def _add(groups: Dict, key, total: int, completed: int, overdue: int):
+    counts = groups.setdefault(key, {"total": 0, "completed": 0, "overdue": 0})
+    counts["total"] += total
+    counts["completed"] += completed
+    counts["overdue"] += overdue
+
+
+def _result(group_by: str, source: str, groups: Dict) -> dict:
+    labels = {}
+    if group_by == "priority":
+        labels = {level.name: level.value for level in PriorityLevel}
+    rows = []
+    for key in sorted(groups, key=lambda key: (key is None, str(key) if key is not None else "")):
+        counts = groups[key]
+        rows.append({
+            "key": key,
+            "label": labels.get(key, key),
+            "total": counts["total"],
+            "completed": counts["completed"],
+            "open": counts["total"] - counts["completed"],
+            "overdue": counts["overdue"],
+        })
+    totals = {name: sum(row[name] for row in rows) for name in ("total", "completed", "open", "overdue")}
+    return {"group_by": group_by, "source": source, "groups": rows, "totals": totals}
+
+
+def _count_rows(groups: Dict, group_by: str, query: Query, now: datetime):
+    """일정 행을 GROUP BY 로 셈"""
+    key = _group_key(group_by, Schedule.date, Schedule.priority, Schedule.owner_id, Schedule.project_name)
+    rows = query.with_entities(
+        key.label("key"),
+        func.count(Schedule.id),
+        func.sum(case((Schedule.is_completed == True, 1), else_=0)),
+        func.sum(case((_overdue(now), 1), else_=0)),
+    ).group_by(key).all()
+    for row_key, total, completed, overdue in rows:
+        _add(groups, _normalize_key(group_by, row_key), total, completed or 0, overdue or 0)
+
+
+def _count_occurrences(
+    db: Session,
+    groups: Dict,
+    group_by: str,
+    recurring_query: Query,
+    start_date: datetime,
+    end_date: datetime,
+    show_completed: bool,
+    completed_only: bool,
+    now: datetime,
+):
+    """기간 안의 반복 일정을 회차로 펼쳐 셈"""
+    masters = recurring_query.filter(Schedule.rrule.isnot(None), recurring_in_window(start_date, end_date)).all()
+    for occurrence in expand_occurrences(db, masters, start_date, end_date):
+        completed = bool(occurrence.is_completed)
+        if (completed_only and not completed) or (not show_completed and completed):
+            continue
+        overdue = not completed and occurrence.due_time is not None and occurrence.due_time < now
+        _add(groups, _python_key(group_by, occurrence), 1, int(completed), int(overdue))
+
+
+def live_stats(
+    db: Session,
+    query: Query,
+    recurring_query: Optional[Query],
+    group_by: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    show_completed: bool = True,
+    completed_only: bool = False,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    read_schedules 와 같은 조건을 건 쿼리로 GROUP BY 집계를 합니다.
+
+    Args:
+        query: 모든 조건(완료/기간 포함)을 건 일정 쿼리
+        recurring_query: 완료/기간 조건 전의 쿼리. 기간이 있으면 반복 일정을 회차로 펼쳐 더함
+    """
+    now = now or datetime.now()
+    expand = recurring_query is not None and start_date and end_date
+    if expand:
+        query = query.filter(Schedule.rrule.is_(None))
+    groups: Dict = {}
+    _count_rows(groups, group_by, query, now)
+    if expand:
+        _count_occurrences(
+            db, groups, group_by, recurring_query, start_date, end_date, show_completed, completed_only, now
+        )
+    return _result(group_by, "live", groups)
+
+
+def rollup_supported(start_date: Optional[datetime], end_date: Optional[datetime], has_terms: bool) -> bool:
+    """롤업은 날짜 단위로만 세므로 검색어가 없고 기간이 하루 경계에 맞을 때만 씀"""
+    if has_terms:
+        return False
+    if start_date is not None and start_date.time() != time.min:
+        return False
+    if end_date is not None and end_date.time() not in (time.max, time(23, 59, 59)):
+        return False
+    return True
+
+
+def rollup_stats(
+    db: Session,
+    user: User,
+    group_by: str,
+    query: Query,
+    show_all_users: bool = True,
+    show_completed: bool = True,
+    completed_only: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    트리거로 유지하는 schedule_daily_stats 롤업에서 집계합니다 (일반 일정 행을 읽지 않음).
+
+    지연 여부는 시간이 지나면 바뀌므로 롤업에 담지 않고, 마감이 지난 미완료 일정만
+    due_time 인덱스로 따로 셉니다. 반복 일정은 회차마다 다르므로 롤업에 없고,
+    live_stats 와 같이 기간이 있으면 회차로 펼치고 없으면 원본 한 건으로 더합니다.
+
+    Args:
+        query: read_schedules 와 같은 보기 조건을 건 일정 쿼리 (완료/기간 조건 전)
+    """
+    now = now or datetime.now()
+    stat = ScheduleDailyStat
+    key = _group_key(group_by, stat.day, stat.priority, stat.owner_id, stat.project_name)
+    rollup = db.query(key.label("key"), func.sum(stat.total), func.sum(stat.completed))
+    if show_all_users:
+        rollup = rollup.filter(or_(stat.owner_id == user.id, stat.individual == False))
+    else:
+        rollup = rollup.filter(stat.owner_id == user.id)
+    if start_date is not None:
+        rollup = rollup.filter(stat.day >= start_date.date().isoformat())
+    if end_date is not None:
+        rollup = rollup.filter(stat.day <= end_date.date().isoformat())
+
+    groups: Dict = {}
+    for row_key, total, completed in rollup.group_by(key).all():
+        total, completed = total or 0, completed or 0
+        if completed_only:
+            total = completed
+        elif not show_completed:
+            total, completed = total - completed, 0
+        if total:
+            _add(groups, _normalize_key(group_by, row_key), total, completed, 0)
+
+    if not completed_only:
+        overdue_key = _group_key(group_by, Schedule.date, Schedule.priority, Schedule.owner_id, Schedule.project_name)
+        overdue_query = filter_status_and_range(query, False, False, start_date, end_date)
+        for row_key, overdue in overdue_query.filter(
+            Schedule.rrule.is_(None), _overdue(now)
+        ).with_entities(overdue_key, func.count(Schedule.id)).group_by(overdue_key):
+            _add(groups, _normalize_key(group_by, row_key), 0, 0, overdue)
+
+    if start_date and end_date:
+        _count_occurrences(db, groups, group_by, query, start_date, end_date, show_completed, completed_only, now)
+    else:
+        recurring = filter_status_and_range(query, show_completed, completed_only, start_date, end_date)
+        _count_rows(groups, group_by, recurring.filter(Schedule.rrule.isnot(None)), now)
+    return _result(group_by, "rollup", groups)
@@ -0,0 +1,113 @@
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import String, and_, exists, func, literal, select
+from sqlalchemy.orm import Session, aliased
+from app.core.schedule_access import can_view_clause
+from app.models.models import Schedule, ScheduleClosure, User
+
+logger = logging.getLogger(__name__)
+
+# depth 를 주지 않았을 때의 상한 (parent_id 가 순환하더라도 재귀가 끝나도록)
+TREE_MAX_DEPTH = 100
+
+
+def _sort_key(model):
+    """
+    형제 사이 정렬 키 (order_key, 키가 없으면 parent_order, id).
+
+    각 단계 끝에 어떤 키 문자보다 작은 구분자(char(1))를 붙여서, 이어 붙인 경로를 그대로 정렬하면
+    전위 순회가 됨
+    """
+    return func.printf(
+        "%s%c%010d%010d%c",
+        func.coalesce(model.order_key, ""), func.char(1),
+        func.coalesce(model.parent_order, 0), model.id, func.char(1),
+        type_=String
+    )
+
+
+def load_subtree(
+    db: Session,
+    root_id: int,
+    user: User,
+    depth: Optional[int] = None,
+) -> List[Tuple[Schedule, int, bool]]:
+    """
+    일정과 그 아래 후속 작업 전체를 재귀 CTE 한 번으로 조회합니다.
+
+    삭제되었거나 사용자가 볼 수 없는 일정은 그 아래 하위 트리와 함께 제외합니다.
+    결과는 전위 순회 순서이고 형제 사이에서는 parent_order 순입니다.
+
+    Args:
+        depth: 루트로부터 최대 깊이 (1 이면 직계 자식까지). None 이면 TREE_MAX_DEPTH
+
+    Returns:
+        List[Tuple[Schedule, int, bool]]: (일정, 깊이, 보이는 하위 작업이 더 있는지).
+            루트를 볼 수 없으면 빈 목록
+    """
+    max_depth = min(depth, TREE_MAX_DEPTH) if depth is not None else TREE_MAX_DEPTH
+
+    tree = select(
+        Schedule.id.label("id"),
+        literal(0).label("depth"),
+        _sort_key(Schedule).label("path"),
+    ).where(
+        Schedule.id == root_id,
+        Schedule.is_deleted == False,
+        can_view_clause(user)
+    ).cte("schedule_tree", recursive=True)
+
+    child = aliased(Schedule)
+    tree = tree.union_all(
+        select(
+            child.id,
+            tree.c.depth + 1,
+            tree.c.path + _sort_key(child),
+        ).join(
+            tree, child.parent_id == tree.c.id
+        ).where(
+            tree.c.depth < max_depth,
+            child.is_deleted == False,
+            can_view_clause(user, child)
+        )
+    )
+
+    grandchild = aliased(Schedule)
+    has_children = exists().where(and_(
+        grandchild.parent_id == Schedule.id,
+        grandchild.is_deleted == False,
+        can_view_clause(user, grandchild)
+    ))
+    rows = db.query(Schedule, tree.c.depth, has_children).join(
+        tree, Schedule.id == tree.c.id
+    ).order_by(tree.c.path).all()
+    return [(schedule, node_depth, bool(more)) for schedule, node_depth, more in rows]
+
+
+def ancestors(db: Session, schedule_id: int, user: User) -> List[Schedule]:
+    """
+    루트부터 바로 위 부모까지의 조상 일정 (브레드크럼). closure table 인덱스 조회 한 번으로 처리합니다.
+
+    삭제되었거나 사용자가 볼 수 없는 조상은 건너뜁니다.
+    """
+    return db.query(Schedule).join(
+        ScheduleClosure, ScheduleClosure.ancestor_id == Schedule.id
+    ).filter(
+        ScheduleClosure.descendant_id == schedule_id,
+        ScheduleClosure.depth > 0,
+        Schedule.is_deleted == False,
+        can_view_clause(user)
+    ).order_by(ScheduleClosure.depth.desc()).all()
+
+
+def descendant_ids(db: Session, schedule_id: int, include_self: bool = False) -> List[int]:
+    """하위 트리의 모든 일정 id (삭제 여부와 무관). closure table 인덱스 조회 한 번으로 처리합니다."""
+    query = db.query(ScheduleClosure.descendant_id).filter(ScheduleClosure.ancestor_id == schedule_id)
+    if not include_self:
+        query = query.filter(ScheduleClosure.depth > 0)
+    return [descendant_id for (descendant_id,) in query]
+
+
+def is_descendant(db: Session, ancestor_id: int, descendant_id: int) -> bool:
+    """descendant_id 가 ancestor_id 의 하위 트리에 있는지 (자기 자신 포함)"""
+    return db.get(ScheduleClosure, (ancestor_id, descendant_id)) is not None
@@ -0,0 +1,312 @@
+import os
+import shutil
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional
+from urllib.parse import quote
+from app.core.range_response import file_etag
+
+logger = logging.getLogger(__name__)
+
+# 저장소 종류: "local" (기본) 또는 "s3" (S3 호환 오브젝트 스토리지)
+STORAGE_BACKEND = os.environ.get("ATTACHMENT_STORAGE", "local")
+# 로컬 저장소는 정적 파일 경로 아래에 저장 (여러 서버는 공유 마운트 또는 S3 사용)
+LOCAL_STORAGE_ROOT = Path("./static/uploads")
+S3_BUCKET = os.environ.get("ATTACHMENT_S3_BUCKET", "")
+S3_PREFIX = os.environ.get("ATTACHMENT_S3_PREFIX", "")
+S3_ENDPOINT_URL = os.environ.get("ATTACHMENT_S3_ENDPOINT_URL") or None
+S3_REGION = os.environ.get("ATTACHMENT_S3_REGION") or None
+# 미리 서명된 다운로드 URL 유효 시간 (초)
+PRESIGNED_URL_EXPIRES = int(os.environ.get("ATTACHMENT_PRESIGNED_URL_EXPIRES", "300"))
+
+CHUNK_SIZE = 64 * 1024
+# 로컬 저장 중인 임시 파일: "<원본파일명>.upload-<임의 문자열>.tmp"
+TEMP_MARKER = ".upload-"
+TEMP_SUFFIX = ".tmp"
+# S3 DeleteObjects 한 번에 보낼 수 있는 최대 키 수
+S3_DELETE_BATCH_SIZE = 1000
+
+
+class StoredObject(NamedTuple):
+    """저장된 객체의 메타데이터"""
+    size: int
+    etag: str
+    modified: float
+
+
+def measure(src: BinaryIO) -> int:
+    """탐색 가능한 파일 객체의 남은 크기를 반환합니다 (위치는 그대로 유지)."""
+    position = src.tell()
+    size = src.seek(0, os.SEEK_END) - position
+    src.seek(position)
+    return size
+
+
+def temp_file_origin(name: str) -> Optional[str]:
+    """LocalStorage.put 이 쓰는 임시 파일이면 완성될 원본 파일명, 아니면 None"""
+    if not name.endswith(TEMP_SUFFIX):
+        return None
+    name = name[:-len(TEMP_SUFFIX)]
+    # 예전 방식 "<원본파일명>.tmp" 도 같은 원본으로 취급
+    return name.rsplit(TEMP_MARKER, 1)[0] if TEMP_MARKER in name else name
+
+
+class StorageBackend(ABC):
+    """
+    첨부파일 저장소 인터페이스
+
+    키는 "3f/a2/3fa2...e1.pdf" 같은 저장소 내부 상대 경로입니다.
+    """
+
+    @abstractmethod
+    def put(self, key: str, src: BinaryIO, content_type: Optional[str] = None) -> int:
+        """src 를 끝까지 읽어 저장하고 저장한 바이트 수를 반환합니다."""
+
+    @abstractmethod
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> BinaryIO:
+        """
+        읽기용 스트림을 엽니다. start 부터 end (포함) 까지 읽습니다.
+
+        Raises:
+            FileNotFoundError: 객체가 없는 경우
+        """
+
+    @abstractmethod
+    def delete(self, key: str):
+        """객체를 삭제합니다. 없으면 무시합니다."""
+
+    def delete_many(self, keys: Iterable[str]):
+        for key in keys:
+            self.delete(key)
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[StoredObject]:
+        """객체 메타데이터를 반환합니다. 없으면 None"""
+
+    def presigned_url(
+        self, key: str, filename: Optional[str] = None, as_attachment: bool = False,
+        content_type: Optional[str] = None, expires: int = PRESIGNED_URL_EXPIRES
+    ) -> Optional[str]:
+        """클라이언트가 저장소에서 직접 받을 수 있는 URL. 지원하지 않으면 None"""
+        return None
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """로컬 디스크 경로 (zero-copy 전송용). 로컬 저장소가 아니면 None"""
+        return None
+
+    def iter_range(self, key: str, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """start 부터 end (포함) 까지 청크 단위로 읽습니다."""
+        remaining = end - start + 1
+        with self.open(key, start, end) as src:
+            while remaining > 0:
+                chunk = src.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        """
+        로컬 파일이 필요한 작업 (썸네일 생성 등)을 위해 파일 경로를 제공합니다.
+
+        로컬 저장소는 원본 경로를, 원격 저장소는 임시 파일에 내려받은 경로를 줍니다.
+        """
+        path = self.local_path(key)
+        if path is not None:
+            yield path
+            return
+        fd, tmp_name = tempfile.mkstemp(suffix=Path(key).suffix)
+        try:
+            with os.fdopen(fd, "wb") as dst, self.open(key) as src:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            yield Path(tmp_name)
+        finally:
+            os.unlink(tmp_name)
+
+
+class LocalStorage(StorageBackend):
+    """로컬 (또는 공유 마운트) 디스크 저장소"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put(self, key: str, src: BinaryIO, content_type: Optional[str] = None) -> int:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 쓰는 도중의 파일이 읽히지 않도록 임시 파일에 쓴 뒤 교체.
+        # 같은 키를 동시에 쓰는 요청(미리보기 생성 등)이 서로의 임시 파일을 덮지 않도록 이름을 따로 받음
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + TEMP_MARKER, suffix=TEMP_SUFFIX)
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            # mkstemp 는 0600 으로 만드므로 정적 파일로 제공할 수 있게 일반 파일 권한으로 맞춤
+            tmp_path.chmod(0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return path.stat().st_size
+
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> BinaryIO:
+        src = open(self._path(key), "rb")
+        if start:
+            src.seek(start)
+        return src
+
+    def delete(self, key: str):
+        try:
+            self._path(key).unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to delete {key}: {str(e)}")
+
+    def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            stat_result = self._path(key).stat()
+        except FileNotFoundError:
+            return None
+        return StoredObject(stat_result.st_size, file_etag(stat_result), stat_result.st_mtime)
+
+    def local_path(self, key: str) -> Optional[Path]:
+        path = self._path(key)
+        return path if path.is_file() else None
+
+
+class _S3Body:
+    """get_object 응답 본문을 with 문에서 쓸 수 있게 감싼 스트림"""
+
+    def __init__(self, body):
+        self._body = body
+
+    def read(self, size: int = -1) -> bytes:
+        return self._body.read() if size is None or size < 0 else self._body.read(size)
+
+    def close(self):
+        self._body.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _is_not_found(error: Exception) -> bool:
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage(StorageBackend):
+    """
+    S3 호환 오브젝트 스토리지 (AWS S3, MinIO 등)
+
+    여러 앱 서버가 같은 버킷을 공유할 수 있습니다. client 는 boto3 S3 클라이언트와
+    같은 메서드를 제공하는 객체이며, 생략하면 환경 설정으로 boto3 클라이언트를 만듭니다.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", client=None,
+                 endpoint_url: Optional[str] = None, region: Optional[str] = None):
+        if client is None:
+            import boto3  # S3 저장소를 쓸 때만 필요
+
+            client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def put(self, key: str, src: BinaryIO, content_type: Optional[str] = None) -> int:
+        size = measure(src)
+        extra_args = {"ContentType": content_type} if content_type else {}
+        # upload_fileobj 는 큰 파일을 멀티파트로 나눠 올림 (메모리에 전부 올리지 않음)
+        self.client.upload_fileobj(src, self.bucket, self._key(key), ExtraArgs=extra_args)
+        return size
+
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> BinaryIO:
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            response = self.client.get_object(**params)
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+        return _S3Body(response["Body"])
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def delete_many(self, keys: Iterable[str]):
+        keys = [self._key(key) for key in keys]
+        for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [{"Key": key} for key in keys[start:start + S3_DELETE_BATCH_SIZE]],
+                    "Quiet": True
+                }
+            )
+
+    def stat(self, key: str) -> Optional[StoredObject]:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+        modified = response.get("LastModified")
+        return StoredObject(
+            response["ContentLength"],
+            response["ETag"],
+            modified.timestamp() if isinstance(modified, datetime) else 0.0
+        )
+
+    def presigned_url(
+        self, key: str, filename: Optional[str] = None, as_attachment: bool = False,
+        content_type: Optional[str] = None, expires: int = PRESIGNED_URL_EXPIRES
+    ) -> Optional[str]:
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if filename:
+            disposition = "attachment" if as_attachment else "inline"
+            params["ResponseContentDisposition"] = f"{disposition}; filename*=utf-8''{quote(filename)}"
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires)
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """설정된 첨부파일 저장소를 반환합니다 (FastAPI 의존성으로도 사용)."""
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "s3":
+            if not S3_BUCKET:
+                raise RuntimeError("ATTACHMENT_S3_BUCKET must be set when ATTACHMENT_STORAGE=s3")
+            _storage = S3Storage(S3_BUCKET, S3_PREFIX, endpoint_url=S3_ENDPOINT_URL, region=S3_REGION)
+        else:
+            _storage = LocalStorage(LOCAL_STORAGE_ROOT)
+        logger.info(f"Attachment storage: {type(_storage).__name__}")
+    return _storage
+
+
+def set_storage(storage: Optional[StorageBackend]):
+    """저장소를 교체합니다 (테스트, 별도 설정용). None 이면 다음 호출 때 다시 설정에서 만듭니다."""
+    global _storage
+    _storage = storage
@@ -0,0 +1,136 @@
+import os
+from collections import defaultdict
+from typing import AsyncIterator, Iterable, Optional
+from sqlalchemy import update, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models.models import Attachment, StorageUsage
+
+# 용량 제한 (바이트). 0이면 제한 없음
+USER_QUOTA_BYTES = int(os.environ.get("USER_STORAGE_QUOTA_BYTES", "0"))
+SCHEDULE_QUOTA_BYTES = int(os.environ.get("SCHEDULE_STORAGE_QUOTA_BYTES", "0"))
+
+# 요청 본문 크기로 미리 거를 때 multipart 경계/헤더 몫으로 더 허용하는 크기
+# (파일 크기 자체는 저장 전에 ensure_within_limit 로 정확히 다시 확인)
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+SCOPE_USER = "user"
+SCOPE_SCHEDULE = "schedule"
+
+
+class QuotaExceeded(Exception):
+    """업로드가 사용량 제한을 초과한 경우"""
+
+
+def _quota_for(scope: str) -> int:
+    return USER_QUOTA_BYTES if scope == SCOPE_USER else SCHEDULE_QUOTA_BYTES
+
+
+def get_usage(db: Session, scope: str, owner_id: int) -> dict:
+    """카운터 한 행을 조회합니다 (전체 첨부파일 합산 없이 O(1))."""
+    usage = db.query(StorageUsage).filter(
+        StorageUsage.scope == scope,
+        StorageUsage.owner_id == owner_id
+    ).first()
+    quota = _quota_for(scope)
+    bytes_used = usage.bytes_used if usage else 0
+    return {
+        "bytes_used": bytes_used,
+        "file_count": usage.file_count if usage else 0,
+        "quota_bytes": quota or None,
+        "remaining_bytes": max(quota - bytes_used, 0) if quota else None
+    }
+
+
+def remaining_bytes(db: Session, user_id: int, schedule_id: int) -> Optional[int]:
+    """사용자/일정 제한 중 더 작은 남은 용량. 제한이 없으면 None"""
+    remaining = None
+    for scope, owner_id in ((SCOPE_USER, user_id), (SCOPE_SCHEDULE, schedule_id)):
+        scope_remaining = get_usage(db, scope, owner_id)["remaining_bytes"]
+        if scope_remaining is not None:
+            remaining = scope_remaining if remaining is None else min(remaining, scope_remaining)
+    return remaining
+
+
+def ensure_within_limit(size: int, limit: Optional[int]):
+    """
+    저장 전에 크기가 남은 용량 안에 드는지 확인합니다.
+
+    Raises:
+        QuotaExceeded: limit 초과 시
+    """
+    if limit is not None and size > limit:
+        raise QuotaExceeded("Storage quota exceeded")
+
+
+def body_limit(limit: Optional[int]) -> Optional[int]:
+    """남은 용량으로 받아들일 수 있는 최대 요청 본문 크기. 제한이 없으면 None"""
+    return None if limit is None else limit + MULTIPART_OVERHEAD_BYTES
+
+
+async def limited_stream(stream: AsyncIterator[bytes], limit: Optional[int]) -> AsyncIterator[bytes]:
+    """
+    요청 본문을 읽으면서 크기를 세고, limit 을 넘는 순간 더 받지 않고 중단합니다.
+
+    Raises:
+        QuotaExceeded: limit 초과 시
+    """
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if limit is not None and received > limit:
+            raise QuotaExceeded("Storage quota exceeded")
+        yield chunk
+
+
+def add_usage(db: Session, user_id: int, schedule_id: int, size: int, count: int):
+    """
+    업로드된 용량을 카운터에 더합니다. 요청 트랜잭션 안에서 호출해야 합니다.
+
+    동시 업로드에 대비해 조건부 UPDATE로 제한을 다시 확인합니다.
+
+    Raises:
+        QuotaExceeded: 제한 초과 시 (호출자가 rollback)
+    """
+    for scope, owner_id in ((SCOPE_USER, user_id), (SCOPE_SCHEDULE, schedule_id)):
+        db.execute(
+            insert(StorageUsage)
+            .values(scope=scope, owner_id=owner_id, bytes_used=0, file_count=0)
+            .on_conflict_do_nothing(index_elements=["scope", "owner_id"])
+        )
+        statement = update(StorageUsage).where(
+            StorageUsage.scope == scope,
+            StorageUsage.owner_id == owner_id
+        )
+        quota = _quota_for(scope)
+        if quota:
+            statement = statement.where(StorageUsage.bytes_used + size <= quota)
+        result = db.execute(
+            statement.values(
+                bytes_used=StorageUsage.bytes_used + size,
+                file_count=StorageUsage.file_count + count
+            ).execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            raise QuotaExceeded("Storage quota exceeded")
+
+
+def subtract_usage(db: Session, attachments: Iterable[Attachment]):
+    """삭제되는 첨부파일만큼 카운터를 줄입니다. 요청 트랜잭션 안에서 호출해야 합니다."""
+    totals = defaultdict(lambda: [0, 0])
+    for attachment in attachments:
+        size = attachment.file_size or 0
+        for key in ((SCOPE_USER, attachment.uploader_id), (SCOPE_SCHEDULE, attachment.schedule_id)):
+            totals[key][0] += size
+            totals[key][1] += 1
+
+    for (scope, owner_id), (size, count) in totals.items():
+        db.execute(
+            update(StorageUsage).where(
+                StorageUsage.scope == scope,
+                StorageUsage.owner_id == owner_id
+            ).values(
+                bytes_used=func.max(StorageUsage.bytes_used - size, 0),
+                file_count=func.max(StorageUsage.file_count - count, 0)
+            ).execution_options(synchronize_session=False)
+        )
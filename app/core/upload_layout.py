@@ -0,0 +1,177 @@
+import os
+import uuid
+import shutil
+import asyncio
+import logging
+from pathlib import Path
+from typing import Tuple
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.checkpoints import load_checkpoint, save_checkpoint
+from app.core.storage import LOCAL_STORAGE_ROOT, LocalStorage, get_storage
+from app.core.previews import PREVIEW_SIZES, preview_path
+from app.models.models import Attachment
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = LOCAL_STORAGE_ROOT
+# attachments.file_path 는 "/static/uploads/<저장소 키>" 형태
+UPLOAD_URL_PREFIX = "/static/uploads/"
+
+# 저장 객체 이름에 남길 확장자 최대 길이 (원본 파일명은 DB에만 저장)
+MAX_EXTENSION_LENGTH = 16
+
+MIGRATION_CHECKPOINT_NAME = "upload_layout_migration"
+MIGRATION_BATCH_SIZE = 100
+MIGRATION_BATCH_PAUSE_SECONDS = 0.5
+
+
+def _extension(filename: str) -> str:
+    ext = Path(filename or "").suffix.lower()
+    if len(ext) > MAX_EXTENSION_LENGTH or not ext[1:].isalnum():
+        return ""
+    return ext
+
+
+def new_object_key(filename: str) -> Tuple[str, str]:
+    """
+    새 저장소 키를 만듭니다.
+
+    객체 이름은 uuid4 (충돌 확인 불필요)이고, 앞 4자리로 두 단계 하위 디렉토리
+    (256 x 256)를 나눠 한 디렉토리의 항목 수가 커지지 않게 합니다.
+    예: 3f/a2/3fa2...e1.pdf
+
+    Returns:
+        Tuple[str, str]: (저장소 키, attachments.file_path 에 저장할 경로)
+    """
+    object_name = uuid.uuid4().hex + _extension(filename)
+    key = f"{object_name[:2]}/{object_name[2:4]}/{object_name}"
+    return key, UPLOAD_URL_PREFIX + key
+
+
+def new_object_path(filename: str) -> Tuple[Path, str]:
+    """new_object_key 의 로컬 디스크 버전. 하위 디렉토리를 미리 만듭니다."""
+    key, file_path = new_object_key(filename)
+    path = UPLOAD_DIR / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path, file_path
+
+
+def storage_key(file_path: str) -> str:
+    """attachments.file_path 를 저장소 키로 바꿉니다."""
+    if file_path.startswith(UPLOAD_URL_PREFIX):
+        return file_path[len(UPLOAD_URL_PREFIX):]
+    return file_path.lstrip("/")
+
+
+def is_legacy_path(file_path: str) -> bool:
+    """하위 디렉토리 없이 업로드 디렉토리에 바로 저장된 예전 방식 경로인지 확인합니다."""
+    if not file_path or not file_path.startswith(UPLOAD_URL_PREFIX):
+        return False
+    return "/" not in file_path[len(UPLOAD_URL_PREFIX):]
+
+
+def migrate_attachment(db: Session, attachment: Attachment) -> bool:
+    """
+    예전 방식으로 저장된 첨부파일 하나를 새 디렉토리 구조로 옮깁니다.
+
+    서비스 중에도 안전하도록 새 위치에 하드 링크(불가능하면 복사)를 만든 뒤
+    DB 경로를 커밋하고, 그 다음에 예전 파일을 지웁니다. 어느 시점에 읽어도
+    DB가 가리키는 파일은 항상 존재합니다.
+
+    Returns:
+        bool: 이동했으면 True
+    """
+    old_path = Path("." + attachment.file_path)
+    if not old_path.is_file():
+        return False
+
+    new_path, new_url = new_object_path(attachment.filename)
+    try:
+        os.link(old_path, new_path)
+    except OSError:
+        shutil.copy2(old_path, new_path)
+    # 정리 작업이 커밋 전의 새 파일을 고아로 오인하지 않도록 수정 시각 갱신
+    os.utime(new_path, None)
+
+    try:
+        attachment.file_path = new_url
+        db.commit()
+    except Exception:
+        db.rollback()
+        new_path.unlink(missing_ok=True)
+        raise
+
+    for size in PREVIEW_SIZES:
+        try:
+            os.replace(preview_path(old_path, size), preview_path(new_path, size))
+        except OSError:
+            pass
+    old_path.unlink(missing_ok=True)
+    return True
+
+
+def migrate_batch(db: Session, after_id: int) -> int:
+    """
+    id 순서로 배치 하나를 옮깁니다.
+
+    Returns:
+        int: 이번 배치의 마지막 id (더 이상 행이 없으면 after_id)
+    """
+    rows = db.query(Attachment).filter(
+        Attachment.id > after_id
+    ).order_by(Attachment.id).limit(MIGRATION_BATCH_SIZE).all()
+
+    for attachment in rows:
+        if not is_legacy_path(attachment.file_path):
+            continue
+        try:
+            migrate_attachment(db, attachment)
+        except Exception as e:
+            logger.error(f"Failed to migrate attachment {attachment.id}: {str(e)}")
+    return rows[-1].id if rows else after_id
+
+
+async def run_layout_migration():
+    """
+    기존 업로드 파일을 새 디렉토리 구조로 옮깁니다 (서비스 중단 없이).
+
+    배치마다 체크포인트를 저장하므로 재시작 후 이어서 진행하며, 완료 후에는
+    다시 실행되지 않습니다.
+    """
+    if not isinstance(get_storage(), LocalStorage):
+        # 로컬 디스크 저장소에서만 의미가 있는 작업
+        return
+    db = SessionLocal()
+    try:
+        state = load_checkpoint(db, MIGRATION_CHECKPOINT_NAME)
+        if state.get("done"):
+            return
+        logger.info("Starting upload layout migration...")
+        cursor = state.get("cursor", 0)
+        while True:
+            last_id = await asyncio.to_thread(migrate_batch, db, cursor)
+            if last_id == cursor:
+                break
+            cursor = last_id
+            save_checkpoint(db, MIGRATION_CHECKPOINT_NAME, {"cursor": cursor})
+            db.commit()
+            await asyncio.sleep(MIGRATION_BATCH_PAUSE_SECONDS)
+
+        save_checkpoint(db, MIGRATION_CHECKPOINT_NAME, {"cursor": cursor, "done": True})
+        db.commit()
+        logger.info("Upload layout migration finished")
+    except Exception as e:
+        logger.error(f"Error in upload layout migration: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    MIGRATION_BATCH_PAUSE_SECONDS = 0
+    asyncio.run(run_layout_migration())
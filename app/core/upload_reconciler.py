@@ -0,0 +1,223 @@
+import os
+import time
+import shutil
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from itertools import islice
+from typing import Iterator, List
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.checkpoints import load_checkpoint, save_checkpoint
+from app.core.storage import LocalStorage, get_storage, temp_file_origin
+from app.core.previews import PREVIEW_MARKER, is_preview_file
+from app.core.upload_layout import UPLOAD_DIR, UPLOAD_URL_PREFIX
+from app.models.models import Attachment
+
+logger = logging.getLogger(__name__)
+
+# 고아 파일 격리 위치 (정적 파일로 서빙되지 않는 곳)
+QUARANTINE_DIR = Path("./quarantine/uploads")
+
+CHECKPOINT_NAME = "upload_reconciler"
+BATCH_SIZE = 200
+# 배치 사이 대기 시간 - 디스크/DB I/O가 실제 요청과 경쟁하지 않도록 천천히 진행
+BATCH_PAUSE_SECONDS = 1.0
+# 한 번의 순회가 끝난 뒤 다음 순회까지 대기 시간
+RUN_INTERVAL_SECONDS = 3600
+# 업로드 중인 파일을 고아로 오인하지 않도록 이 시간보다 오래된 파일만 격리
+ORPHAN_GRACE_SECONDS = 3600
+# 이 주기마다 전체 파일을 다시 검사 (그 사이에는 새로 생긴 파일/행만 검사)
+FULL_SCAN_INTERVAL = timedelta(days=7)
+
+
+def _walk_upload_files(after: str = "", since: float = 0.0, prefix: str = "") -> Iterator[str]:
+    """
+    업로드 디렉토리의 파일을 상대경로(posix) 문자열 순서로, after 보다 뒤의 것만 돌려줍니다.
+
+    디렉토리는 "이름/" 으로 파일과 함께 정렬해야 상대경로 문자열 비교와 같은 순서가 되어
+    after 에서 이어서 순회할 때 빠지는 파일이 없습니다. 하위 경로가 모두 after 이하인
+    디렉토리는 들어가지 않고, since 이후 바뀌지 않은 디렉토리(항목이 추가/삭제되지 않음)의
+    파일은 stat 없이 건너뜁니다.
+    """
+    directory = UPLOAD_DIR / prefix
+    try:
+        with os.scandir(directory) as it:
+            entries = [
+                (entry.name + "/" if entry.is_dir(follow_symlinks=False) else entry.name, entry)
+                for entry in it
+            ]
+        changed = since <= 0 or directory.stat().st_mtime >= since
+    except FileNotFoundError:
+        return
+    for name, entry in sorted(entries, key=lambda item: item[0]):
+        relative = prefix + name
+        if name.endswith("/"):
+            if relative > after or after.startswith(relative):
+                yield from _walk_upload_files(after, since, relative)
+        elif changed and relative > after and entry.is_file(follow_symlinks=False):
+            yield relative
+
+
+def _next_names(files: Iterator[str]) -> List[str]:
+    return list(islice(files, BATCH_SIZE))
+
+
+def _blob_name(relative: str) -> str:
+    """미리보기/임시 파일이면 원본 파일의 상대경로를 반환합니다."""
+    path = Path(relative)
+    origin = temp_file_origin(path.name)
+    if origin is not None:
+        path = path.with_name(origin)
+    if is_preview_file(path):
+        path = path.with_name(path.name.rsplit(PREVIEW_MARKER, 1)[0])
+    return path.as_posix()
+
+
+def _quarantine(relative: str):
+    source = UPLOAD_DIR / relative
+    target = QUARANTINE_DIR / datetime.now().strftime("%Y%m%d") / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(source), str(target))
+    logger.warning(f"Quarantined orphaned upload: {relative}")
+
+
+def reconcile_file_batch(db: Session, names: List[str], since: float) -> int:
+    """
+    파일 이름 배치를 DB와 비교해 참조되지 않는 파일을 격리합니다.
+
+    Returns:
+        int: 격리한 파일 수
+    """
+    now = time.time()
+    candidates = {}
+    for relative in names:
+        try:
+            mtime = (UPLOAD_DIR / relative).stat().st_mtime
+        except FileNotFoundError:
+            continue
+        # 증분 순회에서는 지난 순회 이후 생긴 파일만, 업로드 중인 파일은 제외
+        if mtime < since or now - mtime < ORPHAN_GRACE_SECONDS:
+            continue
+        candidates[relative] = UPLOAD_URL_PREFIX + _blob_name(relative)
+
+    if not candidates:
+        return 0
+
+    referenced = {
+        file_path for (file_path,) in db.query(Attachment.file_path).filter(
+            Attachment.file_path.in_(set(candidates.values()))
+        )
+    }
+    quarantined = 0
+    for relative, file_path in candidates.items():
+        if file_path not in referenced:
+            try:
+                _quarantine(relative)
+                quarantined += 1
+            except OSError as e:
+                logger.error(f"Failed to quarantine {relative}: {str(e)}")
+    return quarantined
+
+
+def reconcile_row_batch(db: Session, after_id: int) -> int:
+    """
+    첨부파일 행 배치를 검사해 파일이 없는 행을 표시합니다 (file_missing_at).
+
+    Returns:
+        int: 이번 배치의 마지막 id (더 이상 행이 없으면 after_id)
+    """
+    rows = db.query(Attachment).filter(
+        Attachment.id > after_id
+    ).order_by(Attachment.id).limit(BATCH_SIZE).all()
+
+    now = datetime.now()
+    for attachment in rows:
+        exists = bool(attachment.file_path) and Path("." + attachment.file_path).exists()
+        if not exists and attachment.file_missing_at is None:
+            attachment.file_missing_at = now
+            logger.warning(f"Attachment {attachment.id} points to a missing file: {attachment.file_path}")
+        elif exists and attachment.file_missing_at is not None:
+            attachment.file_missing_at = None
+    return rows[-1].id if rows else after_id
+
+
+async def run_reconcile_pass():
+    """
+    업로드 디렉토리와 attachments 테이블을 한 번 대조합니다.
+
+    배치마다 체크포인트를 저장하므로 중간에 재시작되어도 이어서 진행합니다.
+    """
+    if not isinstance(get_storage(), LocalStorage):
+        # 로컬 디스크 저장소에서만 의미가 있는 작업
+        return
+    db = SessionLocal()
+    try:
+        state = load_checkpoint(db, CHECKPOINT_NAME)
+        now = datetime.now()
+        last_full = state.get("last_full_scan_at")
+        full_scan = not last_full or now - datetime.fromisoformat(last_full) >= FULL_SCAN_INTERVAL
+        if "pass_started_at" not in state:
+            state.update({
+                "pass_started_at": now.isoformat(),
+                "full_scan": full_scan,
+                "file_cursor": "",
+                "row_cursor": 0 if full_scan else state.get("row_cursor", 0),
+            })
+        since = 0.0 if state["full_scan"] else state.get("files_since", 0.0)
+
+        # 1. 디스크 -> DB: 참조되지 않는 파일 격리 (디렉토리 순회도 이벤트 루프 밖에서)
+        files = _walk_upload_files(state["file_cursor"], since)
+        quarantined = 0
+        while True:
+            names = await asyncio.to_thread(_next_names, files)
+            if not names:
+                break
+            quarantined += await asyncio.to_thread(reconcile_file_batch, db, names, since)
+            state["file_cursor"] = names[-1]
+            save_checkpoint(db, CHECKPOINT_NAME, state)
+            db.commit()
+            await asyncio.sleep(BATCH_PAUSE_SECONDS)
+
+        # 2. DB -> 디스크: 파일이 없는 행 표시
+        while True:
+            last_id = await asyncio.to_thread(reconcile_row_batch, db, state["row_cursor"])
+            if last_id == state["row_cursor"]:
+                break
+            state["row_cursor"] = last_id
+            save_checkpoint(db, CHECKPOINT_NAME, state)
+            db.commit()
+            await asyncio.sleep(BATCH_PAUSE_SECONDS)
+
+        # 순회 완료: 다음 순회는 이번 순회 시작 이후 생긴 항목만 검사
+        started_at = datetime.fromisoformat(state.pop("pass_started_at"))
+        state["files_since"] = started_at.timestamp() - ORPHAN_GRACE_SECONDS
+        if state.pop("full_scan"):
+            state["last_full_scan_at"] = started_at.isoformat()
+        state.pop("file_cursor", None)
+        save_checkpoint(db, CHECKPOINT_NAME, state)
+        db.commit()
+        logger.info(f"Upload reconcile pass finished (quarantined: {quarantined})")
+    except Exception as e:
+        logger.error(f"Error in upload reconciler: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def start_upload_reconciler():
+    """고아 파일 정리 작업을 시작합니다."""
+    logger.info("Starting upload reconciler...")
+    while True:
+        await run_reconcile_pass()
+        await asyncio.sleep(RUN_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    BATCH_PAUSE_SECONDS = 0
+    asyncio.run(run_reconcile_pass())
@@ -0,0 +1,133 @@
+import io
+import os
+import time
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional, Set, Union
+
+# 소스 파일을 읽을 때 사용하는 청크 크기
+CHUNK_SIZE = 64 * 1024
+
+# 이미 압축된 포맷은 다시 deflate 해도 용량이 줄지 않으므로 그대로 저장
+STORED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif",
+    ".mp3", ".m4a", ".aac", ".ogg", ".flac",
+    ".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm",
+    ".zip", ".7z", ".rar", ".gz", ".tgz", ".bz2", ".xz", ".zst",
+    ".docx", ".xlsx", ".pptx", ".hwpx", ".odt", ".ods", ".odp",
+}
+STORED_MIME_PREFIXES = ("image/jpeg", "image/png", "image/gif", "image/webp", "video/", "audio/")
+
+
+class ZipMember(NamedTuple):
+    """
+    ZIP에 담을 파일 하나 (아카이브 내 이름, 원본 경로 또는 저장소 키, MIME 타입)
+
+    modified/size 를 생략하면 source 를 로컬 경로로 보고 stat 으로 채웁니다.
+    """
+    arcname: str
+    source: Union[Path, str]
+    mime_type: str = ""
+    modified: Optional[float] = None
+    size: Optional[int] = None
+
+
+class _StreamBuffer(io.RawIOBase):
+    """ZipFile이 써넣은 바이트를 모아두었다가 꺼내갈 수 있는 비탐색(non-seekable) 버퍼"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def is_precompressed(filename: str, mime_type: str = "") -> bool:
+    """이미 압축된 미디어/아카이브인지 확인합니다."""
+    if Path(filename).suffix.lower() in STORED_EXTENSIONS:
+        return True
+    return bool(mime_type) and mime_type.lower().startswith(STORED_MIME_PREFIXES)
+
+
+def unique_archive_name(filename: str, used_names: Set[str]) -> str:
+    """아카이브 안에서 중복되지 않는 이름을 반환하고 used_names에 등록합니다."""
+    archive_name = filename
+    counter = 1
+    stem, ext = Path(filename).stem, Path(filename).suffix
+    while archive_name in used_names:
+        archive_name = f"{stem}_{counter}{ext}"
+        counter += 1
+    used_names.add(archive_name)
+    return archive_name
+
+
+def _open_path(source) -> BinaryIO:
+    return open(source, "rb")
+
+
+def _zip_info(member: ZipMember) -> zipfile.ZipInfo:
+    modified, size = member.modified, member.size
+    if modified is None or size is None:
+        stat_result = os.stat(member.source)
+        modified, size = stat_result.st_mtime, stat_result.st_size
+    # ZIP 날짜 형식은 1980년 이후만 표현 가능
+    date_time = time.localtime(max(modified, 315532800))[:6]
+    zinfo = zipfile.ZipInfo(member.arcname, date_time=date_time)
+    zinfo.external_attr = 0o644 << 16
+    # DB 에서 온 크기는 비어 있거나 틀릴 수 있음 (실제 크기는 쓰면서 셈)
+    zinfo.file_size = size
+    if is_precompressed(member.arcname, member.mime_type):
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+    return zinfo
+
+
+def iter_zip(
+    members: Iterable[ZipMember],
+    opener: Callable[[Union[Path, str]], BinaryIO] = _open_path,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    파일들을 청크 단위로 읽으면서 ZIP 바이트를 바로 생성합니다.
+
+    임시 파일 없이 스트리밍되며, 각 항목 뒤에 data descriptor가 붙는 형태로 기록됩니다.
+    이미 압축된 파일은 ZIP_STORED, 나머지는 ZIP_DEFLATED로 저장합니다.
+    opener 로 원본을 여는 방법 (로컬 파일, 저장소 스트림)을 바꿀 수 있습니다.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for member in members:
+            try:
+                zinfo = _zip_info(member)
+                src = opener(member.source)
+            except FileNotFoundError:
+                # 그 사이 삭제된 파일은 건너뜀 (헤더를 쓰기 전이므로 아카이브는 온전함)
+                continue
+            # zip64 여부는 헤더를 쓸 때 정해지므로, 크기를 믿지 않고 켜 두어야 4GiB 넘는 파일도 중간에 실패하지 않음
+            with src, zipf.open(zinfo, "w", force_zip64=True) as dest:
+                while True:
+                    chunk = src.read(chunk_size)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    # 중앙 디렉터리(central directory)
+    data = buffer.drain()
+    if data:
+        yield data
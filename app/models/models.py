@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Enum
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, BigInteger, String, DateTime, Text, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship, backref
 from datetime import datetime
 import enum
@@ -43,8 +43,13 @@ class Schedule(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     project_name = Column(String, nullable=True)
     parent_id = Column(Integer, ForeignKey("schedules.id"), nullable=True)
-    parent_order = Column(Integer, nullable=True)
+    parent_order = Column(Integer, nullable=True)  # 화면에 표시하는 후속작업 번호
+    order_key = Column(String, nullable=True)  # 형제 사이 정렬 키 (사전순, schedule_order.key_between)
     is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(DateTime, nullable=True)
+    deleted_batch = Column(String, nullable=True)  # 함께 삭제된 하위 트리/알람/공유를 묶는 값 (복원 단위)
+    rrule = Column(String, nullable=True)  # 반복 규칙 (RRULE 부분집합, app.core.recurrence). date 가 첫 회차
+    recurrence_end = Column(DateTime, nullable=True)  # 마지막 회차 시작 시각 (끝이 없으면 NULL)
     
     owner = relationship("User", back_populates="schedules", foreign_keys=[owner_id])
     memo_author = relationship("User", foreign_keys=[memo_author_id])
@@ -52,6 +57,67 @@ class Schedule(Base):
     attachments = relationship("Attachment", back_populates="schedule")
     parent = relationship("Schedule", remote_side=[id], backref=backref("children", lazy="select"))
 
+    # 자식 조회(재귀 CTE)와 형제 순서/마지막 키 조회
+    __table_args__ = (
+        Index("ix_schedules_parent_order_key", "parent_id", "order_key"),
+        Index("ix_schedules_deleted_batch", "deleted_batch", sqlite_where=deleted_batch.isnot(None)),
+        Index("ix_schedules_recurring", "date", "recurrence_end", sqlite_where=rrule.isnot(None)),
+        # 달력 창 조회: 창 안에서 시작하는 일정과 창 전에 시작해서 이어지는 일정
+        Index("ix_schedules_date", "date"),
+        Index("ix_schedules_due_time", "due_time"),
+        # 검색식 owner:/project: 조건 (목록은 마감시간 순)
+        Index("ix_schedules_owner_due", "owner_id", "due_time"),
+        Index("ix_schedules_project_due", "project_name", "due_time"),
+    )
+
+class ScheduleDailyStat(Base):
+    """날짜/소유자/공개 여부/우선순위/프로젝트별 일정 수 (schedules 테이블 트리거로 유지, 통계 조회용 롤업)"""
+    __tablename__ = "schedule_daily_stats"
+
+    day = Column(String, primary_key=True)  # YYYY-MM-DD (일정 date 의 날짜)
+    owner_id = Column(Integer, primary_key=True)
+    individual = Column(Boolean, primary_key=True)
+    priority = Column(String, primary_key=True)  # PriorityLevel 이름, 없으면 ""
+    project_name = Column(String, primary_key=True)  # 없으면 ""
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+
+class ScheduleOccurrenceOverride(Base):
+    """반복 일정 한 회차의 예외 (취소 또는 바뀐 값). 회차는 원래 시작 시각으로 구분"""
+    __tablename__ = "schedule_occurrence_overrides"
+
+    id = Column(Integer, primary_key=True)
+    schedule_id = Column(Integer, ForeignKey("schedules.id"), nullable=False)
+    occurrence_date = Column(DateTime, nullable=False)
+    is_cancelled = Column(Boolean, default=False)
+    # None 이면 원본 일정 값을 따름
+    title = Column(String, nullable=True)
+    content = Column(Text, nullable=True)
+    date = Column(DateTime, nullable=True)
+    due_time = Column(DateTime, nullable=True)
+    alarm_time = Column(DateTime, nullable=True)
+    priority = Column(Enum(PriorityLevel), nullable=True)
+    is_completed = Column(Boolean, nullable=True)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        UniqueConstraint("schedule_id", "occurrence_date", name="uq_occurrence_override"),
+        Index("ix_occurrence_overrides_moved", "schedule_id", "date"),
+    )
+
+class ScheduleClosure(Base):
+    """일정 계층의 closure table: 모든 (조상, 자손) 쌍과 거리. 자기 자신도 depth 0 으로 포함 (트리거로 유지)"""
+    __tablename__ = "schedule_closure"
+
+    ancestor_id = Column(Integer, primary_key=True)
+    descendant_id = Column(Integer, primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    # 조상 조회(브레드크럼)는 descendant_id 로 시작하는 인덱스 사용
+    __table_args__ = (
+        Index("ix_schedule_closure_descendant", "descendant_id", "depth"),
+    )
+
 class ScheduleShare(Base):
     __tablename__ = "schedule_shares"
 
@@ -60,6 +126,8 @@ class ScheduleShare(Base):
     shared_with_id = Column(Integer, ForeignKey("users.id"))
     memo = Column(Text)
     created_at = Column(DateTime, default=datetime.now)
+    is_deleted = Column(Boolean, default=False)
+    deleted_batch = Column(String, nullable=True)
     
     schedule = relationship("Schedule", back_populates="shares")
     shared_with = relationship("User", back_populates="shared_schedules")
@@ -72,18 +140,56 @@ class Attachment(Base):
     file_path = Column(String)
     file_size = Column(Integer)
     mime_type = Column(String)
-    schedule_id = Column(Integer, ForeignKey("schedules.id"))
+    schedule_id = Column(Integer, ForeignKey("schedules.id"), index=True)
     uploader_id = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=datetime.now)
+    created_at = Column(DateTime, default=datetime.now, index=True)
+    file_missing_at = Column(DateTime, nullable=True)  # 파일이 디스크에서 사라진 것을 발견한 시각
+
+    __table_args__ = (
+        Index("ix_attachments_uploader_created", "uploader_id", "created_at"),
+    )
 
     schedule = relationship("Schedule", back_populates="attachments")
     uploader = relationship("User", backref="uploads")
 
+class StorageUsage(Base):
+    """사용자/일정별 첨부파일 사용량 (업로드/삭제 시 트랜잭션 안에서 갱신)"""
+    __tablename__ = "storage_usage"
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String, nullable=False)  # "user" | "schedule"
+    owner_id = Column(Integer, nullable=False)
+    bytes_used = Column(BigInteger, default=0, nullable=False)
+    file_count = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        UniqueConstraint("scope", "owner_id", name="uq_storage_usage_scope_owner"),
+    )
+
+class MaintenanceCheckpoint(Base):
+    """백그라운드 작업의 진행 상태 (재시작 시 이어서 처리하기 위한 체크포인트)"""
+    __tablename__ = "maintenance_checkpoints"
+
+    name = Column(String, primary_key=True)
+    value = Column(Text)  # JSON
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+class LeaderLease(Base):
+    """여러 워커 중 백그라운드 작업을 실행할 리더의 임대 (만료 전에 갱신하지 않으면 다른 워커가 인수)"""
+    __tablename__ = "leader_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    acquired_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
 class AlarmType(enum.Enum):
     SCHEDULE_DUE = "schedule_due"
     MEMO = "memo"
     SHARE = "share"
     COMPLETION_REQUEST = "completion_request"
+    DIGEST = "digest"
 
 class Alarm(Base):
     __tablename__ = "alarms"
@@ -99,10 +205,131 @@ class Alarm(Base):
     created_at = Column(DateTime, default=datetime.now)
     activated_at = Column(DateTime, nullable=True)
     acked_at = Column(DateTime, nullable=True)
+    # 같은 (사용자, 일정, 종류) 알람이 짧은 시간에 반복되면 한 행으로 합치고 횟수/마지막 행위자만 갱신
+    coalesced_count = Column(Integer, default=1)
+    last_actor_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    deleted_batch = Column(String, nullable=True)  # 일정 삭제와 함께 지워진 경우 (복원 시 되살림)
 
-    user = relationship("User", backref="alarms")
+    user = relationship("User", backref="alarms", foreign_keys=[user_id])
     schedule = relationship("Schedule", backref="alarms")
 
+    # 알람 목록/피드: 사용자별 삭제되지 않은 알람을 최신순으로 인덱스만으로 조회
+    __table_args__ = (
+        Index("ix_alarms_user_feed", user_id, is_deleted, created_at.desc()),
+        Index("ix_alarms_schedule_type", schedule_id, type),
+        Index("ix_alarms_deleted_batch", deleted_batch, sqlite_where=deleted_batch.isnot(None)),
+    )
+
+class AlarmArchive(Base):
+    """
+    보존 기간이 지난 확인/삭제된 알람 (alarms 테이블에서 옮겨 옴).
+
+    alarms.id 는 AUTOINCREMENT 가 아니라 가장 큰 id 가 옮겨지면 다시 쓰이므로
+    보관 행은 자체 id 를 쓰고 원래 알람 id 는 original_id 에 남깁니다 (중복될 수 있음).
+    """
+    __tablename__ = "alarms_archive"
+
+    id = Column(Integer, primary_key=True)
+    original_id = Column(Integer, index=True)
+    user_id = Column(Integer, index=True)
+    schedule_id = Column(Integer)
+    type = Column(Enum(AlarmType))
+    message = Column(Text)
+    is_activated = Column(Boolean, default=False)
+    is_acked = Column(Boolean, default=False)
+    is_deleted = Column(Boolean, default=False)
+    created_at = Column(DateTime)
+    activated_at = Column(DateTime, nullable=True)
+    acked_at = Column(DateTime, nullable=True)
+    coalesced_count = Column(Integer, default=1)
+    last_actor_id = Column(Integer, nullable=True)
+    archived_at = Column(DateTime, default=datetime.now)
+
+class AlarmDigestItem(Base):
+    """요약 알람으로 묶어 보낼 대기 중인 저우선순위 알림"""
+    __tablename__ = "alarm_digest_items"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    schedule_id = Column(Integer, ForeignKey("schedules.id"), nullable=True)
+    type = Column(Enum(AlarmType))
+    message = Column(Text)
+    actor_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+
+class AlarmOutbox(Base):
+    """요청 트랜잭션에서 기록하고 디스패처가 나중에 전달하는 알람 이벤트 (transactional outbox)"""
+    __tablename__ = "alarm_outbox"
+
+    id = Column(Integer, primary_key=True)
+    idempotency_key = Column(String, unique=True, nullable=False)
+    schedule_id = Column(Integer, ForeignKey("schedules.id"), nullable=True)
+    type = Column(Enum(AlarmType))
+    message = Column(Text)
+    recipient_ids = Column(Text, nullable=True)  # JSON 배열, NULL 이면 전체 사용자
+    exclude_user_id = Column(Integer, nullable=True)  # 전체 사용자 대상일 때 제외할 사용자
+    actor_id = Column(Integer, nullable=True)
+    activated = Column(Boolean, default=False)  # 만들 알람을 바로 활성화 상태로
+    status = Column(String, default="pending", nullable=False)  # pending / delivered / failed
+    delivered_channels = Column(Text, default="[]")  # JSON 배열, 전달을 마친 채널 이름
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.now)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    delivered_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_alarm_outbox_pending", "status", "next_attempt_at"),
+    )
+
+class ScheduleSearchQueue(Base):
+    """검색 색인을 다시 만들어야 하는 일정 (schedules/attachments 트리거가 쌓고, 검색 전에 비움)"""
+    __tablename__ = "schedule_search_queue"
+
+    schedule_id = Column(Integer, primary_key=True)
+
+class ScheduleChange(Base):
+    """
+    일정 변경 피드 (schedules/attachments 트리거가 바뀐 일정 id 를 seq 순으로 쌓음).
+
+    저장된 검색의 캐시가 마지막으로 본 seq 이후의 변경만 확인하는 데 씀. 저장된 검색이 있을 때만 쌓임
+    """
+    __tablename__ = "schedule_changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # 오래된 변경을 지워도 seq 를 다시 쓰지 않음
+
+    seq = Column(Integer, primary_key=True)
+    schedule_id = Column(Integer, nullable=False)
+
+class SavedSearch(Base):
+    """사용자별 저장된 검색 (검색식과 목록 조건). 결과 id 목록을 캐시함 (app.core.saved_search)"""
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String, nullable=False)
+    query = Column(Text, nullable=False)  # 검색식 (app.core.schedule_dsl)
+    show_completed = Column(Boolean, default=True)
+    show_all_users = Column(Boolean, default=True)
+    completed_only = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    # 결과 캐시: 정렬된 일정 id (JSON), 계산할 때 본 변경 피드 seq, 시간이 지나면 바뀌는 검색식의 만료 시각
+    cached_ids = Column(Text, nullable=True)
+    cached_version = Column(Integer, nullable=True)
+    cached_at = Column(DateTime, nullable=True)
+    cached_until = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("owner_id", "name", name="uq_saved_search_name"),
+    )
+
+class AlarmUnreadCount(Base):
+    """사용자별 미확인 알람 수 (alarms 테이블 트리거로 유지)"""
+    __tablename__ = "alarm_unread_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+
 class QuickMemo(Base):
     __tablename__ = "quickmemos"
     
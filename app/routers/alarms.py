@@ -1,15 +1,33 @@
+import base64
 from datetime import datetime
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.models.models import Alarm, Schedule
+from app.models.models import Alarm, AlarmType, AlarmUnreadCount, Schedule
 from app.schemas.schemas import Alarm as AlarmSchema, AlarmCreate
 from app.routers.auth import get_current_active_user
 from app.models.models import User
 
 router = APIRouter()
 
+# 피드 한 페이지 기본/최대 크기
+FEED_PAGE_SIZE = 50
+MAX_FEED_PAGE_SIZE = 200
+
+def serialize_alarm(alarm: Alarm) -> dict:
+    return {
+        "id": alarm.id,
+        "type": alarm.type.value,
+        "message": alarm.message,
+        "is_acked": alarm.is_acked,
+        "created_at": alarm.created_at.isoformat(),
+        "schedule_id": alarm.schedule_id,
+        "count": alarm.coalesced_count or 1,
+        "last_actor_id": alarm.last_actor_id
+    }
+
 @router.get("/", response_model=List[AlarmSchema])
 def get_alarms(
     skip: int = 0,
@@ -26,6 +44,68 @@ def get_alarms(
     ).offset(skip).limit(limit).all()
     return alarms
 
+@router.get("/unread-count")
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """미확인 알람 수를 반환합니다 (카운터 한 행 조회)."""
+    counter = db.get(AlarmUnreadCount, current_user.id)
+    return {"unread_count": counter.unread_count if counter else 0}
+
+def _encode_feed_cursor(alarm: Alarm) -> str:
+    """다음 페이지 조회용 커서 (created_at, id). created_at 이 없는 예전 행은 빈 값"""
+    created_at = alarm.created_at.isoformat() if alarm.created_at else ""
+    return base64.urlsafe_b64encode(f"{created_at}|{alarm.id}".encode()).decode()
+
+def _decode_feed_cursor(cursor: str):
+    try:
+        created_at, alarm_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at) if created_at else None, int(alarm_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/feed")
+def get_alarm_feed(
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (이 알람보다 이전 알람부터 조회)"),
+    type: Optional[List[AlarmType]] = Query(None, description="알람 종류 필터 (여러 개 가능)"),
+    limit: int = Query(FEED_PAGE_SIZE, ge=1, le=MAX_FEED_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    알람을 최신순으로 한 페이지씩 반환합니다.
+
+    (created_at, id) 기준 keyset 페이지네이션이므로 페이지가 깊어져도 비용이 같고,
+    (user_id, is_deleted, created_at DESC) 인덱스 범위만 읽습니다.
+    응답의 next_cursor 를 다음 요청의 cursor 로 넘기면 됩니다. 커서에 (created_at, id) 값이 들어 있으므로
+    그 알람이 보관(삭제)되거나 묶이면서 created_at 이 바뀌어도 페이지가 겹치거나 빠지지 않습니다.
+    """
+    query = db.query(Alarm).filter(
+        Alarm.user_id == current_user.id,
+        Alarm.is_deleted == False
+    )
+    if type:
+        query = query.filter(Alarm.type.in_(type))
+    if cursor:
+        cursor_created_at, cursor_id = _decode_feed_cursor(cursor)
+        if cursor_created_at is None:
+            query = query.filter(Alarm.created_at.is_(None), Alarm.id < cursor_id)
+        else:
+            query = query.filter(or_(
+                Alarm.created_at < cursor_created_at,
+                and_(Alarm.created_at == cursor_created_at, Alarm.id < cursor_id),
+                Alarm.created_at.is_(None)
+            ))
+
+    alarms = query.order_by(Alarm.created_at.desc(), Alarm.id.desc()).limit(limit + 1).all()
+    has_more = len(alarms) > limit
+    alarms = alarms[:limit]
+    return {
+        "items": [serialize_alarm(alarm) for alarm in alarms],
+        "next_cursor": _encode_feed_cursor(alarms[-1]) if has_more else None
+    }
+
 @router.post("/ack_alarms/{alarm_id}/ack")
 def acknowledge_alarm(
     alarm_id: int,
@@ -1,24 +1,46 @@
-import os
-import shutil
-import zipfile
-import tempfile
+import base64
+import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+from sqlalchemy import and_, or_, func, select, table, column
 from sqlalchemy.orm import Session, joinedload
+from app.core import migrate_db
 from app.core.database import get_db
-from app.models.models import Attachment, Schedule, User, ScheduleShare
+from app.models.models import Attachment, Schedule, User
 from app.schemas.schemas import Attachment as AttachmentSchema
-from app.core.auth import get_current_active_user
-from pathlib import Path
+from app.core.auth import get_current_active_user, get_current_user_from_request
+from app.core.attachment_access import (
+    IN_CHUNK_SIZE, can_read_clause, readable_attachments, modifiable_attachments
+)
+from app.core.storage_quota import (
+    SCOPE_USER, SCOPE_SCHEDULE, QuotaExceeded, get_usage, remaining_bytes,
+    ensure_within_limit, body_limit, limited_stream, add_usage, subtract_usage
+)
+from app.core.schedule_access import can_view_clause
+from app.core.range_response import RangeFileResponse, RangeStreamResponse
+from app.core.storage import StorageBackend, get_storage, measure
+from app.core.zipstream import ZipMember, iter_zip, unique_archive_name
+from app.core.upload_layout import new_object_key, storage_key
+from app.core.previews import (
+    DEFAULT_PREVIEW_SIZE, PREVIEW_MEDIA_TYPE, can_preview, normalize_size,
+    get_or_create_preview, schedule_previews, preview_keys
+)
 from pydantic import BaseModel
 import datetime
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-# 업로드 디렉토리 생성
-UPLOAD_DIR = Path("./static/uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+# 목록/검색 한 페이지 최대 크기
+MAX_PAGE_SIZE = 1000
+
+# 미리보기 캐시 유지 시간 (초)
+PREVIEW_CACHE_MAX_AGE = 7 * 24 * 3600
 
 # 파일 이름 변경을 위한 스키마
 class FileRenameRequest(BaseModel):
@@ -28,20 +50,88 @@ class FileRenameRequest(BaseModel):
 class MultiFileRequest(BaseModel):
     file_ids: List[int]
 
-@router.get("/", response_model=List[AttachmentSchema])
-async def get_all_attachments(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+def _object_response(
+    storage: StorageBackend,
+    key: str,
+    request: Request,
+    media_type: Optional[str],
+    filename: Optional[str] = None,
+    as_attachment: bool = False,
+    headers: Optional[dict] = None
 ):
-    """모든 첨부파일을 조회합니다."""
-    # 사용자가 볼 수 있는 첨부파일만 반환 (공개 일정 + 본인 일정 + 공유받은 일정)
-    attachments = db.query(Attachment).options(
-        joinedload(Attachment.uploader),
-        joinedload(Attachment.schedule)
-    ).join(Schedule).filter(
-        # 개인일정이 아니거나 본인이 작성한 일정
-        (Schedule.individual == False) | (Schedule.owner_id == current_user.id)
-    ).all()
+    """
+    저장소 객체를 Range 지원 응답으로 반환합니다.
+
+    로컬 파일은 경로로 직접 전송하고 (zero-copy 가능), 원격 저장소는 스트림으로 전송합니다.
+    """
+    path = storage.local_path(key)
+    if path is not None:
+        return RangeFileResponse(
+            str(path), request, media_type=media_type, filename=filename,
+            as_attachment=as_attachment, headers=headers
+        )
+    stored = storage.stat(key)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return RangeStreamResponse(
+        lambda start, end: storage.iter_range(key, start, end),
+        request, stored.size, stored.etag, stored.modified,
+        media_type=media_type, filename=filename, as_attachment=as_attachment, headers=headers
+    )
+
+def _delete_objects(storage: StorageBackend, attachments: List[Attachment]):
+    """첨부파일 원본과 미리보기 캐시를 저장소에서 삭제합니다 (실패해도 DB 삭제는 진행)."""
+    keys = []
+    for attachment in attachments:
+        key = storage_key(attachment.file_path)
+        keys.append(key)
+        keys.extend(preview_keys(key))
+    try:
+        storage.delete_many(keys)
+    except Exception as e:
+        logger.error(f"Failed to delete attachment objects: {str(e)}")
+
+def _encode_cursor(attachment: Attachment) -> str:
+    """다음 페이지 조회용 커서 (created_at, id). created_at 이 없는 예전 행은 빈 값"""
+    created_at = attachment.created_at.isoformat() if attachment.created_at else ""
+    raw = f"{created_at}|{attachment.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, attachment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.datetime.fromisoformat(created_at) if created_at else None, int(attachment_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _fetch_page(query, response: Response, cursor: Optional[str], limit: Optional[int]):
+    """
+    (created_at DESC, id DESC) 순서의 keyset 페이지네이션을 적용합니다.
+    
+    다음 페이지가 있으면 X-Next-Cursor 헤더에 커서를 담습니다.
+    limit이 없으면 기존처럼 전체를 반환합니다.
+    SQLite 는 내림차순에서 NULL 을 맨 뒤에 두므로 created_at 이 없는 예전 행은
+    마지막 페이지들에 id 순으로 옵니다.
+    """
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        if cursor_created_at is None:
+            query = query.filter(Attachment.created_at.is_(None), Attachment.id < cursor_id)
+        else:
+            query = query.filter(or_(
+                Attachment.created_at < cursor_created_at,
+                and_(Attachment.created_at == cursor_created_at, Attachment.id < cursor_id),
+                Attachment.created_at.is_(None)
+            ))
+    
+    query = query.order_by(Attachment.created_at.desc(), Attachment.id.desc())
+    if not limit:
+        attachments = query.all()
+    else:
+        attachments = query.limit(limit + 1).all()
+        if len(attachments) > limit:
+            attachments = attachments[:limit]
+            response.headers["X-Next-Cursor"] = _encode_cursor(attachments[-1])
     
     # schedule_title과 project_name을 첨부파일 객체에 추가
     for attachment in attachments:
@@ -51,25 +141,38 @@ async def get_all_attachments(
     
     return attachments
 
-@router.get("/search", response_model=List[AttachmentSchema])
-async def search_attachments(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    start_date: Optional[str] = Query(None),
-    end_date: Optional[str] = Query(None),
-    filename_pattern: Optional[str] = Query(None),
-    uploader_id: Optional[int] = Query(None),
-    project_name: Optional[str] = Query(None),
-    schedule_title: Optional[str] = Query(None)
-):
-    """필터를 이용하여 첨부파일을 검색합니다."""
+def _filename_condition(filename_pattern: str):
+    """파일명 패턴 조건. trigram 인덱스가 있으면 인덱스로 후보를 찾는다."""
+    if '*' in filename_pattern:
+        # 와일드카드 패턴 지원
+        pattern = filename_pattern.replace('*', '%')
+    else:
+        # 부분 매칭
+        pattern = f'%{filename_pattern}%'
     
-    query = db.query(Attachment).options(
-        joinedload(Attachment.uploader),
-        joinedload(Attachment.schedule)
-    ).join(Schedule).filter(
+    # trigram 인덱스는 와일드카드 없이 연속된 3글자 이상이 있어야 사용 가능
+    longest_literal = max((len(part) for part in filename_pattern.split('*')), default=0)
+    if migrate_db.attachment_fts_enabled and longest_literal >= 3:
+        fts = table(migrate_db.ATTACHMENT_FTS_TABLE, column("rowid"), column("filename"))
+        return Attachment.id.in_(
+            select(fts.c.rowid).where(fts.c.filename.like(pattern))
+        )
+    return Attachment.filename.ilike(pattern)
+
+def _search_query(
+    db: Session,
+    current_user: User,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    filename_pattern: Optional[str],
+    uploader_id: Optional[int],
+    project_name: Optional[str],
+    schedule_title: Optional[str]
+):
+    """검색 조건이 적용된 첨부파일 쿼리 (정렬/페이지네이션 제외)"""
+    query = db.query(Attachment).join(Schedule).filter(
         # 개인일정이 아니거나 본인이 작성한 일정
-        (Schedule.individual == False) | (Schedule.owner_id == current_user.id)
+        can_read_clause(current_user)
     )
     
     # 날짜 필터
@@ -90,13 +193,7 @@ async def search_attachments(
     
     # 파일명 패턴 필터
     if filename_pattern:
-        if '*' in filename_pattern:
-            # 와일드카드 패턴 지원
-            pattern = filename_pattern.replace('*', '%')
-            query = query.filter(Attachment.filename.ilike(pattern))
-        else:
-            # 부분 매칭
-            query = query.filter(Attachment.filename.ilike(f'%{filename_pattern}%'))
+        query = query.filter(_filename_condition(filename_pattern))
     
     # 업로더 필터
     if uploader_id:
@@ -110,69 +207,211 @@ async def search_attachments(
     if schedule_title:
         query = query.filter(Schedule.title.ilike(f'%{schedule_title}%'))
     
-    # 생성일 기준 내림차순 정렬
-    attachments = query.order_by(Attachment.created_at.desc()).all()
+    return query
+
+@router.get("/", response_model=List[AttachmentSchema])
+async def get_all_attachments(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """모든 첨부파일을 조회합니다."""
+    # 사용자가 볼 수 있는 첨부파일만 반환 (공개 일정 + 본인 일정 + 공유받은 일정)
+    query = db.query(Attachment).options(
+        joinedload(Attachment.uploader),
+        joinedload(Attachment.schedule)
+    ).join(Schedule).filter(
+        # 개인일정이 아니거나 본인이 작성한 일정
+        can_read_clause(current_user)
+    )
     
-    # schedule_title과 project_name을 첨부파일 객체에 추가
-    for attachment in attachments:
-        if hasattr(attachment, 'schedule') and attachment.schedule:
-            attachment.schedule_title = attachment.schedule.title
-            attachment.project_name = attachment.schedule.project_name
+    return _fetch_page(query, response, cursor, limit)
+
+@router.get("/search", response_model=List[AttachmentSchema])
+async def search_attachments(
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    filename_pattern: Optional[str] = Query(None),
+    uploader_id: Optional[int] = Query(None),
+    project_name: Optional[str] = Query(None),
+    schedule_title: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)
+):
+    """
+    필터를 이용하여 첨부파일을 검색합니다.
     
-    return attachments
+    limit을 지정하면 생성일 내림차순으로 페이지 단위 조회하며,
+    다음 페이지 커서는 X-Next-Cursor 헤더로 반환합니다.
+    """
+    query = _search_query(
+        db, current_user, start_date, end_date, filename_pattern,
+        uploader_id, project_name, schedule_title
+    ).options(
+        joinedload(Attachment.uploader),
+        joinedload(Attachment.schedule)
+    )
+    
+    return _fetch_page(query, response, cursor, limit)
+
+@router.get("/search/count")
+async def count_attachments(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    filename_pattern: Optional[str] = Query(None),
+    uploader_id: Optional[int] = Query(None),
+    project_name: Optional[str] = Query(None),
+    schedule_title: Optional[str] = Query(None)
+):
+    """검색 조건에 맞는 첨부파일 총 개수를 반환합니다."""
+    query = _search_query(
+        db, current_user, start_date, end_date, filename_pattern,
+        uploader_id, project_name, schedule_title
+    )
+    total = query.with_entities(func.count(Attachment.id)).scalar()
+    return {"total": total}
+
+@router.get("/usage")
+async def get_storage_usage(
+    schedule_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """현재 사용자 (및 조회할 수 있는 일정)의 첨부파일 사용량과 제한을 반환합니다."""
+    result = {"user": get_usage(db, SCOPE_USER, current_user.id)}
+    if schedule_id is not None:
+        visible = db.query(Schedule.id).filter(
+            Schedule.id == schedule_id,
+            can_view_clause(current_user)
+        ).first()
+        if not visible:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        result["schedule"] = get_usage(db, SCOPE_SCHEDULE, schedule_id)
+    return result
+
+async def _receive_upload_files(request: Request, remaining: Optional[int]) -> List[UploadFile]:
+    """
+    multipart 본문에서 files 필드를 받습니다.
+    
+    남은 용량이 있으면 Content-Length 로 먼저 거르고, 받는 도중에도 크기를 세어
+    제한을 넘는 순간 중단합니다 (초과 업로드를 끝까지 받아 임시 파일에 쓰지 않음).
+    
+    Raises:
+        QuotaExceeded: 본문이 남은 용량을 넘는 경우
+    """
+    limit = body_limit(remaining)
+    content_length = request.headers.get("content-length", "")
+    if limit is not None and content_length.isdigit() and int(content_length) > limit:
+        raise QuotaExceeded("Storage quota exceeded")
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="multipart/form-data required")
+    
+    parser = MultiPartParser(request.headers, limited_stream(request.stream(), limit))
+    try:
+        form = await parser.parse()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+    files = [item for item in form.getlist("files") if isinstance(item, UploadFile)]
+    if not files:
+        await form.close()
+        raise HTTPException(status_code=422, detail="files is required")
+    return files
+
+# 본문을 직접 읽으므로 문서용 요청 스키마를 따로 지정
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"files": {"type": "array", "items": {"type": "string", "format": "binary"}}},
+                    "required": ["files"]
+                }
+            }
+        }
+    }
+}
 
-@router.post("/schedules/{schedule_id}/attachments")
+@router.post("/schedules/{schedule_id}/attachments", openapi_extra=UPLOAD_REQUEST_BODY)
 async def upload_files_to_schedule(
     schedule_id: int,
-    files: List[UploadFile] = File(...),
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    storage: StorageBackend = Depends(get_storage)
 ):
     # 일정 존재 여부 확인
     schedule = db.query(Schedule).filter(Schedule.id == schedule_id).first()
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     
+    # 남은 저장 용량 (제한이 없으면 None)
+    remaining = remaining_bytes(db, current_user.id, schedule_id)
+    
     # 업로드된 파일들 저장
     uploaded_files = []
-    for file in files:
-        # 파일명 안전화 및 중복 방지
-        safe_filename = f"{schedule_id}_{file.filename}"
-        file_path = UPLOAD_DIR / safe_filename
+    saved_keys = []
+    total_size = 0
+    files = []
+    try:
+        files = await _receive_upload_files(request, remaining)
+        for file in files:
+            # 해시 디렉토리 아래 고유한 이름으로 저장 (원본 파일명은 DB에만 보관)
+            key, file_path = new_object_key(file.filename)
+            
+            # 본문 크기에는 multipart 헤더가 섞여 있으므로 파일마다 정확한 크기로 다시 확인
+            file_size = measure(file.file)
+            ensure_within_limit(file_size, None if remaining is None else remaining - total_size)
+            await run_in_threadpool(storage.put, key, file.file, file.content_type)
+            saved_keys.append(key)
+            total_size += file_size
+            
+            # DB에 첨부파일 정보 저장
+            attachment = Attachment(
+                filename=file.filename,
+                file_path=file_path,
+                file_size=file_size,
+                mime_type=file.content_type,
+                schedule_id=schedule_id,
+                uploader_id=current_user.id,
+                created_at=datetime.datetime.now()
+            )
+            db.add(attachment)
+            uploaded_files.append(attachment)
         
-        # 중복 파일명 처리
-        counter = 1
-        original_path = file_path
-        while file_path.exists():
-            name, ext = original_path.stem, original_path.suffix
-            file_path = UPLOAD_DIR / f"{name}_{counter}{ext}"
-            counter += 1
-        
-        # 파일 저장
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # DB에 첨부파일 정보 저장
-        attachment = Attachment(
-            filename=file.filename,
-            file_path=f"/static/uploads/{file_path.name}",
-            file_size=file_path.stat().st_size,
-            mime_type=file.content_type,
-            schedule_id=schedule_id,
-            uploader_id=current_user.id,
-            created_at=datetime.datetime.now()
-        )
-        db.add(attachment)
-        uploaded_files.append(attachment)
+        # 사용량 카운터도 같은 트랜잭션에서 갱신
+        add_usage(db, current_user.id, schedule_id, total_size, len(uploaded_files))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        if saved_keys:
+            await run_in_threadpool(storage.delete_many, saved_keys)
+        if isinstance(e, QuotaExceeded):
+            raise HTTPException(status_code=413, detail="저장 용량 제한을 초과했습니다")
+        raise
+    finally:
+        for file in files:
+            await file.close()
     
-    db.commit()
+    # 썸네일/미리보기는 응답을 지연시키지 않도록 백그라운드에서 생성
+    for attachment in uploaded_files:
+        schedule_previews(storage, storage_key(attachment.file_path), attachment.filename, attachment.mime_type)
     return {"message": f"{len(uploaded_files)} files uploaded successfully", "files": uploaded_files}
 
 @router.delete("/{attachment_id}")
 async def delete_attachment(
     attachment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    storage: StorageBackend = Depends(get_storage)
 ):
     attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
     if not attachment:
@@ -186,17 +425,92 @@ async def delete_attachment(
     if attachment.uploader_id != current_user.id and schedule.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Permission denied")
     
-    # 파일 시스템에서 파일 삭제
-    file_path = Path("." + attachment.file_path)  # /uploads/filename -> ./uploads/filename
-    if file_path.exists():
-        file_path.unlink()
+    # 저장소에서 원본과 미리보기 삭제
+    await run_in_threadpool(_delete_objects, storage, [attachment])
     
     # DB에서 삭제
+    subtract_usage(db, [attachment])
     db.delete(attachment)
     db.commit()
     
     return {"message": "Attachment deleted successfully"}
 
+@router.api_route("/{attachment_id}/content", methods=["GET", "HEAD"])
+async def get_attachment_content(
+    attachment_id: int,
+    request: Request,
+    download: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_from_request),
+    storage: StorageBackend = Depends(get_storage)
+):
+    """
+    첨부파일 원본을 반환합니다.
+    
+    Range / If-Range 요청을 지원하여 동영상 탐색과 끊긴 다운로드 이어받기가 가능합니다.
+    오브젝트 스토리지는 권한 확인 후 미리 서명된 URL로 보내 앱 서버를 거치지 않게 합니다.
+    """
+    attachments = readable_attachments(db, [attachment_id], current_user)
+    if not attachments:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    attachment = attachments[0]
+    
+    key = storage_key(attachment.file_path)
+    presigned_url = storage.presigned_url(
+        key, filename=attachment.filename, as_attachment=download, content_type=attachment.mime_type
+    )
+    if presigned_url:
+        return RedirectResponse(presigned_url, status_code=307, headers={"Cache-Control": "private, no-store"})
+    
+    return await run_in_threadpool(
+        _object_response,
+        storage,
+        key,
+        request,
+        attachment.mime_type,
+        filename=attachment.filename,
+        as_attachment=download,
+        headers={"Cache-Control": "private, no-cache"}
+    )
+
+@router.get("/{attachment_id}/preview")
+async def get_attachment_preview(
+    attachment_id: int,
+    request: Request,
+    size: int = Query(DEFAULT_PREVIEW_SIZE, ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_from_request),
+    storage: StorageBackend = Depends(get_storage)
+):
+    """첨부파일의 축소 미리보기(이미지 썸네일, PDF 첫 페이지)를 반환합니다."""
+    attachments = readable_attachments(db, [attachment_id], current_user)
+    if not attachments:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    attachment = attachments[0]
+    
+    if not can_preview(attachment.filename, attachment.mime_type):
+        raise HTTPException(status_code=404, detail="Preview not available")
+    
+    # 캐시가 없으면 (업로드 직후이거나 이전에 올린 파일) 즉시 생성
+    preview = await run_in_threadpool(
+        get_or_create_preview, storage, storage_key(attachment.file_path),
+        attachment.filename, attachment.mime_type, normalize_size(size)
+    )
+    if preview is None:
+        raise HTTPException(status_code=404, detail="Preview not available")
+    
+    preview_key, stored = preview
+    headers = {
+        "Cache-Control": f"private, max-age={PREVIEW_CACHE_MAX_AGE}",
+        "ETag": stored.etag
+    }
+    if request.headers.get("if-none-match") == stored.etag:
+        return Response(status_code=304, headers=headers)
+    
+    return await run_in_threadpool(
+        _object_response, storage, preview_key, request, PREVIEW_MEDIA_TYPE, headers=headers
+    )
+
 @router.put("/{attachment_id}/rename")
 async def rename_attachment(
     attachment_id: int,
@@ -227,82 +541,68 @@ async def rename_attachment(
 async def download_multiple_files(
     request: MultiFileRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    storage: StorageBackend = Depends(get_storage)
 ):
     """선택된 여러 파일을 ZIP으로 압축하여 다운로드합니다."""
     
-    # 파일들 조회 및 권한 확인
-    attachments = []
-    for file_id in request.file_ids:
-        attachment = db.query(Attachment).filter(Attachment.id == file_id).first()
-        if not attachment:
-            continue
-        
-        # 권한 확인
-        schedule = db.query(Schedule).filter(Schedule.id == attachment.schedule_id).first()
-        if schedule and ((not schedule.individual) or (schedule.owner_id == current_user.id)):
-            attachments.append(attachment)
+    # 파일들 조회 및 권한 확인 (선택 개수와 관계없이 한 번의 쿼리)
+    attachments = readable_attachments(db, request.file_ids, current_user)
     
     if not attachments:
         raise HTTPException(status_code=404, detail="No accessible files found")
     
-    # 임시 ZIP 파일 생성
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp_zip:
-        with zipfile.ZipFile(tmp_zip.name, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for attachment in attachments:
-                file_path = Path("." + attachment.file_path)
-                if file_path.exists():
-                    # 같은 이름 파일이 있을 경우 번호 추가
-                    archive_name = attachment.filename
-                    counter = 1
-                    while archive_name in [info.filename for info in zipf.filelist]:
-                        name, ext = Path(attachment.filename).stem, Path(attachment.filename).suffix
-                        archive_name = f"{name}_{counter}{ext}"
-                        counter += 1
-                    
-                    zipf.write(file_path, archive_name)
-        
-        # ZIP 파일 다운로드 응답
-        return FileResponse(
-            tmp_zip.name,
-            media_type='application/zip',
-            filename=f"attachments_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-        )
+    # ZIP에 담을 파일 목록 구성 (아카이브 내 이름 중복은 set으로 관리)
+    # 파일 정보는 DB 값을 쓰므로 파일마다 저장소에 stat 요청을 보내지 않음
+    used_names = set()
+    members = []
+    for attachment in attachments:
+        if attachment.file_missing_at is not None:
+            continue
+        archive_name = unique_archive_name(attachment.filename, used_names)
+        members.append(ZipMember(
+            archive_name,
+            storage_key(attachment.file_path),
+            attachment.mime_type or "",
+            (attachment.created_at or datetime.datetime.now()).timestamp(),
+            attachment.file_size or 0
+        ))
+    
+    if not members:
+        raise HTTPException(status_code=404, detail="No accessible files found")
+    
+    # 디스크에 임시 파일을 만들지 않고 ZIP을 스트리밍으로 생성하여 응답
+    zip_filename = f"attachments_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(
+        iter_zip(members, opener=storage.open),
+        media_type='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{zip_filename}"'}
+    )
 
 @router.delete("/delete/batch")
 async def delete_multiple_files(
     request: MultiFileRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    storage: StorageBackend = Depends(get_storage)
 ):
     """선택된 여러 파일을 일괄 삭제합니다."""
     
-    deleted_count = 0
-    for file_id in request.file_ids:
-        attachment = db.query(Attachment).filter(Attachment.id == file_id).first()
-        if not attachment:
-            continue
-        
-        # 권한 확인
-        schedule = db.query(Schedule).filter(Schedule.id == attachment.schedule_id).first()
-        if not schedule:
-            continue
-        
-        if attachment.uploader_id != current_user.id and schedule.owner_id != current_user.id:
-            continue
-        
-        # 파일 시스템에서 삭제
-        file_path = Path("." + attachment.file_path)
-        if file_path.exists():
-            try:
-                file_path.unlink()
-            except:
-                pass  # 파일 삭제 실패해도 DB에서는 삭제
-        
-        # DB에서 삭제
-        db.delete(attachment)
-        deleted_count += 1
+    # 권한이 있는 파일만 한 번의 쿼리로 조회
+    attachments = modifiable_attachments(db, request.file_ids, current_user)
+    
+    # 저장소에서 삭제 (오브젝트 스토리지는 일괄 삭제 요청 사용)
+    await run_in_threadpool(_delete_objects, storage, attachments)
+    
+    # DB에서 일괄 삭제
+    subtract_usage(db, attachments)
+    deleted_ids = [attachment.id for attachment in attachments]
+    for start in range(0, len(deleted_ids), IN_CHUNK_SIZE):
+        db.query(Attachment).filter(
+            Attachment.id.in_(deleted_ids[start:start + IN_CHUNK_SIZE])
+        ).delete(synchronize_session=False)
+    deleted_count = len(attachments)
     
     db.commit()
     
-    return {"message": f"{deleted_count} files deleted successfully"}
\ No newline at end of file
+    return {"message": f"{deleted_count} files deleted successfully"}
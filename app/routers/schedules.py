@@ -1,18 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import os
-from sqlalchemy import or_, and_, not_, func
+from sqlalchemy import or_, and_, func
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
-from app.models.models import User, Schedule, ScheduleShare, Attachment, PriorityLevel, Alarm, AlarmType
+from app.core.alarm_outbox import enqueue_alarm
+from app.core.schedule_access import can_view_clause
+from app.core.schedule_bulk import apply_bulk, MAX_BULK_OPERATIONS
+from app.core.calendar_view import build_calendar
+from app.core.recurrence import expand_occurrences, is_occurrence, recurrence_fields, recurring_in_window
+from app.core.schedule_cascade import soft_delete_subtree, deletion_root, restore_subtree, RestoreConflict
+from app.core.schedule_search import search_schedules
+from app.core.saved_search import cached_result_ids, invalidate, load_page
+from app.core.schedule_dsl import QuerySyntaxError, apply_search_terms, occurrence_matches, parse_search_query, split_terms
+from app.core.schedule_query import filter_visible, filter_terms, filter_status_and_range
+from app.core.schedule_stats import GROUP_BY_OPTIONS, live_stats, rollup_stats, rollup_supported
+from app.core.schedule_order import append_key, move_schedule
+from app.core.schedule_tree import load_subtree, ancestors, is_descendant, TREE_MAX_DEPTH
+from app.models.models import User, Schedule, ScheduleShare, SavedSearch, ScheduleOccurrenceOverride, Attachment, PriorityLevel, AlarmType
 from app.schemas.schemas import (
     ScheduleCreate,
     Schedule as ScheduleSchema,
     ScheduleShareCreate,
     ScheduleShare as ScheduleShareSchema,
-    Attachment as AttachmentSchema
+    Attachment as AttachmentSchema,
+    ScheduleTreeNode,
+    ScheduleMove,
+    OccurrenceOverride,
+    BulkRequest,
+    SavedSearch as SavedSearchSchema,
+    SavedSearchCreate,
+    SavedSearchUpdate
 )
 from pydantic import BaseModel
 from app.routers.auth import get_current_user
@@ -55,32 +76,16 @@ def create_schedule(
         schedule_data = schedule.dict()
         logger.info(f"Creating schedule with data: {schedule_data}")
         
-        # parent_order 계산 로직 수정
-        if schedule_data.get("parent_id"):
-            logger.info(f"Parent ID found: {schedule_data['parent_id']}")
-            # 부모 일정의 parent_order 가져오기
-            parent_schedule = db.query(Schedule).filter(Schedule.id == schedule_data["parent_id"]).first()
-            if parent_schedule:
-                parent_order = parent_schedule.parent_order
-                logger.info(f"Parent's parent_order: {parent_order}")
-                # 같은 부모를 가진 일정들의 최대 parent_order 찾기
-                max_order = db.query(func.max(Schedule.parent_order)).filter(
-                    Schedule.parent_id == schedule_data["parent_id"]
-                ).scalar() or parent_order
-                logger.info(f"Max parent_order found: {max_order}")
-                schedule_data["parent_order"] = max_order + 1
-                logger.info(f"New parent_order set to: {schedule_data['parent_order']}")
-            else:
-                logger.warning(f"Parent schedule not found for ID: {schedule_data['parent_id']}")
-                schedule_data["parent_order"] = 0
-        else:
-            logger.info("No parent_id found, setting parent_order to 0")
-            schedule_data["parent_order"] = 0
+        # 반복 규칙 검사와 마지막 회차 계산 (회차는 조회할 때 펼치므로 행은 하나)
+        schedule_data.update(recurrence_fields(schedule_data.get("rrule"), schedule_data["date"]))
 
         db_schedule = Schedule(**schedule_data, owner_id=current_user.id)
         logger.info(f"Created schedule object: {db_schedule.__dict__}")
         
         db.add(db_schedule)
+        db.flush()
+        # 형제 순서는 order_key 로 정함 (최상위 포함, 마지막 형제 뒤). 키에 id 를 붙여 동시 생성끼리도 겹치지 않음
+        append_key(db, db_schedule)
         db.commit()
         db.refresh(db_schedule)
         db.refresh(db_schedule.owner)
@@ -94,6 +99,35 @@ def create_schedule(
             detail=f"Failed to create schedule: {str(e)}"
         )
 
+@router.post("/bulk")
+def bulk_schedules(
+    request: BulkRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    여러 일정의 생성/수정/완료/삭제/공유를 한 번의 요청과 한 트랜잭션으로 처리합니다.
+
+    권한이 없거나 잘못된 작업은 결과에 error 로 표시하고 나머지는 적용합니다.
+    """
+    if len(request.operations) > MAX_BULK_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"한 번에 최대 {MAX_BULK_OPERATIONS}개까지 처리할 수 있습니다"
+        )
+    try:
+        results = apply_bulk(db, request.operations, current_user)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error applying bulk schedule operations: {str(e)}")
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to apply bulk operations: {str(e)}"
+        )
+    applied = sum(1 for result in results if result["status"] == "ok")
+    return {"results": results, "applied": applied, "failed": len(results) - applied}
+
 @router.get("/", response_model=List[ScheduleSchema])
 def read_schedules(
     skip: int = 0,
@@ -108,82 +142,36 @@ def read_schedules(
     search_in_title: bool = True,
     search_in_content: bool = True,
     search_in_memo: bool = True,
+    q: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """일정 목록을 반환합니다."""
+    """
+    일정 목록을 반환합니다.
+
+    q 는 검색식입니다 (예: `owner:kim project:개발 priority:긴급 due<2026-11-01 "정확한 문구" -제외 is:open`,
+    문법은 app.core.schedule_dsl.parse_search_query). 다른 조건과 AND 로 묶입니다.
+    """
     #logger.info(f"[TIME_DEBUG] read_schedules called - start_date: {start_date}, end_date: {end_date}")
+    try:
+        row_terms, occurrence_terms = split_terms(parse_search_query(q))
+    except QuerySyntaxError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    search_options = dict(
+        search_in_title=search_in_title, search_in_content=search_in_content, search_in_memo=search_in_memo
+    )
     
-    query = db.query(Schedule)
-
-    # 삭제되지 않은 일정만 조회
-    query = query.filter(Schedule.is_deleted == False)
-
-    # 사용자 및 개인일정 필터링
-    if not show_all_users:
-        # 자신의 일정만 조회
-        query = query.filter(Schedule.owner_id == current_user.id)
-    else:
-        # 모든 사용자 일정을 보되, 다른 사용자의 개인일정은 제외
-        query = query.filter(
-            or_(
-                Schedule.owner_id == current_user.id,  # 자신의 모든 일정
-                and_(
-                    Schedule.owner_id != current_user.id,  # 다른 사용자의 일정 중
-                    Schedule.individual == False  # 개인일정이 아닌 것만
-                )
-            )
-        )
+    query = filter_visible(db.query(Schedule), current_user, show_all_users)
+    query = filter_terms(query, search_terms, exclude_terms, search_in_title, search_in_content, search_in_memo)
+    query = apply_search_terms(db, query, row_terms, current_user, **search_options)
 
-    # 완료 상태 필터링
-    if completed_only:
-        query = query.filter(Schedule.is_completed == True)
-    elif not show_completed:
-        query = query.filter(Schedule.is_completed == False)
-
-    # 날짜 범위 필터링
-    if start_date:
-        #logger.info(f"[TIME_DEBUG] Filtering with start_date: {start_date}")
-        query = query.filter(Schedule.date >= start_date)
-    if end_date:
-        #logger.info(f"[TIME_DEBUG] Filtering with end_date: {end_date}")
-        query = query.filter(Schedule.date <= end_date)
-
-    # 검색어 필터링
-    if search_terms:
-        search_conditions = []
-        for term in search_terms.split(','):
-            term = term.strip()
-            if term:
-                term_conditions = []
-                if search_in_title:
-                    term_conditions.append(Schedule.title.ilike(f'%{term}%'))
-                if search_in_content:
-                    term_conditions.append(Schedule.content.ilike(f'%{term}%'))
-                if search_in_memo:
-                    term_conditions.append(Schedule.memo.ilike(f'%{term}%'))
-                if term_conditions:
-                    search_conditions.append(or_(*term_conditions))
-        if search_conditions:
-            query = query.filter(or_(*search_conditions))
-
-    # 제외 검색어 필터링
-    if exclude_terms:
-        exclude_conditions = []
-        for term in exclude_terms.split(','):
-            term = term.strip()
-            if term:
-                exclude_term_conditions = []
-                if search_in_title:
-                    exclude_term_conditions.append(Schedule.title.ilike(f'%{term}%'))
-                if search_in_content:
-                    exclude_term_conditions.append(Schedule.content.ilike(f'%{term}%'))
-                if search_in_memo:
-                    exclude_term_conditions.append(Schedule.memo.ilike(f'%{term}%'))
-                if exclude_term_conditions:
-                    exclude_conditions.append(not_(or_(*exclude_term_conditions)))
-        if exclude_conditions:
-            query = query.filter(and_(*exclude_conditions))
+    # 반복 일정은 회차마다 완료 여부/날짜가 다르므로 그 조건 전의 쿼리로 따로 조회
+    recurring_query = query
+    query = apply_search_terms(db, query, occurrence_terms, current_user, **search_options)
+    query = filter_status_and_range(query, show_completed, completed_only, start_date, end_date)
+    if q:
+        # 검색식에 한글 검색어가 있으면 조회 전에 검색 색인을 갱신했으므로 저장
+        db.commit()
 
     # 마감시간 기준 정렬
     query = query.order_by(
@@ -191,7 +179,29 @@ def read_schedules(
         Schedule.created_at.desc()
     )
 
-    schedules = query.offset(skip).limit(limit).all()
+    if not (start_date and end_date):
+        # 기간이 없으면 반복 일정은 원본(첫 회차) 한 행으로 보여줌
+        return query.offset(skip).limit(limit).all()
+
+    # 기간이 있으면 반복 일정을 그 안의 회차로 펼쳐서 일반 일정과 같은 순서로 합침
+    masters = recurring_query.filter(recurring_in_window(start_date, end_date)).all()
+    if not masters:
+        return query.offset(skip).limit(limit).all()
+    schedules = query.filter(Schedule.rrule.is_(None)).limit(skip + limit).all()
+    for occurrence in expand_occurrences(db, masters, start_date, end_date):
+        if completed_only and not occurrence.is_completed:
+            continue
+        if not show_completed and occurrence.is_completed:
+            continue
+        if not occurrence_matches(occurrence_terms, occurrence):
+            continue
+        schedules.append(occurrence)
+    schedules.sort(key=lambda item: (
+        item.due_time is None,
+        item.due_time or datetime.min,
+        -item.created_at.timestamp() if item.created_at else 0
+    ))
+    schedules = schedules[skip:skip + limit]
     
     # 시간 디버깅 로그 추가
     #for schedule in schedules[:3]:  # 처음 3개 일정만 로그
@@ -202,6 +212,191 @@ def read_schedules(
     
     return schedules
 
+@router.get("/search", response_model=List[ScheduleSchema])
+def read_search_results(
+    q: str = Query(..., min_length=1),
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    제목/내용/메모/프로젝트/첨부파일명에서 검색어와 맞는 일정을 관련도(BM25) 순으로 반환합니다.
+
+    한글은 n-gram 이라 조사가 붙은 검색어도 찾고, 초성("ㅎㅇㄹ")이나 입력 중인 낱자("회의ㄹ")로도 찾습니다.
+    """
+    return search_schedules(db, current_user, q, skip, limit)
+
+@router.get("/stats")
+def read_schedule_stats(
+    group_by: str = "day",
+    cached: bool = False,
+    show_completed: bool = True,
+    show_all_users: bool = True,
+    completed_only: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    search_terms: Optional[str] = None,
+    exclude_terms: Optional[str] = None,
+    search_in_title: bool = True,
+    search_in_content: bool = True,
+    search_in_memo: bool = True,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    일정 목록(read_schedules)과 같은 조건으로 묶음별 전체/완료/미완료/지연 수를 반환합니다.
+
+    group_by 는 day, week(월요일 날짜), month, priority, owner, project 중 하나입니다.
+    cached=true 이고 검색어가 없으며 기간이 하루 경계에 맞으면 트리거로 유지하는 롤업 테이블에서 셉니다.
+    """
+    if group_by not in GROUP_BY_OPTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be one of {', '.join(GROUP_BY_OPTIONS)}"
+        )
+    query = filter_visible(db.query(Schedule), current_user, show_all_users)
+    if cached and rollup_supported(start_date, end_date, bool(search_terms or exclude_terms)):
+        return rollup_stats(
+            db, current_user, group_by, query,
+            show_all_users=show_all_users,
+            show_completed=show_completed,
+            completed_only=completed_only,
+            start_date=start_date,
+            end_date=end_date
+        )
+    query = filter_terms(query, search_terms, exclude_terms, search_in_title, search_in_content, search_in_memo)
+    return live_stats(
+        db,
+        filter_status_and_range(query, show_completed, completed_only, start_date, end_date),
+        query,
+        group_by,
+        start_date=start_date,
+        end_date=end_date,
+        show_completed=show_completed,
+        completed_only=completed_only
+    )
+
+def _check_saved_search(saved: SavedSearch):
+    try:
+        parse_search_query(saved.query)
+    except QuerySyntaxError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+def _owned_saved_search(db: Session, search_id: int, current_user: User) -> SavedSearch:
+    saved = db.query(SavedSearch).filter(
+        SavedSearch.id == search_id, SavedSearch.owner_id == current_user.id
+    ).first()
+    if not saved:
+        raise HTTPException(status_code=404, detail="Saved search not found")
+    return saved
+
+def _check_saved_search_name(db: Session, current_user: User, name: str, search_id: Optional[int] = None):
+    query = db.query(SavedSearch.id).filter(SavedSearch.owner_id == current_user.id, SavedSearch.name == name)
+    if search_id is not None:
+        query = query.filter(SavedSearch.id != search_id)
+    if query.first() is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Saved search name already exists")
+
+@router.get("/saved-searches", response_model=List[SavedSearchSchema])
+def read_saved_searches(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """현재 사용자의 저장된 검색 목록을 반환합니다."""
+    return db.query(SavedSearch).filter(SavedSearch.owner_id == current_user.id).order_by(SavedSearch.name).all()
+
+@router.post("/saved-searches", response_model=SavedSearchSchema)
+def create_saved_search(
+    saved_search: SavedSearchCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """검색식을 이름을 붙여 저장합니다. 결과는 처음 실행할 때 계산해서 캐시합니다."""
+    saved = SavedSearch(**saved_search.model_dump(), owner_id=current_user.id)
+    _check_saved_search(saved)
+    _check_saved_search_name(db, current_user, saved.name)
+    db.add(saved)
+    db.commit()
+    db.refresh(saved)
+    return saved
+
+@router.put("/saved-searches/{search_id}", response_model=SavedSearchSchema)
+def update_saved_search(
+    search_id: int,
+    saved_search: SavedSearchUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """저장된 검색의 이름/검색식/조건을 바꿉니다 (캐시는 버림)."""
+    saved = _owned_saved_search(db, search_id, current_user)
+    for field, value in saved_search.model_dump(exclude_unset=True).items():
+        if value is not None:
+            setattr(saved, field, value)
+    _check_saved_search(saved)
+    _check_saved_search_name(db, current_user, saved.name, saved.id)
+    invalidate(saved)
+    db.commit()
+    db.refresh(saved)
+    return saved
+
+@router.delete("/saved-searches/{search_id}")
+def delete_saved_search(
+    search_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """저장된 검색을 삭제합니다."""
+    db.delete(_owned_saved_search(db, search_id, current_user))
+    db.commit()
+    return {"message": "Saved search deleted successfully"}
+
+@router.get("/saved-searches/{search_id}/results", response_model=List[ScheduleSchema])
+def read_saved_search_results(
+    search_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    저장된 검색 결과 한 페이지를 반환합니다.
+
+    결과 id 목록은 서버에 캐시하고, 그 뒤 바뀐 일정 중 결과에 영향을 줄 수 있는 것이 있을 때만 다시 계산합니다.
+    전체 수는 X-Total-Count, 캐시 적중 여부는 X-Cache(hit/miss) 헤더로 반환합니다.
+    """
+    saved = _owned_saved_search(db, search_id, current_user)
+    ids, hit = cached_result_ids(db, current_user, saved)
+    # 캐시 저장 (페이지 일정을 읽기 전에 commit 해야 읽은 객체가 만료되지 않음)
+    db.commit()
+    response.headers["X-Total-Count"] = str(len(ids))
+    response.headers["X-Cache"] = "hit" if hit else "miss"
+    return load_page(db, ids, skip, limit)
+
+@router.get("/calendar")
+def read_calendar(
+    start: date,
+    end: date,
+    tz: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    달력 보기용으로 start~end(tz 기준 날짜) 일정을 날짜별로 묶어 반환합니다.
+
+    각 날짜는 열 배열 {"id": [...], "title": [...], "priority": [...], "time": [...], "completed": [...]} 입니다.
+    여러 날에 걸친 일정은 걸친 날짜마다, 반복 일정은 회차마다 들어갑니다.
+    """
+    try:
+        zone = ZoneInfo(tz) if tz else None
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone: {tz}")
+    try:
+        return build_calendar(db, current_user, start, end, zone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{schedule_id}", response_model=ScheduleSchema)
 def read_schedule(
     schedule_id: int,
@@ -256,9 +451,24 @@ def update_schedule(
         ).first()
         if db_schedule is None:
             raise HTTPException(status_code=404, detail="Schedule not found")
-        
-        for key, value in schedule.dict().items():
+        # 수정 화면은 반복 규칙, 부모 등을 보내지 않으므로 보낸 필드만 바꿈
+        schedule_data = schedule.dict(exclude_unset=True)
+        moved = "parent_id" in schedule_data and schedule_data["parent_id"] != db_schedule.parent_id
+        if moved and schedule.parent_id is not None and is_descendant(db, schedule_id, schedule.parent_id):
+            raise HTTPException(status_code=400, detail="일정을 자신의 하위 작업 아래로 옮길 수 없습니다")
+        rrule = schedule_data.get("rrule", db_schedule.rrule)
+        date = schedule_data.get("date", db_schedule.date)
+        if (rrule, date) != (db_schedule.rrule, db_schedule.date):
+            schedule_data.update(recurrence_fields(rrule, date))
+            # 규칙이나 첫 회차가 바뀌면 회차 구분값(원래 시작 시각)이 달라지므로 회차 예외를 지움
+            db.query(ScheduleOccurrenceOverride).filter(
+                ScheduleOccurrenceOverride.schedule_id == schedule_id
+            ).delete(synchronize_session=False)
+        for key, value in schedule_data.items():
             setattr(db_schedule, key, value)
+        if moved:
+            # 다른 부모 아래로 옮기면 새 형제들의 맨 뒤에 놓음
+            append_key(db, db_schedule)
         
         db.commit()
         db.refresh(db_schedule)
@@ -288,15 +498,94 @@ def delete_schedule(
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     
-    # 실제 삭제 대신 is_deleted 플래그를 True로 설정
-    schedule.is_deleted = True
+    # 실제 삭제 대신 하위 작업 전체와 연관 알람/공유까지 is_deleted 로 표시 (복원 가능)
+    result = soft_delete_subtree(db, schedule_id)
+    db.commit()
+    return {"message": "Schedule deleted successfully", **result}
+
+@router.post("/{schedule_id}/restore")
+def restore_schedule(
+    schedule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """삭제한 일정을 함께 삭제된 하위 작업, 알람, 공유와 같이 복원합니다."""
+    schedule = db.query(Schedule).filter(
+        Schedule.id == schedule_id,
+        Schedule.owner_id == current_user.id,
+        Schedule.is_deleted == True
+    ).first()
     
-    # 연관된 알람들도 함께 soft delete 처리
-    for alarm in schedule.alarms:
-        alarm.is_deleted = True
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Deleted schedule not found")
+    # 하위 일정 소유자가 다른 사용자의 트리 전체를 되살리지 못하도록 삭제 단위의 시작 일정 소유자만 허용
+    if deletion_root(db, schedule).owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Only the owner of the deleted parent schedule can restore it")
     
+    try:
+        result = restore_subtree(db, schedule)
+    except RestoreConflict as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    db.commit()
+    return {"message": "Schedule restored successfully", **result}
+
+def _owned_occurrence(db: Session, schedule_id: int, occurrence_date: datetime, user: User) -> Schedule:
+    """회차 예외를 쓸 수 있는 반복 일정 (소유자, 실제 회차인지 확인)"""
+    master = db.query(Schedule).filter(
+        Schedule.id == schedule_id,
+        Schedule.owner_id == user.id,
+        Schedule.is_deleted == False
+    ).first()
+    if master is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    if not is_occurrence(master, occurrence_date):
+        raise HTTPException(status_code=404, detail="Occurrence not found")
+    return master
+
+def _upsert_override(db: Session, schedule_id: int, occurrence_date: datetime, values: dict) -> ScheduleOccurrenceOverride:
+    override = db.query(ScheduleOccurrenceOverride).filter(
+        ScheduleOccurrenceOverride.schedule_id == schedule_id,
+        ScheduleOccurrenceOverride.occurrence_date == occurrence_date
+    ).first()
+    if override is None:
+        override = ScheduleOccurrenceOverride(schedule_id=schedule_id, occurrence_date=occurrence_date)
+        db.add(override)
+    for key, value in values.items():
+        setattr(override, key, value)
+    return override
+
+@router.put("/{schedule_id}/occurrences/{occurrence_date}")
+def update_occurrence(
+    schedule_id: int,
+    occurrence_date: datetime,
+    changes: OccurrenceOverride,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    반복 일정의 한 회차만 바꿉니다 (제목, 시각, 완료 등). 회차는 원래 시작 시각으로 지정합니다.
+
+    보낸 필드만 예외로 저장하고 나머지는 계속 원본 일정을 따릅니다.
+    """
+    _owned_occurrence(db, schedule_id, occurrence_date, current_user)
+    override = _upsert_override(db, schedule_id, occurrence_date, changes.model_dump(exclude_unset=True))
+    override.is_cancelled = False
+    db.commit()
+    return {"schedule_id": schedule_id, "occurrence_date": occurrence_date, "is_cancelled": False}
+
+@router.delete("/{schedule_id}/occurrences/{occurrence_date}")
+def cancel_occurrence(
+    schedule_id: int,
+    occurrence_date: datetime,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """반복 일정의 한 회차만 취소합니다 (나머지 회차는 그대로)."""
+    _owned_occurrence(db, schedule_id, occurrence_date, current_user)
+    _upsert_override(db, schedule_id, occurrence_date, {"is_cancelled": True})
     db.commit()
-    return {"message": "Schedule deleted successfully"}
+    return {"schedule_id": schedule_id, "occurrence_date": occurrence_date, "is_cancelled": True}
 
 @router.post("/{schedule_id}/complete")
 def complete_schedule(
@@ -389,56 +678,27 @@ async def update_schedule_memo(
         
         logger.info(f"[MEMO UPDATE] Memo changed from '{old_memo}' to '{new_memo}'")
         
-        # 알람 생성 로직
-        alarm_created = False
-        if schedule.owner_id != current_user.id:  
-            # 다른 사용자가 메모를 추가한 경우
-            logger.info(f"[ALARM CREATE] Creating memo alarm - Schedule owner: {schedule.owner_id}, Editor: {current_user.id}")
-            
-            if schedule.individual:
-                # 개인일정: 소유자에게만 알림
-                new_alarm = Alarm(
-                    user_id=schedule.owner_id,  # 일정 소유자에게 알림
-                    schedule_id=schedule_id,
-                    type=AlarmType.MEMO,
-                    message=f"{current_user.name}님이 일정 '{schedule.title}'에 메모를 추가했습니다."
-                )
-                db.add(new_alarm)
-                alarm_created = True
-                logger.info(f"[ALARM SUCCESS] Individual memo alarm created for user {schedule.owner_id}")
-            else:
-                # 일반일정: 모든 사용자에게 알림
-                all_users = db.query(User).all()
-                for user in all_users:
-                    if user.id != current_user.id:  # 본인 제외
-                        new_alarm = Alarm(
-                            user_id=user.id,
-                            schedule_id=schedule_id,
-                            type=AlarmType.MEMO,
-                            message=f"{current_user.name}님이 일정 '{schedule.title}'에 메모를 추가했습니다."
-                        )
-                        db.add(new_alarm)
-                alarm_created = True
-                logger.info(f"[ALARM SUCCESS] Public memo alarms created for all users")
+        # 알람 이벤트를 outbox 에 기록 (메모 변경과 같은 트랜잭션, 실제 전달은 디스패처가 함)
+        alarm_message = f"{current_user.name}님이 일정 '{schedule.title}'에 메모를 추가했습니다."
+        alarm_created = True
+        if schedule.owner_id != current_user.id and schedule.individual:
+            # 개인일정: 소유자에게만 알림
+            enqueue_alarm(
+                db, schedule_id, AlarmType.MEMO, alarm_message,
+                recipient_ids=[schedule.owner_id], actor_id=current_user.id
+            )
+        elif not schedule.individual:
+            # 일반일정: 본인을 제외한 모든 사용자에게 알림
+            enqueue_alarm(
+                db, schedule_id, AlarmType.MEMO, alarm_message,
+                exclude_user_id=current_user.id, actor_id=current_user.id
+            )
         else:
-            # 본인이 자신의 일정에 메모를 추가한 경우
-            if not schedule.individual:
-                # 일반일정의 경우 다른 모든 사용자에게 알림
-                all_users = db.query(User).all()
-                for user in all_users:
-                    if user.id != current_user.id:  # 본인 제외
-                        new_alarm = Alarm(
-                            user_id=user.id,
-                            schedule_id=schedule_id,
-                            type=AlarmType.MEMO,
-                            message=f"{current_user.name}님이 일정 '{schedule.title}'에 메모를 추가했습니다."
-                        )
-                        db.add(new_alarm)
-                alarm_created = True
-                logger.info(f"[ALARM SUCCESS] Public memo alarms created for all other users")
-            else:
-                # 개인일정의 경우 알림 없음
-                logger.info(f"[ALARM SKIP] No alarm created - User editing own individual schedule")
+            # 본인이 자신의 개인일정에 메모를 추가한 경우 알림 없음
+            alarm_created = False
+            logger.info(f"[ALARM SKIP] No alarm created - User editing own individual schedule")
+        if alarm_created:
+            logger.info(f"[ALARM SUCCESS] Memo alarm queued for schedule {schedule_id}")
         
         # 데이터베이스 커밋
         db.commit()
@@ -493,6 +753,93 @@ async def get_schedule_parent(
     
     return parent
 
+@router.get("/{schedule_id}/tree", response_model=List[ScheduleTreeNode])
+def get_schedule_tree(
+    schedule_id: int,
+    depth: Optional[int] = Query(None, ge=1, le=TREE_MAX_DEPTH),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    일정과 하위 후속 작업 전체를 한 번에 반환합니다.
+
+    첫 항목이 요청한 일정(depth 0)이고, 이후는 전위 순회 순서(형제는 parent_order 순)입니다.
+    depth 를 주면 그 깊이까지만 내려가며, has_children 으로 더 내려갈 수 있는지 알 수 있습니다.
+    """
+    nodes = load_subtree(db, schedule_id, current_user, depth)
+    if not nodes:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    columns = set(ScheduleTreeNode.model_fields) - {"depth", "has_children"}
+    return [
+        ScheduleTreeNode(
+            depth=node_depth,
+            has_children=has_children,
+            **{name: getattr(schedule, name) for name in columns}
+        )
+        for schedule, node_depth, has_children in nodes
+    ]
+
+@router.patch("/{schedule_id}/move")
+def move_schedule_endpoint(
+    schedule_id: int,
+    move: ScheduleMove,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    일정을 두 형제 사이(또는 다른 부모 아래)로 옮깁니다. 옮기는 일정 한 행만 씁니다.
+
+    after_id 는 바로 앞에 올 형제, before_id 는 바로 뒤에 올 형제입니다. 둘 다 없으면 맨 뒤로 갑니다.
+    parent_id 를 보내면 그 부모 아래로 옮기고(null 이면 최상위), 보내지 않으면 부모는 그대로입니다.
+    """
+    schedule = db.query(Schedule).filter(
+        Schedule.id == schedule_id,
+        Schedule.owner_id == current_user.id,
+        Schedule.is_deleted == False
+    ).first()
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    
+    parent_id = move.parent_id if "parent_id" in move.model_fields_set else schedule.parent_id
+    if parent_id is not None:
+        parent = db.query(Schedule.id).filter(Schedule.id == parent_id, Schedule.is_deleted == False).first()
+        if parent is None:
+            raise HTTPException(status_code=404, detail="Parent schedule not found")
+        if is_descendant(db, schedule_id, parent_id):
+            raise HTTPException(status_code=400, detail="일정을 자신의 하위 작업 아래로 옮길 수 없습니다")
+    
+    try:
+        move_schedule(db, schedule, parent_id, after_id=move.after_id, before_id=move.before_id)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    db.commit()
+    return {"id": schedule.id, "parent_id": schedule.parent_id, "order_key": schedule.order_key}
+
+@router.get("/{schedule_id}/ancestors", response_model=List[ScheduleTreeNode])
+def get_schedule_ancestors(
+    schedule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """루트부터 바로 위 부모까지의 조상 일정을 반환합니다 (브레드크럼, 루트가 depth 0)."""
+    visible = db.query(Schedule.id).filter(
+        Schedule.id == schedule_id,
+        Schedule.is_deleted == False,
+        can_view_clause(current_user)
+    ).first()
+    if not visible:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    columns = set(ScheduleTreeNode.model_fields) - {"depth", "has_children"}
+    return [
+        ScheduleTreeNode(
+            depth=node_depth,
+            has_children=True,
+            **{name: getattr(schedule, name) for name in columns}
+        )
+        for node_depth, schedule in enumerate(ancestors(db, schedule_id, current_user))
+    ]
+
 @router.get("/export/excel")
 async def export_schedules_to_excel(
     start_date: Optional[datetime] = None,
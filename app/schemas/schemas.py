@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, computed_field
-from typing import Optional, List, ForwardRef
+from typing import Optional, List, ForwardRef, Literal
 from datetime import datetime
 from app.models.models import PriorityLevel
 from .enums import AlarmType
@@ -50,6 +50,7 @@ class ScheduleBase(BaseModel):
     project_name: Optional[str] = None
     parent_id: Optional[int] = None
     parent_order: Optional[int] = 0
+    rrule: Optional[str] = None  # 반복 규칙, 예: "FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20271231"
 
 class ScheduleCreate(ScheduleBase):
     pass
@@ -85,6 +86,9 @@ class Schedule(ScheduleBase):
     shares: List[ScheduleShare] = []
     attachments: List[Attachment] = []
     parent_id: Optional[int] = None
+    order_key: Optional[str] = None
+    recurrence_end: Optional[datetime] = None
+    occurrence_date: Optional[datetime] = None  # 반복 일정의 회차이면 그 회차의 원래 시작 시각
 
     class Config:
         from_attributes = True
@@ -94,6 +98,32 @@ class Schedule(ScheduleBase):
     def is_shared(self) -> bool:
         return len(self.shares) > 0 if self.shares else False
 
+class ScheduleTreeNode(BaseModel):
+    """하위 트리 조회 결과의 한 노드 (전위 순회 순서, 깊이로 들여쓰기)"""
+    id: int
+    title: str
+    date: Optional[datetime] = None
+    due_time: Optional[datetime] = None
+    priority: Optional[PriorityLevel] = None
+    is_completed: bool = False
+    individual: bool = False
+    project_name: Optional[str] = None
+    owner_id: int
+    parent_id: Optional[int] = None
+    parent_order: Optional[int] = None
+    order_key: Optional[str] = None
+    depth: int
+    has_children: bool = False
+
+    class Config:
+        from_attributes = True
+
+class ScheduleMove(BaseModel):
+    """형제 사이 이동 요청. after_id 뒤, before_id 앞에 놓음"""
+    parent_id: Optional[int] = None
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
 class ScheduleUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
@@ -103,6 +133,56 @@ class ScheduleUpdate(BaseModel):
     priority: Optional[PriorityLevel] = None
     individual: Optional[bool] = None
     memo: Optional[str] = None
+    rrule: Optional[str] = None
+
+class OccurrenceOverride(BaseModel):
+    """반복 일정 한 회차의 변경 값. 보내지 않은 필드는 원본 일정을 따름"""
+    title: Optional[str] = None
+    content: Optional[str] = None
+    date: Optional[datetime] = None
+    due_time: Optional[datetime] = None
+    alarm_time: Optional[datetime] = None
+    priority: Optional[PriorityLevel] = None
+    is_completed: Optional[bool] = None
+
+class BulkOperation(BaseModel):
+    """일괄 작업 하나. create/update 는 data 에 필드를, share 는 shared_with_id 를 담음"""
+    op: Literal["create", "update", "complete", "delete", "share"]
+    id: Optional[int] = None
+    data: Optional[dict] = None
+    shared_with_id: Optional[int] = None
+    memo: Optional[str] = None
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation]
+
+class SavedSearchBase(BaseModel):
+    """저장된 검색. query 는 목록 검색식 (예: "project:개발 priority:긴급 is:overdue")"""
+    name: str
+    query: str
+    show_completed: bool = True
+    show_all_users: bool = True
+    completed_only: bool = False
+
+class SavedSearchCreate(SavedSearchBase):
+    pass
+
+class SavedSearchUpdate(BaseModel):
+    name: Optional[str] = None
+    query: Optional[str] = None
+    show_completed: Optional[bool] = None
+    show_all_users: Optional[bool] = None
+    completed_only: Optional[bool] = None
+
+class SavedSearch(SavedSearchBase):
+    id: int
+    owner_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    cached_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
 
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,26 @@
+"""
+성능 측정 스크립트 모음 (운영 코드에서 import 하지 않음)
+
+저장소 루트에서 모듈로 실행합니다. 예: python -m benchmarks.schedule_tree
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from app.core.database import Base
+from app.core.migrate_db import upgrade_schema
+
+
+@contextmanager
+def temporary_engine() -> Iterator[Engine]:
+    """스키마와 트리거를 만든 임시 SQLite DB 엔진 (끝나면 파일째 삭제)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
+        try:
+            yield engine
+        finally:
+            engine.dispose()
@@ -0,0 +1,59 @@
+"""하위 트리 soft delete 와 복원 시간 측정"""
+import time
+import logging
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.schedule_cascade import restore_subtree, soft_delete_subtree
+from app.models.models import Alarm, Schedule, ScheduleShare, User
+from benchmarks import temporary_engine
+
+logger = logging.getLogger(__name__)
+
+
+def benchmark_cascade(nodes: int = 1000, fanout: int = 10) -> dict:
+    """
+    임시 DB에 nodes 개 일정의 트리(각 노드 자식 fanout 개, 알람/공유 포함)를 만들고
+    하위 트리 삭제와 복원 시간(밀리초)을 잽니다.
+    """
+    with temporary_engine() as engine:
+        result = {"nodes": nodes, "fanout": fanout}
+        with Session(engine) as db:
+            user = User(username="bench", name="Bench", hashed_password="x")
+            db.add(user)
+            db.commit()
+            db.execute(insert(Schedule), [{
+                "id": node_id,
+                "title": f"node {node_id}",
+                "owner_id": user.id,
+                "parent_id": None if node_id == 1 else (node_id - 2) // fanout + 1,
+                "parent_order": 0,
+                "is_deleted": False,
+            } for node_id in range(1, nodes + 1)])
+            db.execute(insert(Alarm), [
+                {"user_id": user.id, "schedule_id": node_id, "message": "bench", "is_deleted": False}
+                for node_id in range(1, nodes + 1)
+            ])
+            db.execute(insert(ScheduleShare), [
+                {"schedule_id": node_id, "shared_with_id": user.id, "is_deleted": False}
+                for node_id in range(1, nodes + 1)
+            ])
+            db.commit()
+
+            started = time.perf_counter()
+            result["deleted"] = soft_delete_subtree(db, 1)
+            db.commit()
+            result["delete_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+            started = time.perf_counter()
+            result["restored"] = restore_subtree(db, db.get(Schedule, 1))
+            db.commit()
+            result["restore_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger.info(f"Schedule cascade delete benchmark: {benchmark_cascade()}")
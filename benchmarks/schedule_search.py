@@ -0,0 +1,81 @@
+"""한글 일정 검색의 색인 생성, 증분 갱신, 검색 지연 시간 측정"""
+import time
+import random
+import logging
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.schedule_search import refresh_search_index, search_schedules
+from app.models.models import Attachment, Schedule, User
+from benchmarks import temporary_engine
+
+logger = logging.getLogger(__name__)
+
+# 벤치마크용 문서 조각
+_BENCH_WORDS = (
+    "주간", "회의", "회의록", "개발", "일정", "검토", "배포", "서버", "점검", "견적서", "계약", "보고서",
+    "고객", "미팅", "디자인", "시안", "출장", "교육", "예산", "정산", "테스트", "릴리스", "장애", "대응",
+)
+_BENCH_PARTICLES = ("", "", "을", "를", "의", "에서", "으로", "과")
+_BENCH_QUERIES = ("회의", "회의록을", "서버 점검", "ㄱㅈㅅ", "배포ㅈ", "견적서", "release", "고객 미팅 일정")
+
+
+def benchmark_search(docs: int = 10000, queries: int = 200, seed: int = 7) -> dict:
+    """
+    임시 DB에 docs 개 일정(한글 제목/내용, 첨부파일 포함)을 넣고 색인 생성, 증분 갱신,
+    검색 지연 시간(밀리초, p50/p95)을 잽니다.
+    """
+    rng = random.Random(seed)
+
+    def sentence(words):
+        return " ".join(rng.choice(_BENCH_WORDS) + rng.choice(_BENCH_PARTICLES) for _ in range(words))
+
+    with temporary_engine() as engine:
+        result = {"docs": docs}
+        with Session(engine) as db:
+            user = User(username="bench", name="Bench", hashed_password="x")
+            db.add(user)
+            db.commit()
+            db.execute(insert(Schedule), [{
+                "id": schedule_id,
+                "title": sentence(3),
+                "content": sentence(20) + " release v2",
+                "project_name": rng.choice(("개발", "영업", "운영")),
+                "owner_id": user.id,
+                "is_deleted": False,
+            } for schedule_id in range(1, docs + 1)])
+            db.execute(insert(Attachment), [
+                {"schedule_id": schedule_id, "filename": f"{rng.choice(_BENCH_WORDS)}_{schedule_id}.pdf", "uploader_id": user.id}
+                for schedule_id in range(1, docs + 1, 3)
+            ])
+
+            # commit 할 때 하는 색인 갱신을 따로 재려고 commit 전에 직접 비움
+            started = time.perf_counter()
+            result["indexed"] = refresh_search_index(db.connection())
+            db.commit()
+            result["index_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+            for schedule in db.query(Schedule).filter(Schedule.id <= 100):
+                schedule.title = sentence(3)
+            db.flush()
+            started = time.perf_counter()
+            result["refreshed"] = refresh_search_index(db.connection())
+            db.commit()
+            result["refresh_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+            timings = []
+            for i in range(queries):
+                started = time.perf_counter()
+                search_schedules(db, user, _BENCH_QUERIES[i % len(_BENCH_QUERIES)], limit=20)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            result["query_p50_ms"] = round(timings[len(timings) // 2], 3)
+            result["query_p95_ms"] = round(timings[int(len(timings) * 0.95) - 1], 3)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger.info(f"Schedule search benchmark: {benchmark_search()}")
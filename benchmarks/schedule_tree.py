@@ -0,0 +1,97 @@
+"""closure table 과 parent_id 재귀 CTE 의 계층 조회 지연 시간 비교"""
+import time
+import logging
+import statistics
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, aliased
+from app.core.schedule_tree import descendant_ids, is_descendant
+from app.models.models import Schedule, ScheduleClosure, User
+from benchmarks import temporary_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _median_ms(fn, samples: int = 50) -> float:
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def benchmark_hierarchy(nodes: int = 100_000, depth: int = 20) -> dict:
+    """
+    임시 DB에 프로젝트 루트 하나와 그 아래 길이 depth 의 사슬들로 nodes 개의 일정을 만들고
+    closure table 조회와 parent_id 재귀 CTE 조회의 지연 시간 중앙값(밀리초)을 비교합니다.
+    """
+    with temporary_engine() as engine:
+        result = {"nodes": nodes, "depth": depth}
+        with Session(engine) as db:
+            user = User(username="bench", name="Bench", hashed_password="x")
+            db.add(user)
+            db.commit()
+
+            started = time.perf_counter()
+            rows = []
+            for node_id in range(1, nodes + 1):
+                level = (node_id - 2) % depth if node_id > 1 else None
+                rows.append({
+                    "id": node_id,
+                    "title": f"node {node_id}",
+                    "owner_id": user.id,
+                    # 루트(1) 아래에 2..depth+1, depth+2..2*depth+1, ... 사슬
+                    "parent_id": None if node_id == 1 else (1 if level == 0 else node_id - 1),
+                    "parent_order": 0,
+                })
+            for start in range(0, len(rows), 5000):
+                db.execute(insert(Schedule), rows[start:start + 5000])
+            db.commit()
+            result["insert_seconds"] = round(time.perf_counter() - started, 2)
+            result["closure_rows"] = db.query(func.count()).select_from(ScheduleClosure).scalar()
+
+            root_id, leaf_id = 1, depth + 1
+            chain = select(Schedule.id, Schedule.parent_id).where(
+                Schedule.id == leaf_id
+            ).cte("chain", recursive=True)
+            parent = aliased(Schedule)
+            chain = chain.union_all(
+                select(parent.id, parent.parent_id).join(chain, parent.id == chain.c.parent_id)
+            )
+            subtree = select(Schedule.id).where(Schedule.id == root_id).cte("subtree", recursive=True)
+            child = aliased(Schedule)
+            subtree = subtree.union_all(select(child.id).join(subtree, child.parent_id == subtree.c.id))
+
+            result["ancestors_ms"] = {
+                "closure": _median_ms(lambda: db.query(ScheduleClosure.ancestor_id).filter(
+                    ScheduleClosure.descendant_id == leaf_id
+                ).order_by(ScheduleClosure.depth.desc()).all()),
+                "recursive_cte": _median_ms(lambda: db.execute(select(chain.c.id)).all()),
+            }
+            result["descendants_ms"] = {
+                "closure": _median_ms(lambda: descendant_ids(db, root_id), samples=5),
+                "recursive_cte": _median_ms(lambda: db.execute(select(subtree.c.id)).all(), samples=5),
+            }
+            result["is_descendant_ms"] = {
+                "closure": _median_ms(lambda: is_descendant(db, root_id, leaf_id)),
+                "recursive_cte": _median_ms(
+                    lambda: db.execute(select(chain.c.id).where(chain.c.id == root_id)).first()
+                ),
+            }
+
+            # 첫 사슬의 아래쪽 절반(노드 depth/2 개)을 둘째 사슬 끝으로 옮기는 비용
+            started = time.perf_counter()
+            db.query(Schedule).filter(Schedule.id == 2 + depth // 2).update(
+                {"parent_id": 2 * depth + 1}, synchronize_session=False
+            )
+            db.commit()
+            result["reparent_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger.info(f"Schedule hierarchy benchmark: {benchmark_hierarchy()}")
@@ -6,6 +6,7 @@ from pathlib import Path
 from app.core.database import engine, Base, get_db
 from app.routers import auth, schedules, alarms, attachments, projects, quickmemos
 from app.routers.auth import get_current_user
+from app.routers.alarms import serialize_alarm
 from app.models.models import Alarm
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -14,6 +15,15 @@ from app.models.models import Schedule, AlarmType
 import uvicorn
 import asyncio
 from app.core.alarm_checker import start_alarm_checker
+from app.core.alarm_retention import start_alarm_retention
+from app.core.alarm_coalescing import start_alarm_digest
+from app.core.alarm_outbox import enqueue_alarm, start_alarm_dispatcher
+from app.core.previews import shutdown_preview_workers
+from app.core.upload_reconciler import start_upload_reconciler
+from app.core.upload_layout import run_layout_migration
+from app.core.leader import run_as_leader
+from app.core.schedule_order import start_order_rebalancer
+from app.core.migrate_db import upgrade_schema
 from contextlib import asynccontextmanager
 from typing import Optional
 from fastapi.security import HTTPBearer
@@ -68,15 +78,27 @@ def get_terminal_type():
 logger = logging.getLogger(__name__)
 # Create database tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI application."""
     # Startup
-    asyncio.create_task(start_alarm_checker())
+    # 워커가 여러 개여도 백그라운드 작업은 리더로 선출된 워커 하나에서만 실행
+    leader_task = asyncio.create_task(run_as_leader([
+        start_alarm_checker,
+        start_alarm_retention,
+        start_alarm_digest,
+        start_alarm_dispatcher,
+        start_upload_reconciler,
+        run_layout_migration,
+        start_order_rebalancer,
+    ]))
     yield
     # Shutdown
-    # Add any cleanup code here if needed
+    leader_task.cancel()
+    await asyncio.gather(leader_task, return_exceptions=True)
+    shutdown_preview_workers()
 
 app = FastAPI(title="Schedule Management System", lifespan=lifespan)
 
@@ -87,6 +109,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Mount static files
@@ -107,12 +130,20 @@ async def get_entry_screen_dynamic(screen_id: int):
         logger.error(f"entryScreen.html not found for screen_id: {screen_id}")
         raise HTTPException(status_code=404, detail="entryScreen.html not found")
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+class PublicStaticFiles(StaticFiles):
+    """static 디렉터리를 서빙하되 첨부 파일 저장소(static/uploads)는 제외
 
-# 업로드된 파일들을 정적 파일로 서빙
-uploads_path = Path("uploads")
-uploads_path.mkdir(exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+    원본과 미리보기는 권한을 확인하는 /attachments 엔드포인트로만 내려받습니다.
+    """
+
+    async def get_response(self, path: str, scope) -> Response:
+        parts = Path(path).parts
+        # 대소문자를 구분하지 않는 파일 시스템에서도 막히도록 소문자로 비교
+        if parts and parts[0].lower() == "uploads":
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+app.mount("/static", PublicStaticFiles(directory="static"), name="static")
 
 # Include routers
 app.include_router(auth.router, tags=["authentication"])
@@ -225,23 +256,13 @@ async def get_alarms(
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """사용자의 알람 목록을 반환합니다"""
+    """사용자의 알람 목록을 반환합니다 (전체 목록. 새 클라이언트는 /alarms/feed 사용)"""
     alarms = db.query(Alarm).filter(
         Alarm.user_id == current_user.id,
         Alarm.is_deleted == False
     ).order_by(Alarm.created_at.desc()).all()
     #print(alarms)
-    return [
-        {
-            "id": alarm.id,
-            "type": alarm.type.value,
-            "message": alarm.message,
-            "is_acked": alarm.is_acked,
-            "created_at": alarm.created_at.isoformat(),
-            "schedule_id": alarm.schedule_id
-        }
-        for alarm in alarms
-    ]
+    return [serialize_alarm(alarm) for alarm in alarms]
 
 @app.post("/ack_alarms/{alarm_id}/ack")
 async def acknowledge_alarm(
@@ -318,15 +339,15 @@ async def request_completion(schedule_id: int, current_user = Depends(get_curren
     if schedule.is_completed:
         raise HTTPException(status_code=400, detail="스케쥴이 이미 완료되었습니다")
     
-    # 완료 요청 알람 생성
-    new_alarm = Alarm(
-        user_id=schedule.owner_id,  # 일정 소유자에게 알림
-        schedule_id=schedule_id,
-        type=AlarmType.COMPLETION_REQUEST,
-        message=f"{current_user.name}님이 일정 '{schedule.title}'의 완료를 요청했습니다."
+    # 완료 요청 알람 이벤트 기록 (반복 요청은 전달 시 기존 미확인 알람에 합쳐짐)
+    enqueue_alarm(
+        db,
+        schedule_id,
+        AlarmType.COMPLETION_REQUEST,
+        f"{current_user.name}님이 일정 '{schedule.title}'의 완료를 요청했습니다.",
+        recipient_ids=[schedule.owner_id],  # 일정 소유자에게 알림
+        actor_id=current_user.id
     )
-    
-    db.add(new_alarm)
     db.commit()
     
     return {"message": "Completion request sent", "schedule_id": schedule_id}
@@ -54,7 +54,24 @@ function setupEventListeners() {
     if (listViewBtn) listViewBtn.addEventListener('click', () => switchView('list'));
 }
 
-// 일정 데이터 로드
+// 현재 보기에 표시되는 날짜 범위 (월간: 6주 격자, 주간: 일~토)
+function getVisibleRange() {
+    const start = new Date(currentDate);
+    let days;
+    if (currentView === 'week') {
+        start.setDate(currentDate.getDate() - currentDate.getDay());
+        days = 7;
+    } else {
+        start.setDate(1);
+        start.setDate(start.getDate() - start.getDay());
+        days = 42;
+    }
+    const end = new Date(start);
+    end.setDate(start.getDate() + days - 1);
+    return { start, end };
+}
+
+// 일정 데이터 로드 (보이는 범위만 날짜별로 받아 옴)
 async function loadSchedules() {
     try {
         const token = localStorage.getItem('token');
@@ -65,8 +82,13 @@ async function loadSchedules() {
             return;
         }
         
-        //console.log('[TIME_DEBUG] Loading schedules from API...');
-        const response = await fetch('/schedules/', {
+        const { start, end } = getVisibleRange();
+        const params = new URLSearchParams({
+            start: formatDate(start),
+            end: formatDate(end),
+            tz: Intl.DateTimeFormat().resolvedOptions().timeZone
+        });
+        const response = await fetch(`/schedules/calendar?${params}`, {
             headers: {
                 'Authorization': `Bearer ${token}`
             }
@@ -74,16 +96,7 @@ async function loadSchedules() {
         
         if (response.ok) {
             const data = await response.json();
-            window.schedules = data.schedules || data || [];
-            
-            //console.log(`[TIME_DEBUG] Loaded ${window.schedules.length} schedules`);
-            // 처음 3개 스케줄의 시간 정보 로그
-            window.schedules.slice(0, 3).forEach((schedule, index) => {
-                //console.log(`[TIME_DEBUG] Schedule ${index + 1}: "${schedule.title}"`);
-                //console.log(`[TIME_DEBUG] - date: ${schedule.date}`);
-                //console.log(`[TIME_DEBUG] - due_time: ${schedule.due_time}`);
-            });
-            
+            window.calendarDays = data.days || {};
             renderCurrentView();
         } else {
             console.error('일정 로드 실패:', response.status);
@@ -272,30 +285,18 @@ function createWeeklyScheduleElement(schedule) {
         scheduleElement.classList.add('medium-priority');
     }
     
-    // 시간에 따른 위치 계산 (로컬 시간대 기준)
+    // 시간에 따른 위치 계산 (서버가 보는 사람의 시간대로 바꿔 준 시작 시각)
     let startTime, endTime;
-    if (schedule.due_time) {
-        const dueTime = new Date(schedule.due_time);
-        //console.log(`[TIME_DEBUG] Schedule "${schedule.title}": raw due_time: ${schedule.due_time}`);
-        //console.log(`[TIME_DEBUG] Parsed due_time (local): ${dueTime}`);
-        //console.log(`[TIME_DEBUG] Local Hours: ${dueTime.getHours()}, Minutes: ${dueTime.getMinutes()}`);
-        startTime = dueTime.getHours() + (dueTime.getMinutes() / 60);
-        endTime = startTime + 1; // 기본 1시간
-    } else if (schedule.date) {
-        const date = new Date(schedule.date);
-        //console.log(`[TIME_DEBUG] Schedule "${schedule.title}": raw date: ${schedule.date}`);
-        //console.log(`[TIME_DEBUG] Parsed date (local): ${date}`);
-        //console.log(`[TIME_DEBUG] Local Hours: ${date.getHours()}, Minutes: ${date.getMinutes()}`);
-        startTime = date.getHours() + (date.getMinutes() / 60);
-        endTime = startTime + 1;
+    if (schedule.time) {
+        const [hours, minutes] = schedule.time.split(':').map(Number);
+        startTime = hours + (minutes / 60);
+        endTime = Math.min(startTime + 1, 24); // 기본 1시간
     } else {
-        //console.log(`[TIME_DEBUG] Schedule "${schedule.title}": No time specified, using default 9-10`);
-        startTime = 9; // 기본 오전 9시
-        endTime = 10;
+        // 전날부터 이어지는 일정은 하루 맨 위에
+        startTime = 0;
+        endTime = 1;
     }
     
-    //console.log(`[TIME_DEBUG] Final time calculation for "${schedule.title}": startTime: ${startTime}, endTime: ${endTime}`);
-    
     scheduleElement.style.top = `${startTime * 60}px`;
     scheduleElement.style.height = `${(endTime - startTime) * 60 - 2}px`;
     scheduleElement.style.left = '2px';
@@ -308,40 +309,39 @@ function createWeeklyScheduleElement(schedule) {
     return scheduleElement;
 }
 
-// 특정 날짜의 일정들 가져오기
+// 특정 날짜의 일정들 가져오기 (날짜별 열 배열을 일정 객체 목록으로)
 function getSchedulesForDate(date) {
-    // 로컬 시간대를 유지하여 날짜 문자열 생성
-    const year = date.getFullYear();
-    const month = (date.getMonth() + 1).toString().padStart(2, '0');
-    const day = date.getDate().toString().padStart(2, '0');
-    const dateStr = `${year}-${month}-${day}`;
-    
-    //console.log(`[TIME_DEBUG] getSchedulesForDate called with date: ${date}`);
-    //console.log(`[TIME_DEBUG] dateStr for comparison (local time): ${dateStr}`);
-    
-    const filteredSchedules = (window.schedules || []).filter(schedule => {
-        // 스케줄의 날짜도 로컬 시간대를 유지하여 비교
-        const scheduleDate = new Date(schedule.date);
-        const scheduleYear = scheduleDate.getFullYear();
-        const scheduleMonth = (scheduleDate.getMonth() + 1).toString().padStart(2, '0');
-        const scheduleDay = scheduleDate.getDate().toString().padStart(2, '0');
-        const scheduleDateStr = `${scheduleYear}-${scheduleMonth}-${scheduleDay}`;
-        
-        //console.log(`[TIME_DEBUG] Schedule "${schedule.title}": raw date: ${schedule.date}, local converted: ${scheduleDateStr}, matches: ${scheduleDateStr === dateStr}`);
-        return scheduleDateStr === dateStr;
-    });
-    
-    //console.log(`[TIME_DEBUG] Found ${filteredSchedules.length} schedules for date ${dateStr}`);
-    return filteredSchedules;
+    const bucket = (window.calendarDays || {})[formatDate(date)];
+    if (!bucket) return [];
+    return bucket.id.map((id, i) => ({
+        id,
+        title: bucket.title[i],
+        priority: bucket.priority[i],
+        time: bucket.time[i],
+        completed: bucket.completed[i]
+    }));
 }
 
-// 일정 상세 표시
-function showScheduleDetail(schedule) {
+// 일정 상세 표시 (달력에는 요약만 있으므로 전체 일정을 받아 옴)
+async function showScheduleDetail(schedule) {
+    let detail = schedule;
+    try {
+        const response = await fetch(`/schedules/${schedule.id}`, {
+            headers: {
+                'Authorization': `Bearer ${localStorage.getItem('token')}`
+            }
+        });
+        if (response.ok) {
+            detail = await response.json();
+        }
+    } catch (error) {
+        console.error('일정 상세 로드 중 오류:', error);
+    }
     // 기존 main.js의 handleScheduleClick 함수 활용
     if (typeof handleScheduleClick === 'function') {
-        handleScheduleClick(schedule);
+        handleScheduleClick(detail);
     } else {
-        alert(`제목: ${schedule.title}\n설명: ${schedule.description || '없음'}`);
+        alert(`제목: ${detail.title}\n설명: ${detail.content || '없음'}`);
     }
 }
 
@@ -356,27 +356,27 @@ function formatDate(date) {
 // 네비게이션 함수들
 function goToPreviousMonth() {
     currentDate.setMonth(currentDate.getMonth() - 1);
-    renderMonthCalendar();
+    loadSchedules();
 }
 
 function goToNextMonth() {
     currentDate.setMonth(currentDate.getMonth() + 1);
-    renderMonthCalendar();
+    loadSchedules();
 }
 
 function goToPreviousWeek() {
     currentDate.setDate(currentDate.getDate() - 7);
-    renderWeeklyCalendar();
+    loadSchedules();
 }
 
 function goToNextWeek() {
     currentDate.setDate(currentDate.getDate() + 7);
-    renderWeeklyCalendar();
+    loadSchedules();
 }
 
 function goToToday() {
     currentDate = new Date();
-    renderCurrentView();
+    loadSchedules();
 }
 
 // 뷰 전환
@@ -6,6 +6,10 @@ let isSelectMode = false;
 let selectedFiles = new Set();
 let currentGalleryIndex = 0;
 let currentFile = null; // 컨텍스트 메뉴용
+const FILE_PAGE_SIZE = 200; // 한 번에 불러오는 파일 수
+let nextCursor = null; // 다음 페이지 커서 (서버 X-Next-Cursor)
+let currentSearchParams = null;
+let isLoadingMore = false;
 
 // 페이지 로드 시 초기화
 document.addEventListener('DOMContentLoaded', async () => {
@@ -95,6 +99,13 @@ function setupEventListeners() {
         }
     });
 
+    // 무한 스크롤
+    window.addEventListener('scroll', () => {
+        if (window.innerHeight + window.scrollY >= document.body.offsetHeight - 600) {
+            loadMoreFiles();
+        }
+    });
+
     // ESC 키로 갤러리 모달 닫기
     document.addEventListener('keydown', (e) => {
         if (e.key === 'Escape') {
@@ -129,10 +140,13 @@ async function searchFiles() {
                 params.append(key, value);
             }
         });
+        currentSearchParams = params;
+        nextCursor = null;
 
-        const response = await apiRequest(`/attachments/search?${params.toString()}`);
+        const response = await fetchFilePage(null);
         if (response.ok) {
             const files = await response.json();
+            nextCursor = response.headers.get('X-Next-Cursor');
             currentFiles = files;
             filteredFiles = files;
             renderFiles();
@@ -150,6 +164,45 @@ async function searchFiles() {
     }
 }
 
+// 검색 결과 한 페이지 요청
+async function fetchFilePage(cursor) {
+    const params = new URLSearchParams(currentSearchParams || '');
+    params.set('limit', FILE_PAGE_SIZE);
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    return apiRequest(`/attachments/search?${params.toString()}`);
+}
+
+// 스크롤이 끝에 가까워지면 다음 페이지를 이어서 불러옴
+async function loadMoreFiles() {
+    if (!nextCursor || isLoadingMore) return;
+    isLoadingMore = true;
+    try {
+        const response = await fetchFilePage(nextCursor);
+        if (response.ok) {
+            const files = await response.json();
+            nextCursor = response.headers.get('X-Next-Cursor');
+            const startIndex = currentFiles.length;
+            currentFiles = currentFiles.concat(files);
+            filteredFiles = currentFiles;
+            files.forEach((file, offset) => {
+                if (currentViewMode === 'grid') {
+                    renderFileGrid(file, startIndex + offset);
+                } else {
+                    renderFileList(file, startIndex + offset);
+                }
+            });
+        } else {
+            console.error('Failed to load more files:', response.status);
+        }
+    } catch (error) {
+        console.error('Load more files error:', error);
+    } finally {
+        isLoadingMore = false;
+    }
+}
+
 // 필터 초기화
 function clearFilters() {
     document.getElementById('start-date').value = '';
@@ -167,6 +220,7 @@ function clearFilters() {
     
     currentFiles = [];
     filteredFiles = [];
+    nextCursor = null;
 }
 
 // 뷰 모드 전환
@@ -331,11 +385,15 @@ function createThumbnail(file, mode) {
     const isImage = isImageFile(file.filename, file.mime_type);
     const isVideo = isVideoFile(file.filename, file.mime_type);
     
-    if (isImage) {
-        return `<img src="${file.file_path}" alt="${file.filename}" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex';">
+    const isPdf = isPdfFile(file.filename, file.mime_type);
+    
+    if (isImage || isPdf) {
+        // 원본 대신 서버에서 생성한 축소 미리보기를 사용
+        const previewSize = mode === 'list' ? 160 : 480;
+        return `<img src="/attachments/${file.id}/preview?size=${previewSize}" alt="${file.filename}" loading="lazy" onerror="this.style.display='none'; this.nextElementSibling.style.display='flex';">
                 <div class="file-icon-large" style="display:none;">${getFileIcon(file.filename, file.mime_type)}</div>`;
     } else if (isVideo) {
-        return `<video src="${file.file_path}" muted onclick="event.stopPropagation();">
+        return `<video src="${getContentUrl(file)}" preload="metadata" muted onclick="event.stopPropagation();">
                 <div class="file-icon-large">${getFileIcon(file.filename, file.mime_type)}</div>
                 </video>`;
     } else {
@@ -343,6 +401,19 @@ function createThumbnail(file, mode) {
     }
 }
 
+// 첨부파일 원본 URL (Range 요청 지원, 인증 필요)
+function getContentUrl(file, download = false) {
+    return `/attachments/${file.id}/content${download ? '?download=true' : ''}`;
+}
+
+// PDF 파일 체크
+function isPdfFile(filename, mimeType) {
+    if (mimeType === 'application/pdf') {
+        return true;
+    }
+    return filename.toLowerCase().endsWith('.pdf');
+}
+
 // 비디오 파일 체크
 function isVideoFile(filename, mimeType) {
     if (mimeType && mimeType.startsWith('video/')) {
@@ -407,9 +478,9 @@ function updateGalleryContent() {
     const isVideo = isVideoFile(file.filename, file.mime_type);
     
     if (isImage) {
-        mediaContainer.innerHTML = `<img src="${file.file_path}" alt="${file.filename}">`;
+        mediaContainer.innerHTML = `<img src="${getContentUrl(file)}" alt="${file.filename}">`;
     } else if (isVideo) {
-        mediaContainer.innerHTML = `<video src="${file.file_path}" controls style="max-width: 100%; max-height: 100%;">`;
+        mediaContainer.innerHTML = `<video src="${getContentUrl(file)}" controls style="max-width: 100%; max-height: 100%;">`;
     } else {
         mediaContainer.innerHTML = `<div class="file-icon-large" style="font-size: 120px; color: #6c757d;">${getFileIcon(file.filename, file.mime_type)}</div>`;
     }
@@ -524,7 +595,7 @@ function downloadFile() {
     if (!currentFile) return;
     
     const link = document.createElement('a');
-    link.href = currentFile.file_path;
+    link.href = getContentUrl(currentFile, true);
     link.download = currentFile.filename;
     link.target = '_blank';
     document.body.appendChild(link);
@@ -637,7 +708,7 @@ async function downloadSelected() {
         const file = currentFiles.find(f => f.id === fileId);
         if (file) {
             const link = document.createElement('a');
-            link.href = file.file_path;
+            link.href = getContentUrl(file, true);
             link.download = file.filename;
             link.target = '_blank';
             document.body.appendChild(link);
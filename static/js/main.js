@@ -127,6 +127,7 @@ window.schedules = window.schedules || [];
 let showCompleted = false;
 let completedOnly = false; // 완료된 일정만 보기 상태
 let selectedUsers = new Set();
+let searchQuery = ''; // 검색식 (서버 read_schedules 의 q 파라미터)
 let tokenRefreshInterval = null;
 let currentPage = 1;
 let isLoading = false;
@@ -464,6 +465,16 @@ function updateScheduleCount() {
     }
 }
 
+function searchSchedules(term) {
+    // 인자가 없으면 좌측 메뉴 검색창 값 사용
+    if (term === undefined) {
+        const searchInput = document.getElementById('search-input');
+        term = searchInput ? searchInput.value : '';
+    }
+    searchQuery = term.trim();
+    refreshSchedules();
+}
+
 async function refreshSchedules() {
     log('DEBUG', 'refreshSchedules 시작');
     currentPage = 1;
@@ -557,7 +568,7 @@ function renderFilesForMainView(files) { // 새 함수
         const hours = fileCreatedDate.getHours().toString().padStart(2, '0');
         const minutes = fileCreatedDate.getMinutes().toString().padStart(2, '0');
         const createdDate = `${year}-${month}-${day} ${hours}:${minutes}`;
-        const thumbnailHtml = createFileThumbnail(file.filename, file.file_path, file.mime_type);
+        const thumbnailHtml = createFileThumbnail(file.filename, attachmentPreviewUrl(file), file.mime_type);
         
         li.innerHTML = `
             ${thumbnailHtml}
@@ -569,7 +580,7 @@ function renderFilesForMainView(files) { // 새 함수
                 ${file.schedule_title ? `<span class="file-schedule">관련 일정: ${file.schedule_title}</span>` : ''}
             </div>
             <div class="file-actions">
-                <button onclick="downloadFile('${file.file_path}')">다운로드</button>
+                <button onclick="downloadFile('${attachmentContentUrl(file, true)}', '${file.filename.replace(/'/g, "\\'")}')">다운로드</button>
                 <button onclick="deleteFileFromMainView(${file.id})">삭제</button> 
             </div>
         `;
@@ -615,8 +626,16 @@ async function main_loadSchedules(page = 1, append = false) {
         params.append('show_completed', showCompleted.toString());
     }
 
+    // 사용자 필터와 검색어는 검색식으로 보내서 서버에서 거름 (owner:1,2 "문구" ...)
+    const queryParts = [];
     if (selectedUsers.size > 0) {
-        selectedUsers.forEach(userId => params.append('user_ids', userId));
+        queryParts.push(`owner:${Array.from(selectedUsers).join(',')}`);
+    }
+    if (searchQuery) {
+        queryParts.push(searchQuery);
+    }
+    if (queryParts.length > 0) {
+        params.append('q', queryParts.join(' '));
     }
     
     log('DEBUG', `Requesting schedules from: /schedules/?${params.toString()}`);
@@ -1175,7 +1194,7 @@ function renderAttachmentsForModal(attachments, scheduleId) {
     attachments.forEach(attachment => {
         const attachmentDiv = document.createElement('div');
         attachmentDiv.className = 'attachment-item';
-        const thumbnailHtml = createFileThumbnail(attachment.filename, attachment.file_path, attachment.mime_type);
+        const thumbnailHtml = createFileThumbnail(attachment.filename, attachmentPreviewUrl(attachment), attachment.mime_type);
         let attachment_filename_short = attachment.filename;
         if(attachment.filename.length>15){
             attachment_filename_short  = attachment.filename.substring(0, 12) + '...';
@@ -1185,7 +1204,7 @@ function renderAttachmentsForModal(attachments, scheduleId) {
         attachmentDiv.innerHTML = `
             ${thumbnailHtml}
             <div class="attachment-info">
-                <a href="${attachment.file_path}" target="_blank" download="${attachment.filename || 'download'}">
+                <a href="${attachmentContentUrl(attachment, true)}" target="_blank" download="${attachment.filename || 'download'}">
                   <span class="attachment-name">${attachment_filename_short}</span>
                 </a>
                 <span class="attachment-size">${formatFileSize(attachment.file_size || 0)}</span>
@@ -2301,15 +2320,32 @@ function updateUserFilterCheckboxes() {
 // --- ALARM FUNCTIONS ---
 let alarmPollingInterval = null;
 let alarms = [];
+// 서버가 유지하는 미확인 알람 수, 다음 페이지 조회용 커서
+let alarmUnreadCount = null;
+let alarmNextCursor = null;
+const ALARM_PAGE_SIZE = 50;
+
+async function fetchAlarmUnreadCount() {
+    const response = await apiRequest('/alarms/unread-count');
+    if (!response.ok) return null;
+    const data = await response.json();
+    return data.unread_count;
+}
 
 async function loadAlarms() {
     try {
-        const response = await apiRequest('/alarms'); // API 엔드포인트 확인
+        // 첫 페이지와 미확인 수를 함께 조회
+        const [response, unreadCount] = await Promise.all([
+            apiRequest(`/alarms/feed?limit=${ALARM_PAGE_SIZE}`),
+            fetchAlarmUnreadCount()
+        ]);
         if (response.ok) {
-            const alarmsData = await response.json();
+            const feed = await response.json();
             // 전역 alarms 변수 업데이트
-            alarms = alarmsData || [];
+            alarms = feed.items || [];
             window.alarms = alarms; // window 객체에도 설정
+            alarmNextCursor = feed.next_cursor;
+            if (unreadCount !== null) alarmUnreadCount = unreadCount;
             console.log('Alarms loaded:', alarms.length, 'alarms'); // 디버깅 로그
             renderAlarms();
         } else {
@@ -2324,6 +2360,33 @@ async function loadAlarms() {
     }
 }
 
+async function loadMoreAlarms() {
+    if (alarmNextCursor === null) return;
+    try {
+        const response = await apiRequest(`/alarms/feed?limit=${ALARM_PAGE_SIZE}&cursor=${encodeURIComponent(alarmNextCursor)}`);
+        if (!response.ok) return;
+        const feed = await response.json();
+        alarms = alarms.concat(feed.items || []);
+        window.alarms = alarms;
+        alarmNextCursor = feed.next_cursor;
+        renderAlarms();
+    } catch (error) {
+        log('ERROR', 'Alarm load more error', error);
+    }
+}
+
+// 주기적 확인은 미확인 수만 조회하고, 바뀌었을 때만 목록을 다시 불러옴
+async function pollAlarms() {
+    try {
+        const unreadCount = await fetchAlarmUnreadCount();
+        if (unreadCount !== null && unreadCount !== alarmUnreadCount) {
+            await loadAlarms();
+        }
+    } catch (error) {
+        log('ERROR', 'Alarm poll error', error);
+    }
+}
+
 // renderAlarms 함수 수정 - 미확인 알람 체크 기능 추가
 function renderAlarms() {
     const alarmListDiv = document.getElementById('alarm-list');
@@ -2337,8 +2400,10 @@ function renderAlarms() {
     const currentAlarms = window.alarms || alarms || [];
     console.log('Rendering alarms:', currentAlarms.length, 'total alarms'); // 디버깅 로그
     
-    // 미확인 알람 개수 체크
-    const unackedCount = currentAlarms.filter(alarm => !alarm.is_acked).length;
+    // 미확인 알람 개수 체크 (목록은 한 페이지만 있으므로 서버 카운터 우선)
+    const unackedCount = alarmUnreadCount !== null
+        ? alarmUnreadCount
+        : currentAlarms.filter(alarm => !alarm.is_acked).length;
     console.log('Unacked alarms count:', unackedCount); // 디버깅 로그
     updateAlarmIndicator(unackedCount);
     
@@ -2362,6 +2427,7 @@ function renderAlarms() {
             <div class="alarm-content">
                 <span class="alarm-type-badge">${getAlarmTypeText(alarm.type)}</span>
                 <span class="alarm-message">${alarm.message}</span>
+                ${alarm.count > 1 ? `<span class="alarm-count-badge" title="같은 알림 ${alarm.count}회">×${alarm.count}</span>` : ''}
                 <span class="alarm-time">${createdTime}</span>
             </div>
             <div class="alarm-actions">
@@ -2373,6 +2439,14 @@ function renderAlarms() {
         alarmListDiv.appendChild(alarmDiv);
     });
     
+    if (alarmNextCursor !== null) {
+        const moreButton = document.createElement('button');
+        moreButton.className = 'alarm-more-btn';
+        moreButton.textContent = '이전 알람 더 보기';
+        moreButton.onclick = loadMoreAlarms;
+        alarmListDiv.appendChild(moreButton);
+    }
+    
     console.log('Alarms rendered successfully'); // 디버깅 로그
 }
 
@@ -2442,7 +2516,7 @@ function updateAlarmIndicator(unackedCount) {
 }
 
 function getAlarmTypeText(type) {
-    const map = { 'schedule_due': '일정', 'memo': '새메모', 'share': '공유됨', 'completion_request': '완료요청', 'new_schedule': '새일정' };
+    const map = { 'schedule_due': '일정', 'memo': '새메모', 'share': '공유됨', 'completion_request': '완료요청', 'new_schedule': '새일정', 'digest': '요약' };
     return map[type] || type;
 }
 
@@ -2513,7 +2587,7 @@ async function clearAllAlarms() {
 function startAlarmPolling() {
     stopAlarmPolling(); // 기존 인터벌이 있다면 중지
     loadAlarms(); // 즉시 한번 로드
-    alarmPollingInterval = setInterval(loadAlarms, 30000); // 30초마다
+    alarmPollingInterval = setInterval(pollAlarms, 30000); // 30초마다 미확인 수 확인
     log('INFO', 'Alarm polling started.');
     console.log('Alarm polling started - will check every 30 seconds'); // 디버깅 로그
 }
@@ -2622,17 +2696,25 @@ async function deleteAllSchedules() {
         
         const schedules = await response.json();
         
-        // 각 일정을 순차적으로 삭제
-        for (const schedule of schedules) {
-            const deleteResponse = await fetch(`/schedules/${schedule.id}`, {
-                method: 'DELETE',
-                headers: { 'Authorization': `Bearer ${token}` }
-            });
-            
-            if (!deleteResponse.ok) {
-                console.error(`일정 ID ${schedule.id} 삭제 실패`);
-            }
+        // 한 번의 일괄 요청으로 삭제
+        const bulkResponse = await fetch('/schedules/bulk', {
+            method: 'POST',
+            headers: {
+                'Authorization': `Bearer ${token}`,
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                operations: schedules.map(schedule => ({ op: 'delete', id: schedule.id }))
+            })
+        });
+        
+        if (!bulkResponse.ok) {
+            throw new Error('일정 일괄 삭제에 실패했습니다.');
         }
+        const bulkResult = await bulkResponse.json();
+        bulkResult.results
+            .filter(result => result.status !== 'ok')
+            .forEach(result => console.error(`일정 ID ${result.id} 삭제 실패: ${result.detail}`));
         
         // 일정 목록 새로고침
         await refreshSchedules();
@@ -3092,11 +3174,21 @@ function createFileThumbnail(filename, filepath, mimeType) {
     }
 }
 
-function downloadFile(filePath) {
+// 첨부파일은 저장소(로컬/오브젝트 스토리지)와 관계없이 API를 통해 받음
+function attachmentContentUrl(attachment, download = false) {
+    return `/attachments/${attachment.id}/content${download ? '?download=true' : ''}`;
+}
+
+function attachmentPreviewUrl(attachment, size = 160) {
+    return `/attachments/${attachment.id}/preview?size=${size}`;
+}
+
+function downloadFile(filePath, filename) {
     // 파일 다운로드를 위한 임시 링크 생성
     const link = document.createElement('a');
     link.href = filePath;
-    link.download = filePath.split('/').pop(); // 파일명만 추출
+    // 저장소 키는 생성된 이름이므로 원본 파일명으로 저장
+    link.download = filename || filePath.split('/').pop();
     link.target = '_blank';
     document.body.appendChild(link);
     link.click();
@@ -77,15 +77,17 @@ async function viewParentSchedule(parentId) {
 
 // 후속 작업 보기
 async function viewChildrenSchedules(scheduleId) {
-    const response = await fetch(`/schedules/${scheduleId}/children`);
-    const children = await response.json();
+    // 하위 트리 전체를 한 번에 받아옴 (첫 항목은 자기 자신, 이후 전위 순회 순서)
+    const response = await fetch(`/schedules/${scheduleId}/tree`);
+    const nodes = await response.json();
+    const children = response.ok ? nodes.slice(1) : [];
     
     // children-modal.html을 사용하여 후속 작업 목록 표시
     const modal = new bootstrap.Modal(document.getElementById('childrenModal'));
     const childrenList = document.getElementById('childrenList');
     
     childrenList.innerHTML = children.map(child => `
-        <div class="child-schedule" onclick="showScheduleModal(${child.id})">
+        <div class="child-schedule" style="margin-left: ${(child.depth - 1) * 16}px" onclick="showScheduleModal(${child.id})">
             <div class="child-title">${child.title}</div>
             <div class="child-date">${new Date(child.date).toLocaleDateString()}</div>
         </div>
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.core import database
+from app.core.database import Base, SessionLocal
+from app.core.migrate_db import upgrade_schema
+
+@pytest.fixture
+def engine(tmp_path):
+    """
+    테스트마다 새 임시 DB 엔진. 앱의 sql_app.db 는 건드리지 않고,
+    SessionLocal 을 쓰는 백그라운드 작업도 이 DB 를 보도록 바꿔 둡니다.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    SessionLocal.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        SessionLocal.configure(bind=database.engine)
+        engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    db = Session(engine)
+    try:
+        yield db
+    finally:
+        db.close()
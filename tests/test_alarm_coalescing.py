@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.models import Alarm, AlarmDigestItem, AlarmType, AlarmUnreadCount, User
+from app.core import alarm_coalescing
+from app.core.alarm_coalescing import emit_alarms, flush_digests
+
+@pytest.fixture
+def users(db):
+    users = [
+        User(username=f"user{i}", name=f"User {i}", hashed_password="hashed_password")
+        for i in range(3)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+def unread(db, user):
+    db.expire_all()
+    counter = db.get(AlarmUnreadCount, user.id)
+    return counter.unread_count if counter else 0
+
+def test_burst_is_merged_into_one_row(db, users):
+    recipients = [user.id for user in users[1:]]
+    base = datetime(2026, 1, 1, 9, 0)
+    for i in range(5):
+        result = emit_alarms(
+            db, recipients, 1, AlarmType.MEMO, f"메모 {i}",
+            actor_id=users[0].id, now=base + timedelta(seconds=30 * i)
+        )
+        db.commit()
+    assert result == {"created": 0, "merged": 2, "digested": 0}
+
+    alarms = db.query(Alarm).filter(Alarm.user_id == users[1].id).all()
+    assert len(alarms) == 1
+    assert alarms[0].coalesced_count == 5
+    assert alarms[0].message == "메모 4"
+    assert alarms[0].last_actor_id == users[0].id
+    assert alarms[0].created_at == base + timedelta(seconds=120)
+    assert unread(db, users[1]) == 1
+
+def test_acked_or_expired_alarms_are_not_merged(db, users):
+    user = users[1]
+    base = datetime(2026, 1, 1, 9, 0)
+    emit_alarms(db, [user.id], 1, AlarmType.MEMO, "first", now=base)
+    db.commit()
+    db.query(Alarm).update({"is_acked": True})
+    db.commit()
+
+    emit_alarms(db, [user.id], 1, AlarmType.MEMO, "second", now=base + timedelta(seconds=10))
+    later = base + timedelta(seconds=alarm_coalescing.COALESCE_WINDOW_SECONDS + 60)
+    emit_alarms(db, [user.id], 1, AlarmType.MEMO, "third", now=later)
+    # 다른 일정이나 다른 종류는 따로 남음
+    emit_alarms(db, [user.id], 2, AlarmType.MEMO, "other schedule", now=later)
+    emit_alarms(db, [user.id], 1, AlarmType.COMPLETION_REQUEST, "other type", now=later)
+    db.commit()
+
+    assert db.query(Alarm).filter(Alarm.user_id == user.id).count() == 5
+    assert unread(db, user) == 4
+
+def test_digest_types_are_flushed_per_user(db, users, monkeypatch):
+    monkeypatch.setattr(alarm_coalescing, "DIGEST_TYPES", {"memo"})
+    base = datetime(2026, 1, 1, 9, 0)
+    for i in range(5):
+        result = emit_alarms(
+            db, [users[1].id, users[2].id], i, AlarmType.MEMO, f"메모 {i}",
+            now=base + timedelta(minutes=i)
+        )
+    db.commit()
+    assert result["digested"] == 2
+    assert db.query(Alarm).count() == 0
+
+    assert flush_digests(db, now=base + timedelta(hours=1)) == 2
+
+    digests = db.query(Alarm).filter(Alarm.user_id == users[1].id).all()
+    assert len(digests) == 1
+    assert digests[0].type == AlarmType.DIGEST
+    assert digests[0].coalesced_count == 5
+    assert digests[0].schedule_id is None
+    assert digests[0].message.endswith("외 2건")
+    assert db.query(AlarmDigestItem).count() == 0
+    assert unread(db, users[1]) == 1
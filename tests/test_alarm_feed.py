@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from app.models.models import Alarm, AlarmType, User
+from app.routers.alarms import get_alarm_feed, get_unread_count
+
+@pytest.fixture
+def user(db):
+    user = User(username="user", name="User", hashed_password="hashed_password")
+    db.add(user)
+    db.commit()
+    return user
+
+def add_alarms(db, user, count, alarm_type=AlarmType.MEMO):
+    base = datetime(2026, 1, 1)
+    alarms = [
+        Alarm(user_id=user.id, type=alarm_type, message=f"alarm {i}", created_at=base + timedelta(minutes=i))
+        for i in range(count)
+    ]
+    db.add_all(alarms)
+    db.commit()
+    return alarms
+
+def unread(db, user):
+    db.expire_all()
+    return get_unread_count(db=db, current_user=user)["unread_count"]
+
+def test_unread_counter_follows_ack_delete_and_clear(db, user):
+    alarms = add_alarms(db, user, 5)
+    assert unread(db, user) == 5
+
+    alarms[0].is_acked = True
+    db.commit()
+    alarms[0].is_deleted = True
+    db.commit()
+    assert unread(db, user) == 4
+
+    db.query(Alarm).filter(Alarm.user_id == user.id, Alarm.is_deleted == False).update({"is_deleted": True})
+    db.commit()
+    assert unread(db, user) == 0
+
+def test_feed_pages_with_cursor_and_type(db, user):
+    add_alarms(db, user, 5)
+    add_alarms(db, user, 3, AlarmType.COMPLETION_REQUEST)
+
+    seen = []
+    cursor = None
+    while True:
+        page = get_alarm_feed(cursor=cursor, type=None, limit=3, db=db, current_user=user)
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 8
+    assert len(set(seen)) == 8
+
+    page = get_alarm_feed(
+        cursor=None, type=[AlarmType.COMPLETION_REQUEST], limit=10, db=db, current_user=user
+    )
+    assert [item["type"] for item in page["items"]] == ["completion_request"] * 3
+    assert page["next_cursor"] is None
+
+    with pytest.raises(HTTPException) as error:
+        get_alarm_feed(cursor="not-a-cursor", type=None, limit=3, db=db, current_user=user)
+    assert error.value.status_code == 400
+
+def test_feed_cursor_survives_archived_or_bumped_alarm(db, user):
+    alarms = add_alarms(db, user, 6)
+    first = get_alarm_feed(cursor=None, type=None, limit=2, db=db, current_user=user)
+    assert [item["id"] for item in first["items"]] == [alarms[5].id, alarms[4].id]
+
+    # 커서가 가리키는 알람이 보관되어 테이블에서 빠져도 다음 페이지를 이어서 읽음
+    db.delete(alarms[4])
+    db.commit()
+    second = get_alarm_feed(cursor=first["next_cursor"], type=None, limit=2, db=db, current_user=user)
+    assert [item["id"] for item in second["items"]] == [alarms[3].id, alarms[2].id]
+
+    # 묶이면서 created_at 이 최신으로 바뀐 알람은 앞쪽으로 가고, 이어 읽는 페이지는 겹치지 않음
+    alarms[2].created_at = datetime(2026, 2, 1)
+    db.commit()
+    third = get_alarm_feed(cursor=second["next_cursor"], type=None, limit=2, db=db, current_user=user)
+    assert [item["id"] for item in third["items"]] == [alarms[1].id, alarms[0].id]
+    assert third["next_cursor"] is None
@@ -0,0 +1,107 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.models.models import Alarm, AlarmOutbox, AlarmType, Schedule, User
+from app.core import alarm_outbox
+from app.core.alarm_outbox import AlarmChannel, dispatch_batch, enqueue_alarm, prune_delivered
+from app.core.alarm_checker import create_alarms_for_schedule
+
+@pytest.fixture
+def users(db):
+    users = [
+        User(username=f"user{i}", name=f"User {i}", hashed_password="hashed_password")
+        for i in range(3)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+class FlakyChannel(AlarmChannel):
+    name = "flaky"
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, event):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("unreachable")
+        self.sent.append(event)
+
+def test_channel_must_implement_send():
+    class SilentChannel(AlarmChannel):
+        name = "silent"
+
+    with pytest.raises(TypeError):
+        SilentChannel()
+
+def test_enqueue_only_records_and_dispatch_fans_out(db, users):
+    enqueue_alarm(db, None, AlarmType.MEMO, "memo", exclude_user_id=users[0].id, actor_id=users[0].id)
+    db.commit()
+    assert db.query(Alarm).count() == 0
+
+    assert dispatch_batch(db, channels=[]) == {"delivered": 1, "retried": 0, "failed": 0}
+
+    alarms = db.query(Alarm).order_by(Alarm.user_id).all()
+    assert [alarm.user_id for alarm in alarms] == [users[1].id, users[2].id]
+    assert all(alarm.last_actor_id == users[0].id for alarm in alarms)
+    entry = db.query(AlarmOutbox).one()
+    assert entry.status == "delivered"
+    assert json.loads(entry.delivered_channels) == ["in_app"]
+
+def test_idempotency_key_deduplicates(db, users):
+    assert enqueue_alarm(db, None, AlarmType.MEMO, "memo", recipient_ids=[users[1].id], idempotency_key="k")
+    assert not enqueue_alarm(db, None, AlarmType.MEMO, "memo", recipient_ids=[users[1].id], idempotency_key="k")
+    db.commit()
+    dispatch_batch(db, channels=[])
+    assert db.query(Alarm).count() == 1
+
+def test_failed_channel_is_retried_without_duplicating_alarms(db, users):
+    channel = FlakyChannel(failures=2)
+    enqueue_alarm(db, None, AlarmType.COMPLETION_REQUEST, "done?", recipient_ids=[users[1].id])
+    db.commit()
+    now = datetime.now()
+
+    assert dispatch_batch(db, channels=[channel], now=now)["retried"] == 1
+    entry = db.query(AlarmOutbox).one()
+    assert entry.attempts == 1
+    assert entry.next_attempt_at == now + timedelta(seconds=alarm_outbox.RETRY_BASE_SECONDS)
+    # 재시도 시각 전에는 건드리지 않음
+    assert dispatch_batch(db, channels=[channel], now=now) == {"delivered": 0, "retried": 0, "failed": 0}
+
+    dispatch_batch(db, channels=[channel], now=now + timedelta(minutes=1))
+    result = dispatch_batch(db, channels=[channel], now=now + timedelta(minutes=5))
+    assert result["delivered"] == 1
+    assert db.query(Alarm).count() == 1
+    assert len(channel.sent) == 1
+    assert channel.sent[0]["idempotency_key"] == entry.idempotency_key
+    assert channel.sent[0]["user_ids"] == [users[1].id]
+
+def test_gives_up_after_max_attempts(db, users, monkeypatch):
+    monkeypatch.setattr(alarm_outbox, "MAX_ATTEMPTS", 2)
+    enqueue_alarm(db, None, AlarmType.MEMO, "memo", recipient_ids=[users[1].id])
+    db.commit()
+    channel = FlakyChannel(failures=10)
+    now = datetime.now()
+    dispatch_batch(db, channels=[channel], now=now)
+    assert dispatch_batch(db, channels=[channel], now=now + timedelta(hours=1))["failed"] == 1
+    assert db.query(AlarmOutbox).one().status == "failed"
+
+    assert prune_delivered(db, now=now + timedelta(days=30)) == 0
+
+def test_schedule_due_alarm_is_activated_and_checked_once_per_cycle(db, users):
+    schedule = Schedule(title="회의", owner_id=users[0].id, alarm_time=datetime(2026, 1, 1, 9, 0), individual=True)
+    db.add(schedule)
+    db.commit()
+    checked_at = datetime(2026, 1, 1, 9, 0, 30)
+    create_alarms_for_schedule(db, schedule, schedule.alarm_time, checked_at)
+    create_alarms_for_schedule(db, schedule, schedule.alarm_time, checked_at)
+    db.commit()
+
+    dispatch_batch(db, channels=[])
+
+    alarm = db.query(Alarm).one()
+    assert alarm.user_id == users[0].id
+    assert alarm.is_activated
+    assert alarm.activated_at is not None
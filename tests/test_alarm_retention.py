@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from app.models.models import Alarm, AlarmArchive, AlarmType, AlarmUnreadCount, User
+from app.core import alarm_retention
+
+def test_archive_moves_only_old_acked_or_deleted_alarms(db, monkeypatch):
+    monkeypatch.setattr(alarm_retention, "BATCH_SIZE", 2)
+    user = User(username="user", name="User", hashed_password="hashed_password")
+    db.add(user)
+    db.commit()
+
+    old = datetime.now() - timedelta(days=90)
+    recent = datetime.now() - timedelta(days=1)
+    alarms = {
+        "old_acked": Alarm(user_id=user.id, type=AlarmType.MEMO, created_at=old, is_acked=True),
+        "old_deleted": Alarm(user_id=user.id, type=AlarmType.MEMO, created_at=old, is_deleted=True),
+        "old_acked_2": Alarm(user_id=user.id, type=AlarmType.SHARE, created_at=old, is_acked=True),
+        "old_unread": Alarm(user_id=user.id, type=AlarmType.MEMO, created_at=old),
+        "recent_acked": Alarm(user_id=user.id, type=AlarmType.MEMO, created_at=recent, is_acked=True),
+    }
+    db.add_all(alarms.values())
+    db.commit()
+    ids = {name: alarm.id for name, alarm in alarms.items()}
+
+    cutoff = datetime.now() - timedelta(days=30)
+    moved = []
+    while True:
+        count = alarm_retention.archive_batch(db, cutoff)
+        if not count:
+            break
+        moved.append(count)
+
+    assert moved == [2, 1]
+    remaining = {alarm.id for alarm in db.query(Alarm)}
+    assert remaining == {ids["old_unread"], ids["recent_acked"]}
+    archived = {alarm.original_id: alarm for alarm in db.query(AlarmArchive)}
+    assert set(archived) == {ids["old_acked"], ids["old_deleted"], ids["old_acked_2"]}
+    assert archived[ids["old_acked_2"]].type == AlarmType.SHARE
+    # 미확인 알람은 옮기지 않으므로 카운터는 그대로
+    assert db.get(AlarmUnreadCount, user.id).unread_count == 1
+
+    stats = alarm_retention.alarm_table_stats(db)
+    assert stats["rows"] == 2
+    assert stats["archived_rows"] == 3
+    assert stats["feed_latency_ms"] is not None
+
+def test_reused_alarm_id_is_archived_again(db):
+    user = User(username="user", name="User", hashed_password="hashed_password")
+    db.add(user)
+    db.commit()
+    old = datetime.now() - timedelta(days=90)
+    cutoff = datetime.now() - timedelta(days=30)
+
+    first = Alarm(user_id=user.id, type=AlarmType.MEMO, message="first", created_at=old, is_acked=True)
+    db.add(first)
+    db.commit()
+    first_id = first.id
+    assert alarm_retention.archive_batch(db, cutoff) == 1
+
+    # 가장 큰 id 가 옮겨졌으므로 SQLite 가 같은 id 를 다시 씀
+    second = Alarm(user_id=user.id, type=AlarmType.MEMO, message="second", created_at=old, is_acked=True)
+    db.add(second)
+    db.commit()
+    assert second.id == first_id
+    assert alarm_retention.archive_batch(db, cutoff) == 1
+
+    assert db.query(Alarm).count() == 0
+    archived = db.query(AlarmArchive).order_by(AlarmArchive.id).all()
+    assert [(alarm.original_id, alarm.message) for alarm in archived] == [(first_id, "first"), (first_id, "second")]
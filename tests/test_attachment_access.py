@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import event
+from app.models.models import Schedule, User, Attachment, PriorityLevel
+from app.core.attachment_access import readable_attachments, modifiable_attachments
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+def make_attachments(db, owner, count, individual=False):
+    schedule = Schedule(
+        title="Schedule",
+        priority=PriorityLevel.MEDIUM,
+        owner_id=owner.id,
+        individual=individual
+    )
+    db.add(schedule)
+    db.commit()
+    attachments = [
+        Attachment(
+            filename=f"file_{i}.txt",
+            file_path=f"/static/uploads/file_{i}.txt",
+            file_size=1,
+            mime_type="text/plain",
+            schedule_id=schedule.id,
+            uploader_id=owner.id
+        )
+        for i in range(count)
+    ]
+    db.add_all(attachments)
+    db.commit()
+    return [attachment.id for attachment in attachments]
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+def count_queries(db, func):
+    counter = QueryCounter()
+    event.listen(db.get_bind(), "before_cursor_execute", counter)
+    try:
+        result = func()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", counter)
+    return result, counter.count
+
+def test_query_count_is_constant(db, users):
+    owner, other = users
+    ids = make_attachments(db, owner, 500)
+    db.refresh(other)
+    db.expunge_all()
+
+    small, small_count = count_queries(db, lambda: readable_attachments(db, ids[:5], other))
+    db.expunge_all()
+    large, large_count = count_queries(db, lambda: readable_attachments(db, ids, other))
+
+    assert len(small) == 5
+    assert len(large) == 500
+    assert small_count == large_count == 1
+    # 일정 정보가 함께 로드되어 추가 쿼리가 발생하지 않아야 함
+    _, extra = count_queries(db, lambda: [a.schedule.title for a in large])
+    assert extra == 0
+
+def test_permission_filtering(db, users):
+    owner, other = users
+    public_ids = make_attachments(db, owner, 2)
+    private_ids = make_attachments(db, owner, 2, individual=True)
+    requested = private_ids + public_ids + [public_ids[0], 99999]
+
+    assert [a.id for a in readable_attachments(db, requested, owner)] == private_ids + public_ids
+    assert [a.id for a in readable_attachments(db, requested, other)] == public_ids
+    assert modifiable_attachments(db, requested, other) == []
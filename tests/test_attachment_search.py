@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException, Response
+from app.models.models import Attachment, PriorityLevel, Schedule, User
+from app.core import migrate_db
+from app.routers.attachments import (
+    _filename_condition, count_attachments, get_all_attachments, search_attachments
+)
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+@pytest.fixture
+def attachments(db, users):
+    """같은 시각에 올린 파일, created_at 이 없는 예전 파일, 다른 사용자의 개인 일정 파일"""
+    owner, other = users
+    project = Schedule(title="Project", project_name="개발", priority=PriorityLevel.MEDIUM, owner_id=owner.id)
+    private = Schedule(title="Private", priority=PriorityLevel.MEDIUM, owner_id=other.id, individual=True)
+    db.add_all([project, private])
+    db.commit()
+
+    base = datetime(2026, 3, 1, 9)
+    rows = []
+    for index, filename in enumerate([
+        "report_2026.pdf", "Report_final.PDF", "photo.jpg", "meeting-notes.txt", "report_draft.docx", "budget.xlsx"
+    ]):
+        # 두 개씩 같은 created_at 을 가짐
+        rows.append(Attachment(
+            filename=filename, file_path=f"/static/uploads/{filename}", file_size=1,
+            schedule_id=project.id, uploader_id=owner.id, created_at=base + timedelta(days=index // 2)
+        ))
+    db.add_all(rows)
+    db.commit()
+    legacy = [
+        Attachment(filename=f"legacy_report_{i}.pdf", file_path=f"/static/uploads/legacy_{i}.pdf",
+                   file_size=1, schedule_id=project.id, uploader_id=owner.id)
+        for i in range(3)
+    ]
+    hidden = Attachment(filename="report_secret.pdf", file_path="/static/uploads/secret.pdf", file_size=1,
+                        schedule_id=private.id, uploader_id=other.id, created_at=base)
+    db.add_all(legacy + [hidden])
+    db.commit()
+    # 예전 행은 created_at 이 비어 있음
+    db.query(Attachment).filter(Attachment.id.in_([row.id for row in legacy])).update(
+        {Attachment.created_at: None}, synchronize_session=False
+    )
+    db.commit()
+    return rows + legacy
+
+def search_params(**kwargs):
+    params = dict(
+        start_date=None, end_date=None, filename_pattern=None, uploader_id=None,
+        project_name=None, schedule_title=None
+    )
+    params.update(kwargs)
+    return params
+
+def all_pages(fetch, limit):
+    """X-Next-Cursor 를 따라가며 모든 페이지의 id 를 모읍니다."""
+    ids, cursor, pages = [], None, 0
+    while True:
+        response = Response()
+        page = asyncio.run(fetch(response, cursor, limit))
+        pages += 1
+        assert len(page) <= limit
+        ids.extend(attachment.id for attachment in page)
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return ids, pages
+
+def expected_order(rows):
+    dated = sorted((row for row in rows if row.created_at), key=lambda row: (row.created_at, row.id), reverse=True)
+    legacy = sorted((row.id for row in rows if row.created_at is None), reverse=True)
+    return [row.id for row in dated] + legacy
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 100])
+def test_keyset_pages_cover_every_row_once(db, users, attachments, limit):
+    owner, _ = users
+    expected = expected_order(attachments)
+
+    ids, pages = all_pages(
+        lambda response, cursor, limit: get_all_attachments(response, cursor=cursor, limit=limit, db=db, current_user=owner),
+        limit
+    )
+    assert ids == expected
+    assert pages == -(-len(expected) // limit)
+
+    # limit 이 없으면 전체를 한 번에
+    response = Response()
+    everything = asyncio.run(get_all_attachments(response, cursor=None, limit=None, db=db, current_user=owner))
+    assert [attachment.id for attachment in everything] == expected
+    assert "x-next-cursor" not in response.headers
+
+def test_search_pages_and_count_agree(db, users, attachments):
+    owner, other = users
+    params = search_params(filename_pattern="report")
+    ids, _ = all_pages(
+        lambda response, cursor, limit: search_attachments(
+            response, db=db, current_user=owner, cursor=cursor, limit=limit, **params
+        ),
+        2
+    )
+    reports = [row for row in attachments if "report" in row.filename.lower()]
+    assert ids == expected_order(reports)
+    assert asyncio.run(count_attachments(db=db, current_user=owner, **params)) == {"total": len(reports)}
+    # 다른 사용자의 개인 일정 파일은 작성자에게만 보임
+    assert asyncio.run(count_attachments(db=db, current_user=other, **params)) == {"total": len(reports) + 1}
+
+    dated = search_params(filename_pattern="report", start_date="2026-03-01", end_date="2026-03-02")
+    assert asyncio.run(count_attachments(db=db, current_user=owner, **dated)) == {"total": 2}
+    assert asyncio.run(count_attachments(
+        db=db, current_user=owner, **search_params(filename_pattern="*.pdf", project_name="개발")
+    )) == {"total": 5}
+
+def test_invalid_cursor_is_rejected(db, users, attachments):
+    owner, _ = users
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_all_attachments(Response(), cursor="not-a-cursor", limit=2, db=db, current_user=owner))
+    assert error.value.status_code == 400
+
+def test_trigram_index_matches_like_search(db, users, attachments, monkeypatch):
+    owner, _ = users
+    assert migrate_db.attachment_fts_enabled
+    assert migrate_db.ATTACHMENT_FTS_TABLE in str(_filename_condition("report"))
+    # 3글자보다 짧은 조각만 있으면 인덱스를 쓸 수 없으므로 LIKE 로 찾음
+    assert migrate_db.ATTACHMENT_FTS_TABLE not in str(_filename_condition("re*df"))
+
+    patterns = ["report", "REPORT", "port_", "*.pdf", "report*.pdf", "notes", "re*df", "없음"]
+    with_index = {
+        pattern: asyncio.run(count_attachments(db=db, current_user=owner, **search_params(filename_pattern=pattern)))
+        for pattern in patterns
+    }
+    monkeypatch.setattr(migrate_db, "attachment_fts_enabled", False)
+    without_index = {
+        pattern: asyncio.run(count_attachments(db=db, current_user=owner, **search_params(filename_pattern=pattern)))
+        for pattern in patterns
+    }
+    assert with_index == without_index
+    assert with_index["report"] == {"total": 6}
+
+    # 이름을 바꾸면 트리거로 인덱스도 바뀜
+    monkeypatch.setattr(migrate_db, "attachment_fts_enabled", True)
+    renamed = db.query(Attachment).filter(Attachment.filename == "photo.jpg").one()
+    renamed.filename = "report_photo.jpg"
+    db.commit()
+    assert asyncio.run(count_attachments(
+        db=db, current_user=owner, **search_params(filename_pattern="report_photo")
+    )) == {"total": 1}
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+import pytest
+from fastapi import HTTPException
+from app.models.models import PriorityLevel, Schedule, User
+from app.routers.schedules import read_calendar
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+def add(db, owner, title, start, due=None, **kwargs):
+    schedule = Schedule(
+        title=title, date=start, due_time=due, priority=PriorityLevel.HIGH, owner_id=owner.id, **kwargs
+    )
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def calendar(db, user, start, end, tz=None):
+    return read_calendar(start, end, tz, db=db, current_user=user)
+
+def test_days_are_column_buckets_with_multi_day_expansion(db, users):
+    owner, other = users
+    trip = add(db, owner, "trip", datetime(2026, 9, 29, 9, 0), datetime(2026, 10, 2, 18, 0))
+    meeting = add(db, owner, "meeting", datetime(2026, 10, 1, 14, 30), is_completed=True)
+    add(db, owner, "outside", datetime(2026, 10, 20, 9, 0))
+    add(db, owner, "private", datetime(2026, 10, 1, 8, 0), individual=True)
+    add(db, owner, "deleted", datetime(2026, 10, 1, 8, 0), is_deleted=True)
+
+    result = calendar(db, other, date(2026, 10, 1), date(2026, 10, 3))
+
+    assert list(result["days"]) == ["2026-10-01", "2026-10-02"]
+    assert result["days"]["2026-10-01"] == {
+        "id": [trip.id, meeting.id],
+        "title": ["trip", "meeting"],
+        "priority": ["급함", "급함"],
+        "time": [None, "14:30"],
+        "completed": [False, True],
+    }
+    assert result["days"]["2026-10-02"]["id"] == [trip.id]
+    # 본인에게는 개인일정도 보임
+    assert "private" in calendar(db, owner, date(2026, 10, 1), date(2026, 10, 1))["days"]["2026-10-01"]["title"]
+
+def test_time_zone_moves_entries_across_days(db, users):
+    owner, _ = users
+    add(db, owner, "late", datetime(2026, 10, 1, 23, 30))
+
+    # 저장 시각은 Asia/Seoul 기준. UTC 로 보면 같은 날 14:30
+    utc = calendar(db, owner, date(2026, 10, 1), date(2026, 10, 1), tz="UTC")
+    assert utc["days"]["2026-10-01"]["time"] == ["14:30"]
+    la = calendar(db, owner, date(2026, 10, 1), date(2026, 10, 1), tz="America/Los_Angeles")
+    assert la["days"]["2026-10-01"]["time"] == ["07:30"]
+    assert calendar(db, owner, date(2026, 10, 2), date(2026, 10, 2), tz="Pacific/Kiritimati")["days"] != {}
+
+def test_recurring_schedules_appear_per_occurrence(db, users):
+    owner, _ = users
+    weekly = add(
+        db, owner, "weekly", datetime(2026, 1, 5, 10, 0),
+        rrule="FREQ=WEEKLY;BYDAY=MO"
+    )
+
+    days = calendar(db, owner, date(2026, 10, 1), date(2026, 10, 31))["days"]
+
+    assert list(days) == ["2026-10-05", "2026-10-12", "2026-10-19", "2026-10-26"]
+    assert days["2026-10-05"]["id"] == [weekly.id]
+
+def test_rejects_bad_ranges_and_zones(db, users):
+    owner, _ = users
+    for start, end, tz in [
+        (date(2026, 10, 2), date(2026, 10, 1), None),
+        (date(2026, 1, 1), date(2026, 12, 31), None),
+        (date(2026, 10, 1), date(2026, 10, 2), "Mars/Olympus"),
+    ]:
+        with pytest.raises(HTTPException) as exc:
+            calendar(db, owner, start, end, tz)
+        assert exc.value.status_code == 400
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime, timedelta
+from app.models.models import LeaderLease
+from app.core import leader
+from app.core.leader import release, run_as_leader, try_acquire
+
+def test_only_one_holder_until_expiry(db):
+    now = datetime(2026, 1, 1, 9, 0)
+    assert try_acquire(db, "jobs", "a", ttl_seconds=15, now=now)
+    assert not try_acquire(db, "jobs", "b", ttl_seconds=15, now=now + timedelta(seconds=5))
+
+    # 갱신하면 만료가 밀리고 처음 얻은 시각은 유지
+    assert try_acquire(db, "jobs", "a", ttl_seconds=15, now=now + timedelta(seconds=10))
+    assert not try_acquire(db, "jobs", "b", ttl_seconds=15, now=now + timedelta(seconds=20))
+    lease = db.get(LeaderLease, "jobs")
+    assert lease.acquired_at == now
+    assert lease.expires_at == now + timedelta(seconds=25)
+
+    # 갱신이 끊기면 만료 후 다른 워커가 인수
+    assert try_acquire(db, "jobs", "b", ttl_seconds=15, now=now + timedelta(seconds=26))
+    assert not try_acquire(db, "jobs", "a", ttl_seconds=15, now=now + timedelta(seconds=27))
+
+def test_release_lets_other_worker_take_over(db):
+    assert try_acquire(db, "jobs", "a")
+    release(db, "jobs", "b")  # 남의 임대는 놓을 수 없음
+    assert not try_acquire(db, "jobs", "b")
+    release(db, "jobs", "a")
+    assert try_acquire(db, "jobs", "b")
+
+def test_jobs_fail_over_when_leader_dies(db, monkeypatch):
+    monkeypatch.setattr(leader, "LEASE_TTL_SECONDS", 1)
+    monkeypatch.setattr(leader, "HEARTBEAT_SECONDS", 0.05)
+    running = []
+
+    def job(holder):
+        async def run():
+            running.append(holder)
+            await asyncio.Event().wait()
+        return run
+
+    async def scenario():
+        worker_a = asyncio.create_task(run_as_leader([job("a")], name="jobs", holder="a"))
+        await asyncio.sleep(0.2)
+        worker_b = asyncio.create_task(run_as_leader([job("b")], name="jobs", holder="b"))
+        await asyncio.sleep(0.3)
+        assert running == ["a"]
+
+        # 임대를 놓지 못하고 죽은 경우: 만료 후 b 가 인수
+        monkeypatch.setattr(leader, "_release", lambda name, holder: None)
+        worker_a.cancel()
+        await asyncio.sleep(1.5)
+        assert running == ["a", "b"]
+
+        worker_b.cancel()
+        await asyncio.gather(worker_a, worker_b, return_exceptions=True)
+
+    asyncio.run(scenario())
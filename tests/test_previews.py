@@ -0,0 +1,160 @@
+import io
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+from starlette.requests import Request
+from app.models.models import Attachment, PriorityLevel, Schedule, User
+from app.core import previews
+from app.core.previews import generate_previews, get_or_create_preview, normalize_size, preview_key
+from app.core.storage import LocalStorage
+from app.routers.attachments import PREVIEW_CACHE_MAX_AGE, get_attachment_preview
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(tmp_path / "uploads")
+
+def image_bytes(size, color="red", format="PNG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format)
+    return buffer.getvalue()
+
+def pdf_bytes():
+    """첫 페이지는 가로로 긴 빨간 페이지, 두 번째 페이지는 세로로 긴 파란 페이지"""
+    import fitz
+
+    document = fitz.open()
+    first = document.new_page(width=800, height=400)
+    first.draw_rect(first.rect, color=(1, 0, 0), fill=(1, 0, 0))
+    second = document.new_page(width=400, height=800)
+    second.draw_rect(second.rect, color=(0, 0, 1), fill=(0, 0, 1))
+    data = document.tobytes()
+    document.close()
+    return data
+
+def preview_image(storage, key):
+    with storage.open(key) as src:
+        image = Image.open(io.BytesIO(src.read()))
+        image.load()
+    return image
+
+def test_normalize_size():
+    assert normalize_size(1) == 160
+    assert normalize_size(160) == 160
+    assert normalize_size(161) == 480
+    assert normalize_size(5000) == 1280
+
+def test_image_previews_fit_each_size(storage):
+    storage.put("ab/cd/photo.png", io.BytesIO(image_bytes((2000, 1000))))
+
+    result = generate_previews(storage, "ab/cd/photo.png", "photo.png", "image/png", sizes=(160, 480, 1280))
+
+    assert result == {size: preview_key("ab/cd/photo.png", size) for size in (160, 480, 1280)}
+    for size, key in result.items():
+        image = preview_image(storage, key)
+        assert image.format == "JPEG"
+        assert image.size == (size, size // 2)
+
+def test_pdf_preview_rasterizes_first_page(storage):
+    storage.put("ab/cd/doc.pdf", io.BytesIO(pdf_bytes()))
+
+    result = generate_previews(storage, "ab/cd/doc.pdf", "doc.pdf", "application/pdf", sizes=(480,))
+
+    image = preview_image(storage, result[480])
+    assert image.size == (480, 240)
+    red, green, blue = image.convert("RGB").getpixel((240, 120))
+    assert red > 200 and green < 60 and blue < 60
+
+def test_unpreviewable_or_missing_files(storage):
+    storage.put("ab/cd/notes.txt", io.BytesIO(b"text"))
+    storage.put("ab/cd/broken.jpg", io.BytesIO(b"not an image"))
+
+    assert generate_previews(storage, "ab/cd/notes.txt", "notes.txt", "text/plain") == {}
+    assert generate_previews(storage, "ab/cd/broken.jpg", "broken.jpg", "image/jpeg") == {}
+    assert generate_previews(storage, "ab/cd/gone.jpg", "gone.jpg", "image/jpeg") == {}
+    assert get_or_create_preview(storage, "ab/cd/gone.jpg", "gone.jpg", "image/jpeg", 160) is None
+
+def test_missing_cached_preview_is_created_on_request(storage):
+    storage.put("ab/cd/photo.png", io.BytesIO(image_bytes((600, 600))))
+    # 업로드 때 만든 캐시가 지워졌거나 미리 만들지 않는 크기
+    assert storage.stat(preview_key("ab/cd/photo.png", 1280)) is None
+
+    key, stored = get_or_create_preview(storage, "ab/cd/photo.png", "photo.png", "image/png", 1280)
+
+    assert key == preview_key("ab/cd/photo.png", 1280)
+    assert stored == storage.stat(key)
+    # 다음 요청은 캐시를 그대로 씀
+    assert get_or_create_preview(storage, "ab/cd/photo.png", "photo.png", "image/png", 1280) == (key, stored)
+
+@pytest.fixture
+def attachment(db, storage):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    db.add(owner)
+    db.commit()
+    schedule = Schedule(title="Schedule", priority=PriorityLevel.MEDIUM, owner_id=owner.id)
+    db.add(schedule)
+    db.commit()
+    storage.put("ab/cd/photo.png", io.BytesIO(image_bytes((600, 300))))
+    attachment = Attachment(
+        filename="photo.png", file_path="/static/uploads/ab/cd/photo.png", file_size=1,
+        mime_type="image/png", schedule_id=schedule.id, uploader_id=owner.id
+    )
+    db.add(attachment)
+    db.commit()
+    return attachment
+
+def request(headers=None):
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+def get_preview(db, storage, attachment, size=160, headers=None):
+    return asyncio.run(get_attachment_preview(
+        attachment.id, request(headers), size=size, db=db, current_user=attachment.uploader, storage=storage
+    ))
+
+def test_preview_endpoint_sets_cache_headers(db, storage, attachment):
+    response = get_preview(db, storage, attachment, size=200)
+
+    assert response.status_code == 200
+    assert response.media_type == "image/jpeg"
+    assert response.headers["cache-control"] == f"private, max-age={PREVIEW_CACHE_MAX_AGE}"
+    etag = response.headers["etag"]
+    assert etag == storage.stat(preview_key("ab/cd/photo.png", 480)).etag
+
+    response = get_preview(db, storage, attachment, size=200, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+def test_preview_endpoint_without_preview_returns_404(db, storage, attachment):
+    attachment.filename, attachment.mime_type = "notes.txt", "text/plain"
+    db.commit()
+    with pytest.raises(HTTPException) as error:
+        get_preview(db, storage, attachment)
+    assert error.value.status_code == 404
+
+    attachment.filename, attachment.mime_type = "photo.png", "image/png"
+    storage.delete("ab/cd/photo.png")
+    db.commit()
+    with pytest.raises(HTTPException) as error:
+        get_preview(db, storage, attachment)
+    assert error.value.status_code == 404
+
+def test_shutdown_cancels_queued_preview_jobs(storage, monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(previews, "_executor", executor)
+    release = threading.Event()
+    running = executor.submit(release.wait, 5)
+    storage.put("ab/cd/photo.png", io.BytesIO(image_bytes((100, 100))))
+
+    queued = previews.schedule_previews(storage, "ab/cd/photo.png", "photo.png", "image/png")
+    assert previews.schedule_previews(storage, "ab/cd/notes.txt", "notes.txt", "text/plain") is None
+
+    previews.shutdown_preview_workers()
+    release.set()
+    assert queued.cancelled()
+    assert running.result() is True
+    assert storage.stat(preview_key("ab/cd/photo.png", 160)) is None
+    with pytest.raises(RuntimeError):
+        previews.schedule_previews(storage, "ab/cd/photo.png", "photo.png", "image/png")
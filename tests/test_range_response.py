@@ -0,0 +1,141 @@
+import os
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core.range_response import RangeFileResponse, RangeStreamResponse, file_etag, parse_range
+
+DATA = bytes(range(256)) * 4
+
+@pytest.fixture
+def client(tmp_path):
+    """같은 내용을 로컬 파일(/file)과 스트림(/stream)으로 돌려주는 앱"""
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    app = FastAPI()
+
+    @app.get("/file")
+    def file(request: Request):
+        return RangeFileResponse(str(path), request, filename="data.bin")
+
+    @app.get("/empty")
+    def empty_file(request: Request):
+        return RangeFileResponse(str(empty), request)
+
+    @app.get("/stream")
+    def stream(request: Request):
+        stat_result = os.stat(path)
+        return RangeStreamResponse(
+            lambda start, end: iter([DATA[start:end + 1]]),
+            request, len(DATA), file_etag(stat_result), stat_result.st_mtime, filename="data.bin"
+        )
+
+    return TestClient(app)
+
+def test_parse_range():
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=500-5000", 1000) == (500, 999)
+    # 해석할 수 없거나 다중 범위는 전체 전송
+    assert parse_range("bytes=0-9,20-29", 1000) is None
+    assert parse_range("items=0-9", 1000) is None
+    assert parse_range("bytes=abc-", 1000) is None
+
+def test_parse_range_unsatisfiable():
+    with pytest.raises(ValueError):
+        parse_range("bytes=1000-", 1000)
+    with pytest.raises(ValueError):
+        parse_range("bytes=-0", 1000)
+    # 빈 파일에는 만족할 수 있는 범위가 없음
+    with pytest.raises(ValueError):
+        parse_range("bytes=-100", 0)
+    with pytest.raises(ValueError):
+        parse_range("bytes=0-", 0)
+
+def test_range_stream_response():
+    from fastapi import FastAPI, Request
+    from fastapi.testclient import TestClient
+    from app.core.range_response import RangeStreamResponse
+
+    data = bytes(range(256)) * 4
+    app = FastAPI()
+
+    @app.get("/blob")
+    def blob(request: Request):
+        return RangeStreamResponse(
+            lambda start, end: iter([data[start:end + 1]]),
+            request, len(data), '"v1"', 0.0, media_type="application/octet-stream"
+        )
+
+    client = TestClient(app)
+    response = client.get("/blob", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == data[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(data)}"
+    assert client.get("/blob").content == data
+    assert client.get("/blob", headers={"If-None-Match": '"v1"'}).status_code == 304
+    assert client.get("/blob", headers={"Range": "bytes=5000-"}).status_code == 416
+
+@pytest.mark.parametrize("url", ["/file", "/stream"])
+def test_partial_content(client, url):
+    response = client.get(url, headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == DATA[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(DATA)}"
+    assert response.headers["content-length"] == "100"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-disposition"] == "inline; filename*=utf-8''data.bin"
+
+    response = client.get(url, headers={"Range": "bytes=-10"})
+    assert response.status_code == 206
+    assert response.content == DATA[-10:]
+
+@pytest.mark.parametrize("url", ["/file", "/stream"])
+def test_if_range_mismatch_sends_full_body(client, url):
+    etag = client.get(url).headers["etag"]
+    response = client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert response.status_code == 206
+    assert response.content == DATA[:10]
+
+    # 검증값이 바뀌었으면 구간 대신 전체 본문을 200 으로
+    response = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"changed"'})
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert "content-range" not in response.headers
+
+@pytest.mark.parametrize("url", ["/file", "/stream"])
+def test_if_none_match_returns_not_modified(client, url):
+    etag = client.get(url).headers["etag"]
+    response = client.get(url, headers={"If-None-Match": f'"other", {etag}', "Range": "bytes=0-9"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+@pytest.mark.parametrize("url", ["/file", "/stream"])
+def test_unsatisfiable_range(client, url):
+    response = client.get(url, headers={"Range": f"bytes={len(DATA)}-"})
+    assert response.status_code == 416
+    assert response.content == b""
+    assert response.headers["content-range"] == f"bytes */{len(DATA)}"
+
+def test_empty_file(client):
+    response = client.get("/empty")
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["content-length"] == "0"
+
+    response = client.get("/empty", headers={"Range": "bytes=-100"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */0"
+
+def test_subclass_must_implement_send_range():
+    from app.core.range_response import RangeResponse
+
+    class Incomplete(RangeResponse):
+        pass
+
+    with pytest.raises(TypeError, match="abstract"):
+        Incomplete()
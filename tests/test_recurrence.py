@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from app.models.models import AlarmOutbox, PriorityLevel, Schedule, ScheduleOccurrenceOverride, User
+from app.core.alarm_checker import check_recurring_alarms
+from app.core.recurrence import occurrence_starts, parse_rrule, recurrence_end
+from app.routers.schedules import cancel_occurrence, create_schedule, read_schedules, update_occurrence, update_schedule
+from app.schemas.schemas import OccurrenceOverride, Schedule as ScheduleSchema, ScheduleCreate
+
+@pytest.fixture
+def owner(db):
+    user = User(username="owner", name="Owner", hashed_password="hashed_password")
+    db.add(user)
+    db.commit()
+    return user
+
+def starts(rrule, dtstart, start, end):
+    return occurrence_starts(parse_rrule(rrule), dtstart, start, end)
+
+def create(db, owner, rrule, date=datetime(2026, 1, 5, 9, 0), **kwargs):
+    body = ScheduleCreate(title="standup", date=date, priority=PriorityLevel.MEDIUM, rrule=rrule, **kwargs)
+    return create_schedule(body, db=db, current_user=owner)
+
+def read(db, owner, start, end, **kwargs):
+    return read_schedules(
+        start_date=start, end_date=end, search_terms=None, exclude_terms=None,
+        db=db, current_user=owner, **kwargs
+    )
+
+def test_rule_expansion():
+    monday = datetime(2026, 1, 5, 9, 0)
+    assert starts("FREQ=WEEKLY;BYDAY=MO,WE", monday, monday, datetime(2026, 1, 14, 23, 59)) == [
+        monday, datetime(2026, 1, 7, 9, 0), datetime(2026, 1, 12, 9, 0), datetime(2026, 1, 14, 9, 0)
+    ]
+    # 31일이 없는 달은 건너뜀, -1 은 말일
+    jan31 = datetime(2026, 1, 31)
+    assert [d.month for d in starts("FREQ=MONTHLY", jan31, jan31, datetime(2026, 6, 1))] == [1, 3, 5]
+    assert [d.day for d in starts("FREQ=MONTHLY;BYMONTHDAY=-1", jan31, jan31, datetime(2026, 3, 31))] == [31, 28, 31]
+    assert recurrence_end(parse_rrule("FREQ=DAILY;INTERVAL=2;COUNT=3"), monday) == datetime(2026, 1, 9, 9, 0)
+    assert starts("FREQ=YEARLY;UNTIL=20281231", datetime(2024, 2, 29), datetime(2024, 1, 1), datetime(2030, 1, 1)) == [
+        datetime(2024, 2, 29), datetime(2028, 2, 29)
+    ]
+    for bad in ("FREQ=HOURLY", "FREQ=DAILY;BYSETPOS=1", "FREQ=DAILY;COUNT=2;UNTIL=20260101", "FREQ=DAILY;BYDAY=MO"):
+        with pytest.raises(ValueError):
+            parse_rrule(bad)
+
+def test_ten_years_daily_is_one_row_expanded_per_window(db, owner):
+    create(db, owner, "FREQ=DAILY;UNTIL=20351231", due_time=datetime(2026, 1, 5, 10, 0))
+    create_schedule(
+        ScheduleCreate(
+            title="one-off", date=datetime(2030, 6, 2, 12, 0), due_time=datetime(2030, 6, 2, 13, 0),
+            priority=PriorityLevel.LOW
+        ),
+        db=db, current_user=owner
+    )
+
+    assert db.query(Schedule).count() == 2
+    rows = read(db, owner, datetime(2030, 6, 1), datetime(2030, 6, 3, 23, 59))
+    assert [(row.title, row.date) for row in rows] == [
+        ("standup", datetime(2030, 6, 1, 9, 0)),
+        ("standup", datetime(2030, 6, 2, 9, 0)),
+        ("one-off", datetime(2030, 6, 2, 12, 0)),
+        ("standup", datetime(2030, 6, 3, 9, 0)),
+    ]
+    # 회차의 마감도 회차만큼 옮겨짐
+    assert rows[0].due_time == datetime(2030, 6, 1, 10, 0)
+    # 응답 모델로 그대로 직렬화됨 (일반 일정은 occurrence_date 가 없음)
+    assert ScheduleSchema.model_validate(rows[0]).occurrence_date == datetime(2030, 6, 1, 9, 0)
+    assert ScheduleSchema.model_validate(rows[2]).occurrence_date is None
+
+def test_overrides_cancel_move_and_complete_single_occurrences(db, owner):
+    master = create(db, owner, "FREQ=WEEKLY;BYDAY=MO;COUNT=4")
+    week2, week3 = datetime(2026, 1, 12, 9, 0), datetime(2026, 1, 19, 9, 0)
+
+    cancel_occurrence(master.id, week2, db=db, current_user=owner)
+    update_occurrence(
+        master.id, week3, OccurrenceOverride(title="moved", date=datetime(2026, 1, 20, 14, 0)),
+        db=db, current_user=owner
+    )
+    update_occurrence(master.id, datetime(2026, 1, 26, 9, 0), OccurrenceOverride(is_completed=True), db=db, current_user=owner)
+    with pytest.raises(HTTPException) as exc:
+        cancel_occurrence(master.id, datetime(2026, 1, 13, 9, 0), db=db, current_user=owner)
+    assert exc.value.status_code == 404
+
+    rows = read(db, owner, datetime(2026, 1, 1), datetime(2026, 2, 28), show_completed=False)
+    assert [(row.title, row.date) for row in rows] == [
+        ("standup", datetime(2026, 1, 5, 9, 0)),
+        ("moved", datetime(2026, 1, 20, 14, 0)),
+    ]
+    # 창 밖의 회차가 창 안으로 옮겨진 경우도 보임
+    rows = read(db, owner, datetime(2026, 1, 20), datetime(2026, 1, 20, 23, 59))
+    assert [row.occurrence_date for row in rows] == [week3]
+
+def test_edit_form_update_keeps_rule_and_overrides(db, owner):
+    master = create(db, owner, "FREQ=WEEKLY;BYDAY=MO;COUNT=4", due_time=datetime(2026, 1, 5, 10, 0))
+    end = master.recurrence_end
+    cancel_occurrence(master.id, datetime(2026, 1, 12, 9, 0), db=db, current_user=owner)
+
+    # 수정 화면(main.js updateSchedule)이 보내는 본문에는 rrule, parent_id 가 없음
+    body = ScheduleCreate.model_validate({
+        "project_name": "일정", "title": "standup v2", "date": "2026-01-05T09:00:00", "priority": "일반",
+        "content": None, "due_time": "2026-01-05T10:00:00", "alarm_time": None, "individual": False,
+    })
+    update_schedule(master.id, body, db=db, current_user=owner)
+    db.expire_all()
+
+    master = db.get(Schedule, master.id)
+    assert master.title == "standup v2"
+    assert master.rrule == "FREQ=WEEKLY;BYDAY=MO;COUNT=4"
+    assert master.recurrence_end == end
+    assert db.query(ScheduleOccurrenceOverride).filter_by(schedule_id=master.id).count() == 1
+
+    # 첫 회차를 바꾸면 회차 예외는 더 이상 맞지 않으므로 지우고 마지막 회차를 다시 계산
+    body = ScheduleCreate(title="standup v2", date=datetime(2026, 1, 6, 9, 0), priority=PriorityLevel.MEDIUM)
+    update_schedule(master.id, body, db=db, current_user=owner)
+    db.expire_all()
+    master = db.get(Schedule, master.id)
+    assert master.rrule == "FREQ=WEEKLY;BYDAY=MO;COUNT=4"
+    assert master.recurrence_end > end
+    assert db.query(ScheduleOccurrenceOverride).filter_by(schedule_id=master.id).count() == 0
+
+def test_alarm_checker_queues_each_occurrence_once(db, owner):
+    master = create(
+        db, owner, "FREQ=DAILY",
+        date=datetime(2026, 1, 1, 9, 0), alarm_time=datetime(2026, 1, 1, 8, 50)
+    )
+    now = datetime(2026, 3, 10, 8, 55)
+
+    assert check_recurring_alarms(db, now) == 1
+    assert check_recurring_alarms(db, now + timedelta(minutes=1)) == 1
+    db.commit()
+    keys = [row.idempotency_key for row in db.query(AlarmOutbox)]
+    assert keys == [f"schedule_due:{master.id}:202603100900"]
+
+    update_occurrence(master.id, datetime(2026, 3, 11, 9, 0), OccurrenceOverride(is_completed=True), db=db, current_user=owner)
+    assert check_recurring_alarms(db, datetime(2026, 3, 11, 8, 55)) == 0
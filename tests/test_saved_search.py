@@ -0,0 +1,131 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import event
+from app.models.models import Attachment, PriorityLevel, SavedSearch, Schedule, ScheduleChange, User
+from app.core.saved_search import cached_result_ids
+from app.routers.schedules import create_saved_search, read_saved_search_results, update_saved_search
+from app.schemas.schemas import SavedSearchCreate, SavedSearchUpdate
+
+@pytest.fixture
+def users(db):
+    lead = User(username="lead", name="Lead", hashed_password="hashed_password")
+    member = User(username="member", name="Member", hashed_password="hashed_password")
+    db.add_all([lead, member])
+    db.commit()
+    return lead, member
+
+def add(db, owner, title, project="개발", priority=PriorityLevel.URGENT, **kwargs):
+    schedule = Schedule(
+        title=title, date=datetime(2026, 10, 1), priority=priority, project_name=project, owner_id=owner.id, **kwargs
+    )
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def save(db, user, query, name="urgent"):
+    return create_saved_search(SavedSearchCreate(name=name, query=query), db=db, current_user=user)
+
+def run(db, user, saved, skip=0, limit=50):
+    response = Response()
+    rows = read_saved_search_results(saved.id, response, skip=skip, limit=limit, db=db, current_user=user)
+    return [row.title for row in rows], response.headers["X-Cache"], int(response.headers["X-Total-Count"])
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+def count_queries(db, func):
+    counter = QueryCounter()
+    event.listen(db.get_bind(), "before_cursor_execute", counter)
+    try:
+        result = func()
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", counter)
+    return result, counter.count
+
+def test_rerun_is_cache_lookup_plus_page(db, users):
+    lead, member = users
+    for i in range(5):
+        add(db, member, f"urgent {i}", due_time=datetime(2026, 10, 10 + i))
+    add(db, member, "sales", project="영업")
+    saved = save(db, lead, "project:개발 priority:긴급 is:open")
+
+    assert run(db, lead, saved, limit=2) == (["urgent 0", "urgent 1"], "miss", 5)
+    # 요청마다 새로 읽는 로그인 사용자처럼 미리 읽어 둠
+    db.refresh(lead)
+    db.refresh(saved)
+    (titles, cache, total), statements = count_queries(db, lambda: run(db, lead, saved, skip=2, limit=2))
+    assert (titles, cache, total) == (["urgent 2", "urgent 3"], "hit", 5)
+    # 저장된 검색 조회, 변경 피드 확인, 페이지 일정 조회
+    assert statements <= 3
+
+def test_only_changes_that_can_affect_the_result_invalidate(db, users):
+    lead, member = users
+    first = add(db, member, "first", due_time=datetime(2026, 10, 10))
+    other = add(db, member, "sales", project="영업")
+    low = add(db, member, "low", priority=PriorityLevel.LOW)
+    saved = save(db, lead, "project:개발 priority:긴급 is:open")
+    assert run(db, lead, saved)[:2] == (["first"], "miss")
+
+    # 결과와 상관없는 일정이 바뀌면 캐시를 그대로 쓰고 피드 위치만 옮김
+    other.title = "sales 2"
+    low.memo = "memo"
+    db.commit()
+    assert run(db, lead, saved)[:2] == (["first"], "hit")
+    assert db.query(ScheduleChange).count() == 0
+
+    # 조건에 새로 맞게 된 일정, 새 일정, 결과에서 빠지는 일정은 다시 계산
+    low.priority = PriorityLevel.URGENT
+    db.commit()
+    assert run(db, lead, saved)[:2] == (["first", "low"], "miss")
+    add(db, member, "new", due_time=datetime(2026, 10, 5))
+    assert run(db, lead, saved)[:2] == (["new", "first", "low"], "miss")
+    first.is_completed = True
+    db.commit()
+    assert run(db, lead, saved)[:2] == (["new", "low"], "miss")
+    assert run(db, lead, saved)[:2] == (["new", "low"], "hit")
+
+    # 첨부파일 변경도 피드에 남음 (has:attachment)
+    with_file = save(db, lead, "has:attachment", name="files")
+    assert run(db, lead, with_file)[:2] == ([], "miss")
+    db.add(Attachment(filename="a.pdf", schedule_id=low.id, uploader_id=member.id))
+    db.commit()
+    assert run(db, lead, with_file)[:2] == (["low"], "miss")
+
+    # 검색식을 바꾸면 캐시를 버림
+    update_saved_search(saved.id, SavedSearchUpdate(query="project:영업"), db=db, current_user=lead)
+    assert run(db, lead, saved)[:2] == (["sales 2"], "miss")
+
+def test_time_dependent_searches_expire(db, users):
+    lead, member = users
+    add(db, member, "due soon", due_time=datetime(2026, 10, 20, 9, 0))
+    saved = save(db, lead, "is:overdue")
+
+    ids, hit = cached_result_ids(db, lead, saved, now=datetime(2026, 10, 19, 12, 0))
+    assert (ids, hit) == ([], False)
+    assert saved.cached_until == datetime(2026, 10, 20, 9, 0)
+    assert cached_result_ids(db, lead, saved, now=datetime(2026, 10, 19, 18, 0)) == ([], True)
+    ids, hit = cached_result_ids(db, lead, saved, now=datetime(2026, 10, 20, 9, 30))
+    assert (len(ids), hit) == (1, False)
+
+    today = save(db, lead, "due<today", name="today")
+    cached_result_ids(db, lead, today, now=datetime(2026, 10, 19, 12, 0))
+    assert today.cached_until == datetime(2026, 10, 20)
+
+def test_saved_searches_are_per_user_and_validated(db, users):
+    lead, member = users
+    saved = save(db, lead, "is:open")
+
+    for query, code in (("priority:someday", 400), ("is:done", 409)):
+        with pytest.raises(HTTPException) as exc:
+            save(db, lead, query)
+        assert exc.value.status_code == code
+    with pytest.raises(HTTPException) as exc:
+        run(db, member, saved)
+    assert exc.value.status_code == 404
+    assert save(db, member, "is:open").owner_id == member.id
+    assert db.query(SavedSearch).count() == 2
@@ -0,0 +1,128 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app.models.models import Alarm, AlarmType, PriorityLevel, Schedule, ScheduleShare, User
+from app.routers.schedules import bulk_schedules
+from app.schemas.schemas import BulkRequest
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+def add(db, owner, title, **kwargs):
+    schedule = Schedule(title=title, date=datetime(2026, 1, 1), priority=PriorityLevel.MEDIUM, owner_id=owner.id, **kwargs)
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def run(db, user, operations):
+    return bulk_schedules(BulkRequest(operations=operations), db=db, current_user=user)
+
+def test_mixed_operations_with_per_item_results(db, users):
+    owner, other = users
+    a, b, c = (add(db, owner, title) for title in "abc")
+    theirs = add(db, other, "theirs")
+    db.add(Alarm(user_id=owner.id, schedule_id=c.id, type=AlarmType.MEMO, message="m"))
+    db.commit()
+
+    result = run(db, owner, [
+        {"op": "create", "data": {"title": "child 1", "date": "2026-02-01T00:00:00", "priority": "긴급", "parent_id": a.id}},
+        {"op": "create", "data": {"title": "child 2", "date": "2026-02-01T00:00:00", "priority": "일반", "parent_id": a.id}},
+        {"op": "update", "id": a.id, "data": {"title": "a2", "priority": "급함"}},
+        {"op": "complete", "id": b.id},
+        {"op": "delete", "id": c.id},
+        {"op": "share", "id": a.id, "shared_with_id": other.id},
+        {"op": "delete", "id": theirs.id},
+        {"op": "create", "data": {"title": "no date"}},
+        {"op": "share", "id": a.id, "shared_with_id": 999},
+    ])
+
+    assert [item["status"] for item in result["results"]] == ["ok"] * 6 + ["error"] * 3
+    assert result["applied"] == 6
+    assert result["results"][6]["detail"] == "Schedule not found"
+    db.expire_all()
+    assert db.get(Schedule, a.id).title == "a2"
+    assert db.get(Schedule, a.id).priority == PriorityLevel.HIGH
+    assert db.get(Schedule, b.id).is_completed
+    assert db.get(Schedule, c.id).is_deleted
+    assert db.query(Alarm).filter(Alarm.schedule_id == c.id).one().is_deleted
+    assert not db.get(Schedule, theirs.id).is_deleted
+    assert db.query(ScheduleShare).filter(ScheduleShare.schedule_id == a.id).count() == 1
+
+    children = [db.get(Schedule, item["id"]) for item in result["results"][:2]]
+    assert [child.title for child in children] == ["child 1", "child 2"]
+    assert [child.owner_id for child in children] == [owner.id, owner.id]
+    assert [child.parent_order for child in children] == [1, 2]
+    assert children[0].order_key < children[1].order_key
+
+def test_create_under_missing_or_hidden_parent_is_an_item_error(db, users):
+    owner, other = users
+    parent = add(db, owner, "parent")
+    gone = add(db, owner, "gone", is_deleted=True)
+    private = add(db, other, "private", individual=True)
+
+    def create(title, parent_id):
+        return {"op": "create", "data": {"title": title, "date": "2026-02-01T00:00:00", "priority": "일반", "parent_id": parent_id}}
+
+    result = run(db, owner, [
+        create("ok", parent.id), create("missing", 999), create("deleted", gone.id),
+        create("hidden", private.id), create("root", None),
+    ])
+
+    assert [item["status"] for item in result["results"]] == ["ok", "error", "error", "error", "ok"]
+    assert {item["detail"] for item in result["results"][1:4]} == {"Parent schedule not found"}
+    assert db.query(Schedule).filter(Schedule.title.in_(["missing", "deleted", "hidden"])).count() == 0
+    assert db.get(Schedule, result["results"][0]["id"]).parent_id == parent.id
+
+def test_share_rejects_self_and_duplicate_shares(db, users):
+    owner, other = users
+    third = User(username="third", name="Third", hashed_password="hashed_password")
+    db.add(third)
+    a, b = add(db, owner, "a"), add(db, owner, "b")
+    db.add_all([
+        ScheduleShare(schedule_id=a.id, shared_with_id=other.id),
+        # 삭제된 공유는 다시 공유할 수 있음
+        ScheduleShare(schedule_id=b.id, shared_with_id=other.id, is_deleted=True),
+    ])
+    db.commit()
+
+    result = run(db, owner, [
+        {"op": "share", "id": a.id, "shared_with_id": owner.id},
+        {"op": "share", "id": a.id, "shared_with_id": other.id},
+        {"op": "share", "id": b.id, "shared_with_id": other.id},
+        {"op": "share", "id": b.id, "shared_with_id": other.id},
+        {"op": "share", "id": a.id, "shared_with_id": third.id},
+    ])
+
+    assert [item["status"] for item in result["results"]] == ["error", "error", "ok", "error", "ok"]
+    assert result["results"][0]["detail"] == "Cannot share a schedule with yourself"
+    assert result["results"][1]["detail"] == "Schedule is already shared with this user"
+    assert result["results"][3]["detail"] == "Schedule is already shared with this user"
+    live = db.query(ScheduleShare.schedule_id, ScheduleShare.shared_with_id).filter(ScheduleShare.is_deleted == False)
+    assert sorted(live) == sorted([(a.id, other.id), (b.id, other.id), (a.id, third.id)])
+
+def test_bulk_delete_uses_constant_number_of_statements(engine, db, users):
+    owner, _ = users
+    db.add_all([
+        Schedule(title=f"s{i}", date=datetime(2026, 1, 1), priority=PriorityLevel.LOW, owner_id=owner.id)
+        for i in range(300)
+    ])
+    db.commit()
+    ids = [schedule_id for (schedule_id,) in db.query(Schedule.id)]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = run(db, owner, [{"op": "delete", "id": schedule_id} for schedule_id in ids])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert result["applied"] == 300
+    # 사용자 로드, 권한 확인, 일정/알람/공유 UPDATE 각 한 번, commit 때 검색 색인 갱신(큐 조회/색인 삭제/첨부·일정 조회/큐 삭제)
+    assert len(statements) <= 10
+    assert db.query(Schedule).filter(Schedule.is_deleted == False).count() == 0
@@ -0,0 +1,114 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.models.models import Alarm, PriorityLevel, Schedule, ScheduleShare, User
+from benchmarks.schedule_cascade import benchmark_cascade
+from app.routers.schedules import delete_schedule, restore_schedule
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+def add(db, owner, title, parent=None, **kwargs):
+    schedule = Schedule(
+        title=title,
+        date=datetime(2026, 1, 1),
+        priority=PriorityLevel.MEDIUM,
+        owner_id=owner.id,
+        parent_id=parent.id if parent else None,
+        parent_order=0,
+        **kwargs
+    )
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def deleted(db, model=Schedule):
+    return {row.id for row in db.query(model).filter(model.is_deleted == True)}
+
+def test_delete_cascades_to_subtree_alarms_and_shares(db, users):
+    owner, other = users
+    root = add(db, owner, "root")
+    child = add(db, owner, "child", root)
+    grandchild = add(db, owner, "grandchild", child)
+    sibling = add(db, owner, "sibling")
+    alarm = Alarm(user_id=other.id, schedule_id=grandchild.id, message="due")
+    kept_alarm = Alarm(user_id=other.id, schedule_id=sibling.id, message="due")
+    share = ScheduleShare(schedule_id=child.id, shared_with_id=other.id)
+    db.add_all([alarm, kept_alarm, share])
+    db.commit()
+
+    result = delete_schedule(root.id, db=db, current_user=owner)
+
+    assert (result["schedules"], result["alarms"], result["shares"]) == (3, 1, 1)
+    assert deleted(db) == {root.id, child.id, grandchild.id}
+    assert deleted(db, Alarm) == {alarm.id}
+    assert deleted(db, ScheduleShare) == {share.id}
+    assert db.get(Schedule, grandchild.id).deleted_batch == result["batch"]
+
+def test_restore_revives_only_rows_deleted_together(db, users):
+    owner, other = users
+    root = add(db, owner, "root")
+    child = add(db, owner, "child", root)
+    dismissed = Alarm(user_id=other.id, schedule_id=child.id, message="old", is_deleted=True)
+    active = Alarm(user_id=other.id, schedule_id=child.id, message="new")
+    db.add_all([dismissed, active])
+    db.commit()
+    # 먼저 따로 지운 가지는 다른 삭제 단위
+    branch = add(db, owner, "branch", root)
+    delete_schedule(branch.id, db=db, current_user=owner)
+    delete_schedule(root.id, db=db, current_user=owner)
+
+    # 하위 일정을 주어도 그 일정이 지워진 삭제 단위 전체를 복원
+    result = restore_schedule(child.id, db=db, current_user=owner)
+
+    assert result["schedules"] == 2
+    assert deleted(db) == {branch.id}
+    assert deleted(db, Alarm) == {dismissed.id}
+    assert db.get(Schedule, root.id).deleted_batch is None
+
+def test_restore_requires_deleted_parent_to_be_restored_first(db, users):
+    owner, other = users
+    root = add(db, owner, "root")
+    child = add(db, owner, "child", root)
+    delete_schedule(child.id, db=db, current_user=owner)
+    delete_schedule(root.id, db=db, current_user=owner)
+
+    with pytest.raises(HTTPException) as exc:
+        restore_schedule(child.id, db=db, current_user=owner)
+    assert exc.value.status_code == 409
+
+    with pytest.raises(HTTPException) as exc:
+        restore_schedule(root.id, db=db, current_user=other)
+    assert exc.value.status_code == 404
+
+    restore_schedule(root.id, db=db, current_user=owner)
+    restore_schedule(child.id, db=db, current_user=owner)
+    assert deleted(db) == set()
+
+def test_restore_requires_owning_the_deleted_root(db, users):
+    owner, other = users
+    root = add(db, owner, "root")
+    child = add(db, other, "child", root)
+    delete_schedule(root.id, db=db, current_user=owner)
+
+    # 하위 일정의 소유자는 다른 사용자가 지운 트리 전체를 되살릴 수 없음
+    with pytest.raises(HTTPException) as exc:
+        restore_schedule(child.id, db=db, current_user=other)
+    assert exc.value.status_code == 403
+    assert deleted(db) == {root.id, child.id}
+
+    result = restore_schedule(root.id, db=db, current_user=owner)
+    assert result["schedules"] == 2
+    assert deleted(db) == set()
+
+def test_delete_of_thousand_node_tree_is_set_based():
+    result = benchmark_cascade(nodes=1000)
+    assert result["deleted"]["schedules"] == 1000
+    assert result["deleted"]["alarms"] == 1000
+    assert result["restored"]["shares"] == 1000
+    assert result["delete_ms"] < 1000
@@ -1,18 +1,6 @@
 import pytest
-from sqlalchemy.orm import Session
 from app.models.models import Schedule, User, PriorityLevel
 from datetime import datetime, timedelta
-from app.core.database import Base, engine
-
-@pytest.fixture
-def db():
-    Base.metadata.create_all(bind=engine)
-    db = Session(engine)
-    try:
-        yield db
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture
 def test_user(db):
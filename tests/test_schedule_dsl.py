@@ -0,0 +1,98 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.models.models import Attachment, PriorityLevel, Schedule, User
+from app.core.schedule_dsl import QuerySyntaxError, SearchTerm, apply_search_terms, parse_search_query, uses_search_index
+from app.routers.schedules import read_schedules
+
+@pytest.fixture
+def users(db):
+    kim = User(username="kim", name="김철수", hashed_password="hashed_password")
+    lee = User(username="lee", name="이영희", hashed_password="hashed_password")
+    db.add_all([kim, lee])
+    db.commit()
+    return kim, lee
+
+def add(db, owner, title, due=None, priority=PriorityLevel.MEDIUM, start=datetime(2026, 10, 1, 9, 0), **kwargs):
+    schedule = Schedule(title=title, date=start, due_time=due, priority=priority, owner_id=owner.id, **kwargs)
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def read(db, user, q, **kwargs):
+    params = dict(skip=0, limit=100, show_completed=True, search_terms=None, exclude_terms=None)
+    params.update(kwargs)
+    return [schedule.title for schedule in read_schedules(q=q, db=db, current_user=user, **params)]
+
+def test_parse_example_query():
+    terms = parse_search_query('owner:kim project:개발 priority:긴급 due<2026-11-01 "exact phrase" -excluded is:open 10:30')
+    assert terms == [
+        SearchTerm("owner", ":", ("kim",)),
+        SearchTerm("project", ":", ("개발",)),
+        SearchTerm("priority", ":", (PriorityLevel.URGENT,)),
+        SearchTerm("due", "<", (None, datetime(2026, 11, 1))),
+        SearchTerm(None, ":", ("exact phrase",)),
+        SearchTerm(None, ":", ("excluded",), True),
+        SearchTerm("is", ":", ("open",)),
+        SearchTerm(None, ":", ("10:30",)),
+    ]
+    # 날짜만 주면 하루 단위
+    assert parse_search_query("due<=2026-11-01")[0].values == (None, datetime(2026, 11, 2))
+    assert parse_search_query("due:2026-11-01T09:30")[0].values[0] == datetime(2026, 11, 1, 9, 30)
+    for bad in ('"open', "priority:someday", "is:sleeping", "due<november", "owner:", "project<a"):
+        with pytest.raises(QuerySyntaxError):
+            parse_search_query(bad)
+
+def test_filters_run_in_the_database(db, users):
+    kim, lee = users
+    add(db, kim, "서버 점검 회의록", datetime(2026, 10, 20), PriorityLevel.URGENT, project_name="개발")
+    add(db, kim, "배포 회의", datetime(2026, 11, 5), PriorityLevel.URGENT, project_name="개발")
+    add(db, kim, "점검 완료 보고", datetime(2026, 10, 10), PriorityLevel.URGENT, project_name="개발", is_completed=True)
+    add(db, lee, "고객 회의", datetime(2026, 10, 15), PriorityLevel.LOW, project_name="영업", memo="exact phrase here")
+    add(db, lee, "50% 할인 검토", None, PriorityLevel.HIGH, individual=True)
+
+    assert read(db, lee, 'owner:kim project:개발 priority:긴급 due<2026-11-01 is:open') == ["서버 점검 회의록"]
+    assert read(db, lee, "owner:김철수 -점검") == ["배포 회의"]
+    assert read(db, kim, "owner:lee") == ["고객 회의"]
+    assert read(db, lee, "owner:me,kim -is:done due<=2026-10-20") == ["고객 회의", "서버 점검 회의록"]
+    assert read(db, kim, '"exact phrase"') == ["고객 회의"]
+    assert read(db, kim, '"exact phrase"', search_in_memo=False) == []
+    assert read(db, lee, "50%") == ["50% 할인 검토"]
+    assert read(db, lee, "-50%", show_completed=False) == ["고객 회의", "서버 점검 회의록", "배포 회의"]
+    # 한글 검색어는 색인으로 후보를 줄이되 결과는 부분 문자열 일치와 같음 (단어 중간 "의록" 포함)
+    assert read(db, kim, "의록") == ["서버 점검 회의록"]
+    assert read(db, kim, "회의 -서버") == ["고객 회의", "배포 회의"]
+    overdue = apply_search_terms(db, db.query(Schedule.title), parse_search_query("is:overdue"), kim, now=datetime(2026, 10, 16))
+    assert [title for title, in overdue] == ["고객 회의"]
+    # 기존 검색 파라미터와 함께 쓰면 AND
+    assert read(db, kim, "priority:긴급", search_terms="배포") == ["배포 회의"]
+
+    with pytest.raises(HTTPException) as exc:
+        read(db, kim, "priority:someday")
+    assert exc.value.status_code == 400
+
+def test_has_and_index_usage(db, users):
+    kim, _ = users
+    with_file = add(db, kim, "견적 요청")
+    add(db, kim, "견적 회신", alarm_time=datetime(2026, 10, 1, 8, 0))
+    db.add(Attachment(filename="견적서.pdf", schedule_id=with_file.id, uploader_id=kim.id))
+    db.commit()
+
+    assert read(db, kim, "has:attachment") == ["견적 요청"]
+    assert read(db, kim, "견적 -has:attachment has:alarm") == ["견적 회신"]
+    assert uses_search_index(parse_search_query("견적 owner:kim"))
+    assert not uses_search_index(parse_search_query("-견적 a"))
+
+    query = apply_search_terms(db, db.query(Schedule.id), parse_search_query("project:개발"), kim)
+    compiled = query.statement.compile(compile_kwargs={"literal_binds": True})
+    plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+    assert "ix_schedules_project_due" in plan
+
+def test_recurring_occurrences_are_filtered_per_occurrence(db, users):
+    kim, _ = users
+    add(db, kim, "주간 보고", datetime(2026, 1, 5, 10, 0), start=datetime(2026, 1, 5, 9, 0), rrule="FREQ=WEEKLY;BYDAY=MO")
+
+    window = dict(start_date=datetime(2026, 10, 1), end_date=datetime(2026, 10, 31, 23, 59))
+    rows = read_schedules(q="due<2026-10-15 보고", db=db, current_user=kim, skip=0, limit=100,
+                          search_terms=None, exclude_terms=None, **window)
+    assert [row.due_time for row in rows] == [datetime(2026, 10, 5, 10, 0), datetime(2026, 10, 12, 10, 0)]
@@ -0,0 +1,190 @@
+import random
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from app.models.models import PriorityLevel, Schedule, User
+from app.core import schedule_order
+from app.core.schedule_order import append_key, key_between, rebalance_batch, spread_keys
+from app.routers.schedules import create_schedule, get_schedule_tree, move_schedule_endpoint, update_schedule
+from app.schemas.schemas import ScheduleCreate, ScheduleMove
+
+@pytest.fixture
+def user(db):
+    user = User(username="user", name="User", hashed_password="hashed_password")
+    db.add(user)
+    db.commit()
+    return user
+
+def create(db, user, title, parent_id=None):
+    body = ScheduleCreate(title=title, date=datetime(2026, 1, 1), priority=PriorityLevel.MEDIUM, parent_id=parent_id)
+    return create_schedule(body, db=db, current_user=user)
+
+def child_titles(db, user, root):
+    return [node.title for node in get_schedule_tree(root.id, depth=1, db=db, current_user=user)[1:]]
+
+def test_key_between_stays_ordered():
+    keys = [key_between(None, None)]
+    rng = random.Random(7)
+    for _ in range(500):
+        i = rng.randrange(len(keys) + 1)
+        new = key_between(keys[i - 1] if i else None, keys[i] if i < len(keys) else None)
+        keys.insert(i, new)
+        assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert all(not key.endswith("0") for key in keys)
+    with pytest.raises(ValueError):
+        key_between("b", "a")
+
+def test_spread_keys_are_short_and_ordered():
+    for count in (1, 2, 61, 62, 1000):
+        keys = spread_keys(count)
+        assert keys == sorted(keys)
+        assert len(set(keys)) == count
+    assert max(len(key) for key in spread_keys(1000)) == 2
+
+def test_move_writes_only_the_moved_row(db, user):
+    root = create(db, user, "root")
+    a, b, c = (create(db, user, title, root.id) for title in "abc")
+    keys = {s.id: s.order_key for s in (a, b, c)}
+
+    result = move_schedule_endpoint(c.id, ScheduleMove(after_id=a.id), db=db, current_user=user)
+
+    assert child_titles(db, user, root) == ["a", "c", "b"]
+    db.expire_all()
+    assert db.get(Schedule, a.id).order_key == keys[a.id]
+    assert db.get(Schedule, b.id).order_key == keys[b.id]
+    assert keys[a.id] < result["order_key"] < keys[b.id]
+
+    move_schedule_endpoint(a.id, ScheduleMove(before_id=c.id), db=db, current_user=user)
+    assert child_titles(db, user, root) == ["a", "c", "b"]
+    move_schedule_endpoint(a.id, ScheduleMove(), db=db, current_user=user)
+    assert child_titles(db, user, root) == ["c", "b", "a"]
+
+def test_move_to_another_parent_and_cycle_check(db, user):
+    root = create(db, user, "root")
+    a = create(db, user, "a", root.id)
+    other = create(db, user, "other")
+    x = create(db, user, "x", other.id)
+
+    move_schedule_endpoint(a.id, ScheduleMove(parent_id=other.id, before_id=x.id), db=db, current_user=user)
+    assert child_titles(db, user, other) == ["a", "x"]
+    assert child_titles(db, user, root) == []
+
+    with pytest.raises(HTTPException) as exc:
+        move_schedule_endpoint(other.id, ScheduleMove(parent_id=a.id), db=db, current_user=user)
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException) as exc:
+        move_schedule_endpoint(a.id, ScheduleMove(after_id=root.id), db=db, current_user=user)
+    assert exc.value.status_code == 400
+
+def test_root_schedules_are_keyed_and_moves_touch_one_row(engine, db, user):
+    a, b, c = (create(db, user, title) for title in "abc")
+    assert all(s.order_key for s in (a, b, c))
+    assert a.order_key < b.order_key < c.order_key
+    # 삭제된 최상위 일정은 재정렬 대상이 아님
+    deleted = create(db, user, "deleted")
+    deleted.is_deleted = True
+    db.commit()
+    keys = {s.id: s.order_key for s in (a, b, deleted)}
+
+    updates = []
+    listener = lambda *args: updates.append(args[2]) if args[2].lstrip().upper().startswith("UPDATE") else None
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        move_schedule_endpoint(c.id, ScheduleMove(parent_id=None, after_id=a.id), db=db, current_user=user)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(updates) == 1
+    db.expire_all()
+    assert {s.id: s.order_key for s in db.query(Schedule).filter(Schedule.id.in_(keys))} == keys
+    assert keys[a.id] < db.get(Schedule, c.id).order_key < keys[b.id]
+
+    # 자식을 최상위로 옮기면 최상위 맨 뒤에 놓임
+    child = create(db, user, "child", a.id)
+    move_schedule_endpoint(child.id, ScheduleMove(parent_id=None), db=db, current_user=user)
+    db.expire_all()
+    assert db.get(Schedule, child.id).order_key > db.get(Schedule, deleted.id).order_key
+
+def test_rebalance_fills_legacy_root_keys(db, user):
+    first = create(db, user, "first")
+    db.add_all([Schedule(title=f"legacy {i}", owner_id=user.id, parent_order=0) for i in range(2)])
+    deleted = Schedule(title="deleted legacy", owner_id=user.id, parent_order=0, is_deleted=True)
+    db.add(deleted)
+    db.commit()
+
+    assert rebalance_batch(db) == 1
+    db.expire_all()
+    roots = db.query(Schedule).filter(Schedule.parent_id.is_(None), Schedule.is_deleted == False)
+    assert sorted((s.order_key, s.title) for s in roots)[0][1] == "legacy 0"
+    assert all(s.order_key for s in roots)
+    assert db.get(Schedule, deleted.id).order_key is None
+    assert rebalance_batch(db) == 0
+    assert db.get(Schedule, first.id).order_key
+
+def test_rebalance_fills_legacy_rows_and_shortens_keys(db, user, monkeypatch):
+    root = create(db, user, "root")
+    p, q = create(db, user, "p", root.id), create(db, user, "q", root.id)
+    # 항상 맨 앞에 끼워 넣으면 키가 길어짐
+    for _ in range(20):
+        move_schedule_endpoint(q.id, ScheduleMove(before_id=p.id), db=db, current_user=user)
+        move_schedule_endpoint(p.id, ScheduleMove(before_id=q.id), db=db, current_user=user)
+    assert len(db.get(Schedule, p.id).order_key) > 1
+
+    old_root = create(db, user, "old root")
+    db.add_all([
+        Schedule(title=f"legacy {i}", owner_id=user.id, parent_id=old_root.id, parent_order=i)
+        for i in (2, 1)
+    ])
+    db.commit()
+
+    monkeypatch.setattr(schedule_order, "REBALANCE_KEY_LENGTH", 1)
+    # 새로 만든 키에는 id 가 붙어 있으므로 최상위 형제들도 함께 재정렬됨
+    assert rebalance_batch(db) == 3
+    db.expire_all()
+
+    assert child_titles(db, user, root) == ["p", "q"]
+    assert child_titles(db, user, old_root) == ["legacy 1", "legacy 2"]
+    keys = [s.order_key for s in db.query(Schedule).filter(Schedule.parent_id.isnot(None))]
+    assert all(key and len(key) == 1 for key in keys)
+    assert rebalance_batch(db) == 0
+
+def test_concurrent_creates_get_distinct_keys(db, user):
+    root = create(db, user, "root")
+    a = create(db, user, "a", root.id)
+    first = Schedule(title="b", priority=PriorityLevel.MEDIUM, owner_id=user.id, parent_id=root.id)
+    second = Schedule(title="c", priority=PriorityLevel.MEDIUM, owner_id=user.id, parent_id=root.id)
+    db.add_all([first, second])
+    db.flush()
+    # 두 요청이 서로의 키를 보기 전에 같은 마지막 키를 읽은 경우
+    with db.no_autoflush:
+        append_key(db, first)
+        append_key(db, second)
+    db.commit()
+
+    assert first.order_key != second.order_key
+    assert a.order_key < min(first.order_key, second.order_key)
+    assert child_titles(db, user, root) == ["a", "b", "c"]
+
+def test_edit_without_parent_keeps_position(db, user):
+    root = create(db, user, "root")
+    a, b = (create(db, user, title, root.id) for title in "ab")
+    key = a.order_key
+
+    # 수정 화면은 parent_id 를 보내지 않음
+    body = ScheduleCreate.model_validate({"title": "a2", "date": "2026-01-01T00:00:00", "priority": "일반"})
+    update_schedule(a.id, body, db=db, current_user=user)
+    db.expire_all()
+    edited = db.get(Schedule, a.id)
+    assert (edited.title, edited.parent_id, edited.order_key) == ("a2", root.id, key)
+    assert child_titles(db, user, root) == ["a2", "b"]
+
+    # parent_id 를 명시하면 옮김
+    body = ScheduleCreate(title="a2", date=datetime(2026, 1, 1), priority=PriorityLevel.MEDIUM, parent_id=None)
+    update_schedule(a.id, body, db=db, current_user=user)
+    db.expire_all()
+    edited = db.get(Schedule, a.id)
+    assert edited.parent_id is None
+    assert edited.order_key > root.order_key
+    assert child_titles(db, user, root) == ["b"]
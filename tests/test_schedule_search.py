@@ -0,0 +1,136 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+from app.models.models import Attachment, PriorityLevel, Schedule, ScheduleSearchQueue, User
+from app.core.schedule_cascade import restore_subtree, soft_delete_subtree
+from app.core.schedule_search import compile_query, document_tokens
+from app.routers.schedules import read_search_results
+from benchmarks.schedule_search import benchmark_search
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+# 관련도 테스트 말뭉치: 키 -> (제목, 내용, 메모, 프로젝트, 첨부파일명)
+CORPUS = {
+    "weekly": ("주간 회의", "이번 주 개발 진행 상황 공유", None, "개발", []),
+    "client": ("고객 미팅", "회의실 예약 후 견적 논의", None, None, []),
+    "server": ("서버 점검", "배포 전에 서버를 점검합니다", None, "운영", []),
+    "quote": ("견적서 발송", "고객에게 견적서를 보냄", None, None, ["견적서_최종.pdf"]),
+    "minutes": ("회의록 정리", "지난 회의의 회의록을 공유", None, "개발", []),
+    "release": ("릴리스 준비", "Release notes 작성", None, None, ["release-notes.md"]),
+    "design": ("디자인 시안 검토", None, "회의 때 받은 피드백 반영", None, []),
+    "cat": ("고양이 사료 구매", None, None, None, []),
+    "contract": ("계약", "계약서 검토", None, None, ["계약서.hwp"]),
+}
+
+# 검색어 -> 기대하는 결과 (list 면 순서까지, set 이면 집합만)
+RELEVANCE = [
+    ("회의", {"weekly", "client", "minutes", "design"}),
+    ("회의를", {"weekly", "client", "minutes", "design"}),
+    ("회의록을", ["minutes"]),
+    ("ㅎㅇㄹ", ["minutes"]),
+    ("ㅎㅇ", {"weekly", "minutes"}),
+    ("회의ㄹ", ["minutes"]),
+    ("견적서", ["quote"]),
+    ("최종", ["quote"]),
+    ("rel", ["release"]),
+    ("고양이를", ["cat"]),
+    ("서버 점검", ["server"]),
+    ("계약서", ["contract"]),
+    ("개발", {"weekly", "minutes"}),
+    ("없는말", []),
+]
+
+def add(db, owner, title, content=None, memo=None, project=None, filenames=(), **kwargs):
+    schedule = Schedule(
+        title=title, content=content, memo=memo, project_name=project, date=datetime(2026, 10, 1),
+        priority=PriorityLevel.MEDIUM, owner_id=owner.id, **kwargs
+    )
+    db.add(schedule)
+    db.flush()
+    for filename in filenames:
+        db.add(Attachment(filename=filename, schedule_id=schedule.id, uploader_id=owner.id))
+    db.commit()
+    return schedule
+
+def search(db, user, q, **kwargs):
+    return [schedule.id for schedule in read_search_results(q, db=db, current_user=user, **kwargs)]
+
+def test_tokenizer_and_query_compilation():
+    assert document_tokens("주간 회의를 2026년도 Report_final.pdf") == [
+        "주간", "회의", "의를", "회의를", "2026", "년도", "report", "final", "pdf"
+    ]
+    assert compile_query("회의를") == '{title body memo project filenames} : ("회의를" OR "회의")'
+    assert compile_query("ㅎㅇㄹ") == 'choseong : "ㅎㅇㄹ"*'
+    assert compile_query(" ,. ") is None
+
+def test_relevance_corpus(db, users):
+    owner, _ = users
+    ids = {key: add(db, owner, *fields).id for key, fields in CORPUS.items()}
+    names = {schedule_id: key for key, schedule_id in ids.items()}
+
+    for q, expected in RELEVANCE:
+        found = [names[schedule_id] for schedule_id in search(db, owner, q, skip=0, limit=50)]
+        if isinstance(expected, set):
+            assert set(found) == expected, q
+        else:
+            assert found == expected, q
+    # 제목에 있는 일정이 내용/메모에만 있는 일정보다 앞
+    top = [names[schedule_id] for schedule_id in search(db, owner, "회의", skip=0, limit=2)]
+    assert set(top) == {"weekly", "minutes"}
+    assert search(db, owner, "회의", skip=3, limit=50) == [ids["design"]]
+
+def test_index_follows_writes_and_visibility(db, users):
+    owner, other = users
+    schedule = add(db, owner, "분기 보고")
+    private = add(db, owner, "개인 보고", individual=True)
+
+    assert search(db, other, "보고", skip=0, limit=50) == [schedule.id]
+    assert set(search(db, owner, "보고", skip=0, limit=50)) == {schedule.id, private.id}
+
+    schedule.title = "연간 결산"
+    db.commit()
+    assert search(db, owner, "분기", skip=0, limit=50) == []
+    assert search(db, owner, "결산", skip=0, limit=50) == [schedule.id]
+
+    # ORM 을 거치지 않는 일괄 UPDATE 와 첨부파일 추가도 트리거로 반영
+    db.execute(update(Schedule).where(Schedule.id == private.id).values(memo="감사 자료"))
+    db.add(Attachment(filename="결산표.xlsx", schedule_id=private.id, uploader_id=owner.id))
+    db.commit()
+    assert search(db, owner, "감사", skip=0, limit=50) == [private.id]
+    assert search(db, owner, "결산표", skip=0, limit=50) == [private.id]
+
+    soft_delete_subtree(db, schedule.id)
+    db.commit()
+    assert search(db, owner, "결산", skip=0, limit=50) == [private.id]
+    restore_subtree(db, db.get(Schedule, schedule.id))
+    db.commit()
+    assert schedule.id in search(db, owner, "결산", skip=0, limit=50)
+
+def test_search_only_reads_and_writes_drain_the_queue(engine, db, users):
+    owner, _ = users
+    schedule = add(db, owner, "분기 보고")
+    assert db.query(ScheduleSearchQueue).count() == 0
+
+    # 세션을 거치지 않은 변경은 큐에 남고, 검색은 그 큐를 비우지 않음 (읽기 요청은 쓰지 않음)
+    with engine.begin() as conn:
+        conn.execute(update(Schedule).where(Schedule.id == schedule.id).values(title="연간 결산"))
+    db.expire_all()
+    assert search(db, owner, "분기", skip=0, limit=50) == [schedule.id]
+    assert db.query(ScheduleSearchQueue).count() == 1
+
+    # 다음 쓰기 commit 에서 함께 색인됨
+    add(db, owner, "다른 일정")
+    assert db.query(ScheduleSearchQueue).count() == 0
+    assert search(db, owner, "결산", skip=0, limit=50) == [schedule.id]
+
+def test_search_latency_benchmark():
+    result = benchmark_search(docs=2000, queries=80)
+    assert result["indexed"] == 2000
+    assert result["refreshed"] == 100
+    assert result["query_p95_ms"] < 200
@@ -0,0 +1,113 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.models.models import PriorityLevel, Schedule, ScheduleDailyStat, User
+from app.core.migrate_db import upgrade_schema
+from app.core.schedule_cascade import soft_delete_subtree
+from app.routers.schedules import read_schedule_stats
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+def add(db, owner, start, priority=PriorityLevel.MEDIUM, **kwargs):
+    schedule = Schedule(title="s", date=start, priority=priority, owner_id=owner.id, **kwargs)
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def stats(db, user, group_by, **kwargs):
+    params = dict(
+        group_by=group_by, cached=False, show_completed=True, show_all_users=True, completed_only=False,
+        start_date=None, end_date=None, search_terms=None, exclude_terms=None,
+        search_in_title=True, search_in_content=True, search_in_memo=True
+    )
+    params.update(kwargs)
+    return read_schedule_stats(db=db, current_user=user, **params)
+
+def counts(result):
+    return {row["key"]: (row["total"], row["completed"], row["overdue"]) for row in result["groups"]}
+
+@pytest.fixture
+def sample(db, users):
+    owner, other = users
+    past = datetime(2020, 1, 1)
+    add(db, owner, datetime(2026, 10, 5, 9), PriorityLevel.URGENT, due_time=past)
+    add(db, owner, datetime(2026, 10, 5, 15), PriorityLevel.URGENT, is_completed=True)
+    add(db, owner, datetime(2026, 10, 7, 9), project_name="개발")
+    add(db, other, datetime(2026, 10, 12, 9), project_name="개발", is_completed=True)
+    add(db, other, datetime(2026, 10, 12, 9), individual=True)
+    add(db, owner, datetime(2026, 10, 13, 9), is_deleted=True)
+    return owner, other
+
+def test_live_group_by_matches_list_filters(db, sample):
+    owner, other = sample
+
+    assert counts(stats(db, owner, "day")) == {
+        "2026-10-05": (2, 1, 1), "2026-10-07": (1, 0, 0), "2026-10-12": (1, 1, 0)
+    }
+    assert counts(stats(db, owner, "week")) == {"2026-10-05": (3, 1, 1), "2026-10-12": (1, 1, 0)}
+    assert counts(stats(db, owner, "priority")) == {"URGENT": (2, 1, 1), "MEDIUM": (2, 1, 0)}
+    assert counts(stats(db, other, "owner")) == {owner.id: (3, 1, 1), other.id: (2, 1, 0)}
+    result = stats(db, owner, "project", show_completed=False)
+    assert counts(result) == {"개발": (1, 0, 0), None: (1, 0, 1)}
+    assert result["totals"] == {"total": 2, "completed": 0, "open": 2, "overdue": 1}
+    assert counts(stats(db, owner, "month", search_terms="없는 단어")) == {}
+
+    with pytest.raises(HTTPException) as exc:
+        stats(db, owner, "year")
+    assert exc.value.status_code == 400
+
+def test_rollup_follows_writes_and_matches_live(db, sample):
+    owner, other = sample
+    moved = add(db, owner, datetime(2026, 10, 20, 9), PriorityLevel.LOW)
+    moved.date = datetime(2026, 10, 21, 9)
+    moved.is_completed = True
+    db.commit()
+    root = add(db, owner, datetime(2026, 10, 22, 9))
+    add(db, owner, datetime(2026, 10, 23, 9), parent_id=root.id)
+    soft_delete_subtree(db, root.id)
+    db.commit()
+    # 반복 일정은 롤업에 없으므로 회차(기간이 있을 때) 또는 원본 한 건으로 더해야 함
+    add(db, owner, datetime(2026, 1, 5, 9), rrule="FREQ=WEEKLY;BYDAY=MO", due_time=datetime(2026, 1, 5, 18))
+
+    window = dict(start_date=datetime(2026, 10, 1), end_date=datetime(2026, 10, 31, 23, 59, 59))
+    for group_by in ("day", "week", "month", "priority", "owner", "project"):
+        for user in (owner, other):
+            for flags in ({}, {"show_completed": False}, {"completed_only": True}, {"show_all_users": False}):
+                for bounds in (window, {}, {"start_date": window["start_date"]}):
+                    live = stats(db, user, group_by, **bounds, **flags)
+                    cached = stats(db, user, group_by, cached=True, **bounds, **flags)
+                    assert cached["source"] == "rollup"
+                    assert cached["groups"] == live["groups"], (group_by, user.username, flags, bounds)
+
+    weeks = counts(stats(db, owner, "week", cached=True, **window))
+    assert [weeks[week][0] for week in ("2026-10-05", "2026-10-12", "2026-10-19", "2026-10-26")] == [4, 2, 2, 1]
+    assert counts(stats(db, owner, "month", cached=True))["2026-01"] == (1, 0, 1)
+
+    # 검색어가 있거나 기간이 하루 경계가 아니면 롤업 대신 직접 셈
+    assert stats(db, owner, "day", cached=True, search_terms="s")["source"] == "live"
+    assert stats(db, owner, "day", cached=True, start_date=datetime(2026, 10, 5, 12))["source"] == "live"
+
+def test_rollup_is_rebuilt_when_triggers_are_installed(engine, db, sample):
+    expected = {(row.day, row.owner_id, row.priority, row.total) for row in db.query(ScheduleDailyStat)}
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TRIGGER schedules_stats_au")
+        conn.exec_driver_sql("DELETE FROM schedule_daily_stats")
+    upgrade_schema(engine)
+    assert {(row.day, row.owner_id, row.priority, row.total) for row in db.query(ScheduleDailyStat)} == expected
+
+def test_recurring_occurrences_are_counted_per_window(db, users):
+    owner, _ = users
+    add(db, owner, datetime(2026, 1, 5, 9), rrule="FREQ=WEEKLY;BYDAY=MO")
+
+    window = dict(start_date=datetime(2026, 10, 1), end_date=datetime(2026, 10, 31, 23, 59, 59))
+    assert counts(stats(db, owner, "week", **window)) == {
+        "2026-10-05": (1, 0, 0), "2026-10-12": (1, 0, 0), "2026-10-19": (1, 0, 0), "2026-10-26": (1, 0, 0)
+    }
+    # 기간이 없으면 반복 일정은 원본 한 건으로 셈
+    assert counts(stats(db, owner, "month")) == {"2026-01": (1, 0, 0)}
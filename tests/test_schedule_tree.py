@@ -0,0 +1,146 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.models.models import PriorityLevel, Schedule, ScheduleClosure, ScheduleShare, User
+from app.core.migrate_db import upgrade_schema
+from app.core.schedule_tree import ancestors, descendant_ids, is_descendant
+from app.routers.schedules import get_schedule_ancestors, get_schedule_tree, update_schedule
+from app.schemas.schemas import ScheduleCreate
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+def add(db, owner, title, parent=None, order=0, **kwargs):
+    schedule = Schedule(
+        title=title,
+        date=datetime(2026, 1, 1),
+        priority=PriorityLevel.MEDIUM,
+        owner_id=owner.id,
+        parent_id=parent.id if parent else None,
+        parent_order=order,
+        **kwargs
+    )
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def titles(nodes):
+    return [(node.title, node.depth) for node in nodes]
+
+def test_tree_is_preorder_by_parent_order(db, users):
+    owner, _ = users
+    root = add(db, owner, "root")
+    second = add(db, owner, "second", root, order=2)
+    first = add(db, owner, "first", root, order=1)
+    add(db, owner, "second.a", second, order=1)
+    add(db, owner, "first.a", first, order=1)
+    add(db, owner, "deleted", first, order=2, is_deleted=True)
+
+    nodes = get_schedule_tree(root.id, depth=None, db=db, current_user=owner)
+
+    assert titles(nodes) == [
+        ("root", 0), ("first", 1), ("first.a", 2), ("second", 1), ("second.a", 2)
+    ]
+    assert nodes[1].parent_id == root.id
+    assert [node.has_children for node in nodes] == [True, True, False, True, False]
+
+def test_depth_limit_and_has_children(db, users):
+    owner, _ = users
+    node = root = add(db, owner, "level 0")
+    for level in range(1, 25):
+        node = add(db, owner, f"level {level}", node)
+
+    nodes = get_schedule_tree(root.id, depth=1, db=db, current_user=owner)
+    assert titles(nodes) == [("level 0", 0), ("level 1", 1)]
+    assert nodes[1].has_children
+
+    nodes = get_schedule_tree(root.id, depth=None, db=db, current_user=owner)
+    assert len(nodes) == 25
+    assert nodes[-1].depth == 24
+
+def test_private_subtrees_are_hidden_unless_shared(db, users):
+    owner, other = users
+    root = add(db, owner, "root")
+    private = add(db, owner, "private", root, order=1, individual=True)
+    add(db, owner, "under private", private)
+    add(db, owner, "public", root, order=2)
+
+    assert titles(get_schedule_tree(root.id, depth=None, db=db, current_user=other)) == [
+        ("root", 0), ("public", 1)
+    ]
+    with pytest.raises(HTTPException) as exc:
+        get_schedule_tree(private.id, depth=None, db=db, current_user=other)
+    assert exc.value.status_code == 404
+
+    db.add(ScheduleShare(schedule_id=private.id, shared_with_id=other.id))
+    db.commit()
+    assert titles(get_schedule_tree(root.id, depth=None, db=db, current_user=other)) == [
+        ("root", 0), ("private", 1), ("under private", 2), ("public", 1)
+    ]
+
+def closure(db):
+    return {
+        (row.ancestor_id, row.descendant_id, row.depth)
+        for row in db.query(ScheduleClosure)
+    }
+
+def test_closure_follows_create_reparent_and_delete(db, users):
+    owner, _ = users
+    root = add(db, owner, "root")
+    a = add(db, owner, "a", root)
+    b = add(db, owner, "b", a)
+    other = add(db, owner, "other")
+
+    assert descendant_ids(db, root.id) == sorted([a.id, b.id])
+    assert [s.title for s in ancestors(db, b.id, owner)] == ["root", "a"]
+
+    a.parent_id = other.id
+    db.commit()
+    assert is_descendant(db, other.id, b.id)
+    assert not is_descendant(db, root.id, b.id)
+    assert [s.title for s in ancestors(db, b.id, owner)] == ["other", "a"]
+
+    # 자기 하위 트리 아래로는 옮길 수 없음
+    a.parent_id = b.id
+    with pytest.raises(Exception):
+        db.commit()
+    db.rollback()
+
+    db.delete(db.get(Schedule, a.id))
+    db.commit()
+    assert closure(db) == {
+        (root.id, root.id, 0), (other.id, other.id, 0), (b.id, b.id, 0)
+    }
+
+def test_backfill_rebuilds_closure_for_existing_rows(engine, db, users):
+    owner, _ = users
+    root = add(db, owner, "root")
+    a = add(db, owner, "a", root)
+    b = add(db, owner, "b", a)
+    expected = closure(db)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TRIGGER schedules_closure_ad")
+        conn.exec_driver_sql("DELETE FROM schedule_closure")
+    upgrade_schema(engine)
+
+    assert closure(db) == expected
+    assert (root.id, b.id, 2) in expected
+
+def test_update_rejects_cycles_and_ancestors_endpoint(db, users):
+    owner, other = users
+    root = add(db, owner, "root")
+    child = add(db, owner, "child", root)
+    body = ScheduleCreate(title="root", date=datetime(2026, 1, 1), priority=PriorityLevel.MEDIUM, parent_id=child.id)
+
+    with pytest.raises(HTTPException) as exc:
+        update_schedule(root.id, body, db=db, current_user=owner)
+    assert exc.value.status_code == 400
+
+    crumbs = get_schedule_ancestors(child.id, db=db, current_user=other)
+    assert [(node.title, node.depth) for node in crumbs] == [("root", 0)]
@@ -0,0 +1,199 @@
+import io
+import threading
+import zipfile
+from datetime import datetime, timezone
+import pytest
+from app.core.storage import LocalStorage, S3Storage, StorageBackend, temp_file_origin
+from app.core.zipstream import ZipMember, iter_zip
+
+class FakeClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+class FakeS3Client:
+    """boto3 S3 클라이언트에서 저장소가 쓰는 메서드만 흉내 낸 인메모리 구현"""
+
+    def __init__(self):
+        self.objects = {}
+        self.delete_requests = 0
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        self.objects[(bucket, key)] = (fileobj.read(), (ExtraArgs or {}).get("ContentType"))
+
+    def _object(self, bucket, key):
+        if (bucket, key) not in self.objects:
+            raise FakeClientError("NoSuchKey")
+        return self.objects[(bucket, key)][0]
+
+    def get_object(self, Bucket, Key, Range=None):
+        data = self._object(Bucket, Key)
+        if Range:
+            start, _, end = Range[len("bytes="):].partition("-")
+            data = data[int(start):int(end) + 1 if end else None]
+        return {"Body": io.BytesIO(data)}
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError("404")
+        data = self._object(Bucket, Key)
+        return {
+            "ContentLength": len(data),
+            "ETag": f'"{hash(data) & 0xffffffff:x}"',
+            "LastModified": datetime(2026, 1, 1, tzinfo=timezone.utc)
+        }
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def delete_objects(self, Bucket, Delete):
+        self.delete_requests += 1
+        for item in Delete["Objects"]:
+            self.objects.pop((Bucket, item["Key"]), None)
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://s3.example.com/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+@pytest.fixture
+def s3():
+    return S3Storage("bucket", prefix="attachments", client=FakeS3Client())
+
+@pytest.fixture
+def local(tmp_path):
+    return LocalStorage(tmp_path / "uploads")
+
+@pytest.fixture(params=["local", "s3"])
+def storage(request, local, s3):
+    return local if request.param == "local" else s3
+
+def test_backend_must_implement_interface():
+    class PartialStorage(StorageBackend):
+        def put(self, key, src, content_type=None):
+            return 0
+
+    with pytest.raises(TypeError):
+        PartialStorage()
+
+def test_put_stat_and_read(storage):
+    size = storage.put("ab/cd/abcd.txt", io.BytesIO(b"0123456789"), "text/plain")
+
+    stored = storage.stat("ab/cd/abcd.txt")
+    assert size == 10
+    assert stored.size == 10
+    assert stored.etag
+    with storage.open("ab/cd/abcd.txt") as src:
+        assert src.read() == b"0123456789"
+    assert b"".join(storage.iter_range("ab/cd/abcd.txt", 2, 5, chunk_size=2)) == b"2345"
+
+def test_missing_object(storage):
+    assert storage.stat("no/such/key") is None
+    with pytest.raises(FileNotFoundError):
+        storage.open("no/such/key")
+
+def test_delete_many(storage):
+    for name in ("a", "b", "c"):
+        storage.put(f"00/00/{name}", io.BytesIO(b"x"))
+
+    storage.delete_many(["00/00/a", "00/00/b", "00/00/missing"])
+
+    assert storage.stat("00/00/a") is None
+    assert storage.stat("00/00/b") is None
+    assert storage.stat("00/00/c") is not None
+
+def test_local_copy(storage):
+    storage.put("ab/cd/photo.jpg", io.BytesIO(b"jpeg"))
+    with storage.local_copy("ab/cd/photo.jpg") as path:
+        assert path.read_bytes() == b"jpeg"
+
+class BlockingReader(io.BytesIO):
+    """첫 read 에서 release 될 때까지 멈추는 스트림 (쓰기가 겹치게 하려고 사용)"""
+
+    def __init__(self, data, started, release):
+        super().__init__(data)
+        self.started, self.release = started, release
+
+    def read(self, size=-1):
+        self.started.set()
+        self.release.wait(5)
+        return super().read(size)
+
+def test_local_concurrent_puts_use_separate_temp_files(local):
+    release = threading.Event()
+    started = [threading.Event(), threading.Event()]
+    payloads = [b"a" * 100000, b"b" * 50]
+    errors = []
+
+    def put(index):
+        try:
+            local.put("ab/cd/same.jpg", BlockingReader(payloads[index], started[index], release))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for event in started:
+        assert event.wait(5)
+    # 두 쓰기가 동시에 진행 중: 임시 파일이 따로 있어야 함
+    temp_files = [path.name for path in (local.root / "ab" / "cd").iterdir()]
+    assert len(temp_files) == 2
+    assert {temp_file_origin(name) for name in temp_files} == {"same.jpg"}
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert local.local_path("ab/cd/same.jpg").read_bytes() in payloads
+    assert [path.name for path in (local.root / "ab" / "cd").iterdir()] == ["same.jpg"]
+
+def test_local_failed_put_removes_temp_file(local):
+    class BrokenReader(io.BytesIO):
+        def read(self, size=-1):
+            raise OSError("connection reset")
+
+    with pytest.raises(OSError):
+        local.put("ab/cd/broken.bin", BrokenReader())
+    assert list((local.root / "ab" / "cd").iterdir()) == []
+
+def test_temp_file_origin():
+    assert temp_file_origin("a.pdf.upload-x1y2z3.tmp") == "a.pdf"
+    assert temp_file_origin("a.pdf.preview160.jpg.upload-x1y2z3.tmp") == "a.pdf.preview160.jpg"
+    # 예전 방식 임시 파일
+    assert temp_file_origin("a.pdf.tmp") == "a.pdf"
+    assert temp_file_origin("a.pdf") is None
+
+def test_s3_uses_prefix_batch_delete_and_presigned_urls(s3):
+    s3.put("ab/cd/abcd.pdf", io.BytesIO(b"pdf"), "application/pdf")
+
+    assert ("bucket", "attachments/ab/cd/abcd.pdf") in s3.client.objects
+    assert s3.local_path("ab/cd/abcd.pdf") is None
+    url = s3.presigned_url("ab/cd/abcd.pdf", filename="보고서.pdf", as_attachment=True)
+    assert url.startswith("https://s3.example.com/bucket/attachments/ab/cd/abcd.pdf")
+
+    s3.delete_many([f"k{i}" for i in range(2500)])
+    assert s3.client.delete_requests == 3
+
+def test_local_has_path_and_no_presigned_url(local):
+    local.put("ab/cd/abcd.txt", io.BytesIO(b"data"))
+    assert local.local_path("ab/cd/abcd.txt").read_bytes() == b"data"
+    assert local.presigned_url("ab/cd/abcd.txt") is None
+
+def test_local_rejects_keys_outside_root(local):
+    with pytest.raises(ValueError):
+        local.put("../escape.txt", io.BytesIO(b"x"))
+
+def test_iter_zip_reads_from_storage(storage):
+    storage.put("ab/cd/one.txt", io.BytesIO(b"one" * 1000))
+    storage.put("ab/cd/two.jpg", io.BytesIO(b"two"))
+    members = [
+        ZipMember("one.txt", "ab/cd/one.txt", "text/plain", 1767225600.0, 3000),
+        ZipMember("gone.txt", "ab/cd/gone.txt", "text/plain", 1767225600.0, 1),
+        ZipMember("two.jpg", "ab/cd/two.jpg", "image/jpeg", 1767225600.0, 3),
+    ]
+
+    data = b"".join(iter_zip(members, opener=storage.open))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == ["one.txt", "two.jpg"]
+        assert archive.read("one.txt") == b"one" * 1000
+        assert archive.getinfo("two.jpg").compress_type == zipfile.ZIP_STORED
@@ -0,0 +1,170 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+from app.models.models import Attachment, PriorityLevel, Schedule, User
+from app.core import storage_quota
+from app.core.storage import LocalStorage
+from app.core.storage_quota import (
+    SCOPE_SCHEDULE, SCOPE_USER, QuotaExceeded, add_usage, get_usage, subtract_usage
+)
+from app.routers.attachments import get_storage_usage, upload_files_to_schedule
+
+BOUNDARY = "quota-test-boundary"
+
+@pytest.fixture
+def users(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    other = User(username="other", name="Other", hashed_password="hashed_password")
+    db.add_all([owner, other])
+    db.commit()
+    return owner, other
+
+@pytest.fixture
+def schedule(db, users):
+    owner, _ = users
+    schedule = Schedule(title="Schedule", priority=PriorityLevel.MEDIUM, owner_id=owner.id)
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(tmp_path / "uploads")
+
+def stored_files(storage):
+    return sorted(path.name for path in storage.root.rglob("*") if path.is_file())
+
+def multipart_request(files, chunk_size=1024):
+    """files: [(파일명, 내용)] 을 chunk_size 씩 나눠 보내는 업로드 요청"""
+    body = b""
+    for filename, content in files:
+        body += (
+            f"--{BOUNDARY}\r\n"
+            f'Content-Disposition: form-data; name="files"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + content + b"\r\n"
+    body += f"--{BOUNDARY}--\r\n".encode()
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    received = []
+
+    async def receive():
+        chunk = chunks[len(received)]
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(received) < len(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    return Request(scope, receive), received, len(chunks)
+
+def upload(db, user, schedule, storage, request):
+    return asyncio.run(upload_files_to_schedule(
+        schedule.id, request, db=db, current_user=user, storage=storage
+    ))
+
+def usage(db, scope, owner_id):
+    db.expire_all()
+    return get_usage(db, scope, owner_id)
+
+def test_add_usage_rechecks_quota_in_the_update(db, users, schedule, monkeypatch):
+    monkeypatch.setattr(storage_quota, "USER_QUOTA_BYTES", 100)
+    owner, _ = users
+    add_usage(db, owner.id, schedule.id, 60, 1)
+    db.commit()
+    assert usage(db, SCOPE_USER, owner.id)["remaining_bytes"] == 40
+
+    # 다른 요청이 먼저 용량을 써서 남은 용량이 모자라면 UPDATE 가 적용되지 않음
+    with pytest.raises(QuotaExceeded):
+        add_usage(db, owner.id, schedule.id, 41, 1)
+    db.rollback()
+    assert usage(db, SCOPE_USER, owner.id)["bytes_used"] == 60
+    assert usage(db, SCOPE_SCHEDULE, schedule.id) == {
+        "bytes_used": 60, "file_count": 1, "quota_bytes": None, "remaining_bytes": None
+    }
+
+    add_usage(db, owner.id, schedule.id, 40, 1)
+    db.commit()
+    assert usage(db, SCOPE_USER, owner.id)["remaining_bytes"] == 0
+
+def test_subtract_usage_groups_by_scope_and_never_goes_negative(db, users, schedule):
+    owner, other = users
+    add_usage(db, owner.id, schedule.id, 30, 2)
+    add_usage(db, other.id, schedule.id, 5, 1)
+    db.commit()
+
+    subtract_usage(db, [
+        Attachment(file_size=10, uploader_id=owner.id, schedule_id=schedule.id),
+        Attachment(file_size=10, uploader_id=owner.id, schedule_id=schedule.id),
+        Attachment(file_size=50, uploader_id=other.id, schedule_id=schedule.id),
+    ])
+    db.commit()
+    assert usage(db, SCOPE_USER, owner.id)["bytes_used"] == 10
+    assert usage(db, SCOPE_USER, owner.id)["file_count"] == 0
+    assert usage(db, SCOPE_USER, other.id)["bytes_used"] == 0
+    assert usage(db, SCOPE_SCHEDULE, schedule.id)["bytes_used"] == 0
+
+def test_upload_updates_counters(db, users, schedule, storage):
+    owner, _ = users
+    request, _, _ = multipart_request([("a.bin", b"a" * 300), ("b.bin", b"b" * 200)])
+    result = upload(db, owner, schedule, storage, request)
+
+    assert len(result["files"]) == 2
+    assert len(stored_files(storage)) == 2
+    assert usage(db, SCOPE_USER, owner.id)["bytes_used"] == 500
+    assert usage(db, SCOPE_SCHEDULE, schedule.id)["file_count"] == 2
+
+def test_rejected_upload_rolls_back_and_removes_stored_files(db, users, schedule, storage, monkeypatch):
+    monkeypatch.setattr(storage_quota, "SCHEDULE_QUOTA_BYTES", 500)
+    owner, _ = users
+    # 첫 파일은 저장된 뒤 두 번째 파일에서 제한 초과
+    request, _, _ = multipart_request([("a.bin", b"a" * 300), ("b.bin", b"b" * 300)])
+    with pytest.raises(HTTPException) as error:
+        upload(db, owner, schedule, storage, request)
+
+    assert error.value.status_code == 413
+    assert stored_files(storage) == []
+    assert db.query(Attachment).count() == 0
+    assert usage(db, SCOPE_SCHEDULE, schedule.id)["bytes_used"] == 0
+
+def test_oversized_upload_is_rejected_before_reading_the_body(db, users, schedule, storage, monkeypatch):
+    monkeypatch.setattr(storage_quota, "USER_QUOTA_BYTES", 1000)
+    owner, _ = users
+    request, received, _ = multipart_request([("big.bin", b"x" * 200 * 1024)])
+    with pytest.raises(HTTPException) as error:
+        upload(db, owner, schedule, storage, request)
+
+    assert error.value.status_code == 413
+    assert received == []
+    assert stored_files(storage) == []
+
+def test_upload_without_length_stops_reading_mid_stream(db, users, schedule, storage, monkeypatch):
+    monkeypatch.setattr(storage_quota, "USER_QUOTA_BYTES", 1000)
+    owner, _ = users
+    request, received, total_chunks = multipart_request([("big.bin", b"x" * 1024 * 1024)], chunk_size=16 * 1024)
+    request.scope["headers"] = [header for header in request.scope["headers"] if header[0] != b"content-length"]
+    with pytest.raises(HTTPException) as error:
+        upload(db, owner, schedule, storage, request)
+
+    assert error.value.status_code == 413
+    # 남은 용량 + multipart 여유분을 넘는 순간 중단
+    assert len(received) < total_chunks
+    assert sum(len(chunk) for chunk in received) <= 1000 + storage_quota.MULTIPART_OVERHEAD_BYTES + 16 * 1024
+    assert stored_files(storage) == []
+
+def test_schedule_usage_requires_read_access(db, users, schedule):
+    owner, other = users
+    assert "schedule" in asyncio.run(get_storage_usage(schedule.id, db=db, current_user=other))
+
+    schedule.individual = True
+    db.commit()
+    assert "schedule" in asyncio.run(get_storage_usage(schedule.id, db=db, current_user=owner))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(get_storage_usage(schedule.id, db=db, current_user=other))
+    assert error.value.status_code == 404
@@ -0,0 +1,75 @@
+import pytest
+from app.models.models import Schedule, User, Attachment, PriorityLevel
+from app.core import upload_layout
+from app.core.previews import preview_path
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    upload_dir = tmp_path / "static" / "uploads"
+    upload_dir.mkdir(parents=True)
+    return upload_dir
+
+def make_attachment(db, file_path):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    db.add(owner)
+    db.commit()
+    schedule = Schedule(title="Schedule", priority=PriorityLevel.MEDIUM, owner_id=owner.id)
+    db.add(schedule)
+    db.commit()
+    attachment = Attachment(
+        filename="보고서 최종.PDF",
+        file_path=file_path,
+        file_size=4,
+        schedule_id=schedule.id,
+        uploader_id=owner.id
+    )
+    db.add(attachment)
+    db.commit()
+    return attachment
+
+def test_new_object_path_is_sharded_and_unique(upload_dir):
+    path, url = upload_layout.new_object_path("보고서 최종.PDF")
+    other_path, _ = upload_layout.new_object_path("보고서 최종.PDF")
+
+    name = path.name
+    assert path != other_path
+    assert name.endswith(".pdf")
+    assert url == f"/static/uploads/{name[:2]}/{name[2:4]}/{name}"
+    assert path.parent.is_dir()
+    assert not upload_layout.is_legacy_path(url)
+
+def test_new_object_path_drops_unsafe_extension(upload_dir):
+    path, _ = upload_layout.new_object_path("archive.tar.g z")
+    assert "." not in path.name
+
+def test_is_legacy_path():
+    assert upload_layout.is_legacy_path("/static/uploads/1_report.pdf")
+    assert not upload_layout.is_legacy_path("/static/uploads/ab/cd/abcd.pdf")
+    assert not upload_layout.is_legacy_path(None)
+
+def test_migrate_batch_moves_legacy_files(db, upload_dir):
+    legacy = upload_dir / "1_report.pdf"
+    legacy.write_bytes(b"data")
+    preview_path(legacy, 160).write_bytes(b"jpeg")
+    attachment = make_attachment(db, "/static/uploads/1_report.pdf")
+
+    last_id = upload_layout.migrate_batch(db, 0)
+
+    db.refresh(attachment)
+    new_path = upload_dir.parent.parent / attachment.file_path.lstrip("/")
+    assert last_id == attachment.id
+    assert not upload_layout.is_legacy_path(attachment.file_path)
+    assert new_path.read_bytes() == b"data"
+    assert preview_path(new_path, 160).read_bytes() == b"jpeg"
+    assert not legacy.exists()
+    assert not preview_path(legacy, 160).exists()
+    assert upload_layout.migrate_batch(db, last_id) == last_id
+
+def test_migrate_batch_skips_missing_files(db, upload_dir):
+    attachment = make_attachment(db, "/static/uploads/missing.pdf")
+
+    upload_layout.migrate_batch(db, 0)
+
+    db.refresh(attachment)
+    assert attachment.file_path == "/static/uploads/missing.pdf"
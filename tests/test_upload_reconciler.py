@@ -0,0 +1,143 @@
+import os
+import time
+import asyncio
+import pytest
+from app.models.models import Attachment, PriorityLevel, Schedule, User
+from app.core import upload_reconciler
+from app.core.checkpoints import load_checkpoint
+from app.core.storage import LocalStorage, set_storage
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    upload_dir = tmp_path / "static" / "uploads"
+    upload_dir.mkdir(parents=True)
+    monkeypatch.setattr(upload_reconciler, "BATCH_PAUSE_SECONDS", 0)
+    set_storage(LocalStorage(upload_dir))
+    try:
+        yield upload_dir
+    finally:
+        set_storage(None)
+
+@pytest.fixture
+def schedule(db):
+    owner = User(username="owner", name="Owner", hashed_password="hashed_password")
+    db.add(owner)
+    db.commit()
+    schedule = Schedule(title="Schedule", priority=PriorityLevel.MEDIUM, owner_id=owner.id)
+    db.add(schedule)
+    db.commit()
+    return schedule
+
+def write(upload_dir, relative, age_seconds=2 * 3600):
+    path = upload_dir / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"data")
+    mtime = time.time() - age_seconds
+    os.utime(path, (mtime, mtime))
+    return path
+
+def attach(db, schedule, relative):
+    attachment = Attachment(
+        filename=relative, file_path="/static/uploads/" + relative, file_size=4,
+        schedule_id=schedule.id, uploader_id=schedule.owner_id
+    )
+    db.add(attachment)
+    db.commit()
+    return attachment
+
+def quarantined(tmp_path):
+    root = tmp_path / "quarantine" / "uploads"
+    return sorted(path.relative_to(root).as_posix().split("/", 1)[1] for path in root.rglob("*") if path.is_file())
+
+def test_walk_order_matches_resume_cursor(upload_dir):
+    for relative in ("20240101_old.jpg", "zz.txt", "0f/a.bin", "ab/b.bin", "ab.txt", "ab/cd/c.bin"):
+        write(upload_dir, relative)
+
+    names = list(upload_reconciler._walk_upload_files())
+    assert names == sorted(names)
+    assert len(names) == 6
+    # 어느 파일에서 끊겨도 나머지를 빠짐없이 이어서 돌려줌
+    for index, name in enumerate(names):
+        assert list(upload_reconciler._walk_upload_files(name)) == names[index + 1:]
+
+def test_incremental_walk_skips_unchanged_directories(upload_dir):
+    write(upload_dir, "0f/old.bin")
+    os.utime(upload_dir / "0f", (time.time() - 7200, time.time() - 7200))
+    write(upload_dir, "ab/new.bin")
+
+    assert list(upload_reconciler._walk_upload_files(since=time.time() - 3600)) == ["ab/new.bin"]
+    assert list(upload_reconciler._walk_upload_files()) == ["0f/old.bin", "ab/new.bin"]
+
+def test_pass_quarantines_orphans_after_grace_window(db, schedule, upload_dir, tmp_path):
+    write(upload_dir, "0f/kept.pdf")
+    write(upload_dir, "0f/kept.pdf.preview160.jpg")
+    attach(db, schedule, "0f/kept.pdf")
+    write(upload_dir, "0f/orphan.pdf")
+    write(upload_dir, "0f/orphan.pdf.preview160.jpg")
+    write(upload_dir, "ab/uploading.bin", age_seconds=10)
+
+    asyncio.run(upload_reconciler.run_reconcile_pass())
+
+    assert quarantined(tmp_path) == ["0f/orphan.pdf", "0f/orphan.pdf.preview160.jpg"]
+    assert (upload_dir / "0f" / "kept.pdf").exists()
+    assert (upload_dir / "0f" / "kept.pdf.preview160.jpg").exists()
+    # 업로드 중일 수 있는 새 파일은 남겨 둠
+    assert (upload_dir / "ab" / "uploading.bin").exists()
+
+def test_temp_files_map_to_their_blob(db, schedule, upload_dir, tmp_path):
+    write(upload_dir, "0f/kept.pdf")
+    attach(db, schedule, "0f/kept.pdf")
+    write(upload_dir, "0f/kept.pdf.upload-k2j4x9.tmp")
+    write(upload_dir, "0f/kept.pdf.preview160.jpg.upload-p8q1r0.tmp")
+    write(upload_dir, "0f/gone.pdf.upload-a1b2c3.tmp")
+
+    asyncio.run(upload_reconciler.run_reconcile_pass())
+
+    # 참조되는 원본의 임시 파일은 두고, 원본이 없는 임시 파일만 격리
+    assert quarantined(tmp_path) == ["0f/gone.pdf.upload-a1b2c3.tmp"]
+    assert (upload_dir / "0f" / "kept.pdf.upload-k2j4x9.tmp").exists()
+
+def test_interrupted_pass_resumes_without_skipping_files(db, schedule, upload_dir, tmp_path, monkeypatch):
+    orphans = ["0f/a.bin", "20240101_old.jpg", "ab/b.bin", "zz.txt"]
+    for relative in orphans:
+        write(upload_dir, relative)
+    monkeypatch.setattr(upload_reconciler, "BATCH_SIZE", 1)
+
+    reconcile = upload_reconciler.reconcile_file_batch
+    calls = []
+
+    def crash_on_third_batch(db, names, since):
+        calls.append(names)
+        if len(calls) == 3:
+            raise RuntimeError("worker restarted")
+        return reconcile(db, names, since)
+
+    monkeypatch.setattr(upload_reconciler, "reconcile_file_batch", crash_on_third_batch)
+    asyncio.run(upload_reconciler.run_reconcile_pass())
+    db.expire_all()
+    state = load_checkpoint(db, upload_reconciler.CHECKPOINT_NAME)
+    assert state["file_cursor"] == "20240101_old.jpg"
+
+    monkeypatch.setattr(upload_reconciler, "reconcile_file_batch", reconcile)
+    asyncio.run(upload_reconciler.run_reconcile_pass())
+    assert quarantined(tmp_path) == orphans
+    db.expire_all()
+    assert "file_cursor" not in load_checkpoint(db, upload_reconciler.CHECKPOINT_NAME)
+
+def test_rows_pointing_to_missing_files_are_flagged(db, schedule, upload_dir):
+    write(upload_dir, "0f/present.pdf")
+    present = attach(db, schedule, "0f/present.pdf")
+    missing = attach(db, schedule, "0f/missing.pdf")
+
+    asyncio.run(upload_reconciler.run_reconcile_pass())
+    db.expire_all()
+    assert present.file_missing_at is None
+    assert missing.file_missing_at is not None
+
+    # 파일이 다시 생기면 다음 전체 순회에서 표시를 지움
+    write(upload_dir, "0f/missing.pdf")
+    assert upload_reconciler.reconcile_row_batch(db, 0) == missing.id
+    db.commit()
+    db.expire_all()
+    assert missing.file_missing_at is None
@@ -0,0 +1,45 @@
+import io
+import zipfile
+import pytest
+from app.core.zipstream import ZipMember, iter_zip, unique_archive_name
+
+def test_iter_zip_builds_valid_archive(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_bytes(b"\xff\xd8" + b"x" * 200000)
+    report = tmp_path / "report.txt"
+    report.write_text("보고서 " * 10000, encoding="utf-8")
+
+    chunks = list(iter_zip([
+        ZipMember("photo.jpg", photo, "image/jpeg"),
+        ZipMember("report.txt", report, "text/plain"),
+    ], chunk_size=4096))
+
+    # 소스를 청크 단위로 읽으면서 여러 조각으로 스트리밍되어야 함
+    assert len(chunks) > 2
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zipf:
+        assert zipf.testzip() is None
+        assert zipf.getinfo("photo.jpg").compress_type == zipfile.ZIP_STORED
+        assert zipf.getinfo("report.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zipf.read("photo.jpg") == photo.read_bytes()
+        assert zipf.read("report.txt") == report.read_bytes()
+
+@pytest.mark.parametrize("size", [0, 10])
+def test_iter_zip_does_not_trust_recorded_size(tmp_path, monkeypatch, size):
+    # 4GiB 대신 작은 한도로 zip64 가 필요한 크기를 흉내 냄
+    monkeypatch.setattr(zipfile, "ZIP64_LIMIT", 1000)
+    data = tmp_path / "large.bin"
+    data.write_bytes(bytes(range(256)) * 20)
+
+    chunks = list(iter_zip([ZipMember("large.bin", data, modified=0, size=size)], chunk_size=512))
+
+    monkeypatch.undo()
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zipf:
+        assert zipf.read("large.bin") == data.read_bytes()
+
+def test_unique_archive_name():
+    used = set()
+    assert unique_archive_name("a.txt", used) == "a.txt"
+    assert unique_archive_name("a.txt", used) == "a_1.txt"
+    assert unique_archive_name("a.txt", used) == "a_2.txt"
+    assert used == {"a.txt", "a_1.txt", "a_2.txt"}